@@ -0,0 +1,6 @@
+from .events import EventLog, EventLogBuilder, load_events, load_recorded
+from .exchange import SimulatedExchange
+from .engine import Backtester, BacktestResult
+from .sweep import ParameterSweep
+
+__all__ = ['EventLog', 'EventLogBuilder', 'load_events', 'load_recorded', 'SimulatedExchange', 'Backtester', 'BacktestResult', 'ParameterSweep']
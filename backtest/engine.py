@@ -0,0 +1,284 @@
+import logging
+import time
+from array import array
+from contextlib import contextmanager, nullcontext
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from config.config import (
+    SYMBOL, TICK_SIZE, QUOTE_REFRESH_INTERVAL,
+    BACKTEST_REQUOTE_INTERVAL, BACKTEST_LATENCY, BACKTEST_FEE_RATE
+)
+from market_data.order_book import OrderBook, BIDS, ASKS
+from market_maker import MarketMaker
+from trading.pricing import PricingModel
+from trading.symbols import SymbolInfo, split_symbol
+from backtest.events import EventLog, BID, ASK, TRADE_BUY, TRADE_SELL, CLEAR
+from backtest.exchange import SimulatedExchange, SimOrder
+
+REPLAY_CHUNK = 65536  # Events converted to Python values at a time
+
+# Per-order loggers that would otherwise write a line per quote and fill
+QUIET_LOGGERS = ('market_maker', 'risk_manager', 'wallet_manager', 'position_tracker',
+                 'quote_engine', 'symbols')
+
+@contextmanager
+def quiet_loggers(names=QUIET_LOGGERS, level: int = logging.ERROR) -> Iterator[None]:
+    loggers = [logging.getLogger(name) for name in names]
+    levels = [lg.level for lg in loggers]
+    for lg in loggers:
+        lg.setLevel(level)
+    try:
+        yield
+    finally:
+        for lg, previous in zip(loggers, levels):
+            lg.setLevel(previous)
+
+class BacktestResult:
+    """Outcome of a replay: PnL, fill statistics and sampled paths
+
+    ``ts``, ``mid``, ``position`` and ``pnl`` are sampled after every
+    requote. PnL is marked to mid in the quote asset and excludes
+    the drift of the starting balances.
+    """
+    def __init__(self, events: int, elapsed: float, requotes: int, stats: Dict[str, float],
+                 fees: float, ts: np.ndarray, mid: np.ndarray, position: np.ndarray, pnl: np.ndarray):
+        self.events = events
+        self.elapsed = elapsed
+        self.requotes = requotes
+        self.stats = stats
+        self.fees = fees
+        self.ts = ts
+        self.mid = mid
+        self.position = position
+        self.pnl = pnl
+
+    @property
+    def final_pnl(self) -> float:
+        return float(self.pnl[-1]) if len(self.pnl) else 0.0
+
+    @property
+    def fill_ratio(self) -> float:
+        """Share of quoted volume that was filled"""
+        placed = self.stats['placed_volume']
+        return self.stats['filled_volume'] / placed if placed else 0.0
+
+    @property
+    def sharpe(self) -> float:
+        """Mean over standard deviation of the PnL change between requotes"""
+        if len(self.pnl) < 3:
+            return 0.0
+        changes = np.diff(self.pnl)
+        std = changes.std()
+        return float(changes.mean() / std) if std else 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'events': self.events,
+            'events_per_second': round(self.events_per_second),
+            'requotes': self.requotes,
+            'orders_placed': self.stats['placed'],
+            'orders_filled': self.stats['filled'],
+            'fills': self.stats['fills'],
+            'fill_ratio': round(self.fill_ratio, 6),
+            'filled_volume': self.stats['filled_volume'],
+            'fees': self.fees,
+            'pnl': self.final_pnl,
+            'sharpe': round(self.sharpe, 6),
+            'max_abs_position': float(np.abs(self.position).max()) if len(self.position) else 0.0,
+            'final_position': float(self.position[-1]) if len(self.position) else 0.0,
+        }
+
+class Backtester:
+    """Replays recorded market data through a MarketMaker
+
+    Book events update the book and the simulated exchange's queue
+    positions; trades fill our quotes (see SimulatedExchange). Events
+    sharing a timestamp are applied together. After each batch the maker
+    requotes via calculate_new_orders and replace_quotes if the touch
+    changed or we were filled, at most every ``requote_interval`` seconds,
+    and at least every QUOTE_REFRESH_INTERVAL. Fills update the maker's
+    PositionTracker, WalletManager and OrderManager. The run is fully
+    deterministic.
+
+    Args:
+        events: Market data to replay
+        symbol: Symbol being quoted
+        symbol_info: Tick/lot metadata; defaults to TICK_SIZE and the
+            registry's lot size
+        initial_balances: Asset -> starting balance; defaults to equal
+            base and quote value at the first mid (10000 quote) plus the
+            KAS gas reserve
+        requote_interval: Minimum seconds of market time between requotes
+        latency: Order entry delay in seconds
+        fee_rate: Fee charged on filled notional, in the quote asset
+        pricing_model: Overrides the risk manager's pricing model
+        volatility_multiplier: Overrides the risk manager's spread per
+            unit of volatility
+        quiet: Silence per-order logging during the run
+        **maker_kwargs: Passed on to MarketMaker
+    """
+    def __init__(self, events: EventLog, symbol: str = SYMBOL, symbol_info: Optional[SymbolInfo] = None,
+                 initial_balances: Optional[Dict[str, Decimal]] = None,
+                 requote_interval: float = BACKTEST_REQUOTE_INTERVAL,
+                 latency: float = BACKTEST_LATENCY, fee_rate: Decimal = BACKTEST_FEE_RATE,
+                 pricing_model: Optional[PricingModel] = None,
+                 volatility_multiplier: Optional[Decimal] = None, quiet: bool = True, **maker_kwargs):
+        self.events = events
+        self.symbol = symbol
+        self.requote_interval = int(requote_interval * 1000)
+        self.refresh_interval = int(QUOTE_REFRESH_INTERVAL * 1000)
+        self.fee_rate = Decimal(fee_rate)
+        self.quiet = quiet
+        self.book = OrderBook(symbol, events.price_decimals, events.size_decimals)
+        self.exchange = SimulatedExchange(self.book, int(latency * 1000), self._on_fill)
+        self.maker = MarketMaker(self.exchange, symbol=symbol, **maker_kwargs)
+        if pricing_model is not None:
+            self.maker.risk_manager.pricing_model = pricing_model
+        if volatility_multiplier is not None:
+            self.maker.risk_manager.volatility_multiplier = Decimal(volatility_multiplier)
+        self.info = symbol_info or SymbolInfo(symbol, *split_symbol(symbol), tick_size=TICK_SIZE)
+        self.maker.symbols.add(self.info)
+        self.base_asset, self.quote_asset = self.info.assets
+
+        balances = initial_balances or self._default_balances()
+        for asset, amount in balances.items():
+            self.maker.wallet_manager.update_balance(asset, Decimal(amount))
+        self._price_scale = 10.0 ** -events.price_decimals
+        self._size_scale = 10.0 ** -events.size_decimals
+        self.cash = 0.0
+        self.inventory = 0.0
+        self.fees = Decimal('0')
+        self._filled = False
+        self._early_fills: List[Tuple[str, Decimal]] = []
+
+    def _default_balances(self) -> Dict[str, Decimal]:
+        scale = Decimal(1).scaleb(-self.events.price_decimals)
+        kind = self.events.kind
+        bids = np.flatnonzero(kind == BID)
+        asks = np.flatnonzero(kind == ASK)
+        quote = Decimal('10000')
+        balances = {self.quote_asset: quote, 'KAS': self.maker.wallet_manager.min_kas_reserve}
+        if len(bids) and len(asks):
+            price = self.events.price
+            mid = (Decimal(int(price[bids[0]])) + Decimal(int(price[asks[0]]))) / 2 * scale
+            balances[self.base_asset] = self.info.quantize_size(quote / mid)
+        return balances
+
+    def _on_fill(self, order: SimOrder, price: int, size: int) -> None:
+        wallet = self.maker.wallet_manager
+        price_dec = Decimal(price).scaleb(-self.book.price_decimals)
+        size_dec = Decimal(size).scaleb(-self.book.size_decimals)
+        notional = price_dec * size_dec
+        fee = notional * self.fee_rate
+        sign = 1 if order.is_buy else -1
+        wallet.adjust_balance(self.base_asset, sign * size_dec)
+        wallet.adjust_balance(self.quote_asset, -sign * notional - fee)
+        self.maker.position_tracker.update_position(self.symbol, size_dec, price_dec, order.is_buy)
+        if order.order_id in self.maker.orders:
+            self.maker.orders.on_fill(order.order_id, size_dec)
+        else:
+            # Marketable quotes fill while they are placed, before the
+            # maker has recorded them
+            self._early_fills.append((order.order_id, size_dec))
+        self.fees += fee
+        self.cash -= sign * float(notional) + float(fee)
+        self.inventory += sign * float(size_dec)
+        self._filled = True
+
+    def run(self) -> BacktestResult:
+        """Replay every event and return the result"""
+        with quiet_loggers() if self.quiet else nullcontext():
+            return self._run()
+
+    def _run(self) -> BacktestResult:
+        book, exchange, maker = self.book, self.exchange, self.maker
+        events = self.events
+        count = len(events)
+        price_scale = self._price_scale
+
+        sample_ts, sample_mid = array('q'), array('d')
+        sample_position, sample_pnl = array('d'), array('d')
+        last_quote_ts = None
+        last_touch = None
+        requotes = 0
+        started = time.perf_counter()
+
+        # Columns may be memory-mapped and shared with other processes, so
+        # they are converted to Python values a chunk at a time
+        for chunk_start in range(0, count, REPLAY_CHUNK):
+            chunk_end = min(chunk_start + REPLAY_CHUNK, count)
+            ts_list = events.ts[chunk_start:chunk_end].tolist()
+            kinds = events.kind[chunk_start:chunk_end].tolist()
+            prices = events.price[chunk_start:chunk_end].tolist()
+            sizes = events.size[chunk_start:chunk_end].tolist()
+            ts_list.append(int(events.ts[chunk_end]) if chunk_end < count else None)
+
+            for i in range(chunk_end - chunk_start):
+                ts = ts_list[i]
+                kind = kinds[i]
+                price = prices[i]
+                size = sizes[i]
+                if exchange.pending:
+                    exchange.advance(ts)
+                else:
+                    exchange.now = ts
+
+                if kind == BID:
+                    book.update_scaled(BIDS, price, size)
+                    if exchange.bids or exchange.asks:
+                        exchange.on_level(True, price, size)
+                elif kind == ASK:
+                    book.update_scaled(ASKS, price, size)
+                    if exchange.bids or exchange.asks:
+                        exchange.on_level(False, price, size)
+                elif kind == TRADE_BUY:
+                    exchange.on_trade(True, price, size)
+                elif kind == TRADE_SELL:
+                    exchange.on_trade(False, price, size)
+                elif kind == CLEAR:
+                    book.load_snapshot([], [])
+
+                # Requote once every event at this timestamp has been applied
+                if ts_list[i + 1] == ts:
+                    continue
+                if last_quote_ts is not None and ts - last_quote_ts < self.requote_interval:
+                    continue
+                bid = book.best_bid_scaled()
+                ask = book.best_ask_scaled()
+                if bid is None or ask is None:
+                    continue
+                touch = (bid, ask)
+                if (touch == last_touch and not self._filled
+                        and ts - last_quote_ts < self.refresh_interval):
+                    continue
+
+                maker.replace_quotes(maker.calculate_new_orders(book))
+                if self._early_fills:
+                    for order_id, size in self._early_fills:
+                        maker.orders.on_fill(order_id, size)
+                    self._early_fills.clear()
+                requotes += 1
+                last_quote_ts = ts
+                last_touch = touch
+                self._filled = False
+
+                mid = (bid + ask) * 0.5 * price_scale
+                sample_ts.append(ts)
+                sample_mid.append(mid)
+                sample_position.append(self.inventory)
+                sample_pnl.append(self.cash + self.inventory * mid)
+
+        elapsed = time.perf_counter() - started
+        stats = dict(exchange.stats)
+        stats['placed_volume'] *= self._size_scale
+        stats['filled_volume'] *= self._size_scale
+        return BacktestResult(
+            count, elapsed, requotes, stats, float(self.fees),
+            np.array(sample_ts, dtype=np.int64), np.array(sample_mid), np.array(sample_position),
+            np.array(sample_pnl)
+        )
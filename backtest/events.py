@@ -0,0 +1,229 @@
+import gzip
+import json
+import os
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from market_data.columnar import MarketDataStore
+from market_data.depth_feed import parse_depth_message
+from market_data.order_book import to_scaled
+
+# Event kinds
+BID = 0  # Set the size of a bid level (0 removes it)
+ASK = 1  # Set the size of an ask level
+TRADE_BUY = 2  # Buyer-initiated trade, lifts asks
+TRADE_SELL = 3  # Seller-initiated trade, hits bids
+CLEAR = 4  # Empty the book ahead of a snapshot
+
+COLUMNS = ('ts', 'kind', 'price', 'size')
+EVENT_LOG_META = 'events.json'
+
+class EventLog:
+    """Columnar market events in replay order
+
+    Prices and sizes are scaled integers (see market_data.order_book), so
+    events apply to an OrderBook without any parsing during replay.
+    """
+    __slots__ = ('ts', 'kind', 'price', 'size', 'price_decimals', 'size_decimals')
+
+    def __init__(self, ts: np.ndarray, kind: np.ndarray, price: np.ndarray, size: np.ndarray,
+                 price_decimals: int = 8, size_decimals: int = 8):
+        self.ts = ts
+        self.kind = kind
+        self.price = price
+        self.size = size
+        self.price_decimals = price_decimals
+        self.size_decimals = size_decimals
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def save(self, path: str) -> None:
+        """Write as an uncompressed .npz, or a directory of .npy columns
+
+        Paths ending in ``.npz`` get a single file. Any other path becomes a
+        directory that load() memory-maps, so processes replaying the same
+        log share its pages instead of each holding a copy.
+        """
+        if path.endswith('.npz'):
+            np.savez(path, ts=self.ts, kind=self.kind, price=self.price, size=self.size,
+                     decimals=np.array([self.price_decimals, self.size_decimals]))
+            return
+        os.makedirs(path, exist_ok=True)
+        for name in COLUMNS:
+            np.save(os.path.join(path, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(path, EVENT_LOG_META), 'w') as f:
+            json.dump({'price_decimals': self.price_decimals, 'size_decimals': self.size_decimals}, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'EventLog':
+        """Load a saved log; column directories are memory-mapped read-only"""
+        if is_event_log(path):
+            with open(os.path.join(path, EVENT_LOG_META)) as f:
+                meta = json.load(f)
+            columns = [np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in COLUMNS]
+            return cls(*columns, meta['price_decimals'], meta['size_decimals'])
+        with np.load(path) as data:
+            price_decimals, size_decimals = (int(d) for d in data['decimals'])
+            return cls(data['ts'], data['kind'], data['price'], data['size'],
+                       price_decimals, size_decimals)
+
+def is_event_log(path: str) -> bool:
+    """Whether ``path`` is a directory written by EventLog.save"""
+    return os.path.isfile(os.path.join(path, EVENT_LOG_META))
+
+class EventLogBuilder:
+    """Accumulates events from parsed messages into an EventLog"""
+    def __init__(self, price_decimals: int = 8, size_decimals: int = 8):
+        self.price_decimals = price_decimals
+        self.size_decimals = size_decimals
+        self._ts = array('q')
+        self._kind = array('b')
+        self._price = array('q')
+        self._size = array('q')
+        self.last_ts = 0
+
+    def __len__(self) -> int:
+        return len(self._ts)
+
+    def _timestamp(self, ts: Optional[Any]) -> int:
+        # Events without a timestamp, or stamped earlier than the last one,
+        # keep replay order monotonic
+        if ts is not None and int(ts) > self.last_ts:
+            self.last_ts = int(ts)
+        return self.last_ts
+
+    def add(self, ts: int, kind: int, price: Any, size: Any) -> None:
+        self._ts.append(ts)
+        self._kind.append(kind)
+        self._price.append(to_scaled(price, self.price_decimals))
+        self._size.append(to_scaled(size, self.size_decimals))
+
+    def add_levels(self, ts: Optional[Any], bids: Iterable, asks: Iterable) -> None:
+        ts = self._timestamp(ts)
+        for price, size in bids:
+            self.add(ts, BID, price, size)
+        for price, size in asks:
+            self.add(ts, ASK, price, size)
+
+    def add_snapshot(self, ts: Optional[Any], bids: Iterable, asks: Iterable) -> None:
+        ts = self._timestamp(ts)
+        self.add(ts, CLEAR, 0, 0)
+        self.add_levels(ts, bids, asks)
+
+    def add_trade(self, ts: Optional[Any], is_buy: bool, price: Any, size: Any) -> None:
+        self.add(self._timestamp(ts), TRADE_BUY if is_buy else TRADE_SELL, price, size)
+
+    def add_message(self, message: Dict) -> bool:
+        """Add one recorded message; returns False if it was not recognised"""
+        depth = parse_depth_message(message)
+        if depth is not None:
+            self.add_levels(depth.timestamp, depth.bids, depth.asks)
+            return True
+        trades = parse_trade_message(message)
+        if trades is not None:
+            for ts, is_buy, price, size in trades:
+                self.add_trade(ts, is_buy, price, size)
+            return True
+        data = message.get('data', message)
+        if isinstance(data, dict) and 'bids' in data and 'asks' in data:
+            self.add_snapshot(data.get('timestamp', message.get('ts')), data['bids'], data['asks'])
+            return True
+        return False
+
+    def build(self) -> EventLog:
+        return EventLog(
+            np.frombuffer(self._ts, dtype=np.int64).copy(),
+            np.frombuffer(self._kind, dtype=np.int8).copy(),
+            np.frombuffer(self._price, dtype=np.int64).copy(),
+            np.frombuffer(self._size, dtype=np.int64).copy(),
+            self.price_decimals, self.size_decimals
+        )
+
+def parse_trade_message(message: Dict) -> Optional[List[Tuple[Optional[int], bool, Any, Any]]]:
+    """Parse a trade channel message into (ts, is_buy, price, size) tuples
+
+    Expected shape::
+
+        {"channel": "market_szarusdt_trade_ticker", "ts": 1700000000000,
+         "tick": {"data": [{"side": "buy", "price": "0.0951", "vol": "250",
+                            "ts": 1700000000000}]}}
+    """
+    tick = message.get('tick')
+    if not isinstance(tick, dict) or not isinstance(tick.get('data'), list):
+        return None
+    trades = []
+    for trade in tick['data']:
+        try:
+            size = trade.get('vol', trade.get('amount', trade.get('qty')))
+            trades.append((trade.get('ts', message.get('ts')),
+                           str(trade['side']).upper() == 'BUY', trade['price'], size))
+        except (KeyError, AttributeError):
+            continue
+    return trades
+
+def _open(path: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+def load_events(path: str, price_decimals: int = 8, size_decimals: int = 8) -> EventLog:
+    """Load recorded market data for replay
+
+    ``.npz`` files and directories written by EventLog.save load directly.
+    Anything else is read as JSON lines (optionally gzipped) of recorded depth, trade or
+    snapshot messages; unrecognised lines are skipped.
+    """
+    if path.endswith('.npz') or is_event_log(path):
+        return EventLog.load(path)
+    builder = EventLogBuilder(price_decimals, size_decimals)
+    with _open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(message, dict):
+                builder.add_message(message)
+    return builder.build()
+
+def load_recorded(root: str, symbol: str, day: str, start: Optional[int] = None,
+                  end: Optional[int] = None) -> EventLog:
+    """Build an EventLog from a recorder store's depth snapshots and trades
+
+    Each snapshot becomes a CLEAR followed by its levels; trades are merged
+    in by timestamp, after any snapshot taken at the same millisecond.
+    """
+    store = MarketDataStore(root)
+    parts = []
+    decimals = (8, 8)
+    if 'depth' in _streams(store, symbol, day):
+        depth = store.open(symbol, 'depth', day)
+        decimals = (depth.price_decimals, depth.size_decimals)
+        cols = depth.between(start, end)
+        ts, seq = cols['ts'], cols['seq']
+        starts = np.flatnonzero(np.r_[True, (ts[1:] != ts[:-1]) | (seq[1:] != seq[:-1])]) if len(ts) else []
+        kind = np.where(cols['side'] == 0, BID, ASK).astype(np.int8)
+        parts.append((
+            np.insert(ts, starts, ts[starts]) if len(ts) else ts,
+            np.insert(kind, starts, CLEAR),
+            np.insert(cols['price'], starts, 0),
+            np.insert(cols['size'], starts, 0),
+        ))
+    if 'trades' in _streams(store, symbol, day):
+        trades = store.open(symbol, 'trades', day)
+        decimals = (trades.price_decimals, trades.size_decimals)
+        cols = trades.between(start, end)
+        kind = np.where(cols['side'] == 1, TRADE_BUY, TRADE_SELL).astype(np.int8)
+        parts.append((np.asarray(cols['ts']), kind, np.asarray(cols['price']), np.asarray(cols['size'])))
+    if not parts:
+        empty = np.zeros(0, dtype=np.int64)
+        return EventLog(empty, empty.astype(np.int8), empty, empty, *decimals)
+    ts, kind, price, size = (np.concatenate(column) for column in zip(*parts))
+    order = np.argsort(ts, kind='stable')
+    return EventLog(ts[order], kind[order], price[order], size[order], *decimals)
+
+def _streams(store: MarketDataStore, symbol: str, day: str) -> List[str]:
+    return [stream for stream in ('depth', 'trades') if day in store.days(symbol, stream)]
@@ -0,0 +1,183 @@
+from typing import Callable, Dict, List, Optional
+from market_data.order_book import OrderBook, BIDS, ASKS, to_scaled
+from trading.quote_engine import normalize_side, BUY
+
+class SimOrder:
+    """A resting quote with its simulated queue position"""
+    __slots__ = ('order_id', 'is_buy', 'price', 'size', 'remaining', 'queue_ahead', 'active_at')
+
+    def __init__(self, order_id: str, is_buy: bool, price: int, size: int, active_at: int):
+        self.order_id = order_id
+        self.is_buy = is_buy
+        self.price = price
+        self.size = size
+        self.remaining = size
+        self.queue_ahead = 0
+        self.active_at = active_at
+
+class SimulatedExchange:
+    """Matches our quotes against replayed market data
+
+    Stands in for the exchange client, so MarketMaker.replace_quotes runs
+    unchanged. Fills are deterministic:
+
+    - A quote joins the back of its price level: the book size there when
+      it becomes active is queued ahead of it. Marketable quotes take the
+      opposite levels immediately.
+    - A level shrinking below our queue position moves us up to its new size.
+    - A trade through our price fills us; a trade at our price first
+      consumes the queue ahead.
+    - The opposite side moving through our price fills us at our price.
+
+    Orders become matchable ``latency`` ms after they are sent. Cancels
+    take effect immediately.
+
+    Args:
+        book: Book the replay applies market events to
+        latency: Order entry delay in ms
+        on_fill: Called with (order, price, size) in scaled units per fill
+    """
+    supports_batch_orders = True
+    max_batch_size = 10
+
+    def __init__(self, book: OrderBook, latency: int = 0,
+                 on_fill: Optional[Callable[[SimOrder, int, int], None]] = None):
+        self.book = book
+        self.latency = latency
+        self.on_fill = on_fill
+        self.now = 0
+        self.orders: Dict[str, SimOrder] = {}
+        self.bids: List[SimOrder] = []  # Active, best price first
+        self.asks: List[SimOrder] = []
+        self.pending: List[SimOrder] = []  # Sent, not yet matchable
+        self._next_id = 0
+        self.stats = {'placed': 0, 'canceled': 0, 'filled': 0, 'fills': 0,
+                      'placed_volume': 0, 'filled_volume': 0}
+
+    # Exchange client surface used by MarketMaker
+
+    def place_orders(self, symbol: str, orders: List[Dict]) -> List[Optional[Dict]]:
+        return [self.place_order(symbol, **order) for order in orders]
+
+    def place_order(self, symbol: str, side, order_type, volume, price) -> Optional[Dict]:
+        side = normalize_side(side)
+        if side is None:
+            return None
+        self._next_id += 1
+        order = SimOrder(str(self._next_id), side == BUY, to_scaled(price, self.book.price_decimals),
+                         to_scaled(volume, self.book.size_decimals), self.now + self.latency)
+        if order.size <= 0:
+            return None
+        self.orders[order.order_id] = order
+        self.stats['placed'] += 1
+        self.stats['placed_volume'] += order.size
+        if self.latency:
+            self.pending.append(order)
+        else:
+            self._activate(order)
+        return {'code': 200, 'data': {'orderId': order.order_id}}
+
+    def cancel_orders(self, symbol: str, order_ids: List[str]) -> List[Optional[Dict]]:
+        return [self.cancel_order(symbol, order_id) for order_id in order_ids]
+
+    def cancel_order(self, symbol: str, order_id: str) -> Optional[Dict]:
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return None
+        for queue in (self.bids if order.is_buy else self.asks, self.pending):
+            if order in queue:
+                queue.remove(order)
+        self.stats['canceled'] += 1
+        return {'code': 200, 'data': {'orderId': order_id}}
+
+    def cancel_replace(self, symbol: str, cancel_ids: List[str],
+                       new_orders: List[Dict]) -> Dict[str, List[Optional[Dict]]]:
+        canceled = self.cancel_orders(symbol, cancel_ids)
+        return {'canceled': canceled, 'placed': self.place_orders(symbol, new_orders)}
+
+    # Matching
+
+    def advance(self, ts: int) -> None:
+        """Move the clock, activating orders whose latency has elapsed"""
+        self.now = ts
+        if self.pending and self.pending[0].active_at <= ts:
+            ready = [order for order in self.pending if order.active_at <= ts]
+            self.pending = [order for order in self.pending if order.active_at > ts]
+            for order in ready:
+                self._activate(order)
+
+    def _activate(self, order: SimOrder) -> None:
+        # Take any opposite levels our price crosses, as a taker
+        keys, sizes, sign = self.book.scaled_columns(ASKS if order.is_buy else BIDS)
+        for key, available in zip(keys, sizes):
+            price = sign * key
+            if order.remaining == 0 or (price > order.price if order.is_buy else price < order.price):
+                break
+            self._fill(order, price, min(order.remaining, available))
+        if order.remaining == 0:
+            return
+        keys, sizes, sign = self.book.scaled_columns(BIDS if order.is_buy else ASKS)
+        for key, size in zip(keys, sizes):
+            if sign * key == order.price:
+                order.queue_ahead = size
+                break
+        side = self.bids if order.is_buy else self.asks
+        side.append(order)
+        side.sort(key=lambda o: -o.price if o.is_buy else o.price)
+
+    def _fill(self, order: SimOrder, price: int, size: int) -> None:
+        if size <= 0:
+            return
+        order.remaining -= size
+        self.stats['fills'] += 1
+        self.stats['filled_volume'] += size
+        if order.remaining == 0:
+            self.stats['filled'] += 1
+            self.orders.pop(order.order_id, None)
+        if self.on_fill is not None:
+            self.on_fill(order, price, size)
+
+    def _remove_filled(self, side: List[SimOrder]) -> None:
+        side[:] = [order for order in side if order.remaining > 0]
+
+    def on_level(self, is_bid: bool, price: int, size: int) -> None:
+        """Apply a book level update to our queue positions and crossing quotes"""
+        same = self.bids if is_bid else self.asks
+        for order in same:
+            if order.price == price and order.queue_ahead > size:
+                order.queue_ahead = size
+        opposite = self.asks if is_bid else self.bids
+        if opposite and size > 0:
+            # Someone now rests at or through our opposite quotes
+            crossed = False
+            for order in opposite:
+                if order.price <= price if is_bid else order.price >= price:
+                    self._fill(order, order.price, order.remaining)
+                    crossed = True
+                else:
+                    break
+            if crossed:
+                self._remove_filled(opposite)
+
+    def on_trade(self, is_buy: bool, price: int, size: int) -> None:
+        """Match a market trade against our quotes on the side it took"""
+        side = self.asks if is_buy else self.bids
+        if not side:
+            return
+        filled = False
+        for order in side:
+            if size <= 0:
+                break
+            if order.price == price:
+                ahead = min(order.queue_ahead, size)
+                order.queue_ahead -= ahead
+                size -= ahead
+            elif order.price > price if is_buy else order.price < price:
+                break
+            take = min(order.remaining, size)
+            if take > 0:
+                self._fill(order, order.price, take)
+                size -= take
+                filled = True
+        if filled:
+            self._remove_filled(side)
@@ -0,0 +1,175 @@
+import itertools
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from config.config import SYMBOL, SWEEP_PROCESSES, SWEEP_RANK_BY
+from trading.pricing import create_pricing_model
+from utils.logger import setup_logger
+from backtest.events import EventLog, is_event_log, load_events
+from backtest.engine import Backtester, quiet_loggers
+
+logger = setup_logger("sweep")
+
+# Sweep parameters handed to the pricing model rather than the Backtester
+PRICING_PARAMS = ('risk_aversion', 'intensity', 'horizon')
+# Parameters the risk and order logic expect as Decimals
+DECIMAL_PARAMS = ('spread_percentage', 'min_order_size', 'max_order_size',
+                  'volatility_multiplier', 'fee_rate')
+
+# Summary columns shown after the parameters in a results table
+RESULT_COLUMNS = ('pnl', 'sharpe', 'fills', 'fill_ratio', 'max_abs_position', 'fees', 'requotes')
+
+def expand_grid(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Every combination of the grid's values, in the grid's key order"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+def _parse_value(text: str) -> Any:
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+def parse_param(spec: str) -> Tuple[str, List[Any]]:
+    """Parse ``name=v1,v2,...`` into a name and its values (ints, floats or strings)"""
+    name, sep, values = spec.partition('=')
+    if not sep or not name.strip() or not values.strip():
+        raise ValueError(f"Expected name=value[,value...], got {spec!r}")
+    return name.strip(), [_parse_value(v.strip()) for v in values.split(',') if v.strip()]
+
+def backtest_kwargs(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Map sweep parameters onto Backtester arguments
+
+    ``pricing_model`` names a model built with any PRICING_PARAMS given;
+    DECIMAL_PARAMS are converted from their text form; everything else
+    is passed through to the Backtester and on to MarketMaker.
+    """
+    kwargs = {k: v for k, v in params.items() if k not in PRICING_PARAMS}
+    pricing = {k: params[k] for k in PRICING_PARAMS if k in params}
+    if pricing or 'pricing_model' in params:
+        name = params.get('pricing_model')
+        kwargs['pricing_model'] = create_pricing_model(name, **pricing) if name else create_pricing_model(**pricing)
+    for key in DECIMAL_PARAMS:
+        if key in kwargs and not isinstance(kwargs[key], Decimal):
+            kwargs[key] = Decimal(str(kwargs[key]))
+    return kwargs
+
+# Per-process state, set once by _init_worker
+_events: Optional[EventLog] = None
+_options: Dict[str, Any] = {}
+
+def _init_worker(events_dir: str, options: Dict[str, Any]) -> None:
+    global _events, _options
+    _events = EventLog.load(events_dir)
+    _options = options
+
+def _run_one(job: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+    index, params = job
+    row = {'config': index, **params}
+    try:
+        with quiet_loggers():
+            backtester = Backtester(_events, **_options, **backtest_kwargs(params))
+        row.update(backtester.run().summary())
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+    return row
+
+def rank(rows: List[Dict[str, Any]], by: str = SWEEP_RANK_BY) -> List[Dict[str, Any]]:
+    """Sort rows best first by ``by``; failed configurations go last"""
+    return sorted(rows, key=lambda r: ('error' in r, -float(r.get(by, 0.0)), r['config']))
+
+def format_table(rows: List[Dict[str, Any]], params: Sequence[str],
+                 columns: Sequence[str] = RESULT_COLUMNS) -> str:
+    """Render ranked rows as a fixed-width text table"""
+    headers = ['rank', *params, *columns]
+    cells = [[str(position), *(str(row.get(p, '')) for p in params),
+              *(_format_number(row.get(c, '')) for c in columns)]
+             for position, row in enumerate(rows, 1)]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) if cells else len(h)
+              for i, h in enumerate(headers)]
+    lines = ['  '.join(h.rjust(w) for h, w in zip(headers, widths))]
+    for row, cell in zip(rows, cells):
+        if 'error' in row:
+            # Failed runs have no results; show why in their place
+            lines.append('  '.join(c.rjust(w) for c, w in zip(cell[:len(params) + 1], widths))
+                         + '  ' + row['error'])
+        else:
+            lines.append('  '.join(c.rjust(w) for c, w in zip(cell, widths)))
+    return '\n'.join(lines)
+
+def _format_number(value: Any) -> str:
+    if isinstance(value, float):
+        return f'{value:.6g}'
+    return str(value)
+
+class ParameterSweep:
+    """Backtests every combination of MarketMaker parameters in parallel
+
+    The events are written once as a memory-mapped EventLog directory;
+    each worker process maps it read-only, so the market data is shared
+    through the page cache rather than copied per worker. Each worker
+    replays whole configurations independently, so throughput scales
+    with the number of cores.
+
+    Args:
+        events: Event log to replay, or a path for load_events. Logs
+            saved by EventLog.save as a directory are mapped as-is
+        grid: Parameter name -> values to try. Accepts Backtester and
+            MarketMaker arguments (spread_percentage, order_book_depth,
+            requote_interval, ...), volatility_multiplier, pricing_model
+            and the pricing model's PRICING_PARAMS
+        symbol: Symbol the events are for
+        processes: Worker processes; 0 uses one per CPU core and 1 runs
+            in this process
+        rank_by: Summary column to rank by, highest first
+        workdir: Where to write the shared event log if ``events`` is
+            not already saved; defaults to a temporary directory
+        **backtest_options: Fixed Backtester arguments for every run
+    """
+    def __init__(self, events: Any, grid: Dict[str, Sequence[Any]], symbol: str = SYMBOL,
+                 processes: int = SWEEP_PROCESSES, rank_by: str = SWEEP_RANK_BY,
+                 workdir: Optional[str] = None, **backtest_options):
+        self.events = events
+        self.grid = dict(grid)
+        self.configs = expand_grid(self.grid)
+        self.processes = processes or os.cpu_count() or 1
+        self.rank_by = rank_by
+        self.workdir = workdir
+        self.options = {'symbol': symbol, **backtest_options}
+        self.elapsed = 0.0
+        self.logger = logger
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Backtest every configuration and return rows ranked best first"""
+        started = time.perf_counter()
+        if isinstance(self.events, str) and is_event_log(self.events):
+            rows = self._run(self.events)
+        else:
+            with tempfile.TemporaryDirectory(dir=self.workdir) as directory:
+                events = self.events if isinstance(self.events, EventLog) else load_events(self.events)
+                events.save(os.path.join(directory, 'events'))
+                rows = self._run(os.path.join(directory, 'events'))
+        self.elapsed = time.perf_counter() - started
+        failed = sum('error' in row for row in rows)
+        self.logger.info(f"Swept {len(rows)} configurations on {self.processes} processes "
+                         f"in {self.elapsed:.2f}s ({failed} failed)")
+        return rank(rows, self.rank_by)
+
+    def _run(self, events_dir: str) -> List[Dict[str, Any]]:
+        jobs = list(enumerate(self.configs))
+        workers = min(self.processes, len(jobs))
+        if workers <= 1:
+            _init_worker(events_dir, self.options)
+            return [_run_one(job) for job in jobs]
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(events_dir, self.options)) as pool:
+            # One configuration per task: replays are long and uneven
+            return list(pool.map(_run_one, jobs))
+
+    def table(self, rows: List[Dict[str, Any]], top: Optional[int] = None) -> str:
+        return format_table(rows[:top] if top else rows, list(self.grid))
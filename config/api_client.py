@@ -1,19 +1,31 @@
+import itertools
 import requests
 import time
 import hmac
 import hashlib
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 from config.base_client import ExchangeClient
 from config.config import API_BASE_URL
+from config.rate_limiter import RateLimiter
 import logging
 
 logger = logging.getLogger(__name__)
 
-class FameexClient(ExchangeClient):
-    def __init__(self, api_key: str, api_secret: str, test_mode: bool = False):
-        super().__init__(api_key, api_secret, API_BASE_URL, test_mode)
-        
-    def _generate_signature(self, timestamp: str, method: str, 
+# Only mock TRADE endpoints in test mode
+MOCK_ENDPOINTS = [
+    "/sapi/v1/order",        # Create order
+    "/sapi/v1/order/test",   # Test order
+    "/sapi/v1/batchOrders",  # Batch create
+    "/sapi/v1/cancel",       # Cancel order
+    "/sapi/v1/batchCancel",  # Batch cancel
+    "/sapi/v1/openOrders",   # Open orders
+    "/sapi/v1/myTrades"      # Trade history
+]
+
+class FameexRequestMixin:
+    """Signing, request building and mock responses shared by the sync and async FameEX clients"""
+
+    def _generate_signature(self, timestamp: str, method: str,
                           endpoint: str, params: Dict = None) -> str:
         """Generate signature for API request"""
         # Sort parameters alphabetically and create parameter string
@@ -22,100 +34,90 @@ class FameexClient(ExchangeClient):
             for key in sorted(params.keys()):
                 params_list.append(f"{key}={params[key]}")
         params_str = '&'.join(params_list)
-        
+
         # Create message string according to FameEX docs
         message = f"{method.upper()}{endpoint}{timestamp}{params_str}"
-        
+
         # Generate HMAC SHA256 signature
         signature = hmac.new(
             self.api_secret.encode('utf-8'),
             message.encode('utf-8'),
             hashlib.sha256
         ).hexdigest()
-        
+
         logger.debug(f"Signature message: {message}")
         logger.debug(f"Generated signature: {signature}")
-        
+
         return signature
-        
-    def _request(self, method: str, endpoint: str, 
-                 params: Dict = None, signed: bool = False) -> Optional[Dict]:
-        """Make API request with optional signing"""
-        # Only mock TRADE endpoints in test mode
-        MOCK_ENDPOINTS = [
-            "/sapi/v1/order",        # Create order
-            "/sapi/v1/order/test",   # Test order
-            "/sapi/v1/cancel",       # Cancel order
-            "/sapi/v1/batchCancel",  # Batch cancel
-            "/sapi/v1/openOrders",   # Open orders
-            "/sapi/v1/myTrades"      # Trade history
-        ]
-        
-        if self.test_mode and endpoint in MOCK_ENDPOINTS:
-            return self._get_mock_response(endpoint, params)
-            
+
+    def _prepare_request(self, method: str, endpoint: str,
+                         params: Dict = None, signed: bool = False) -> Tuple[str, Dict, Optional[Dict]]:
+        """Build URL, headers and params (with signature if required) for a request"""
         url = f"{self.base_url}{endpoint}"
-        
+
         # Generate timestamp for all requests
         timestamp = str(int(time.time() * 1000))  # Use milliseconds timestamp
-        
+
         headers = {
             'Content-Type': 'application/json',
             'X-CH-APIKEY': self.api_key,
             'X-CH-TS': timestamp
         }
-        
+
         if signed:
             # Include timestamp in params for signature
             if params is None:
                 params = {}
             params['timestamp'] = timestamp
-            
+
             # Generate signature with all parameters
             signature = self._generate_signature(timestamp, method, endpoint, params)
             headers['X-CH-SIGN'] = signature
-        
-        try:
-            if method == 'GET':
-                response = self.session.get(url, params=params, headers=headers)
-            else:
-                response = self.session.post(url, json=params, headers=headers)
-                
-            # Log request details for debugging
-            logger.debug(f"Request URL: {url}")
-            logger.debug(f"Request Headers: {headers}")
-            logger.debug(f"Request Params: {params}")
-            logger.debug(f"Response Status: {response.status_code}")
-            logger.debug(f"Response Text: {response.text}")
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            # Check for API error codes
-            if isinstance(data, dict) and 'code' in data and data['code'] != 200:
-                logger.error(f"API Error: {data.get('msg', 'Unknown error')}")
-                return None
-            
-            # Handle both direct data and data within 'data' field
-            if isinstance(data, dict) and 'data' in data:
-                return data['data']
-            return data
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request error: {str(e)}")
-            if hasattr(e.response, 'text'):
-                logger.error(f"Response text: {e.response.text}")
-            return None
-        except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}")
+
+        return url, headers, params
+
+    def _parse_response_data(self, data: Any) -> Optional[Any]:
+        """Unwrap the API payload, returning None on API error codes"""
+        # Check for API error codes
+        if isinstance(data, dict) and 'code' in data and data['code'] != 200:
+            logger.error(f"API Error: {data.get('msg', 'Unknown error')}")
             return None
-            
+
+        # Handle both direct data and data within 'data' field
+        if isinstance(data, dict) and 'data' in data:
+            return data['data']
+        return data
+
+    def _mock_rest(self, order_id: str, symbol: str, side: Union[str, int], volume: str, price: str) -> None:
+        """Record a test-mode order as resting, so openOrders lists it until it is cancelled"""
+        self._test_orders[order_id] = {
+            'symbol': symbol.upper(),
+            'side': 'BUY' if side in (1, 'BUY') else 'SELL',
+            'executedQty': '0',
+            'orderId': order_id,
+            'price': price,
+            'origQty': volume,
+            'avgPrice': '0',
+            'time': int(time.time() * 1000),
+            'type': 'LIMIT',
+            'status': 'NEW'
+        }
+
     def _get_mock_response(self, endpoint: str, params: Dict = None) -> Dict:
-        """Generate mock responses for testing - only for order operations"""
+        """Generate mock responses for testing - only for order operations
+
+        Test-mode orders never fill: they rest until cancelled, openOrders
+        lists them and myTrades is empty.
+        """
         if endpoint == "/sapi/v1/order" or endpoint == "/sapi/v1/order/test":
+            order_id = f"test_{next(self._test_ids)}"
+            if endpoint == "/sapi/v1/order" and params.get('type') == 1:
+                self._mock_rest(order_id, params.get('symbol', ''), params.get('side'), params.get('volume'),
+                                params.get('price'))
             return {
                 'code': 200,
                 'data': {
-                    'orderId': 'test_' + str(int(time.time())),
+                    'orderId': order_id,
                     'symbol': params.get('symbol'),
                     'side': params.get('side'),
                     'type': params.get('type'),
@@ -125,6 +127,7 @@ class FameexClient(ExchangeClient):
                 }
             }
         elif endpoint == "/sapi/v1/cancel":
+            self._test_orders.pop(str(params.get('orderId')), None)
             return {
                 'code': 200,
                 'data': {
@@ -132,53 +135,49 @@ class FameexClient(ExchangeClient):
                     'status': 'CANCELED'
                 }
             }
-        elif endpoint == "/sapi/v1/openOrders":
-            # Mock response for open orders
-            return [
-                {
-                    'symbol': params.get('symbol', '').upper(),
-                    'side': 'BUY',
-                    'executedQty': '0',
-                    'orderId': 'test_' + str(int(time.time())),
-                    'price': '1000.0',
-                    'origQty': '1.0',
-                    'avgPrice': '0',
-                    'time': int(time.time() * 1000),
-                    'type': 'LIMIT',
-                    'status': 'NEW'
+        elif endpoint == "/sapi/v1/batchOrders":
+            ids = []
+            for order in params.get('orders', []):
+                ids.append(f"test_{next(self._test_ids)}")
+                if order.get('batchType') == 'LIMIT':
+                        self._mock_rest(ids[-1], params.get('symbol', ''), order.get('side'), order.get('volume'),
+                                    order.get('price'))
+            return {
+                'code': 200,
+                'data': {
+                    'ids': ids
                 }
-            ]
-        elif endpoint == "/sapi/v1/myTrades":
-            # Mock response for trade history
-            return [
-                {
-                    'symbol': params.get('symbol', '').upper(),
-                    'side': 'BUY',
-                    'fee': '0.001',
-                    'price': '1000.0',
-                    'qty': '1.0',
-                    'id': 'trade_' + str(int(time.time())),
-                    'time': int(time.time() * 1000),
-                    'isMaker': True,
-                    'isBuyer': True
+            }
+        elif endpoint == "/sapi/v1/batchCancel":
+            for order_id in params.get('orderIds', []):
+                self._test_orders.pop(str(order_id), None)
+            return {
+                'code': 200,
+                'data': {
+                    'success': list(params.get('orderIds', [])),
+                    'failed': []
                 }
-            ]
+            }
+        elif endpoint == "/sapi/v1/openOrders":
+            symbol = params.get('symbol', '').upper()
+            return [dict(order) for order in self._test_orders.values() if order['symbol'] == symbol]
+        elif endpoint == "/sapi/v1/myTrades":
+            return []
         return {'code': 200, 'data': {}}
 
+    def _retry_after(self, headers: Any) -> Optional[float]:
+        """Parse a Retry-After header in seconds, if present"""
+        try:
+            return float(headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+
     def _format_symbol(self, symbol: str) -> str:
         """Format symbol to match exchange requirements"""
         return symbol.lower().replace('-', '')
 
-    def get_order_book(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
-        """Get the order book for a symbol"""
-        endpoint = "/sapi/v1/depth"
-        params = {
-            "symbol": self._format_symbol(symbol),
-            "limit": limit
-        }
-        response = self._request('GET', endpoint, params)
-        
-        # Transform response to expected format
+    def _format_order_book(self, response: Any) -> Dict[str, Any]:
+        """Transform depth response to expected format"""
         if response and isinstance(response, dict):
             return {
                 'data': {
@@ -188,6 +187,130 @@ class FameexClient(ExchangeClient):
                 }
             }
         return response
+
+    def _order_params(self, symbol: str, side: Union[str, int], order_type: Union[str, int],
+                      volume: str, price: str = None) -> Dict[str, Any]:
+        """Build order params, converting side/type strings to FameEX integers"""
+        # Convert side to integer if it's a string
+        if isinstance(side, str):
+            side = 1 if side.upper() == "BUY" else 2
+
+        # Convert order_type to integer if it's a string
+        if isinstance(order_type, str):
+            order_type = 1 if order_type.upper() == "LIMIT" else 2
+
+        params = {
+            "symbol": self._format_symbol(symbol),
+            "volume": volume,
+            "side": side,  # Use integer directly
+            "type": order_type  # Use integer directly
+        }
+        if price:
+            params["price"] = price
+        return params
+
+    def _chunks(self, items: List[Any]) -> List[List[Any]]:
+        """Split items into batches the venue accepts"""
+        return [items[i:i + self.max_batch_size] for i in range(0, len(items), self.max_batch_size)]
+
+    def _batch_order_params(self, symbol: str, orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build /batchOrders params from place_order keyword dicts"""
+        entries = []
+        for order in orders:
+            params = self._order_params(symbol, **order)
+            entry = {
+                "side": "BUY" if params["side"] == 1 else "SELL",
+                "batchType": "LIMIT" if params["type"] == 1 else "MARKET",
+                "volume": params["volume"]
+            }
+            if "price" in params:
+                entry["price"] = params["price"]
+            entries.append(entry)
+        return {"symbol": self._format_symbol(symbol), "orders": entries}
+
+    def _batch_place_results(self, response: Any, symbol: str,
+                             orders: List[Dict[str, Any]]) -> List[Optional[Dict]]:
+        """Expand a /batchOrders response into one result per order"""
+        data = self._parse_response_data(response) if response is not None else None
+        ids = data.get('ids', []) if isinstance(data, dict) else []
+        results = []
+        for i, order in enumerate(orders):
+            if i < len(ids) and ids[i] is not None:
+                results.append({
+                    'orderId': str(ids[i]),
+                    'symbol': self._format_symbol(symbol),
+                    'side': order.get('side'),
+                    'price': order.get('price'),
+                    'volume': order.get('volume'),
+                    'status': 'NEW'
+                })
+            else:
+                results.append(None)
+        return results
+
+    def _batch_cancel_results(self, response: Any, order_ids: List[str]) -> List[Optional[Dict]]:
+        """Expand a /batchCancel response into one result per order id"""
+        data = self._parse_response_data(response) if response is not None else None
+        succeeded = {str(i) for i in data.get('success', [])} if isinstance(data, dict) else set()
+        return [
+            {'orderId': order_id, 'status': 'CANCELED'} if str(order_id) in succeeded else None
+            for order_id in order_ids
+        ]
+
+class FameexClient(FameexRequestMixin, ExchangeClient):
+    supports_batch_orders = True
+
+    def __init__(self, api_key: str, api_secret: str, test_mode: bool = False,
+                 base_url: str = API_BASE_URL, rate_limiter: Optional[RateLimiter] = None):
+        super().__init__(api_key, api_secret, base_url, test_mode)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._test_orders: Dict[str, Dict] = {}  # Test-mode orders resting on the mock, by order id
+        self._test_ids = itertools.count(1)
+        
+    def _request(self, method: str, endpoint: str, 
+                 params: Dict = None, signed: bool = False) -> Optional[Dict]:
+        """Make API request with optional signing"""
+        if self.test_mode and endpoint in MOCK_ENDPOINTS:
+            return self._get_mock_response(endpoint, params)
+            
+        self.rate_limiter.acquire(endpoint)
+        url, headers, params = self._prepare_request(method, endpoint, params, signed)
+        
+        try:
+            if method == 'GET':
+                response = self.session.get(url, params=params, headers=headers)
+            else:
+                response = self.session.post(url, json=params, headers=headers)
+                
+            # Log request details for debugging
+            logger.debug(f"Request URL: {url}")
+            logger.debug(f"Request Headers: {headers}")
+            logger.debug(f"Request Params: {params}")
+            logger.debug(f"Response Status: {response.status_code}")
+            logger.debug(f"Response Text: {response.text}")
+            
+            response.raise_for_status()
+            return self._parse_response_data(response.json())
+        except requests.exceptions.RequestException as e:
+            logger.error(f"API request error: {str(e)}")
+            if e.response is not None and e.response.status_code == 429:
+                self.rate_limiter.backoff(endpoint, self._retry_after(e.response.headers))
+            if hasattr(e.response, 'text'):
+                logger.error(f"Response text: {e.response.text}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error: {str(e)}")
+            return None
+            
+    def get_order_book(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
+        """Get the order book for a symbol"""
+        endpoint = "/sapi/v1/depth"
+        params = {
+            "symbol": self._format_symbol(symbol),
+            "limit": limit
+        }
+        response = self._request('GET', endpoint, params)
+        return self._format_order_book(response)
         
     def get_ticker(self, symbol: str) -> Dict[str, Any]:
         """Get 24hr ticker information"""
@@ -204,6 +327,11 @@ class FameexClient(ExchangeClient):
         }
         return self._request('GET', endpoint, params)
         
+    def get_symbols(self) -> Dict[str, Any]:
+        """Get trading rules (precision, base/quote assets) for all symbols"""
+        endpoint = "/sapi/v1/symbols"
+        return self._request('GET', endpoint)
+        
     def get_klines(self, symbol: str, interval: str = "1min", 
                    limit: int = 100) -> Dict[str, Any]:
         """Get kline/candlestick data"""
@@ -227,24 +355,7 @@ class FameexClient(ExchangeClient):
             price: Order price (required for limit orders)
         """
         endpoint = "/sapi/v1/order"
-        
-        # Convert side to integer if it's a string
-        if isinstance(side, str):
-            side = 1 if side.upper() == "BUY" else 2
-        
-        # Convert order_type to integer if it's a string    
-        if isinstance(order_type, str):
-            order_type = 1 if order_type.upper() == "LIMIT" else 2
-        
-        params = {
-            "symbol": self._format_symbol(symbol),
-            "volume": volume,
-            "side": side,  # Use integer directly
-            "type": order_type  # Use integer directly
-        }
-        if price:
-            params["price"] = price
-            
+        params = self._order_params(symbol, side, order_type, volume, price)
         return self._request('POST', endpoint, params, signed=True)
         
     def cancel_order(self, symbol: str, order_id: str) -> Dict[str, Any]:
@@ -270,35 +381,55 @@ class FameexClient(ExchangeClient):
         endpoint = "/sapi/v1/account"
         return self._request('GET', endpoint, signed=True)
         
-    def get_my_trades(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
-        """Get user's trade history"""
+    def get_my_trades(self, symbol: str, limit: int = 100,
+                      from_id: Optional[int] = None) -> Dict[str, Any]:
+        """Get user's trade history, oldest first from trade id ``from_id`` if given"""
         endpoint = "/sapi/v1/myTrades"
         params = {
             "symbol": self._format_symbol(symbol),
             "limit": str(limit)  # Convert to string for consistent signature
         }
+        if from_id is not None:
+            params["fromId"] = str(from_id)
         return self._request('GET', endpoint, params, signed=True)
         
     def test_order(self, symbol: str, side: Union[str, int], order_type: Union[str, int],
                    volume: str, price: str = None) -> Dict[str, Any]:
         """Test a new order without sending to matching engine"""
         endpoint = "/sapi/v1/order/test"
-        
-        # Convert side to integer if it's a string
-        if isinstance(side, str):
-            side = 1 if side.upper() == "BUY" else 2
-        
-        # Convert order_type to integer if it's a string    
-        if isinstance(order_type, str):
-            order_type = 1 if order_type.upper() == "LIMIT" else 2
-        
-        params = {
-            "symbol": self._format_symbol(symbol),
-            "volume": volume,
-            "side": side,
-            "type": order_type
-        }
-        if price:
-            params["price"] = price
-        
-        return self._request('POST', endpoint, params, signed=True) 
\ No newline at end of file
+        params = self._order_params(symbol, side, order_type, volume, price)
+        return self._request('POST', endpoint, params, signed=True) 
+
+    def place_orders(self, symbol: str, orders: List[Dict[str, Any]]) -> List[Optional[Dict]]:
+        """Place several orders with one signed /batchOrders request per batch"""
+        if not self.supports_batch_orders:
+            return super().place_orders(symbol, orders)
+        endpoint = "/sapi/v1/batchOrders"
+        chunks = self._chunks(orders)
+        responses = self._parallel([
+            (lambda chunk=chunk: self._request('POST', endpoint,
+                                               self._batch_order_params(symbol, chunk), signed=True))
+            for chunk in chunks
+        ])
+        results = []
+        for chunk, response in zip(chunks, responses):
+            results.extend(self._batch_place_results(response, symbol, chunk))
+        return results
+
+    def cancel_orders(self, symbol: str, order_ids: List[str]) -> List[Optional[Dict]]:
+        """Cancel several orders with one signed /batchCancel request per batch"""
+        if not self.supports_batch_orders:
+            return super().cancel_orders(symbol, order_ids)
+        endpoint = "/sapi/v1/batchCancel"
+        chunks = self._chunks(order_ids)
+        responses = self._parallel([
+            (lambda chunk=chunk: self._request('POST', endpoint, {
+                "symbol": self._format_symbol(symbol),
+                "orderIds": chunk
+            }, signed=True))
+            for chunk in chunks
+        ])
+        results = []
+        for chunk, response in zip(chunks, responses):
+            results.extend(self._batch_cancel_results(response, chunk))
+        return results
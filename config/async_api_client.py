@@ -0,0 +1,227 @@
+import asyncio
+import itertools
+import aiohttp
+from typing import Dict, Any, List, Optional, Union, Awaitable
+from config.base_client import AsyncExchangeClient
+from config.api_client import FameexRequestMixin, MOCK_ENDPOINTS
+from config.config import API_BASE_URL
+from config.rate_limiter import RateLimiter
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AsyncFameexClient(FameexRequestMixin, AsyncExchangeClient):
+    """Asyncio FameEX client with a pooled keep-alive connection
+
+    Uses the same signing and test-mode mocks as FameexClient, so the two
+    can be swapped without changing request semantics.
+    """
+    supports_batch_orders = True
+
+    def __init__(self, api_key: str, api_secret: str, test_mode: bool = False,
+                 base_url: str = API_BASE_URL, pool_size: int = 32,
+                 keepalive_timeout: float = 30.0, request_timeout: float = 10.0,
+                 rate_limiter: Optional[RateLimiter] = None):
+        super().__init__(api_key, api_secret, base_url, test_mode)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._test_orders: Dict[str, Dict] = {}  # Test-mode orders resting on the mock, by order id
+        self._test_ids = itertools.count(1)
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+        return self.session
+
+    async def close(self) -> None:
+        """Close the underlying HTTP session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def _request(self, method: str, endpoint: str,
+                       params: Dict = None, signed: bool = False) -> Optional[Dict]:
+        """Make API request with optional signing"""
+        if self.test_mode and endpoint in MOCK_ENDPOINTS:
+            return self._get_mock_response(endpoint, params)
+
+        await self.rate_limiter.acquire_async(endpoint)
+        url, headers, params = self._prepare_request(method, endpoint, params, signed)
+        session = self._get_session()
+
+        try:
+            if method == 'GET':
+                # aiohttp only accepts str/int/float query values
+                query = {k: str(v) for k, v in params.items()} if params else None
+                request = session.get(url, params=query, headers=headers)
+            else:
+                request = session.post(url, json=params, headers=headers)
+
+            async with request as response:
+                text = await response.text()
+
+                logger.debug(f"Request URL: {url}")
+                logger.debug(f"Request Params: {params}")
+                logger.debug(f"Response Status: {response.status}")
+                logger.debug(f"Response Text: {text}")
+
+                if response.status == 429:
+                    self.rate_limiter.backoff(endpoint, self._retry_after(response.headers))
+                response.raise_for_status()
+                return self._parse_response_data(await response.json(content_type=None))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"API request error: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error: {str(e)}")
+            return None
+
+    async def gather(self, *calls: Awaitable) -> List[Any]:
+        """Run independent API calls concurrently over the shared connection pool
+
+        Exceptions are returned in place of results so one failed call does
+        not cancel the others.
+        """
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    async def get_order_book(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
+        """Get the order book for a symbol"""
+        endpoint = "/sapi/v1/depth"
+        params = {
+            "symbol": self._format_symbol(symbol),
+            "limit": limit
+        }
+        response = await self._request('GET', endpoint, params)
+        return self._format_order_book(response)
+
+    async def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        """Get 24hr ticker information"""
+        endpoint = "/sapi/v1/ticker"
+        params = {"symbol": self._format_symbol(symbol)}
+        return await self._request('GET', endpoint, params)
+
+    async def get_trades(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
+        """Get recent trades"""
+        endpoint = "/sapi/v1/trades"
+        params = {
+            "symbol": self._format_symbol(symbol),
+            "limit": limit
+        }
+        return await self._request('GET', endpoint, params)
+
+    async def get_symbols(self) -> Dict[str, Any]:
+        """Get trading rules (precision, base/quote assets) for all symbols"""
+        endpoint = "/sapi/v1/symbols"
+        return await self._request('GET', endpoint)
+
+    async def get_klines(self, symbol: str, interval: str = "1min",
+                         limit: int = 100) -> Dict[str, Any]:
+        """Get kline/candlestick data"""
+        endpoint = "/sapi/v1/klines"
+        params = {
+            "symbol": self._format_symbol(symbol),
+            "interval": interval,
+            "limit": limit
+        }
+        return await self._request('GET', endpoint, params)
+
+    async def place_order(self, symbol: str, side: Union[str, int], order_type: Union[str, int],
+                          volume: str, price: str = None) -> Dict[str, Any]:
+        """Place a new order
+
+        Args:
+            symbol: Trading pair symbol
+            side: 1 for BUY, 2 for SELL (or "BUY"/"SELL" strings)
+            order_type: 1 for LIMIT, 2 for MARKET (or "LIMIT"/"MARKET" strings)
+            volume: Order volume
+            price: Order price (required for limit orders)
+        """
+        endpoint = "/sapi/v1/order"
+        params = self._order_params(symbol, side, order_type, volume, price)
+        return await self._request('POST', endpoint, params, signed=True)
+
+    async def cancel_order(self, symbol: str, order_id: str) -> Dict[str, Any]:
+        """Cancel an existing order"""
+        endpoint = "/sapi/v1/cancel"
+        params = {
+            "symbol": self._format_symbol(symbol),
+            "orderId": order_id
+        }
+        return await self._request('POST', endpoint, params, signed=True)
+
+    async def get_open_orders(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
+        """Get current open orders"""
+        endpoint = "/sapi/v1/openOrders"
+        params = {
+            "symbol": self._format_symbol(symbol),
+            "limit": str(limit)  # Convert to string for consistent signature
+        }
+        return await self._request('GET', endpoint, params, signed=True)
+
+    async def get_account_info(self) -> Dict[str, Any]:
+        """Get account information"""
+        endpoint = "/sapi/v1/account"
+        return await self._request('GET', endpoint, signed=True)
+
+    async def get_my_trades(self, symbol: str, limit: int = 100,
+                            from_id: Optional[int] = None) -> Dict[str, Any]:
+        """Get user's trade history, oldest first from trade id ``from_id`` if given"""
+        endpoint = "/sapi/v1/myTrades"
+        params = {
+            "symbol": self._format_symbol(symbol),
+            "limit": str(limit)  # Convert to string for consistent signature
+        }
+        if from_id is not None:
+            params["fromId"] = str(from_id)
+        return await self._request('GET', endpoint, params, signed=True)
+
+    async def test_order(self, symbol: str, side: Union[str, int], order_type: Union[str, int],
+                         volume: str, price: str = None) -> Dict[str, Any]:
+        """Test a new order without sending to matching engine"""
+        endpoint = "/sapi/v1/order/test"
+        params = self._order_params(symbol, side, order_type, volume, price)
+        return await self._request('POST', endpoint, params, signed=True)
+
+    async def place_orders(self, symbol: str, orders: List[Dict[str, Any]]) -> List[Optional[Dict]]:
+        """Place several orders with one signed /batchOrders request per batch"""
+        if not self.supports_batch_orders:
+            return await super().place_orders(symbol, orders)
+        endpoint = "/sapi/v1/batchOrders"
+        chunks = self._chunks(orders)
+        responses = await asyncio.gather(*(
+            self._request('POST', endpoint, self._batch_order_params(symbol, chunk), signed=True)
+            for chunk in chunks
+        ))
+        results = []
+        for chunk, response in zip(chunks, responses):
+            results.extend(self._batch_place_results(response, symbol, chunk))
+        return results
+
+    async def cancel_orders(self, symbol: str, order_ids: List[str]) -> List[Optional[Dict]]:
+        """Cancel several orders with one signed /batchCancel request per batch"""
+        if not self.supports_batch_orders:
+            return await super().cancel_orders(symbol, order_ids)
+        endpoint = "/sapi/v1/batchCancel"
+        chunks = self._chunks(order_ids)
+        responses = await asyncio.gather(*(
+            self._request('POST', endpoint, {
+                "symbol": self._format_symbol(symbol),
+                "orderIds": chunk
+            }, signed=True)
+            for chunk in chunks
+        ))
+        results = []
+        for chunk, response in zip(chunks, responses):
+            results.extend(self._batch_cancel_results(response, chunk))
+        return results
@@ -1,11 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union
+import asyncio
 import requests
 import logging
 
 logger = logging.getLogger(__name__)
 
 class ExchangeClient(ABC):
+    supports_batch_orders = False
+    max_batch_size = 10  # Orders per batch request
+    _executor: Optional[ThreadPoolExecutor] = None
+
     def __init__(self, api_key: str, api_secret: str, base_url: str, test_mode: bool = False):
         self.api_key = api_key
         self.api_secret = api_secret
@@ -53,4 +59,137 @@ class ExchangeClient(ABC):
     @abstractmethod
     def get_account_info(self) -> Dict[str, Any]:
         """Get account information"""
-        pass 
\ No newline at end of file
+        pass
+
+    # Batch operations. Venues with native batch endpoints set
+    # supports_batch_orders and override these; the defaults fan single
+    # calls out over a small thread pool.
+    def _parallel(self, calls: List) -> List[Any]:
+        """Run zero-argument callables concurrently, preserving order"""
+        if len(calls) <= 1:
+            return [call() for call in calls]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_batch_size)
+        return list(self._executor.map(lambda call: call(), calls))
+
+    def place_orders(self, symbol: str, orders: List[Dict[str, Any]]) -> List[Optional[Dict]]:
+        """Place several orders for one symbol
+
+        Args:
+            symbol: Trading pair symbol
+            orders: place_order keyword dicts (side, order_type, volume, price)
+
+        Returns:
+            One result per order, in order (None for failures)
+        """
+        return self._parallel([
+            (lambda order=order: self.place_order(symbol, **order)) for order in orders
+        ])
+
+    def cancel_orders(self, symbol: str, order_ids: List[str]) -> List[Optional[Dict]]:
+        """Cancel several orders for one symbol, one result per id"""
+        return self._parallel([
+            (lambda order_id=order_id: self.cancel_order(symbol, order_id)) for order_id in order_ids
+        ])
+
+    def cancel_replace(self, symbol: str, cancel_ids: List[str],
+                       new_orders: List[Dict[str, Any]]) -> Dict[str, List[Optional[Dict]]]:
+        """Cancel stale quotes, then place their replacements
+
+        Replacements are only sent if every cancel succeeded, so a failed
+        cancel never leaves both the old and new quote resting.
+        """
+        canceled = self.cancel_orders(symbol, cancel_ids) if cancel_ids else []
+        if any(result is None for result in canceled):
+            logger.warning(f"Cancel failed for {symbol}, skipping replacement orders")
+            return {'canceled': canceled, 'placed': []}
+        placed = self.place_orders(symbol, new_orders) if new_orders else []
+        return {'canceled': canceled, 'placed': placed}
+
+
+class AsyncExchangeClient(ABC):
+    """Asyncio counterpart of ExchangeClient.
+
+    Implementations own a pooled keep-alive HTTP session so independent
+    calls (e.g. depth fetch and both quote sides) can be awaited concurrently.
+    """
+    supports_batch_orders = False
+    max_batch_size = 10  # Orders per batch request
+
+    def __init__(self, api_key: str, api_secret: str, base_url: str, test_mode: bool = False):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.base_url = base_url
+        self.session = None  # Created lazily inside the running event loop
+        self.test_mode = test_mode
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Close the underlying HTTP session"""
+        pass
+
+    @abstractmethod
+    def _generate_signature(self, *args, **kwargs) -> str:
+        """Generate signature for API request"""
+        pass
+
+    @abstractmethod
+    async def _request(self, method: str, endpoint: str,
+                       params: Dict = None, signed: bool = False) -> Optional[Dict]:
+        """Make API request with optional signing"""
+        pass
+
+    @abstractmethod
+    async def get_order_book(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
+        """Get the order book for a symbol"""
+        pass
+
+    @abstractmethod
+    async def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        """Get ticker information"""
+        pass
+
+    @abstractmethod
+    async def place_order(self, symbol: str, side: Union[str, int], order_type: Union[str, int],
+                          volume: str, price: str = None) -> Dict[str, Any]:
+        """Place a new order"""
+        pass
+
+    @abstractmethod
+    async def cancel_order(self, symbol: str, order_id: str) -> Dict[str, Any]:
+        """Cancel an existing order"""
+        pass
+
+    @abstractmethod
+    async def get_open_orders(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
+        """Get current open orders"""
+        pass
+
+    @abstractmethod
+    async def get_account_info(self) -> Dict[str, Any]:
+        """Get account information"""
+        pass
+
+    async def place_orders(self, symbol: str, orders: List[Dict[str, Any]]) -> List[Optional[Dict]]:
+        """Place several orders for one symbol, one result per order"""
+        return list(await asyncio.gather(*(self.place_order(symbol, **order) for order in orders)))
+
+    async def cancel_orders(self, symbol: str, order_ids: List[str]) -> List[Optional[Dict]]:
+        """Cancel several orders for one symbol, one result per id"""
+        return list(await asyncio.gather(*(self.cancel_order(symbol, order_id) for order_id in order_ids)))
+
+    async def cancel_replace(self, symbol: str, cancel_ids: List[str],
+                             new_orders: List[Dict[str, Any]]) -> Dict[str, List[Optional[Dict]]]:
+        """Cancel stale quotes, then place their replacements if every cancel succeeded"""
+        canceled = await self.cancel_orders(symbol, cancel_ids) if cancel_ids else []
+        if any(result is None for result in canceled):
+            logger.warning(f"Cancel failed for {symbol}, skipping replacement orders")
+            return {'canceled': canceled, 'placed': []}
+        placed = await self.place_orders(symbol, new_orders) if new_orders else []
+        return {'canceled': canceled, 'placed': placed}
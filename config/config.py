@@ -9,6 +9,7 @@ load_dotenv()
 API_BASE_URL = "https://openapi.fameex.net"  # Updated to match API docs
 API_KEY = os.getenv("FAMEEX_API_KEY")
 API_SECRET = os.getenv("FAMEEX_API_SECRET")
+WS_BASE_URL = os.getenv("FAMEEX_WS_URL", "wss://ws.fameex.net/kline-api/ws")
 
 # Trading Configuration
 SYMBOL = "SZARUSDT"  # Not "SZAR-USDT" - FameEX doesn't use hyphens
@@ -16,10 +17,95 @@ ORDER_BOOK_DEPTH = 5
 SPREAD_PERCENTAGE = Decimal("0.02")  # 2% spread
 MIN_ORDER_SIZE = Decimal("100")  # Minimum order size
 MAX_ORDER_SIZE = Decimal("1000")  # Maximum order size
+VOLATILITY_WINDOWS = (100, 1000)  # Rolling return windows; the first drives the spread
+VOLATILITY_EWMA_ALPHA = 0.06  # Smoothing for the EWMA volatility estimate
+VOLATILITY_SPREAD_MULTIPLIER = Decimal("2.0")  # Spread added per unit of volatility
+TICK_SIZE = Decimal("0.0001")  # Smallest price increment worth requoting for
+BALANCE_DECIMALS = 8  # Fixed-point places for wallet balances and positions
+TRADE_HISTORY_SIZE = 100000  # Recent fills PositionTracker keeps; aggregates cover every fill
+QUOTE_PRICE_TOLERANCE = Decimal("0.001")  # Leave quotes resting until price moves 0.1%
+QUOTE_SIZE_TOLERANCE = Decimal("0")  # Requote on any size change
+QUOTE_REFRESH_INTERVAL = 1.0  # Max seconds between quote checks without book updates
+LADDER_LEVELS = ORDER_BOOK_DEPTH  # Quotes per side
+LADDER_SPACING = "linear"  # "linear" or "geometric" gaps between levels
+LADDER_STEP = Decimal("0.002")  # 0.2% between the first two levels
+LADDER_SIZE_CURVE = "linear"  # "flat", "linear", "geometric" or "depth"
+PRICING_MODEL = "symmetric"  # "symmetric" or "avellaneda_stoikov" (inventory-skewed)
+AS_RISK_AVERSION = 2.5  # Skew per unit of position/limit and volatility^2 * horizon
+AS_ORDER_INTENSITY = 100.0  # Fill-probability decay per unit relative distance from mid
+AS_HORIZON = 1000  # Book updates the inventory risk is measured over
+
+# Market data recording
+RECORDER_DIR = os.getenv("RECORDER_DIR", "data")  # Root of the columnar market data store
+RECORDER_INTERVAL = 1.0  # Seconds between depth/trade polls
+RECORDER_DEPTH = 50  # Book levels per recorded snapshot
+RECORDER_KLINE_INTERVAL = "1min"
+RECORDER_KLINE_PERIOD = 60.0  # Seconds between kline polls
+
+# Backtesting
+BACKTEST_REQUOTE_INTERVAL = 0.1  # Min seconds of market time between requotes
+BACKTEST_LATENCY = 0.0  # Seconds before a sent order can fill
+BACKTEST_FEE_RATE = Decimal("0.001")  # Maker fee on filled notional
+SWEEP_PROCESSES = 0  # Parameter sweep workers; 0 = one per CPU core
+SWEEP_RANK_BY = "pnl"  # Result column sweeps are ranked by (highest first)
+
+# Multi-symbol runner: symbol -> MarketMaker overrides (order_book_depth,
+# spread_percentage, min_order_size, max_order_size); unset keys use the defaults above
+MARKETS = {
+    "SZARUSDT": {},
+    "KASUSDT": {},
+    "CUSDUSDT": {},
+    "XECUSDT": {},
+}
+EXECUTION_POLL_INTERVAL = 1.0  # Min seconds between myTrades polls per symbol
+EXECUTION_FETCH_LIMIT = 100  # Trades per myTrades request
+EXECUTION_MAX_PAGES = 10  # myTrades requests per poll when catching up on fills
+ORDER_RECONCILE_INTERVAL = 5.0  # Seconds between open-order reconciliations per symbol
+ORDER_RECONCILE_GRACE = 2.0  # Seconds a new order may be missing from the venue's listing
+ORDER_RECONCILE_LIMIT = 500  # Open orders requested per reconciliation
+ACCOUNT_SYNC_INTERVAL = 30.0  # Seconds between balance syncs from get_account_info
+MAX_CONCURRENT_MARKETS = 8  # Quoting cycles in flight at once
+MARKET_STEP_TIMEOUT = 5.0  # Seconds before a symbol's quoting cycle is abandoned
+LATENCY_TRACKING = os.getenv("LATENCY_TRACKING", "").lower() in ("1", "true", "yes")  # Time quote loop spans
+LATENCY_LOG_INTERVAL = 60.0  # Seconds between latency summaries in the log
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # Prometheus /metrics port; 0 = off
+
+# Logging
+LOG_ASYNC = os.getenv("LOG_ASYNC", "").lower() in ("1", "true", "yes")  # Write logs from a background thread
+LOG_QUEUE_SIZE = 10000  # Records queued for the log thread before LOG_QUEUE_POLICY applies
+LOG_QUEUE_POLICY = "drop"  # "drop" (discard INFO/DEBUG when full) or "block" (wait for room)
+LOG_BATCH_SIZE = 256  # Most records written per flush
+
+# Journal
+JOURNAL_DIR = os.getenv("JOURNAL_DIR", "")  # Trading state journal directory; empty = off
+JOURNAL_COMMIT_INTERVAL = 0.05  # Seconds of journal records gathered per write + fsync
+JOURNAL_SNAPSHOT_EVERY = 100000  # Journal records between state snapshots
+
+# Venues
+VENUE_FEES = {  # Venue -> maker/taker fee rates the router prices orders with
+    "fameex": {"maker_fee": Decimal("0.001"), "taker_fee": Decimal("0.001")},
+    "mock": {"maker_fee": Decimal("0"), "taker_fee": Decimal("0.001")},
+}
+MOCK_VENUE_URL = os.getenv("MOCK_VENUE_URL", "http://127.0.0.1:9001")  # Where `main.py mock-venue` listens
+ROUTER_TIMEOUT = 2.0  # Seconds to wait for a venue's book before routing without it
+
+# Hedging
+HEDGE_VENUES = [v for v in os.getenv("HEDGE_VENUES", "").split(",") if v]  # Venues hedges are routed to; empty = off
+HEDGE_API_KEY = os.getenv("HEDGE_API_KEY")  # Hedge account; required to hedge on the quoting venue
+HEDGE_API_SECRET = os.getenv("HEDGE_API_SECRET")
+HEDGE_THRESHOLDS = {  # Net inventory (base units) at which a symbol is hedged back to flat
+    "SZARUSDT": Decimal("50000"),
+    "KASUSDT": Decimal("5000"),
+}
+HEDGE_SLIPPAGE = Decimal("0.002")  # Fraction past the best price a hedge may take
+HEDGE_LATENCY_BUDGET = 0.25  # Seconds from fill detection to hedge acknowledgement before warning
+HEDGE_SETTLE_CHECKS = 5  # Re-checks of a hedge leg whose fill is unknown before waiting for the next fill
+HEDGE_SETTLE_INTERVAL = 1.0  # Seconds between those re-checks
 
 # Rate Limiting
 ORDER_RATE_LIMIT = 100  # 100 times per 2 seconds
 ORDER_BOOK_RATE_LIMIT = 20  # 20 times per 2 seconds
+RATE_LIMIT_PERIOD = 2.0  # Window in seconds for the limits above
 
 # Add Kaspa configuration
 KASPA_NODE_URL = os.getenv("KASPA_NODE_URL", "http://localhost:16110")
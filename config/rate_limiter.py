@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+from enum import IntEnum
+from typing import Dict, Optional, Tuple
+from config.config import ORDER_RATE_LIMIT, ORDER_BOOK_RATE_LIMIT, RATE_LIMIT_PERIOD
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Priority(IntEnum):
+    """Request lanes, lower value is served first"""
+    CANCEL = 0
+    ORDER = 1
+    QUERY = 2
+
+# Endpoint -> (bucket, lane). Unlisted endpoints use the market data bucket.
+ENDPOINT_CLASSES: Dict[str, Tuple[str, Priority]] = {
+    "/sapi/v1/cancel": ("order", Priority.CANCEL),
+    "/sapi/v1/batchCancel": ("order", Priority.CANCEL),
+    "/sapi/v1/order": ("order", Priority.ORDER),
+    "/sapi/v1/order/test": ("order", Priority.ORDER),
+    "/sapi/v1/batchOrders": ("order", Priority.ORDER),
+    "/sapi/v1/openOrders": ("order", Priority.QUERY),
+    "/sapi/v1/myTrades": ("order", Priority.QUERY),
+    "/sapi/v1/account": ("order", Priority.QUERY),
+    "/sapi/v1/depth": ("market_data", Priority.QUERY),
+}
+DEFAULT_CLASS = ("market_data", Priority.QUERY)
+
+class TokenBucket:
+    """Token bucket with priority lanes
+
+    Lower-priority lanes may not drain the bucket below ``reserve`` tokens
+    per lane of headroom, and always yield to higher-priority waiters, so
+    cancels get through even when quoting has used up the budget.
+    """
+    def __init__(self, capacity: int, period: float, reserve: float = 0.0):
+        self.capacity = float(capacity)
+        self.rate = capacity / period  # Tokens per second
+        self.reserve = reserve
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._waiting = [0] * len(Priority)
+        self._lock = threading.Lock()
+        self.stats = {
+            priority.name.lower(): {'requests': 0, 'throttled': 0, 'wait_time': 0.0}
+            for priority in Priority
+        }
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.last_refill = now
+
+    def _try_acquire(self, priority: Priority, registered: bool) -> float:
+        """Take a token or return seconds to wait before retrying (caller holds lock)"""
+        self._refill(time.monotonic())
+        floor = self.reserve * priority
+        blocked = any(self._waiting[p] for p in range(priority))
+        if not blocked and self.tokens - 1 >= floor:
+            self.tokens -= 1
+            if registered:
+                self._waiting[priority] -= 1
+            return 0.0
+        if not registered:
+            self._waiting[priority] += 1
+        return max((floor + 1 - self.tokens) / self.rate, 1 / self.rate / 10)
+
+    def _leave(self, priority: Priority) -> None:
+        """Drop a waiter that gave up (e.g. its task was cancelled) so it stops holding back lower lanes"""
+        with self._lock:
+            self._waiting[priority] -= 1
+
+    def _record(self, priority: Priority, waited: float) -> None:
+        lane = self.stats[priority.name.lower()]
+        lane['requests'] += 1
+        if waited > 0:
+            lane['throttled'] += 1
+            lane['wait_time'] += waited
+
+    def acquire(self, priority: Priority = Priority.QUERY) -> float:
+        """Block until a token is available, returning seconds waited"""
+        waited = 0.0
+        registered = False
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_acquire(priority, registered)
+                    if wait == 0.0:
+                        registered = False  # Left the lane with its token
+                        self._record(priority, waited)
+                        return waited
+                    registered = True
+                time.sleep(wait)
+                waited += wait
+        finally:
+            if registered:
+                self._leave(priority)
+
+    async def acquire_async(self, priority: Priority = Priority.QUERY) -> float:
+        """Await a token without blocking the event loop, returning seconds waited"""
+        waited = 0.0
+        registered = False
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_acquire(priority, registered)
+                    if wait == 0.0:
+                        registered = False  # Left the lane with its token
+                        self._record(priority, waited)
+                        return waited
+                    registered = True
+                await asyncio.sleep(wait)
+                waited += wait
+        finally:
+            if registered:
+                self._leave(priority)
+
+    def backoff(self, seconds: float) -> None:
+        """Empty the bucket for ``seconds`` after the venue rejects us with 429"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+class RateLimiter:
+    """Per-endpoint-class token buckets enforcing the venue request limits"""
+    def __init__(self, limits: Optional[Dict[str, Tuple[int, float]]] = None,
+                 reserve_fraction: float = 0.05):
+        """
+        Args:
+            limits: Bucket name -> (requests, period seconds)
+            reserve_fraction: Share of each bucket held back per lower-priority lane
+        """
+        limits = limits or {
+            "order": (ORDER_RATE_LIMIT, RATE_LIMIT_PERIOD),
+            "market_data": (ORDER_BOOK_RATE_LIMIT, RATE_LIMIT_PERIOD)
+        }
+        self.buckets = {
+            name: TokenBucket(capacity, period, reserve=capacity * reserve_fraction)
+            for name, (capacity, period) in limits.items()
+        }
+        self.backoffs = 0
+
+    def classify(self, endpoint: str) -> Tuple[TokenBucket, Priority]:
+        """Return the bucket and lane an endpoint is charged against"""
+        name, priority = ENDPOINT_CLASSES.get(endpoint, DEFAULT_CLASS)
+        return self.buckets[name], priority
+
+    def acquire(self, endpoint: str) -> float:
+        """Block until the endpoint may be called, returning seconds waited"""
+        bucket, priority = self.classify(endpoint)
+        return bucket.acquire(priority)
+
+    async def acquire_async(self, endpoint: str) -> float:
+        """Await permission to call the endpoint, returning seconds waited"""
+        bucket, priority = self.classify(endpoint)
+        return await bucket.acquire_async(priority)
+
+    def backoff(self, endpoint: str, retry_after: Optional[float] = None) -> None:
+        """Pause the endpoint's bucket after a 429 response"""
+        bucket, _ = self.classify(endpoint)
+        seconds = retry_after if retry_after is not None else bucket.capacity / bucket.rate
+        bucket.backoff(seconds)
+        self.backoffs += 1
+        logger.warning(f"Rate limited on {endpoint}, backing off {seconds:.2f}s")
+
+    def get_stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Throttle counters per bucket and lane"""
+        return {name: {lane: dict(counters) for lane, counters in bucket.stats.items()}
+                for name, bucket in self.buckets.items()}
@@ -1,10 +1,10 @@
 import datetime
-from decimal import Decimal
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from config.api_client import FameexClient
 from config.config import ORDER_BOOK_DEPTH
 from utils.logger import setup_logger
 from config.base_client import ExchangeClient
+from market_data.order_book import OrderBook, BIDS, ASKS
 
 logger = setup_logger("test_cli")
 
@@ -94,7 +94,7 @@ def run_api_tests(client: FameexClient, symbol: str, full_test: bool = False) ->
         
     return results
 
-def _log_order_book_details(data: Dict[str, Any], timestamp: Optional[str] = None) -> None:
+def _log_order_book_details(data: Union[OrderBook, Dict[str, Any]], timestamp: Optional[str] = None) -> None:
     """Log detailed order book information"""
     if timestamp:
         dt = datetime.datetime.fromtimestamp(int(timestamp))
@@ -104,23 +104,21 @@ def _log_order_book_details(data: Dict[str, Any], timestamp: Optional[str] = Non
     logger.info("------------------------")
     
     # Show top 5 bids/asks and calculate metrics
-    bids = data.get('bids', [])
-    asks = data.get('asks', [])
+    book = data if isinstance(data, OrderBook) else OrderBook.from_dict(data)
     
-    _log_order_levels("Bids", bids[:5])
-    _log_order_levels("Asks", asks[:5])
+    _log_order_levels("Bids", book.levels(BIDS, 5))
+    _log_order_levels("Asks", book.levels(ASKS, 5))
     
     # Calculate and show spread
-    if bids and asks:
-        best_bid = Decimal(bids[0][0])
-        best_ask = Decimal(asks[0][0])
-        spread = best_ask - best_bid
-        spread_percentage = (spread / best_bid) * 100
+    spread = book.spread()
+    if spread is not None:
+        spread_percentage = (spread / book.best_bid()) * 100
         logger.info(f"\nCurrent Spread: {spread} SZAR ({spread_percentage:.2f}%)")
+        logger.info(f"Microprice: {book.microprice():.8f}")
     
     # Show total depth
-    total_bid_volume = sum(Decimal(bid[1]) for bid in bids)
-    total_ask_volume = sum(Decimal(ask[1]) for ask in asks)
+    total_bid_volume = book.cumulative_depth(BIDS)
+    total_ask_volume = book.cumulative_depth(ASKS)
     logger.info("\nOrder Book Depth:")
     logger.info(f"Total Bid Volume: {total_bid_volume:.8f} KAS")
     logger.info(f"Total Ask Volume: {total_ask_volume:.8f} KAS")
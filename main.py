@@ -10,14 +10,18 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Local imports
+import asyncio
 from config.api_client import FameexClient
 from market_maker import MarketMaker
+from multi_market_maker import MultiSymbolRunner
 from config.config import (
     API_KEY, API_SECRET, SYMBOL, 
     ORDER_BOOK_DEPTH, SPREAD_PERCENTAGE,
-    MIN_ORDER_SIZE
+    MIN_ORDER_SIZE, MARKETS, LATENCY_TRACKING, METRICS_PORT, LOG_ASYNC, JOURNAL_DIR, HEDGE_VENUES,
+    HEDGE_API_KEY, HEDGE_API_SECRET
 )
-from utils.logger import setup_logger
+from utils.logger import setup_logger, enable_async_logging
+from utils.latency import LatencyRecorder, serve_metrics
 from tests.test_famex import test_famex_connection, test_market_making
 from tests.utils.test_helpers import (
     setup_test_loggers,
@@ -27,19 +31,35 @@ from tests.utils.test_helpers import (
 )
 from config.test_cli import run_api_tests
 from config.base_client import ExchangeClient
-from trading import PositionTracker, RiskManager, WalletManager  # Updated import
+from trading import PositionTracker, RiskManager, WalletManager, ExecutionTracker, Journal  # Updated import
+from venues import Hedger, MockVenue, create_async_client, create_client, venue_names
 
 # Setup main logger and test results logger
 logger = setup_logger("main")
 test_logger = setup_logger("test_results", log_to_console=False)
 
-def run_market_maker(client: FameexClient, spread: Decimal = None):
+def create_latency_recorder(metrics_port: int = 0) -> LatencyRecorder:
+    """
+    Quote loop span recorder, serving Prometheus metrics if a port is given.
+    
+    Args:
+        metrics_port: Port for the /metrics endpoint; 0 leaves it off
+    """
+    recorder = LatencyRecorder(enabled=LATENCY_TRACKING or bool(metrics_port))
+    if metrics_port:
+        serve_metrics(recorder, metrics_port)
+    return recorder
+
+def run_market_maker(client: FameexClient, spread: Decimal = None, metrics_port: int = 0,
+                     journal_dir: str = ""):
     """
     Run the market maker with the specified client and spread.
     
     Args:
         client: The exchange client to use
         spread: Optional spread to use (overrides config)
+        metrics_port: Port for latency metrics; 0 leaves the endpoint off
+        journal_dir: Directory to restore and journal trading state in; empty leaves it off
     """
     logger.info(f"Starting market maker for {SYMBOL}")
     
@@ -49,16 +69,178 @@ def run_market_maker(client: FameexClient, spread: Decimal = None):
         symbol=SYMBOL,
         order_book_depth=ORDER_BOOK_DEPTH,
         spread_percentage=spread or SPREAD_PERCENTAGE,
-        min_order_size=MIN_ORDER_SIZE
+        min_order_size=MIN_ORDER_SIZE,
+        latency=create_latency_recorder(metrics_port)
+    )
+    market_maker.executions = ExecutionTracker(
+        client, market_maker.position_tracker, market_maker.wallet_manager,
+        order_manager=market_maker.orders
     )
+    journal = Journal(journal_dir) if journal_dir else None
+    if journal is not None:
+        journal.attach(market_maker.position_tracker, market_maker.wallet_manager,
+                       market_maker.risk_manager, market_maker.orders)
     
     try:
-    market_maker.run()
+        market_maker.run()
     except KeyboardInterrupt:
         logger.info("Market maker stopped by user")
     except Exception as e:
         logger.error(f"Error in market maker: {e}")
         raise
+    finally:
+        if journal is not None:
+            journal.close()
+
+def hedge_credentials(exchange: str, hedge_venues: list, api_key: str, api_secret: str,
+                      hedge_api_key: str = None, hedge_api_secret: str = None) -> tuple:
+    """API key and secret for the hedge venues' clients
+
+    Hedges must go through a different account from the quoting one: the
+    quoting account's fill tracking would apply them to positions too, and
+    the hedger would count them twice. Venues other than ``exchange`` are
+    separate accounts already and fall back to the quoting credentials.
+
+    Raises:
+        ValueError: A hedge venue is the quoting exchange without separate credentials
+    """
+    if hedge_api_key and hedge_api_key != api_key:
+        return hedge_api_key, hedge_api_secret
+    if exchange.lower() in (venue.lower() for venue in hedge_venues or []):
+        raise ValueError(f"Hedging on {exchange}, the quoting venue, needs a separate account: "
+                         f"set --hedge-api-key/--hedge-api-secret or HEDGE_API_KEY/HEDGE_API_SECRET")
+    return api_key, api_secret
+
+def run_multi_market_maker(api_key: str, api_secret: str, symbols: list = None,
+                           spread: Decimal = None, test_mode: bool = False, metrics_port: int = 0,
+                           journal_dir: str = "", exchange: str = "fameex", hedge_venues: list = None,
+                           hedge_api_key: str = None, hedge_api_secret: str = None):
+    """
+    Quote several symbols concurrently over one async client.
+    
+    Args:
+        api_key: API key
+        api_secret: API secret
+        symbols: Symbols to quote (defaults to every market in MARKETS)
+        spread: Optional spread to use for every symbol (overrides config)
+        test_mode: Use the client's test-mode order mocks
+        metrics_port: Port for latency metrics; 0 leaves the endpoint off
+        journal_dir: Directory to restore and journal trading state in; empty leaves it off
+        exchange: Registered venue to trade on (see venues.registry)
+        hedge_venues: Registered venues to hedge inventory on, through a separate account (see
+            hedge_credentials()); none leaves hedging off
+        hedge_api_key: API key of the hedge account; defaults to ``api_key`` on venues other than ``exchange``
+        hedge_api_secret: API secret of the hedge account
+    """
+    hedge_key, hedge_secret = hedge_credentials(exchange, hedge_venues, api_key, api_secret,
+                                                hedge_api_key, hedge_api_secret)
+    markets = {symbol: dict(MARKETS.get(symbol, {})) for symbol in (symbols or MARKETS)}
+    if spread:
+        for overrides in markets.values():
+            overrides['spread_percentage'] = spread
+    logger.info(f"Starting market maker for {', '.join(markets)}")
+    
+    journal = Journal(journal_dir) if journal_dir else None
+    
+    async def _run():
+        async with create_async_client(exchange, api_key, api_secret, test_mode) as client:
+            latency = create_latency_recorder(metrics_port)
+            hedge_clients = {name: create_async_client(name, hedge_key, hedge_secret, test_mode)
+                             for name in hedge_venues or []}
+            hedger = Hedger.from_venues(hedge_clients, markets, latency) if hedge_clients else None
+            runner = MultiSymbolRunner.from_config(client, markets, latency=latency, journal=journal,
+                                                   hedger=hedger)
+            try:
+                await runner.run()
+            finally:
+                logger.info(f"Market maker stats: {runner.get_stats()}")
+                if hedger is not None:
+                    await hedger.close()
+                    logger.info(f"Hedger stats: {hedger.get_stats()}")
+                for hedge_client in hedge_clients.values():
+                    await hedge_client.close()
+    
+    try:
+        asyncio.run(_run())
+    except KeyboardInterrupt:
+        logger.info("Market maker stopped by user")
+    finally:
+        if journal is not None:
+            journal.close()
+
+def run_backtest(path: str, symbol: str = SYMBOL, spread: Decimal = None,
+                 pricing_model: str = None, day: str = None) -> None:
+    """
+    Replay a recorded market data file through the market maker.
+    
+    Args:
+        path: JSONL recording (optionally gzipped), .npz event log or recorder store directory
+        symbol: Symbol the recording is for
+        spread: Optional spread to use (overrides config)
+        pricing_model: Optional pricing model name (overrides config)
+        day: Day to replay from a recorder store (YYYY-MM-DD)
+    """
+    from backtest import Backtester, load_events, load_recorded
+    from backtest.events import is_event_log
+    from trading.pricing import create_pricing_model
+    
+    if os.path.isdir(path) and not is_event_log(path):
+        events = load_recorded(path, symbol, day)
+    else:
+        events = load_events(path)
+    logger.info(f"Loaded {len(events)} events from {path}")
+    backtester = Backtester(
+        events,
+        symbol=symbol,
+        spread_percentage=spread or SPREAD_PERCENTAGE,
+        pricing_model=create_pricing_model(pricing_model) if pricing_model else None
+    )
+    result = backtester.run()
+    for key, value in result.summary().items():
+        print(f"{key:>20}: {value}")
+
+def run_sweep(path: str, params: list, symbol: str = SYMBOL, day: str = None,
+              processes: int = None, rank_by: str = None, top: int = None) -> None:
+    """
+    Backtest every combination of parameter values across a process pool.
+    
+    Args:
+        path: Recording, event log or recorder store directory (as for run_backtest)
+        params: "name=v1,v2" specs, e.g. spread_percentage=0.001,0.002
+        symbol: Symbol the recording is for
+        day: Day to replay from a recorder store (YYYY-MM-DD)
+        processes: Optional worker count (overrides config)
+        rank_by: Optional result column to rank by (overrides config)
+        top: Only print the best configurations
+    """
+    from backtest import ParameterSweep, load_recorded
+    from backtest.events import is_event_log
+    from backtest.sweep import parse_param
+    
+    grid = dict(parse_param(spec) for spec in params)
+    events = load_recorded(path, symbol, day) if os.path.isdir(path) and not is_event_log(path) else path
+    options = {k: v for k, v in (('processes', processes), ('rank_by', rank_by)) if v is not None}
+    sweep = ParameterSweep(events, grid, symbol=symbol, **options)
+    rows = sweep.run()
+    print(sweep.table(rows, top))
+    print(f"{len(rows)} configurations in {sweep.elapsed:.2f}s on {sweep.processes} processes")
+
+def run_recorder(client: ExchangeClient, symbols: list, root: str = None) -> None:
+    """
+    Record depth, trades and klines for the given symbols until interrupted.
+    
+    Args:
+        client: The exchange client to poll
+        symbols: Symbols to record
+        root: Optional store directory (overrides config)
+    """
+    from market_data.recorder import MarketDataRecorder
+    
+    recorder = MarketDataRecorder(client, symbols, **({'root': root} if root else {}))
+    try:
+        recorder.run()
+    except KeyboardInterrupt:
+        logger.info("Recorder stopped by user")
 
 def print_kas_pairs(summary_data: dict) -> None:
     """
@@ -103,9 +285,9 @@ def get_market_summary(client: FameexClient, filter_kas: bool = True):
     # Get the market summary
     summary = client.get_market_summary()
     
-            if filter_kas:
-                print_kas_pairs(summary)
-            else:
+    if filter_kas:
+        print_kas_pairs(summary)
+    else:
         print(summary)
 
 def init_loggers(symbol: str = None):
@@ -123,10 +305,26 @@ def init_loggers(symbol: str = None):
 
 def create_exchange_client(exchange_type: str, api_key: str, api_secret: str, test_mode: bool = False) -> ExchangeClient:
     """Create an exchange client based on the specified type."""
-    if exchange_type.lower() == "fameex":
-        return FameexClient(api_key, api_secret, test_mode)
-    else:
-        raise ValueError(f"Unsupported exchange type: {exchange_type}")
+    return create_client(exchange_type, api_key, api_secret, test_mode)
+
+def run_mock_venue(symbol: str, port: int, latency: float = 0.0, jitter: float = 0.0):
+    """
+    Serve a synthetic book for one symbol over the FameEX API until interrupted.
+    
+    Args:
+        symbol: Symbol to serve
+        port: Port to listen on
+        latency: Seconds added to every request
+        jitter: Most extra random seconds added to every request
+    """
+    async def _run():
+        async with MockVenue.synthetic(symbol, latency=latency, jitter=jitter, port=port):
+            await asyncio.Event().wait()
+    
+    try:
+        asyncio.run(_run())
+    except KeyboardInterrupt:
+        logger.info("Mock venue stopped by user")
 
 def test_trading_system(client: ExchangeClient, symbol: str, duration: int = 300):
     """
@@ -208,6 +406,8 @@ def main():
     """Main entry point for the application."""
     # Create the argument parser
     parser = argparse.ArgumentParser(description="Market Maker and Solid Pod Server")
+    parser.add_argument("--async-logging", action="store_true", default=LOG_ASYNC,
+                        help="Write logs from a background thread instead of the trading loop")
     
     # Create subparsers for different commands
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
@@ -216,9 +416,20 @@ def main():
     mm_parser = subparsers.add_parser("market-maker", help="Run the market maker")
     mm_parser.add_argument("--spread", type=float, help="Spread percentage")
     mm_parser.add_argument("--test", action="store_true", help="Run in test mode")
-    mm_parser.add_argument("--exchange", default="fameex", help="Exchange to use")
+    mm_parser.add_argument("--exchange", default="fameex", choices=venue_names(), help="Exchange to use")
     mm_parser.add_argument("--api-key", help="API key")
     mm_parser.add_argument("--api-secret", help="API secret")
+    mm_parser.add_argument("--symbols", nargs="*",
+                           help="Quote several symbols concurrently (no values: all configured markets)")
+    mm_parser.add_argument("--metrics-port", type=int, default=METRICS_PORT,
+                           help="Serve quote loop latency histograms on this port's /metrics (enables tracking)")
+    mm_parser.add_argument("--hedge-venues", nargs="+", default=HEDGE_VENUES, choices=venue_names(),
+                           help="Hedge inventory past HEDGE_THRESHOLDS with IOC orders on these venues")
+    mm_parser.add_argument("--hedge-api-key", default=HEDGE_API_KEY,
+                           help="API key of the hedge account (required to hedge on --exchange)")
+    mm_parser.add_argument("--hedge-api-secret", default=HEDGE_API_SECRET, help="API secret of the hedge account")
+    mm_parser.add_argument("--journal-dir", default=JOURNAL_DIR,
+                           help="Restore positions, balances and limits from this journal and keep it up to date")
     
     # Market summary command
     summary_parser = subparsers.add_parser("summary", help="Get market summary")
@@ -243,11 +454,47 @@ def main():
     # Solid client command
     solid_client_parser = subparsers.add_parser("solid-client", help="Run the Solid client CLI")
     
+    # Record command
+    record_parser = subparsers.add_parser("record", help="Record market data for backtests")
+    record_parser.add_argument("--symbols", nargs="+", default=[SYMBOL], help="Symbols to record")
+    record_parser.add_argument("--dir", help="Store directory")
+    record_parser.add_argument("--exchange", default="fameex", help="Exchange to use")
+    record_parser.add_argument("--api-key", help="API key")
+    record_parser.add_argument("--api-secret", help="API secret")
+    
+    # Backtest command
+    backtest_parser = subparsers.add_parser("backtest", help="Replay recorded market data offline")
+    backtest_parser.add_argument("path", help="Recorded depth/trade JSONL file, .npz event log or recorder directory")
+    backtest_parser.add_argument("--day", help="Day to replay from a recorder directory (YYYY-MM-DD)")
+    backtest_parser.add_argument("--symbol", default=SYMBOL, help="Symbol the recording is for")
+    backtest_parser.add_argument("--spread", type=float, help="Spread percentage")
+    backtest_parser.add_argument("--pricing-model", help="Pricing model (symmetric, avellaneda_stoikov)")
+    
+    # Sweep command
+    sweep_parser = subparsers.add_parser("sweep", help="Backtest a grid of market maker parameters in parallel")
+    sweep_parser.add_argument("path", help="Recorded depth/trade JSONL file, event log or recorder directory")
+    sweep_parser.add_argument("--param", action="append", required=True, metavar="NAME=V1,V2",
+                              help="Parameter values to sweep, e.g. spread_percentage=0.001,0.002 (repeatable)")
+    sweep_parser.add_argument("--day", help="Day to replay from a recorder directory (YYYY-MM-DD)")
+    sweep_parser.add_argument("--symbol", default=SYMBOL, help="Symbol the recording is for")
+    sweep_parser.add_argument("--processes", type=int, help="Worker processes (default: one per core)")
+    sweep_parser.add_argument("--rank-by", help="Result column to rank by (default: pnl)")
+    sweep_parser.add_argument("--top", type=int, help="Only show the best N configurations")
+    
+    # Mock venue command
+    mock_parser = subparsers.add_parser("mock-venue", help="Serve a synthetic book over the FameEX API locally")
+    mock_parser.add_argument("--symbol", default=SYMBOL, help="Symbol to serve")
+    mock_parser.add_argument("--port", type=int, default=9001, help="Port to listen on")
+    mock_parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    mock_parser.add_argument("--jitter", type=float, default=0.0, help="Most extra random seconds per request")
+    
     # Parse the arguments
     args = parser.parse_args()
     
     # Initialize loggers
     init_loggers()
+    if args.async_logging:
+        enable_async_logging()
     
     # Handle the command
     if args.command == "market-maker":
@@ -255,12 +502,20 @@ def main():
         api_key = args.api_key or API_KEY
         api_secret = args.api_secret or API_SECRET
         
+        spread = Decimal(str(args.spread)) if args.spread else None
+        if args.symbols is not None or args.hedge_venues:
+            # Hedging runs on the event loop, so it always uses the async runner
+            symbols = args.symbols if args.symbols is not None else [SYMBOL]
+            run_multi_market_maker(api_key, api_secret, symbols, spread, args.test, args.metrics_port,
+                                   args.journal_dir, args.exchange, args.hedge_venues,
+                                   args.hedge_api_key, args.hedge_api_secret)
+            return
+        
         # Create the client
         client = create_exchange_client(args.exchange, api_key, api_secret, args.test)
         
         # Run the market maker
-        spread = Decimal(str(args.spread)) if args.spread else None
-        run_market_maker(client, spread)
+        run_market_maker(client, spread, args.metrics_port, args.journal_dir)
     elif args.command == "summary":
         # Get API credentials
         api_key = args.api_key or API_KEY
@@ -287,6 +542,16 @@ def main():
     elif args.command == "solid-client":
         # Run the Solid client CLI
         run_solid_client()
+    elif args.command == "record":
+        client = create_exchange_client(args.exchange, args.api_key or API_KEY, args.api_secret or API_SECRET)
+        run_recorder(client, args.symbols, args.dir)
+    elif args.command == "backtest":
+        spread = Decimal(str(args.spread)) if args.spread else None
+        run_backtest(args.path, args.symbol, spread, args.pricing_model, args.day)
+    elif args.command == "sweep":
+        run_sweep(args.path, args.param, args.symbol, args.day, args.processes, args.rank_by, args.top)
+    elif args.command == "mock-venue":
+        run_mock_venue(args.symbol, args.port, args.latency, args.jitter)
     else:
         # Print help if no command is specified
         parser.print_help()
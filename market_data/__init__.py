@@ -0,0 +1,6 @@
+from .depth_feed import DepthFeed, DepthUpdate
+from .order_book import OrderBook
+from .columnar import ColumnarFile, MarketDataStore
+from .recorder import MarketDataRecorder
+
+__all__ = ['DepthFeed', 'DepthUpdate', 'OrderBook', 'ColumnarFile', 'MarketDataStore', 'MarketDataRecorder']
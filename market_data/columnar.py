@@ -0,0 +1,221 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+DAY_MS = 86_400_000
+INDEX_STRIDE = 1024  # Rows between sparse time-index entries
+
+# Column layouts per stream; every column is little-endian int64 and
+# prices/sizes are scaled integers (see market_data.order_book.to_scaled)
+DEPTH_COLUMNS = ('ts', 'seq', 'side', 'price', 'size')  # side 0 = bid, 1 = ask
+TRADE_COLUMNS = ('ts', 'id', 'side', 'price', 'size')  # side 1 = buy, 2 = sell
+KLINE_COLUMNS = ('ts', 'open', 'high', 'low', 'close', 'volume')
+
+STREAMS = {
+    'depth': DEPTH_COLUMNS,
+    'trades': TRADE_COLUMNS,
+    'klines': KLINE_COLUMNS,
+}
+
+_DTYPE = np.dtype('<i8')
+
+def day_of(ts: int) -> str:
+    """UTC date (YYYY-MM-DD) of a millisecond timestamp"""
+    return datetime.fromtimestamp(ts // 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+
+class ColumnWriter:
+    """Appends rows to one stream's column files
+
+    Each column is its own append-only file of int64 values, so a reader
+    can memory-map any column without touching the others. ``index.i64``
+    holds (ts, row) pairs every ``index_stride`` rows for time seeks. A
+    torn append from a crash is trimmed to the shortest column on open.
+    """
+    def __init__(self, directory: str, columns: Sequence[str], price_decimals: int = 8,
+                 size_decimals: int = 8, index_stride: int = INDEX_STRIDE):
+        self.directory = directory
+        self.columns = tuple(columns)
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if tuple(meta['columns']) != self.columns:
+                raise ValueError(f"{directory} holds columns {meta['columns']}, not {list(self.columns)}")
+        else:
+            meta = {'columns': list(self.columns), 'price_decimals': price_decimals,
+                    'size_decimals': size_decimals, 'index_stride': index_stride}
+            with open(meta_path, 'w') as f:
+                json.dump(meta, f)
+        self.price_decimals = meta['price_decimals']
+        self.size_decimals = meta['size_decimals']
+        self.index_stride = meta['index_stride']
+        self.rows = self._repair()
+        self._files = {name: open(self._path(name), 'ab') for name in self.columns}
+        self._index = open(os.path.join(directory, 'index.i64'), 'ab')
+
+    def _path(self, column: str) -> str:
+        return os.path.join(self.directory, f'{column}.i64')
+
+    def _repair(self) -> int:
+        sizes = [os.path.getsize(self._path(c)) if os.path.exists(self._path(c)) else 0
+                 for c in self.columns]
+        rows = min(sizes) // _DTYPE.itemsize
+        for column, size in zip(self.columns, sizes):
+            if size != rows * _DTYPE.itemsize:
+                with open(self._path(column), 'r+b') as f:
+                    f.truncate(rows * _DTYPE.itemsize)
+        index_path = os.path.join(self.directory, 'index.i64')
+        if os.path.exists(index_path):
+            entries = (rows + self.index_stride - 1) // self.index_stride
+            with open(index_path, 'r+b') as f:
+                f.truncate(min(os.path.getsize(index_path) // 16, entries) * 16)
+        return rows
+
+    def append(self, data: Dict[str, Sequence[int]]) -> int:
+        """Append rows given as column -> values; returns the number of rows"""
+        arrays = [np.asarray(data[name], dtype=_DTYPE) for name in self.columns]
+        count = len(arrays[0])
+        if count == 0:
+            return 0
+        if any(len(a) != count for a in arrays):
+            raise ValueError("columns must have the same length")
+        ts = arrays[self.columns.index('ts')]
+        first = -(-self.rows // self.index_stride) * self.index_stride
+        rows = np.arange(first, self.rows + count, self.index_stride, dtype=_DTYPE)
+        if len(rows):
+            self._index.write(np.column_stack((ts[rows - self.rows], rows)).astype(_DTYPE).tobytes())
+        for name, values in zip(self.columns, arrays):
+            self._files[name].write(values.tobytes())
+        self.rows += count
+        return count
+
+    def flush(self) -> None:
+        for f in self._files.values():
+            f.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._index.close()
+
+class ColumnarFile:
+    """Read-only, memory-mapped view of one stream's column files
+
+    Columns are numpy arrays backed directly by the page cache: nothing
+    is parsed or copied until values are used.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        self.columns: Tuple[str, ...] = tuple(meta['columns'])
+        self.price_decimals = meta['price_decimals']
+        self.size_decimals = meta['size_decimals']
+        self.index_stride = meta['index_stride']
+        maps = {name: self._map(f'{name}.i64') for name in self.columns}
+        self.rows = min(len(m) for m in maps.values())
+        self._maps = {name: m[:self.rows] for name, m in maps.items()}
+        index = self._map('index.i64')
+        index = index[:len(index) // 2 * 2].reshape(-1, 2)
+        self._index = index[index[:, 1] < self.rows]
+
+    def _map(self, name: str) -> np.ndarray:
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path) or os.path.getsize(path) < _DTYPE.itemsize:
+            return np.empty(0, dtype=_DTYPE)
+        return np.memmap(path, dtype=_DTYPE, mode='r')
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self._maps[column]
+
+    def _seek(self, ts: int, side: str) -> int:
+        """Row of the first ts >= (left) or > (right) the given time"""
+        if self.rows == 0:
+            return 0
+        # The index narrows the search to one stride of the ts column
+        block = int(np.searchsorted(self._index[:, 0], ts, side=side)) if len(self._index) else 0
+        lo = int(self._index[block - 1, 1]) if block > 0 else 0
+        hi = int(self._index[block, 1]) if block < len(self._index) else self.rows
+        return lo + int(np.searchsorted(self._maps['ts'][lo:hi], ts, side=side))
+
+    def row_range(self, start: Optional[int] = None, end: Optional[int] = None) -> Tuple[int, int]:
+        """Rows with start <= ts < end (either bound may be None)"""
+        lo = 0 if start is None else self._seek(start, 'left')
+        hi = self.rows if end is None else self._seek(end, 'left')
+        return lo, max(lo, hi)
+
+    def between(self, start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Zero-copy column slices for start <= ts < end"""
+        lo, hi = self.row_range(start, end)
+        return {name: m[lo:hi] for name, m in self._maps.items()}
+
+class MarketDataStore:
+    """Recorded market data laid out as ``root/SYMBOL/YYYY-MM-DD/stream/``"""
+    def __init__(self, root: str):
+        self.root = root
+        self._writers: Dict[Tuple[str, str, str], ColumnWriter] = {}
+
+    def path(self, symbol: str, day: str, stream: str) -> str:
+        return os.path.join(self.root, symbol.upper(), day, stream)
+
+    def writer(self, symbol: str, stream: str, day: str) -> ColumnWriter:
+        key = (symbol.upper(), stream, day)
+        writer = self._writers.get(key)
+        if writer is None:
+            writer = ColumnWriter(self.path(symbol, day, stream), STREAMS[stream])
+            self._writers[key] = writer
+        return writer
+
+    def append(self, symbol: str, stream: str, data: Dict[str, Sequence[int]]) -> int:
+        """Append rows, splitting them into daily files by their timestamps"""
+        ts = np.asarray(data['ts'], dtype=_DTYPE)
+        if len(ts) == 0:
+            return 0
+        days = ts // DAY_MS
+        if (days == days[0]).all():
+            return self.writer(symbol, stream, day_of(int(ts[0]))).append(data)
+        count = 0
+        for day in np.unique(days):
+            mask = days == day
+            count += self.writer(symbol, stream, day_of(int(day) * DAY_MS)).append(
+                {name: np.asarray(values, dtype=_DTYPE)[mask] for name, values in data.items()}
+            )
+        return count
+
+    def open(self, symbol: str, stream: str, day: str) -> ColumnarFile:
+        writer = self._writers.get((symbol.upper(), stream, day))
+        if writer is not None:
+            writer.flush()
+        return ColumnarFile(self.path(symbol, day, stream))
+
+    def days(self, symbol: str, stream: str) -> List[str]:
+        """Recorded days for a symbol's stream, oldest first"""
+        directory = os.path.join(self.root, symbol.upper())
+        if not os.path.isdir(directory):
+            return []
+        return sorted(d for d in os.listdir(directory)
+                      if os.path.exists(os.path.join(directory, d, stream, 'meta.json')))
+
+    def last_row(self, symbol: str, stream: str) -> Optional[Dict[str, int]]:
+        """Column -> value of the newest recorded row of a symbol's stream, or None"""
+        for day in reversed(self.days(symbol, stream)):
+            data = self.open(symbol, stream, day)
+            if len(data):
+                return {name: int(data[name][-1]) for name in data.columns}
+        return None
+
+    def flush(self) -> None:
+        for writer in self._writers.values():
+            writer.flush()
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
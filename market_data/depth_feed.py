@@ -0,0 +1,213 @@
+import asyncio
+import gzip
+import inspect
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional
+import aiohttp
+from config.base_client import ExchangeClient
+from config.config import WS_BASE_URL, ORDER_BOOK_DEPTH
+from market_data.order_book import OrderBook
+from utils.logger import setup_logger
+
+logger = setup_logger("depth_feed")
+
+class DepthUpdate:
+    """One incremental depth message; a size of 0 removes the level"""
+    __slots__ = ('seq', 'prev_seq', 'bids', 'asks', 'timestamp')
+
+    def __init__(self, seq: int, prev_seq: Optional[int], bids: List, asks: List,
+                 timestamp: Optional[int] = None):
+        self.seq = seq
+        self.prev_seq = prev_seq
+        self.bids = bids
+        self.asks = asks
+        self.timestamp = timestamp
+
+def decode_frame(frame: Any) -> Optional[Dict]:
+    """Decode a raw WebSocket frame (FameEX gzips market frames)"""
+    if isinstance(frame, (bytes, bytearray)):
+        try:
+            frame = gzip.decompress(frame)
+        except OSError:
+            pass
+        frame = frame.decode('utf-8')
+    try:
+        return json.loads(frame)
+    except (TypeError, ValueError):
+        logger.warning(f"Undecodable frame: {frame!r:.200}")
+        return None
+
+def parse_depth_message(message: Dict) -> Optional[DepthUpdate]:
+    """Parse a depth channel message into a DepthUpdate
+
+    Expected shape::
+
+        {"channel": "market_szarusdt_depth_incr", "ts": 1700000000000,
+         "tick": {"seq": 101, "prevSeq": 100,
+                  "bids": [["0.0950", "1500"]], "asks": [["0.0952", "0"]]}}
+    """
+    tick = message.get('tick')
+    if not isinstance(tick, dict) or 'seq' not in tick:
+        return None
+    prev_seq = tick.get('prevSeq')
+    return DepthUpdate(
+        seq=int(tick['seq']),
+        prev_seq=int(prev_seq) if prev_seq is not None else None,
+        bids=tick.get('bids', []),
+        asks=tick.get('asks', []),
+        timestamp=message.get('ts')
+    )
+
+class DepthFeed:
+    """Streaming L2 book for one symbol built from incremental depth updates
+
+    The book is seeded from a REST snapshot via the client's get_order_book
+    and resynced the same way whenever a sequence gap is detected. Levels
+    carry absolute sizes, so replaying an update already reflected in the
+    snapshot is harmless.
+    """
+    def __init__(self, client: ExchangeClient, symbol: str, ws_url: str = WS_BASE_URL,
+                 depth: int = ORDER_BOOK_DEPTH, snapshot_limit: int = 100,
+                 message_parser: Callable[[Dict], Optional[DepthUpdate]] = parse_depth_message,
+                 reconnect_delay: float = 1.0):
+        self.client = client
+        self.symbol = symbol
+        self.ws_url = ws_url
+        self.depth = depth
+        self.snapshot_limit = snapshot_limit
+        self.message_parser = message_parser
+        self.reconnect_delay = reconnect_delay
+        self.book = OrderBook(symbol)
+        self.last_seq: Optional[int] = None
+        self.synced = False
+        self.updated = asyncio.Event()
+        self._changed = threading.Event()  # Same signal for consumers on other threads
+        self.stats = {'updates': 0, 'stale': 0, 'gaps': 0, 'resyncs': 0, 'reconnects': 0}
+        self.logger = logger
+        self._lock = threading.Lock()  # get_order_book may be called from another thread
+        self._running = False
+
+    @property
+    def channel(self) -> str:
+        return f"market_{self.symbol.lower().replace('-', '')}_depth_incr"
+
+    def subscribe_message(self) -> Dict:
+        return {"event": "sub", "params": {"channel": self.channel, "cb_id": self.symbol.lower()}}
+
+    def load_snapshot(self, order_book: Dict) -> bool:
+        """Replace the local book with a REST snapshot"""
+        data = order_book.get('data', order_book) if isinstance(order_book, dict) else None
+        if not data or 'bids' not in data or 'asks' not in data:
+            self.logger.warning(f"Invalid snapshot for {self.symbol}: {order_book}")
+            return False
+        with self._lock:
+            self.book.load_snapshot(data['bids'], data['asks'], data.get('timestamp'))
+            self.last_seq = None  # Next update becomes the new sequence baseline
+            self.synced = True
+        self.updated.set()
+        self._changed.set()
+        return True
+
+    def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Block until the book changes or the timeout expires"""
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        return changed
+
+    async def resync(self) -> bool:
+        """Fetch a REST snapshot through the client and reseed the book"""
+        self.stats['resyncs'] += 1
+        self.synced = False
+        if inspect.iscoroutinefunction(self.client.get_order_book):
+            snapshot = await self.client.get_order_book(self.symbol, self.snapshot_limit)
+        else:
+            # Keep a blocking REST client off the event loop
+            snapshot = await asyncio.to_thread(self.client.get_order_book, self.symbol, self.snapshot_limit)
+        return self.load_snapshot(snapshot) if snapshot else False
+
+    def apply_update(self, update: DepthUpdate) -> bool:
+        """Apply an incremental update, returning False on a sequence gap"""
+        if self.last_seq is not None:
+            if update.seq <= self.last_seq:
+                self.stats['stale'] += 1
+                return True
+            if update.prev_seq is not None and update.prev_seq != self.last_seq:
+                self.stats['gaps'] += 1
+                self.logger.warning(f"Depth gap on {self.symbol}: expected prevSeq "
+                                    f"{self.last_seq}, got {update.prev_seq}")
+                self.synced = False
+                return False
+
+        with self._lock:
+            self.book.apply_levels(update.bids, update.asks, update.timestamp)
+            self.last_seq = update.seq
+        self.stats['updates'] += 1
+        self.updated.set()
+        self._changed.set()
+        return True
+
+    async def handle_message(self, message: Dict, ws: Any = None) -> None:
+        """Process one decoded message from the socket"""
+        if 'ping' in message:
+            if ws is not None:
+                await ws.send_json({'pong': message['ping']})
+            return
+        update = self.message_parser(message)
+        if update is None:
+            return
+        if not self.synced:
+            return  # Dropped until the resync in progress completes
+        if not self.apply_update(update):
+            await self.resync()
+
+    def get_book(self, depth: Optional[int] = None) -> OrderBook:
+        """Consistent copy of the local book, truncated to ``depth`` levels"""
+        with self._lock:
+            return self.book.copy(depth or self.depth)
+
+    def get_order_book(self, depth: Optional[int] = None) -> Dict[str, Any]:
+        """Current book in the {'bids', 'asks'} shape of the REST API"""
+        return self.get_book(depth).to_dict()
+
+    async def _consume(self, session: aiohttp.ClientSession) -> None:
+        async with session.ws_connect(self.ws_url, heartbeat=30) as ws:
+            await ws.send_json(self.subscribe_message())
+            await self.resync()
+            async for msg in ws:
+                if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    message = decode_frame(msg.data)
+                    if message is not None:
+                        await self.handle_message(message, ws)
+                elif msg.type == aiohttp.WSMsgType.ERROR:
+                    break
+
+    async def run(self, max_reconnects: Optional[int] = None) -> None:
+        """Stream updates until stop() is called, reconnecting on failure"""
+        self._running = True
+        attempts = 0
+        async with aiohttp.ClientSession() as session:
+            while self._running:
+                try:
+                    await self._consume(session)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    self.logger.error(f"Depth feed error for {self.symbol}: {str(e)}")
+                if not self._running:
+                    break
+                self.synced = False
+                attempts += 1
+                self.stats['reconnects'] += 1
+                if max_reconnects is not None and attempts > max_reconnects:
+                    break
+                await asyncio.sleep(self.reconnect_delay)
+        self._running = False
+
+    def stop(self) -> None:
+        self._running = False
+
+    def start_in_thread(self) -> threading.Thread:
+        """Run the feed on a background event loop for synchronous callers"""
+        thread = threading.Thread(target=lambda: asyncio.run(self.run()), daemon=True,
+                                  name=f"depth-feed-{self.symbol}")
+        thread.start()
+        return thread
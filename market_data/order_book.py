@@ -0,0 +1,196 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from utils.fixed_point import Number, to_scaled, format_scaled
+
+BIDS = 'bids'
+ASKS = 'asks'
+
+class OrderBook:
+    """Compact L2 order book over sorted scaled-integer arrays
+
+    Each side keeps parallel ``array('q')`` price and size columns ordered
+    best-first (bid prices are stored negated), so level lookup is a
+    binary search and best bid/ask is index 0. Adding or removing a level
+    shifts every level behind it, so a level added or removed near the
+    touch - where most updates land - moves almost the whole side: O(depth)
+    per such update. The columns stay best-first and contiguous for the
+    top-of-book and depth reads.
+    """
+    __slots__ = ('symbol', 'price_decimals', 'size_decimals', 'timestamp',
+                 '_bid_keys', '_bid_sizes', '_ask_keys', '_ask_sizes')
+
+    def __init__(self, symbol: str = '', price_decimals: int = 8, size_decimals: int = 8):
+        self.symbol = symbol
+        self.price_decimals = price_decimals
+        self.size_decimals = size_decimals
+        self.timestamp: Optional[int] = None
+        self._bid_keys = array('q')
+        self._bid_sizes = array('q')
+        self._ask_keys = array('q')
+        self._ask_sizes = array('q')
+
+    @classmethod
+    def from_levels(cls, bids: List, asks: List, symbol: str = '', price_decimals: int = 8,
+                    size_decimals: int = 8, timestamp: Optional[int] = None) -> 'OrderBook':
+        """Build a book from [[price, size], ...] level lists"""
+        book = cls(symbol, price_decimals, size_decimals)
+        book.load_snapshot(bids, asks, timestamp)
+        return book
+
+    @classmethod
+    def from_dict(cls, order_book: Dict[str, Any], symbol: str = '', **kwargs) -> 'OrderBook':
+        """Build a book from an API response, with or without the 'data' envelope"""
+        data = order_book.get('data', order_book)
+        return cls.from_levels(data.get(BIDS, []), data.get(ASKS, []), symbol,
+                               timestamp=data.get('timestamp'), **kwargs)
+
+    def _columns(self, side: str) -> Tuple[array, array, int]:
+        if side == BIDS:
+            return self._bid_keys, self._bid_sizes, -1
+        if side == ASKS:
+            return self._ask_keys, self._ask_sizes, 1
+        raise ValueError(f"Unknown book side: {side}")
+
+    def scaled_columns(self, side: str) -> Tuple[array, array, int]:
+        """Best-first (keys, sizes, sign) columns, not copied; price = sign * key"""
+        return self._columns(side)
+
+    def load_snapshot(self, bids: List, asks: List, timestamp: Optional[int] = None) -> None:
+        """Replace both sides with full level lists"""
+        for side, levels in ((BIDS, bids), (ASKS, asks)):
+            keys, sizes, sign = self._columns(side)
+            parsed = sorted(
+                (sign * to_scaled(price, self.price_decimals), to_scaled(size, self.size_decimals))
+                for price, size in levels
+            )
+            del keys[:]
+            del sizes[:]
+            for key, size in parsed:
+                if size > 0:
+                    keys.append(key)
+                    sizes.append(size)
+        self.timestamp = timestamp
+
+    def update_scaled(self, side: str, price: int, size: int) -> None:
+        """Set the size at a scaled price level; size 0 removes the level
+
+        Finding the level is O(log n) and changing a size is O(1). Adding or
+        removing a level is O(n) in the levels behind it, which is nearly
+        the whole side for a level at the touch.
+        """
+        keys, sizes, sign = self._columns(side)
+        key = sign * price
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            if size > 0:
+                sizes[i] = size
+            else:
+                del keys[i]
+                del sizes[i]
+        elif size > 0:
+            keys.insert(i, key)
+            sizes.insert(i, size)
+
+    def update(self, side: str, price: Number, size: Number) -> None:
+        """Set the size at a price level; size 0 removes the level"""
+        self.update_scaled(side, to_scaled(price, self.price_decimals), to_scaled(size, self.size_decimals))
+
+    def apply_levels(self, bids: List, asks: List, timestamp: Optional[int] = None) -> None:
+        """Apply incremental [[price, size], ...] updates to both sides"""
+        for price, size in bids:
+            self.update(BIDS, price, size)
+        for price, size in asks:
+            self.update(ASKS, price, size)
+        if timestamp is not None:
+            self.timestamp = timestamp
+
+    def _price(self, scaled: int) -> Decimal:
+        return Decimal(scaled).scaleb(-self.price_decimals)
+
+    def _size(self, scaled: int) -> Decimal:
+        return Decimal(scaled).scaleb(-self.size_decimals)
+
+    def best_bid_scaled(self) -> Optional[int]:
+        return -self._bid_keys[0] if self._bid_keys else None
+
+    def best_ask_scaled(self) -> Optional[int]:
+        return self._ask_keys[0] if self._ask_keys else None
+
+    def best_bid(self) -> Optional[Decimal]:
+        return self._price(-self._bid_keys[0]) if self._bid_keys else None
+
+    def best_ask(self) -> Optional[Decimal]:
+        return self._price(self._ask_keys[0]) if self._ask_keys else None
+
+    def mid(self) -> Optional[Decimal]:
+        if not self._bid_keys or not self._ask_keys:
+            return None
+        return self._price(self._ask_keys[0] - self._bid_keys[0]) / 2
+
+    def spread(self) -> Optional[Decimal]:
+        if not self._bid_keys or not self._ask_keys:
+            return None
+        return self._price(self._ask_keys[0] + self._bid_keys[0])
+
+    def microprice(self) -> Optional[Decimal]:
+        """Top-of-book price weighted towards the side with less size"""
+        if not self._bid_keys or not self._ask_keys:
+            return None
+        bid, ask = -self._bid_keys[0], self._ask_keys[0]
+        bid_size, ask_size = self._bid_sizes[0], self._ask_sizes[0]
+        return self._price(bid * ask_size + ask * bid_size) / (bid_size + ask_size)
+
+    def depth_at(self, side: str, price: Number) -> Decimal:
+        """Size resting at an exact price level"""
+        keys, sizes, sign = self._columns(side)
+        key = sign * to_scaled(price, self.price_decimals)
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            return self._size(sizes[i])
+        return Decimal('0')
+
+    def cumulative_depth(self, side: str, levels: Optional[int] = None,
+                         price: Optional[Number] = None) -> Decimal:
+        """Total size over the best ``levels`` levels, or down/up to ``price`` inclusive"""
+        keys, sizes, sign = self._columns(side)
+        end = len(keys)
+        if price is not None:
+            end = bisect_right(keys, sign * to_scaled(price, self.price_decimals))
+        if levels is not None:
+            end = min(end, levels)
+        return self._size(sum(sizes[:end]))
+
+    def level_count(self, side: str) -> int:
+        return len(self._columns(side)[0])
+
+    def levels(self, side: str, depth: Optional[int] = None) -> List[List[str]]:
+        """Best-first [[price, size], ...] strings for one side"""
+        keys, sizes, sign = self._columns(side)
+        end = len(keys) if depth is None else min(depth, len(keys))
+        return [[format_scaled(sign * keys[i], self.price_decimals),
+                 format_scaled(sizes[i], self.size_decimals)] for i in range(end)]
+
+    def to_dict(self, depth: Optional[int] = None) -> Dict[str, Any]:
+        """Book in the {'bids', 'asks'} list-of-strings shape used by the API"""
+        return {
+            BIDS: self.levels(BIDS, depth),
+            ASKS: self.levels(ASKS, depth),
+            'timestamp': self.timestamp
+        }
+
+    def copy(self, depth: Optional[int] = None) -> 'OrderBook':
+        """Independent copy, optionally truncated to the best ``depth`` levels"""
+        book = OrderBook(self.symbol, self.price_decimals, self.size_decimals)
+        book.timestamp = self.timestamp
+        end = slice(None, depth)
+        book._bid_keys = self._bid_keys[end]
+        book._bid_sizes = self._bid_sizes[end]
+        book._ask_keys = self._ask_keys[end]
+        book._ask_sizes = self._ask_sizes[end]
+        return book
+
+    def __repr__(self) -> str:
+        return (f"OrderBook({self.symbol!r}, bid={self.best_bid()}, ask={self.best_ask()}, "
+                f"levels={self.level_count(BIDS)}/{self.level_count(ASKS)})")
@@ -0,0 +1,191 @@
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from config.base_client import ExchangeClient
+from config.config import (
+    RECORDER_DIR, RECORDER_INTERVAL, RECORDER_DEPTH, RECORDER_KLINE_INTERVAL, RECORDER_KLINE_PERIOD
+)
+from market_data.columnar import MarketDataStore
+from market_data.order_book import to_scaled
+from utils.logger import setup_logger
+
+logger = setup_logger("recorder")
+
+def _rows(response: Any, *keys: str) -> List:
+    """Unwrap a REST response down to its list of entries"""
+    if isinstance(response, dict):
+        for key in ('data',) + keys:
+            if isinstance(response.get(key), (list, dict)):
+                return _rows(response[key], *keys)
+        return []
+    return response if isinstance(response, list) else []
+
+def _first(entry: Dict, *keys: str) -> Any:
+    for key in keys:
+        if entry.get(key) is not None:
+            return entry[key]
+    raise KeyError(keys[0])
+
+def depth_rows(response: Any, ts: int, seq: int, price_decimals: int = 8,
+               size_decimals: int = 8) -> Dict[str, List[int]]:
+    """Columns for one get_order_book snapshot; all levels share ``seq``"""
+    data = response.get('data', response) if isinstance(response, dict) else {}
+    ts = int(data.get('timestamp') or data.get('time') or ts)
+    columns = {'ts': [], 'seq': [], 'side': [], 'price': [], 'size': []}
+    for side, levels in ((0, data.get('bids') or []), (1, data.get('asks') or [])):
+        for price, size in levels:
+            columns['ts'].append(ts)
+            columns['seq'].append(seq)
+            columns['side'].append(side)
+            columns['price'].append(to_scaled(price, price_decimals))
+            columns['size'].append(to_scaled(size, size_decimals))
+    return columns
+
+def trade_rows(response: Any, after: Tuple[int, int] = (0, 0), price_decimals: int = 8,
+               size_decimals: int = 8) -> Dict[str, List[int]]:
+    """Columns for get_trades entries newer than the ``after`` (ts, id) mark, oldest first"""
+    trades = []
+    for trade in _rows(response, 'list', 'trades'):
+        try:
+            ts = int(_first(trade, 'time', 'ts'))
+            trade_id = int(trade.get('id') or 0)
+            if (ts, trade_id) <= after:
+                continue
+            side = 1 if str(trade.get('side', 'BUY')).upper() in ('BUY', '1') else 2
+            trades.append((ts, trade_id, side, to_scaled(_first(trade, 'price'), price_decimals),
+                           to_scaled(_first(trade, 'qty', 'vol', 'amount'), size_decimals)))
+        except (KeyError, TypeError, ValueError):
+            continue
+    trades.sort()
+    return dict(zip(('ts', 'id', 'side', 'price', 'size'),
+                    (list(col) for col in zip(*trades)) if trades else ([], [], [], [], [])))
+
+def kline_rows(response: Any, after: int = 0, price_decimals: int = 8,
+               size_decimals: int = 8) -> Dict[str, List[int]]:
+    """Columns for closed get_klines bars opened after ``after``, oldest first
+
+    The newest bar is still forming, so it is left for a later poll.
+    """
+    bars = []
+    for kline in _rows(response, 'list', 'klines'):
+        try:
+            bars.append((int(_first(kline, 'idx', 'id', 'time', 'ts')),
+                         *(to_scaled(kline[k], price_decimals) for k in ('open', 'high', 'low', 'close')),
+                         to_scaled(_first(kline, 'vol', 'volume', 'amount'), size_decimals)))
+        except (KeyError, TypeError, ValueError):
+            continue
+    bars.sort()
+    closed = [bar for bar in bars[:-1] if bar[0] > after]
+    return dict(zip(('ts', 'open', 'high', 'low', 'close', 'volume'),
+                    (list(col) for col in zip(*closed)) if closed else ([], [], [], [], [], [])))
+
+class MarketDataRecorder:
+    """Polls depth, trades and klines and appends them to a MarketDataStore
+
+    Each cycle stores one order book snapshot and any trades newer than
+    the last recorded one per symbol; closed klines are fetched every
+    ``kline_period`` seconds. Requests go through the client, so its rate
+    limiter paces the recorder. On start it carries on from the newest
+    rows already in the store, so a restart neither reuses snapshot
+    numbers nor records trades and klines twice.
+
+    Args:
+        client: Exchange client to poll
+        symbols: Symbols to record
+        root: Directory of the columnar store
+        interval: Seconds between polling cycles
+        depth: Book levels per snapshot
+        kline_interval: Kline resolution to record
+        kline_period: Seconds between kline polls
+    """
+    def __init__(self, client: ExchangeClient, symbols: Iterable[str], root: str = RECORDER_DIR,
+                 interval: float = RECORDER_INTERVAL, depth: int = RECORDER_DEPTH,
+                 kline_interval: str = RECORDER_KLINE_INTERVAL, kline_period: float = RECORDER_KLINE_PERIOD):
+        self.client = client
+        self.symbols = [s.upper() for s in symbols]
+        self.store = MarketDataStore(root)
+        self.interval = interval
+        self.depth = depth
+        self.kline_interval = kline_interval
+        self.kline_period = kline_period
+        self.logger = logger
+        self._seq = {symbol: 0 for symbol in self.symbols}
+        self._last_trade = {symbol: (0, 0) for symbol in self.symbols}
+        self._last_kline = {symbol: 0 for symbol in self.symbols}
+        for symbol in self.symbols:
+            self._resume(symbol)
+        self._next_kline_poll = 0.0
+        self.stats = {'snapshots': 0, 'depth_rows': 0, 'trades': 0, 'klines': 0, 'errors': 0}
+        self._running = False
+
+    def _resume(self, symbol: str) -> None:
+        depth = self.store.last_row(symbol, 'depth')
+        if depth is not None:
+            self._seq[symbol] = depth['seq']
+        trade = self.store.last_row(symbol, 'trades')
+        if trade is not None:
+            self._last_trade[symbol] = (trade['ts'], trade['id'])
+        kline = self.store.last_row(symbol, 'klines')
+        if kline is not None:
+            self._last_kline[symbol] = kline['ts']
+
+    def record_depth(self, symbol: str) -> int:
+        self._seq[symbol] += 1
+        rows = depth_rows(self.client.get_order_book(symbol, self.depth),
+                          int(time.time() * 1000), self._seq[symbol])
+        count = self.store.append(symbol, 'depth', rows)
+        self.stats['snapshots'] += 1
+        self.stats['depth_rows'] += count
+        return count
+
+    def record_trades(self, symbol: str) -> int:
+        rows = trade_rows(self.client.get_trades(symbol), self._last_trade[symbol])
+        count = self.store.append(symbol, 'trades', rows)
+        if count:
+            self._last_trade[symbol] = (rows['ts'][-1], rows['id'][-1])
+        self.stats['trades'] += count
+        return count
+
+    def record_klines(self, symbol: str) -> int:
+        rows = kline_rows(self.client.get_klines(symbol, self.kline_interval),
+                          self._last_kline[symbol])
+        count = self.store.append(symbol, 'klines', rows)
+        if count:
+            self._last_kline[symbol] = rows['ts'][-1]
+        self.stats['klines'] += count
+        return count
+
+    def record_once(self) -> None:
+        """Poll every symbol once and flush the store"""
+        poll_klines = time.monotonic() >= self._next_kline_poll
+        if poll_klines:
+            self._next_kline_poll = time.monotonic() + self.kline_period
+        for symbol in self.symbols:
+            recorders = [self.record_depth, self.record_trades]
+            if poll_klines:
+                recorders.append(self.record_klines)
+            for record in recorders:
+                try:
+                    record(symbol)
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    self.logger.error(f"Error recording {record.__name__[7:]} for {symbol}: {e}")
+        self.store.flush()
+
+    def run(self, max_cycles: Optional[int] = None) -> None:
+        """Record until stop() is called, or for ``max_cycles`` cycles"""
+        self._running = True
+        self.logger.info(f"Recording {', '.join(self.symbols)} to {self.store.root}")
+        cycles = 0
+        try:
+            while self._running and (max_cycles is None or cycles < max_cycles):
+                started = time.monotonic()
+                self.record_once()
+                cycles += 1
+                if max_cycles is None or cycles < max_cycles:
+                    time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+        finally:
+            self.store.close()
+            self.logger.info(f"Recorder stopped: {self.stats}")
+
+    def stop(self) -> None:
+        self._running = False
@@ -1,123 +1,191 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 import time
 from decimal import Decimal
+import numpy as np
 from config.base_client import ExchangeClient
+from market_data.depth_feed import DepthFeed
+from market_data.order_book import OrderBook
 from config.config import (
     SYMBOL, ORDER_BOOK_DEPTH, SPREAD_PERCENTAGE,
-    MIN_ORDER_SIZE, MAX_ORDER_SIZE
+    MIN_ORDER_SIZE, MAX_ORDER_SIZE, VOLATILITY_WINDOWS, VOLATILITY_EWMA_ALPHA,
+    TICK_SIZE, QUOTE_PRICE_TOLERANCE, QUOTE_SIZE_TOLERANCE, QUOTE_REFRESH_INTERVAL,
+    LADDER_SPACING, LADDER_STEP, LADDER_SIZE_CURVE
 )
 from trading.position_tracker import PositionTracker
 from trading.risk_manager import RiskManager
 from utils.logger import setup_logger
 from trading.wallet_manager import WalletManager
-import statistics
+from trading.volatility import VolatilityEstimator
+from trading.quote_engine import QuoteEngine, QuotePlan
+from trading.symbols import SymbolRegistry
+from trading.ladder import QuoteLadder
+from trading.executions import ExecutionTracker
+from trading.orders import OrderManager, Submission
+from utils.latency import LatencyRecorder
 
 logger = setup_logger("market_maker")
 
 class MarketMaker:
-    def __init__(self, client: ExchangeClient):
+    def __init__(self, client: ExchangeClient, depth_feed: Optional[DepthFeed] = None,
+                 symbol: str = SYMBOL, order_book_depth: int = ORDER_BOOK_DEPTH,
+                 spread_percentage: Decimal = SPREAD_PERCENTAGE, min_order_size: Decimal = MIN_ORDER_SIZE,
+                 max_order_size: Decimal = MAX_ORDER_SIZE,
+                 position_tracker: Optional[PositionTracker] = None,
+                 wallet_manager: Optional[WalletManager] = None,
+                 risk_manager: Optional[RiskManager] = None,
+                 symbol_registry: Optional[SymbolRegistry] = None,
+                 ladder: Optional[QuoteLadder] = None,
+                 executions: Optional[ExecutionTracker] = None,
+                 order_manager: Optional[OrderManager] = None,
+                 latency: Optional[LatencyRecorder] = None):
+        """
+        Args:
+            client: Exchange client (sync for run(), async for step_async())
+            depth_feed: Streaming book; falls back to REST polling when None
+            symbol: Trading pair to quote
+            order_book_depth: Book levels to request and quote levels per side
+            spread_percentage: Minimum spread on either side of mid
+            min_order_size: Size of the innermost quotes
+            max_order_size: Largest order the risk manager allows
+            position_tracker, wallet_manager, risk_manager: Shared instances
+                when several makers trade from one account
+            symbol_registry: Symbol metadata; defaults to the wallet's registry
+            ladder: Quote ladder; defaults to order_book_depth levels sized
+                from min_order_size to max_order_size
+            executions: Fill tracker polled each cycle so positions and
+                balances follow our executions; None disables tracking
+            order_manager: Live order store, shared when several makers
+                trade from one account
+            latency: Span timings for the quote loop; disabled unless
+                LATENCY_TRACKING is set
+        """
         self.client = client
-        self.active_orders: Dict[str, Dict] = {}
-        self.position_tracker = PositionTracker()
-        self.wallet_manager = WalletManager()
-        self.risk_manager = RiskManager(self.position_tracker, self.wallet_manager)
+        self.depth_feed = depth_feed
+        self.symbol = symbol
+        self.order_book_depth = order_book_depth
+        self.min_order_size = Decimal(min_order_size)
+        self.position_tracker = position_tracker or PositionTracker()
+        self.wallet_manager = wallet_manager or WalletManager(symbol_registry)
+        self.symbols = symbol_registry or self.wallet_manager.symbols
+        self.orders = order_manager if order_manager is not None else OrderManager(self.wallet_manager, self.symbols)
+        self.risk_manager = risk_manager or RiskManager(self.position_tracker, self.wallet_manager, self.symbols)
+        self.executions = executions
+        self.latency = latency if latency is not None else LatencyRecorder()
         self.logger = logger
-        self.price_history = []
+        self.ladder = ladder or QuoteLadder(
+            levels=order_book_depth,
+            spacing=LADDER_SPACING,
+            step=LADDER_STEP,
+            size_curve=LADDER_SIZE_CURVE,
+            min_size=self.min_order_size,
+            max_size=Decimal(max_order_size)
+        )
+        self.volatility = VolatilityEstimator(VOLATILITY_WINDOWS, ewma_alpha=VOLATILITY_EWMA_ALPHA)
+        self.quote_engine = QuoteEngine(
+            tick_size=TICK_SIZE,
+            price_tolerance=QUOTE_PRICE_TOLERANCE,
+            size_tolerance=QUOTE_SIZE_TOLERANCE,
+            batch_size=client.max_batch_size if client.supports_batch_orders is True else 1
+        )
         
         # Set initial risk limits with minimum spread
         self.risk_manager.set_limits(
-            SYMBOL,
+            symbol,
             max_position=Decimal('1000'),
-            max_drawdown=Decimal('100'),
-            min_spread=Decimal('0.02'),  # 2% minimum spread
-            target_ratio=Decimal('1.0')  # Equal value in both assets
+            max_order_size=Decimal(max_order_size),
+            min_spread=Decimal(spread_percentage)
         )
         
+    @property
+    def active_orders(self) -> Dict[str, Dict]:
+        """Order id -> order dict for this symbol's live orders"""
+        return self.orders.open_orders(self.symbol)
+
+    @active_orders.setter
+    def active_orders(self, orders: Dict[str, Dict]) -> None:
+        self.orders.replace_all(self.symbol, orders)
+        
     def calculate_volatility(self) -> Decimal:
         """Calculate recent market volatility"""
-        if len(self.price_history) < 2:
-            return Decimal('0.01')
-            
-        returns = []
-        for i in range(1, len(self.price_history)):
-            prev_price = self.price_history[i-1]
-            curr_price = self.price_history[i]
-            returns.append((curr_price - prev_price) / prev_price)
-            
-        return Decimal(str(statistics.stdev(returns))) if returns else Decimal('0.01')
+        return self.volatility.get_volatility()
+
+    def load_kline_volatility(self, interval: str = "1min", limit: int = 100) -> Dict[str, float]:
+        """Seed range-based volatility estimates from recent klines"""
+        return self._log_kline_volatility(self.client.get_klines(self.symbol, interval, limit))
+
+    async def load_kline_volatility_async(self, interval: str = "1min", limit: int = 100) -> Dict[str, float]:
+        """load_kline_volatility for an async client"""
+        return self._log_kline_volatility(await self.client.get_klines(self.symbol, interval, limit))
 
-    def calculate_new_orders(self, order_book: Dict) -> List[Dict]:
+    def _log_kline_volatility(self, klines) -> Dict[str, float]:
+        estimates = self.volatility.load_klines(klines)
+        if estimates:
+            self.logger.info(f"Kline volatility for {self.symbol}: {estimates}")
+        return estimates
+
+    def calculate_new_orders(self, order_book: Union[OrderBook, Dict]) -> List[Dict]:
         """Calculate new orders based on the current order book"""
         try:
-            if not order_book or 'bids' not in order_book or 'asks' not in order_book:
-                self.logger.warning("Invalid order book data")
-                return []
+            if not isinstance(order_book, OrderBook):
+                if not order_book or 'bids' not in order_book or 'asks' not in order_book:
+                    self.logger.warning("Invalid order book data")
+                    return []
+                order_book = OrderBook.from_dict(order_book, self.symbol)
                 
-            bids = order_book['bids']
-            asks = order_book['asks']
+            # Touch prices stay scaled integers; the mid goes to the float estimators
+            best_bid = order_book.best_bid_scaled()
+            best_ask = order_book.best_ask_scaled()
             
-            if not bids or not asks:
+            if best_bid is None or best_ask is None:
                 self.logger.warning("Empty order book")
                 return []
                 
-            # Get best bid and ask
-            best_bid = Decimal(bids[0][0])
-            best_ask = Decimal(asks[0][0])
+            # Update streaming volatility estimates
+            mid_price = (best_bid + best_ask) / 2 / 10 ** order_book.price_decimals
+            self.volatility.update(mid_price)
             
-            # Update price history for volatility calculation
-            mid_price = (best_bid + best_ask) / 2
-            self.price_history.append(float(mid_price))
-            if len(self.price_history) > 100:  # Keep last 100 prices
-                self.price_history.pop(0)
-                
             # Calculate volatility
             volatility = self.calculate_volatility()
             
-            # Get recommended spread based on market conditions
-            spread_percentage = self.risk_manager.get_recommended_spread(SYMBOL, volatility)
+            # Price our quotes for current inventory and market conditions
+            our_bid, our_ask = self.risk_manager.quote_prices(self.symbol, mid_price, volatility)
             
-            # Calculate our order prices
-            spread = mid_price * spread_percentage
-            our_bid = mid_price - spread
-            our_ask = mid_price + spread
+            # Build the ladder outward from our touch prices, snapped to the
+            # exchange's tick and lot grid away from mid
+            symbol_info = self.symbols.get(self.symbol)
+            bids, asks = self.ladder.build(our_bid, our_ask, symbol_info, order_book)
             
-            # Generate orders
-            orders = []
+            # Funds held by our live quotes come back if they are replaced
+            credit = self.orders.reserved_totals(self.symbol)
             
-            # Check risk limits for buy order
-            if self.risk_manager.check_order(SYMBOL, Decimal(MIN_ORDER_SIZE), our_bid, True):
-                orders.append({
-                    "symbol": SYMBOL,
-                    "side": 1,  # Buy
-                    "orderType": 1,  # Limit
-                    "price": str(our_bid),
-                    "amount": str(MIN_ORDER_SIZE)
-                })
+            # Check risk limits for the whole ladder in one pass
+            is_buy = np.arange(len(bids) + len(asks)) < len(bids)
+            with self.latency.span("check_order"):
+                accepted, _ = self.risk_manager.check_orders(
+                    self.symbol,
+                    np.concatenate((bids.sizes, asks.sizes)),
+                    np.concatenate((bids.prices, asks.prices)),
+                    is_buy,
+                    credit=credit
+                )
             
-            # Check risk limits for sell order
-            if self.risk_manager.check_order(SYMBOL, Decimal(MIN_ORDER_SIZE), our_ask, False):
-                orders.append({
-                    "symbol": SYMBOL,
-                    "side": 2,  # Sell
-                    "orderType": 1,  # Limit
-                    "price": str(our_ask),
-                    "amount": str(MIN_ORDER_SIZE)
-                })
+            # Check wallet balances on the tick/lot counts
+            with self.latency.span("can_place_order"):
+                funded = self.wallet_manager.can_place_orders(
+                    self.symbol,
+                    np.concatenate((bids.ticks, asks.ticks)),
+                    np.concatenate((bids.lots, asks.lots)),
+                    is_buy,
+                    credit=credit
+                )
+            unfunded = accepted & ~funded
+            if unfunded.any():
+                self.logger.warning(f"Insufficient balance for {int(unfunded.sum())} orders")
+            keep = accepted & funded
             
-            # Check wallet balances before returning orders
-            filtered_orders = []
-            for order in orders:
-                if self.wallet_manager.can_place_order(
-                    order["side"],
-                    order["symbol"],
-                    Decimal(order["amount"]),
-                    Decimal(order["price"])
-                ):
-                    filtered_orders.append(order)
-                else:
-                    self.logger.warning(f"Insufficient balance for order: {order}")
-                    
-            return filtered_orders
+            # Orders only become strings once they are going to the exchange
+            return QuoteLadder.to_orders(self.symbol, (bids.select(keep[:len(bids)]),
+                                                       asks.select(keep[len(bids):])))
             
         except Exception as e:
             self.logger.error(f"Error calculating orders: {str(e)}", exc_info=True)
@@ -137,25 +205,149 @@ class MarketMaker:
             
         # Continue with intelligence processing...
 
+    @staticmethod
+    def _order_params(order: Dict) -> Dict:
+        """Map a calculated order onto ExchangeClient.place_order keywords"""
+        return {
+            "side": order["side"],
+            "order_type": order["orderType"],
+            "volume": order["amount"],
+            "price": order["price"]
+        }
+
+    @staticmethod
+    def _extract_order_id(result: Optional[Dict]) -> Optional[str]:
+        """Get the order id from a raw or unwrapped placement response"""
+        if not result or result.get('code', 200) != 200:
+            return None
+        data = result.get('data', result)
+        return data.get('orderId') if isinstance(data, dict) else None
+
+    def _plan_quotes(self, new_orders: List[Dict]) -> QuotePlan:
+        plan = self.quote_engine.plan(self.active_orders, new_orders)
+        self.quote_engine.record(plan)
+        return plan
+
+    def _begin_replace(self, new_orders: List[Dict]) -> Optional[Submission]:
+        """Plan the requote and reserve funds for its new orders"""
+        plan = self._plan_quotes(new_orders)
+        if plan.is_empty:
+            return None
+        return self.orders.begin(self.symbol, plan.cancel_ids, plan.place)
+
+    def _apply_replace_result(self, submission: Submission, result: Optional[Dict[str, List]]) -> None:
+        """Update the order store and reservations from a cancel_replace result"""
+        result = result or {}
+        self.orders.complete(
+            submission,
+            result.get('canceled', []),
+            [self._extract_order_id(placed) for placed in result.get('placed', [])]
+        )
+
+    def replace_quotes(self, new_orders: List[Dict]) -> None:
+        """Move resting quotes to the new set, touching only quotes that changed
+        
+        New orders are funded before they are sent; reservations follow the
+        venue's answer, and are released if the request fails.
+        """
+        submission = self._begin_replace(new_orders)
+        if submission is None:
+            return
+        result = None
+        try:
+            if not submission.is_empty:
+                with self.latency.span("place_order"):
+                    result = self.client.cancel_replace(
+                        self.symbol, submission.cancel_ids,
+                        [self._order_params(order) for order in submission.orders]
+                    )
+        finally:
+            self._apply_replace_result(submission, result)
+
+    async def replace_quotes_async(self, new_orders: List[Dict]) -> None:
+        """replace_quotes for an async client"""
+        submission = self._begin_replace(new_orders)
+        if submission is None:
+            return
+        result = None
+        try:
+            if not submission.is_empty:
+                with self.latency.span("place_order"):
+                    result = await self.client.cancel_replace(
+                        self.symbol, submission.cancel_ids,
+                        [self._order_params(order) for order in submission.orders]
+                    )
+        finally:
+            self._apply_replace_result(submission, result)
+
+    def _book_from_feed(self) -> Optional[OrderBook]:
+        if self.depth_feed is not None and self.depth_feed.synced:
+            return self.depth_feed.get_book(self.order_book_depth)
+        return None
+
+    def _book_from_rest(self, order_book) -> Optional[OrderBook]:
+        if not isinstance(order_book, dict):
+            return None
+        return OrderBook.from_dict(order_book, self.symbol)
+
+    def get_order_book(self) -> Optional[OrderBook]:
+        """Current book from the depth feed, or a REST snapshot without one"""
+        book = self._book_from_feed()
+        if book is not None:
+            return book
+        return self._book_from_rest(self.client.get_order_book(self.symbol, self.order_book_depth))
+
+    async def get_order_book_async(self) -> Optional[OrderBook]:
+        """get_order_book for an async client"""
+        book = self._book_from_feed()
+        if book is not None:
+            return book
+        return self._book_from_rest(await self.client.get_order_book(self.symbol, self.order_book_depth))
+
+    def step(self) -> None:
+        """One quoting cycle: apply new fills, reconcile orders and balances when due, read the book, price quotes and requote what changed"""
+        latency = self.latency
+        with latency.span("step"):
+            if self.executions is not None:
+                self.executions.poll(self.symbol)
+            self.orders.reconcile_with(self.client, self.symbol)
+            self.orders.sync_account_with(self.client)
+            with latency.span("get_order_book"):
+                order_book = self.get_order_book()
+            with latency.span("calculate_new_orders"):
+                new_orders = self.calculate_new_orders(order_book)
+            with latency.span("replace_quotes"):
+                self.replace_quotes(new_orders)
+        latency.maybe_log()
+
+    async def step_async(self) -> None:
+        """step() for an async client"""
+        latency = self.latency
+        with latency.span("step"):
+            if self.executions is not None:
+                await self.executions.poll_async(self.symbol)
+            await self.orders.reconcile_with_async(self.client, self.symbol)
+            await self.orders.sync_account_with_async(self.client)
+            with latency.span("get_order_book"):
+                order_book = await self.get_order_book_async()
+            with latency.span("calculate_new_orders"):
+                new_orders = self.calculate_new_orders(order_book)
+            with latency.span("replace_quotes"):
+                await self.replace_quotes_async(new_orders)
+        latency.maybe_log()
+
     def run(self):
         """Main market making loop"""
+        self.symbols.refresh(self.client)
+        self.load_kline_volatility()
         while True:
             try:
-                # Get current order book
-                order_book = self.client.get_order_book(SYMBOL, ORDER_BOOK_DEPTH)
-                
-                # Calculate and place new orders
-                new_orders = self.calculate_new_orders(order_book)
+                self.step()
                 
-                for order in new_orders:
-                    result = self.client.place_order(**order)
-                    if result and result.get('code') == 200:
-                        order_id = result['data']['orderId']
-                        self.active_orders[order_id] = order
-                        
-                # Sleep to respect rate limits
-                time.sleep(0.1)  # Adjust as needed
+                # With a live feed, wait for the book to move; REST polling is paced by the rate limiter
+                if self.depth_feed is not None and self.depth_feed.synced:
+                    self.depth_feed.wait_for_change(QUOTE_REFRESH_INTERVAL)
                 
             except Exception as e:
                 print(f"Error in market making loop: {e}")
-                time.sleep(1) 
\ No newline at end of file
+                time.sleep(1)
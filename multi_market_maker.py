@@ -0,0 +1,176 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+from config.base_client import AsyncExchangeClient
+from config.config import (
+    MARKETS, ORDER_BOOK_DEPTH, SPREAD_PERCENTAGE, MIN_ORDER_SIZE, MAX_ORDER_SIZE,
+    QUOTE_REFRESH_INTERVAL, MAX_CONCURRENT_MARKETS, MARKET_STEP_TIMEOUT
+)
+from market_maker import MarketMaker
+from trading.executions import ExecutionTracker
+from trading.journal import Journal
+from trading.orders import OrderManager
+from trading.position_tracker import PositionTracker
+from trading.risk_manager import RiskManager
+from trading.wallet_manager import WalletManager
+from utils.latency import LatencyRecorder
+from utils.logger import setup_logger
+from venues.hedger import Hedger
+
+logger = setup_logger("multi_market_maker")
+
+class MultiSymbolRunner:
+    """Runs one MarketMaker per symbol on a single event loop
+
+    All makers share one async client (and so one connection pool and
+    rate limiter), one wallet, position tracker and risk manager. Each
+    symbol gets its own task; quoting cycles take a slot from a FIFO
+    semaphore so at most ``max_concurrency`` cycles are in flight and
+    waiting markets are served in arrival order. A cycle that exceeds
+    ``step_timeout`` is cancelled so one slow market cannot hold a slot.
+
+    Args:
+        client: Shared async exchange client
+        makers: Strategies to schedule, one per symbol
+        refresh_interval: Max seconds between cycles for a symbol
+        max_concurrency: Quoting cycles allowed in flight at once
+        step_timeout: Seconds before a cycle is abandoned
+    """
+    def __init__(self, client: AsyncExchangeClient, makers: List[MarketMaker],
+                 refresh_interval: float = QUOTE_REFRESH_INTERVAL,
+                 max_concurrency: int = MAX_CONCURRENT_MARKETS,
+                 step_timeout: float = MARKET_STEP_TIMEOUT):
+        self.client = client
+        self.makers: Dict[str, MarketMaker] = {maker.symbol: maker for maker in makers}
+        self.refresh_interval = refresh_interval
+        self.step_timeout = step_timeout
+        self.max_concurrency = max_concurrency
+        self.stats = {
+            symbol: {'cycles': 0, 'errors': 0, 'timeouts': 0, 'busy_time': 0.0, 'slot_wait': 0.0}
+            for symbol in self.makers
+        }
+        self.logger = logger
+        self._running = False
+
+    @classmethod
+    def from_config(cls, client: AsyncExchangeClient, markets: Optional[Dict[str, Dict]] = None,
+                    wallet_manager: Optional[WalletManager] = None,
+                    latency: Optional[LatencyRecorder] = None, journal: Optional[Journal] = None,
+                    hedger: Optional[Hedger] = None, **kwargs) -> 'MultiSymbolRunner':
+        """Build makers for each market with shared wallet, positions, risk limits,
+        order store and fill tracking
+
+        Args:
+            client: Shared async exchange client
+            markets: Symbol -> MarketMaker keyword overrides (defaults to MARKETS)
+            wallet_manager: Shared wallet; a new one is created if omitted
+            latency: Span recorder all makers report to; a new one is created if omitted
+            journal: Journal to restore the shared state from and record it to
+            hedger: Hedger to offset the shared positions with
+        """
+        wallet_manager = wallet_manager or WalletManager()
+        position_tracker = PositionTracker()
+        risk_manager = RiskManager(position_tracker, wallet_manager)
+        orders = OrderManager(wallet_manager)
+        executions = ExecutionTracker(client, position_tracker, wallet_manager, order_manager=orders)
+        latency = latency if latency is not None else LatencyRecorder()
+        makers = []
+        for symbol, overrides in (markets if markets is not None else MARKETS).items():
+            settings = {
+                'order_book_depth': ORDER_BOOK_DEPTH,
+                'spread_percentage': SPREAD_PERCENTAGE,
+                'min_order_size': MIN_ORDER_SIZE,
+                'max_order_size': MAX_ORDER_SIZE,
+                **overrides
+            }
+            makers.append(MarketMaker(
+                client, symbol=symbol,
+                position_tracker=position_tracker,
+                wallet_manager=wallet_manager,
+                risk_manager=risk_manager,
+                executions=executions,
+                order_manager=orders,
+                latency=latency,
+                **settings
+            ))
+        if journal is not None:
+            # After the makers, so journaled limits replace their defaults
+            journal.attach(position_tracker, wallet_manager, risk_manager, orders)
+        if hedger is not None:
+            hedger.attach(position_tracker)
+        return cls(client, makers, **kwargs)
+
+    async def _wait_for_next_cycle(self, maker: MarketMaker) -> None:
+        """Wait for the symbol's book to change, or the refresh interval to pass"""
+        feed = maker.depth_feed
+        if feed is not None and feed.synced:
+            try:
+                await asyncio.wait_for(feed.updated.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            feed.updated.clear()
+        else:
+            await asyncio.sleep(self.refresh_interval)
+
+    async def run_cycle(self, maker: MarketMaker, slots: asyncio.Semaphore) -> None:
+        """Run one quoting cycle for a symbol within a scheduling slot"""
+        stats = self.stats[maker.symbol]
+        queued = time.perf_counter()
+        async with slots:
+            started = time.perf_counter()
+            stats['slot_wait'] += started - queued
+            try:
+                await asyncio.wait_for(maker.step_async(), self.step_timeout)
+                stats['cycles'] += 1
+            except asyncio.TimeoutError:
+                stats['timeouts'] += 1
+                self.logger.warning(f"Quoting cycle for {maker.symbol} exceeded {self.step_timeout}s")
+            except Exception as e:
+                stats['errors'] += 1
+                self.logger.error(f"Error in market making cycle for {maker.symbol}: {e}")
+            finally:
+                stats['busy_time'] += time.perf_counter() - started
+
+    async def _run_symbol(self, maker: MarketMaker, slots: asyncio.Semaphore,
+                          max_cycles: Optional[int]) -> None:
+        cycles = 0
+        while self._running and (max_cycles is None or cycles < max_cycles):
+            await self.run_cycle(maker, slots)
+            cycles += 1
+            if max_cycles is None or cycles < max_cycles:
+                await self._wait_for_next_cycle(maker)
+
+    async def run(self, max_cycles: Optional[int] = None) -> None:
+        """Quote all symbols until stop() is called, or for ``max_cycles`` each"""
+        self._running = True
+        slots = asyncio.Semaphore(self.max_concurrency)
+        self.logger.info(f"Starting market making for {len(self.makers)} symbols: "
+                         f"{', '.join(self.makers)}")
+
+        registries = {id(maker.symbols): maker.symbols for maker in self.makers.values()}
+        await asyncio.gather(
+            *(registry.refresh_async(self.client) for registry in registries.values()),
+            *(maker.load_kline_volatility_async() for maker in self.makers.values()),
+            return_exceptions=True
+        )
+        feeds = {maker.depth_feed: asyncio.create_task(maker.depth_feed.run())
+                 for maker in self.makers.values() if maker.depth_feed is not None}
+        try:
+            await asyncio.gather(*(self._run_symbol(maker, slots, max_cycles)
+                                   for maker in self.makers.values()))
+        finally:
+            self._running = False
+            for feed, task in feeds.items():
+                feed.stop()
+                task.cancel()
+            await asyncio.gather(*feeds.values(), return_exceptions=True)
+
+    def stop(self) -> None:
+        self._running = False
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Per-symbol scheduling counters plus quote engine metrics"""
+        return {
+            symbol: {**self.stats[symbol], 'quotes': maker.quote_engine.get_stats()}
+            for symbol, maker in self.makers.items()
+        }
@@ -0,0 +1,77 @@
+"""Quote-cycle latency: sequential FameexClient vs concurrent AsyncFameexClient
+
+A quote cycle is one depth fetch plus a bid and an ask placement. Both
+clients talk to a local mock server with injected per-request latency.
+
+    python script/bench_async_client.py --cycles 50 --latency 0.02
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.api_client import FameexClient
+from config.async_api_client import AsyncFameexClient
+from config.rate_limiter import RateLimiter
+from tests.utils.mock_exchange_server import MockExchangeServer
+
+SYMBOL = "SZARUSDT"
+
+def _unthrottled() -> RateLimiter:
+    """Limiter that never waits, so only transport latency is measured"""
+    return RateLimiter({"order": (10**9, 1.0), "market_data": (10**9, 1.0)})
+
+def _summary(name: str, samples: list) -> str:
+    ordered = sorted(samples)
+    p50 = ordered[len(ordered) // 2] * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    mean = statistics.mean(samples) * 1000
+    return f"{name:<8} mean={mean:8.2f}ms  p50={p50:8.2f}ms  p99={p99:8.2f}ms"
+
+def bench_sync(url: str, cycles: int) -> list:
+    client = FameexClient("bench", "bench", base_url=url, rate_limiter=_unthrottled())
+    samples = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        client.get_order_book(SYMBOL, 5)
+        client.place_order(SYMBOL, 1, 1, "100", "0.0940")
+        client.place_order(SYMBOL, 2, 1, "100", "0.0960")
+        samples.append(time.perf_counter() - start)
+    client.session.close()
+    return samples
+
+async def bench_async(url: str, cycles: int) -> list:
+    samples = []
+    async with AsyncFameexClient("bench", "bench", base_url=url,
+                                 rate_limiter=_unthrottled()) as client:
+        for _ in range(cycles):
+            start = time.perf_counter()
+            await client.gather(
+                client.get_order_book(SYMBOL, 5),
+                client.place_order(SYMBOL, 1, 1, "100", "0.0940"),
+                client.place_order(SYMBOL, 2, 1, "100", "0.0960"),
+            )
+            samples.append(time.perf_counter() - start)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=50, help="Quote cycles per client")
+    parser.add_argument("--latency", type=float, default=0.02, help="Injected server latency (s)")
+    args = parser.parse_args()
+
+    with MockExchangeServer(latency=args.latency) as server:
+        sync_samples = bench_sync(server.url, args.cycles)
+        async_samples = asyncio.run(bench_async(server.url, args.cycles))
+
+    print(f"{args.cycles} cycles, {args.latency * 1000:.0f}ms injected latency per request")
+    print(_summary("sync", sync_samples))
+    print(_summary("async", async_samples))
+    print(f"speedup  {statistics.mean(sync_samples) / statistics.mean(async_samples):.2f}x")
+
+if __name__ == "__main__":
+    main()
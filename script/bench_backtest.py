@@ -0,0 +1,94 @@
+"""Backtest throughput: JSONL loading, raw replay and replay with requoting
+
+Generates a synthetic SZARUSDT recording (random depth updates around a
+wandering touch, with 10% of messages being trades at the touch), then
+times each stage in book events per second and per minute.
+
+    python script/bench_backtest.py --messages 200000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest import Backtester, load_events
+
+def write_recording(path: str, messages: int, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    ts = 1700000000000
+    bids = {949 - i: rng.randint(500, 5000) for i in range(20)}
+    asks = {951 + i: rng.randint(500, 5000) for i in range(20)}
+
+    def level(ticks: int, size: int) -> list:
+        return [f"{ticks / 10000:.4f}", str(size)]
+
+    with open(path, 'w') as f:
+        f.write(json.dumps({"ts": ts, "bids": [level(p, s) for p, s in bids.items()],
+                            "asks": [level(p, s) for p, s in asks.items()]}) + "\n")
+        for seq in range(messages):
+            ts += rng.randint(5, 50)
+            if rng.random() < 0.1:
+                side = rng.choice(('buy', 'sell'))
+                price = min(asks) if side == 'buy' else max(bids)
+                trade = {"side": side, "price": f"{price / 10000:.4f}", "vol": str(rng.randint(10, 3000))}
+                f.write(json.dumps({"ts": ts, "tick": {"data": [trade]}}) + "\n")
+                continue
+            updates = {'bids': [], 'asks': []}
+            for _ in range(rng.randint(1, 4)):
+                is_bid = rng.random() < 0.5
+                levels = bids if is_bid else asks
+                if is_bid:
+                    price = min(max(bids) - rng.randint(-1, 8), min(asks) - 1)
+                else:
+                    price = max(min(asks) + rng.randint(-1, 8), max(bids) + 1)
+                size = 0 if rng.random() < 0.3 and len(levels) > 3 else rng.randint(100, 5000)
+                if size:
+                    levels[price] = size
+                else:
+                    levels.pop(price, None)
+                updates['bids' if is_bid else 'asks'].append(level(price, size))
+            f.write(json.dumps({"ts": ts, "tick": {"seq": seq, "prevSeq": seq - 1, **updates}}) + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200000, help="Recorded messages to generate")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "szarusdt.jsonl")
+        write_recording(path, args.messages)
+        started = time.perf_counter()
+        events = load_events(path)
+        load_time = time.perf_counter() - started
+        npz = os.path.join(tmp, "szarusdt.npz")
+        events.save(npz)
+        started = time.perf_counter()
+        load_events(npz)
+        npz_time = time.perf_counter() - started
+
+    print(f"{len(events)} events from {args.messages} messages")
+    print(f"{'stage':<28} {'seconds':>8} {'events/s':>10} {'events/min':>11} {'requotes':>9}")
+
+    def row(name, seconds, requotes=''):
+        rate = len(events) / seconds
+        print(f"{name:<28} {seconds:>8.2f} {rate:>10.0f} {rate * 60 / 1e6:>10.1f}M {requotes:>9}")
+
+    row("load jsonl", load_time)
+    row("load npz", npz_time)
+    runs = [
+        ("replay, no requotes", {'requote_interval': 1e9}),
+        ("replay, requote <= 1s", {'requote_interval': 1.0}),
+        ("replay, requote <= 100ms", {'requote_interval': 0.1}),
+    ]
+    for name, kwargs in runs:
+        result = Backtester(events, spread_percentage=Decimal('0.0005'), **kwargs).run()
+        row(name, result.elapsed, result.requotes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Quote cycle cost: Decimal balances and order strings vs fixed-point integers
+
+The Decimal path is calculate_new_orders as it was before balances and
+positions became fixed-point: Decimal mid and quote prices, every ladder
+level turned into strings, then a Decimal can_place_order per accepted
+order against Decimal balance dicts. The fixed-point path is the current
+MarketMaker.calculate_new_orders, which checks funds on tick/lot counts
+and formats only the orders it returns.
+
+    python script/bench_fixed_point.py --repeat 2000
+"""
+import argparse
+import logging
+import os
+import sys
+import timeit
+from decimal import Decimal
+from unittest.mock import Mock
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_data.order_book import OrderBook
+from market_maker import MarketMaker
+from trading.ladder import QuoteLadder
+from trading.symbols import SymbolInfo
+
+SYMBOL = 'SZARUSDT'
+
+class DecimalWallet:
+    """WalletManager's balance checks as they were on Decimal dicts"""
+    def __init__(self, wallet):
+        self.symbols = wallet.symbols
+        self.balances = dict(wallet.balances)
+        self.reserved_balances = dict(wallet.reserved_balances)
+        self.min_kas_reserve = wallet.min_kas_reserve
+
+    def get_available_balance(self, asset):
+        return self.balances.get(asset, Decimal('0')) - self.reserved_balances.get(asset, Decimal('0'))
+
+    def can_place_order(self, side, symbol, amount, price, credit=None):
+        info = self.symbols.get(symbol)
+        base_asset, quote_asset = info.assets
+        if not info.meets_minimums(amount, price):
+            return False
+        credit = credit or {}
+        if side == 1:
+            return (self.get_available_balance(quote_asset) + credit.get(quote_asset, 0) >= amount * price and
+                    self.get_available_balance('KAS') >= self.min_kas_reserve)
+        return (self.get_available_balance(base_asset) + credit.get(base_asset, 0) >= amount and
+                self.get_available_balance('KAS') >= self.min_kas_reserve)
+
+def decimal_orders(ladders):
+    return [{"symbol": SYMBOL, "side": ladder.side, "orderType": 1, "price": str(price), "amount": str(size)}
+            for ladder in ladders for price, size in ladder.levels()]
+
+def decimal_cycle(maker: MarketMaker, wallet: DecimalWallet, book: OrderBook):
+    """calculate_new_orders on the Decimal path"""
+    mid_price = book.mid()
+    maker.volatility.update(mid_price)
+    volatility = maker.calculate_volatility()
+    our_bid, our_ask = maker.risk_manager.get_quote_prices(SYMBOL, mid_price, volatility)
+    bids, asks = maker.ladder.build(our_bid, our_ask, maker.symbols.get(SYMBOL), book)
+    candidates = decimal_orders((bids, asks))
+    credit = maker.orders.reserved_totals(SYMBOL)
+    accepted, _ = maker.risk_manager.check_orders(
+        SYMBOL,
+        np.concatenate((bids.sizes, asks.sizes)),
+        np.concatenate((bids.prices, asks.prices)),
+        np.arange(len(candidates)) < len(bids),
+        credit=credit
+    )
+    return [order for order, ok in zip(candidates, accepted)
+            if ok and wallet.can_place_order(order["side"], SYMBOL, Decimal(order["amount"]),
+                                             Decimal(order["price"]), credit=credit)]
+
+def make_maker(levels: int) -> MarketMaker:
+    ladder = QuoteLadder(levels, step=Decimal('0.002'), size_curve='linear',
+                         min_size=Decimal('100'), max_size=Decimal('1000'))
+    maker = MarketMaker(Mock(), symbol=SYMBOL, ladder=ladder)
+    maker.symbols.add(SymbolInfo(SYMBOL, 'SZAR', 'USDT', tick_size=Decimal('0.0001'), lot_size=Decimal('1')))
+    wallet = maker.wallet_manager
+    wallet.update_balance('USDT', Decimal('100000'))
+    wallet.update_balance('SZAR', Decimal('1000000'))
+    wallet.update_balance('KAS', Decimal('10'))
+    maker.risk_manager.max_position_size[SYMBOL] = Decimal('10000000')
+    return maker
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000, help="Cycles per measurement")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    book = OrderBook.from_levels(
+        [[f"{0.0950 - i * 0.0001:.4f}", str(1000 + 10 * i)] for i in range(200)],
+        [[f"{0.0952 + i * 0.0001:.4f}", str(1000 + 10 * i)] for i in range(200)],
+        SYMBOL
+    )
+
+    def per_call_us(fn):
+        return min(timeit.repeat(fn, number=args.repeat, repeat=5)) / args.repeat * 1e6
+
+    print(f"{'levels':>6} {'decimal (us)':>13} {'fixed (us)':>11} {'speedup':>8}")
+    for levels in (5, 20, 50, 200):
+        maker = make_maker(levels)
+        wallet = DecimalWallet(maker.wallet_manager)
+        assert decimal_cycle(maker, wallet, book) == maker.calculate_new_orders(book)
+        decimal_us = per_call_us(lambda: decimal_cycle(maker, wallet, book))
+        fixed_us = per_call_us(lambda: maker.calculate_new_orders(book))
+        print(f"{levels:>6} {decimal_us:>13.1f} {fixed_us:>11.1f} {decimal_us / fixed_us:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
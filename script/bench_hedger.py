@@ -0,0 +1,75 @@
+"""Hedger: quote loop time per fill with background hedging vs hedging inline, and fill-to-ack latency
+
+Starts a local mock venue adding --latency seconds (plus up to --jitter)
+to every request and applies --fills fills, each large enough to cross
+the hedge threshold, through PositionTracker.update_position. With the
+Hedger attached the hedge runs as a task and the fill returns at once;
+the inline run awaits the same hedge before the next fill, as the quote
+loop would without a background hedger. Reports time spent in the
+quoting path per fill and the p50/p99 fill detection to acknowledgement
+latency.
+
+    python script/bench_hedger.py --fills 50 --latency 0.02
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.async_api_client import AsyncFameexClient
+from trading.position_tracker import PositionTracker
+from venues import Hedger, MockVenue
+
+SYMBOL = "SZARUSDT"
+
+async def run(url, args, inline):
+    async with AsyncFameexClient("key", "secret", base_url=url) as client:
+        hedger = Hedger.from_venues({"mock": client}, [SYMBOL], thresholds={SYMBOL: "100"}, budget=args.budget)
+        tracker = PositionTracker()
+        hedger.attach(tracker)
+        if inline:
+            tracker.hedger = None  # Hedged below instead
+        blocked = []
+        for i in range(args.fills):
+            started = time.perf_counter()
+            tracker.update_position(SYMBOL, Decimal("150"), Decimal("0.0951"), i % 2 == 0)
+            if inline:
+                hedger._detected[SYMBOL] = time.perf_counter_ns()
+                await hedger.hedge(SYMBOL)
+            blocked.append(time.perf_counter() - started)
+            # Quoting carries on between fills
+            await asyncio.sleep(args.interval)
+        await hedger.close()
+        return blocked, hedger
+
+async def bench(args):
+    async with MockVenue.synthetic(SYMBOL, levels=50, size="1000000", latency=args.latency,
+                                   jitter=args.jitter) as venue:
+        print(f"{'mode':>10} {'quote path us/fill':>19} {'hedges':>7} {'ack p50 ms':>11} {'ack p99 ms':>11} "
+              f"{'over budget':>12}")
+        for name, inline in (("inline", True), ("background", False)):
+            blocked, hedger = await run(venue.url, args, inline)
+            summary = hedger.latency.summary().get(f"hedge.{SYMBOL}", {})
+            print(f"{name:>10} {statistics.mean(blocked) * 1e6:>19.1f} {hedger.stats['hedges']:>7} "
+                  f"{summary.get('p50_us', 0) / 1e3:>11.2f} {summary.get('p99_us', 0) / 1e3:>11.2f} "
+                  f"{hedger.stats['over_budget']:>12}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fills", type=int, default=50, help="Fills applied, each crossing the threshold")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the venue adds per request")
+    parser.add_argument("--jitter", type=float, default=0.005, help="Most extra random seconds per request")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between fills")
+    parser.add_argument("--budget", type=float, default=0.1, help="Hedge latency budget in seconds")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    asyncio.run(bench(args))
+
+if __name__ == "__main__":
+    main()
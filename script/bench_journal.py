@@ -0,0 +1,87 @@
+"""Trading state journal: per-fill latency and restart restore time
+
+Applies fills through PositionTracker.update_position and
+WalletManager.adjust_balance with no journal, with the group-committed
+journal, and with a journal synced after every fill (one fsync per
+trade). Then times opening and restoring a journal of --records fills
+with no snapshot (replaying every record) and with the configured
+snapshot interval (replaying only the records since the last snapshot).
+
+    python script/bench_journal.py --fills 5000 --records 1050000
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import JOURNAL_SNAPSHOT_EVERY
+from trading.journal import Journal
+from trading.position_tracker import PositionTracker
+from trading.wallet_manager import WalletManager
+from utils.latency import LatencyHistogram
+
+def fill_latency(fills: int, mode: str, directory: str) -> LatencyHistogram:
+    tracker, wallet = PositionTracker(), WalletManager()
+    journal = None
+    if mode != "none":
+        journal = Journal(directory)
+        journal.attach(tracker, wallet)
+    histogram = LatencyHistogram()
+    price, amount = Decimal("0.0951"), Decimal("100")
+    for i in range(fills):
+        t0 = time.perf_counter_ns()
+        is_buy = i % 2 == 0
+        tracker.update_position("SZARUSDT", amount, price, is_buy)
+        wallet.adjust_balance("SZAR", amount if is_buy else -amount)
+        if mode == "fsync each":
+            journal.sync()
+        histogram.record(time.perf_counter_ns() - t0)
+        time.sleep(0.0002)  # The loop would be waiting on the venue here
+    if journal is not None:
+        journal.close()
+    return histogram
+
+def restore_time(records: int, snapshot_every: int, directory: str):
+    journal = Journal(directory, snapshot_every=snapshot_every)
+    symbols = [f"SYM{i}USDT" for i in range(20)]
+    chunk = 10000
+    for start in range(0, records, chunk):
+        for i in range(start, min(start + chunk, records)):
+            journal.fill(symbols[i % len(symbols)], 100, 951, i % 3 != 0)
+        journal.sync()
+    journal.close()
+
+    started = time.perf_counter()
+    restored = Journal(directory)
+    restored.attach(PositionTracker(), WalletManager())
+    elapsed = time.perf_counter() - started
+    restored.close()
+    return elapsed, restored.stats['replayed']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fills", type=int, default=5000, help="Fills per journaling mode")
+    parser.add_argument("--records", type=int, default=1050000, help="Fills in the journal to restore")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    root = tempfile.mkdtemp(prefix="bench_journal_")
+
+    print(f"{'journal':>12} {'p50 (us)':>9} {'p99 (us)':>9} {'p999 (us)':>10} {'max (us)':>10}")
+    for mode in ("none", "grouped", "fsync each"):
+        histogram = fill_latency(args.fills, mode, os.path.join(root, mode.replace(" ", "_")))
+        q = histogram.quantiles((0.5, 0.99, 0.999))
+        print(f"{mode:>12} {q[0.5] / 1e3:>9.1f} {q[0.99] / 1e3:>9.1f} {q[0.999] / 1e3:>10.1f} "
+              f"{histogram.max / 1e3:>10.1f}")
+
+    print(f"\n{'restore':>12} {'replayed':>9} {'time (ms)':>10}")
+    for label, snapshot_every in (("no snapshot", args.records + 1), ("snapshot", JOURNAL_SNAPSHOT_EVERY)):
+        elapsed, replayed = restore_time(args.records, snapshot_every, os.path.join(root, label.replace(" ", "_")))
+        print(f"{label:>12} {replayed:>9} {elapsed * 1e3:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Ladder recompute cost: per-level Decimal loop vs vectorized QuoteLadder
+
+The loop path prices and sizes each level with SymbolInfo.quantize_price /
+quantize_size, the way single-level quoting did before ladders.
+
+    python script/bench_ladder.py --repeat 2000
+"""
+import argparse
+import os
+import sys
+import timeit
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_data.order_book import OrderBook
+from trading.ladder import QuoteLadder
+from trading.symbols import SymbolInfo
+
+def decimal_ladder(info: SymbolInfo, bid: Decimal, ask: Decimal, levels: int, step: Decimal,
+                   min_size: Decimal, max_size: Decimal) -> list:
+    orders = []
+    for side, touch, direction in ((1, bid, -1), (2, ask, 1)):
+        for k in range(levels):
+            price = info.quantize_price(touch * (1 + direction * step * k), side)
+            size = min_size + (max_size - min_size) * k / max(levels - 1, 1)
+            orders.append((side, price, info.quantize_size(size)))
+    return orders
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000, help="Recomputes per measurement")
+    args = parser.parse_args()
+
+    info = SymbolInfo('SZARUSDT', 'SZAR', 'USDT', tick_size=Decimal('0.0001'), lot_size=Decimal('1'))
+    bid, ask = Decimal('0.0931'), Decimal('0.0971')
+    book = OrderBook.from_levels(
+        [[f"{0.0950 - i * 0.0001:.4f}", str(1000 + 10 * i)] for i in range(200)],
+        [[f"{0.0952 + i * 0.0001:.4f}", str(1000 + 10 * i)] for i in range(200)]
+    )
+
+    def per_call_us(fn):
+        return min(timeit.repeat(fn, number=args.repeat, repeat=5)) / args.repeat * 1e6
+
+    print(f"{'levels':>6} {'decimal (us)':>13} {'build (us)':>11} {'depth (us)':>11} {'+orders (us)':>13}")
+    for levels in (5, 20, 50, 200):
+        linear = QuoteLadder(levels, step=Decimal('0.002'), size_curve='linear',
+                             min_size=Decimal('100'), max_size=Decimal('1000'))
+        depth = QuoteLadder(levels, step=Decimal('0.002'), size_curve='depth',
+                            min_size=Decimal('100'), max_size=Decimal('1000'))
+
+        decimal_us = per_call_us(lambda: decimal_ladder(
+            info, bid, ask, levels, Decimal('0.002'), Decimal('100'), Decimal('1000')))
+        build_us = per_call_us(lambda: linear.build(bid, ask, info))
+        depth_us = per_call_us(lambda: depth.build(bid, ask, info, book))
+        orders_us = per_call_us(lambda: QuoteLadder.to_orders('SZARUSDT', linear.build(bid, ask, info)))
+        print(f"{levels:>6} {decimal_us:>13.1f} {build_us:>11.1f} {depth_us:>11.1f} {orders_us:>13.1f}")
+
+if __name__ == "__main__":
+    main()
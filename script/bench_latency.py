@@ -0,0 +1,57 @@
+"""Latency instrumentation overhead: per-span cost and quote cycle cost
+
+Times an empty span with tracking disabled and enabled, then one
+calculate_new_orders cycle (which opens two spans) under both settings.
+
+    python script/bench_latency.py --repeat 2000
+"""
+import argparse
+import logging
+import os
+import sys
+import timeit
+from decimal import Decimal
+from unittest.mock import Mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_data.order_book import OrderBook
+from market_maker import MarketMaker
+from utils.latency import LatencyRecorder
+
+SYMBOL = 'SZARUSDT'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000, help="Cycles per measurement")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    book = OrderBook.from_levels(
+        [[f"{0.0950 - i * 0.0001:.4f}", str(1000 + 10 * i)] for i in range(50)],
+        [[f"{0.0952 + i * 0.0001:.4f}", str(1000 + 10 * i)] for i in range(50)],
+        SYMBOL
+    )
+
+    def per_call_ns(fn, number):
+        return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e9
+
+    def empty_span(recorder):
+        with recorder.span("span"):
+            pass
+
+    print(f"{'':>24} {'disabled':>10} {'enabled':>10}")
+    recorders = (LatencyRecorder(enabled=False), LatencyRecorder(enabled=True))
+    span_ns = [per_call_ns(lambda: empty_span(recorder), args.repeat * 100) for recorder in recorders]
+    print(f"{'empty span (ns)':>24} {span_ns[0]:>10.0f} {span_ns[1]:>10.0f}")
+
+    cycle_us = []
+    for recorder in recorders:
+        maker = MarketMaker(Mock(), symbol=SYMBOL, latency=recorder)
+        for asset, amount in (('USDT', '100000'), ('SZAR', '1000000'), ('KAS', '10')):
+            maker.wallet_manager.update_balance(asset, Decimal(amount))
+        cycle_us.append(per_call_ns(lambda: maker.calculate_new_orders(book), args.repeat) / 1e3)
+    print(f"{'quote cycle (us)':>24} {cycle_us[0]:>10.1f} {cycle_us[1]:>10.1f}")
+
+if __name__ == "__main__":
+    main()
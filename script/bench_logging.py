@@ -0,0 +1,89 @@
+"""Log-heavy quote cycles: synchronous handlers vs the async log pipeline
+
+Each cycle applies a few fills through PositionTracker.update_position and
+WalletManager.adjust_balance/update_balance, which log every trade and
+balance change. Cycle latency is collected into a histogram for each
+mode; --fsync makes every file flush an fsync, standing in for a slow or
+busy disk. --gap idles between cycles the way a live loop waits on the
+venue; with no gap the log thread competes with the loop for the GIL on
+every cycle.
+
+    python script/bench_logging.py --cycles 5000 --fsync --gap 0.001
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trading.position_tracker import PositionTracker
+from trading.wallet_manager import WalletManager
+from utils.latency import LatencyHistogram
+from utils.logger import _handlers, disable_async_logging, enable_async_logging, setup_logger
+
+LOGGERS = ("position_tracker", "wallet_manager")
+
+class FsyncStream:
+    """File stream wrapper that fsyncs on every flush"""
+    def __init__(self, stream):
+        self.stream = stream
+
+    def flush(self):
+        self.stream.flush()
+        os.fsync(self.stream.fileno())
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+def run(cycles: int, fills: int, fsync: bool, gap: float, use_async: bool):
+    for name in LOGGERS:
+        setup_logger(name, log_to_console=False)
+        if fsync:
+            for handler in _handlers[name]:
+                handler.stream = FsyncStream(handler.stream)
+    pipeline = enable_async_logging() if use_async else None
+
+    tracker = PositionTracker()
+    wallet = WalletManager()
+    histogram = LatencyHistogram()
+    price, amount = Decimal("0.0951"), Decimal("100")
+    started = time.perf_counter()
+    for cycle in range(cycles):
+        t0 = time.perf_counter_ns()
+        for fill in range(fills):
+            is_buy = (cycle + fill) % 2 == 0
+            tracker.update_position("SZARUSDT", amount, price, is_buy)
+            wallet.adjust_balance("SZAR", amount if is_buy else -amount)
+        wallet.update_balance("USDT", Decimal(10000 + cycle))
+        histogram.record(time.perf_counter_ns() - t0)
+        if gap:
+            time.sleep(gap)
+    elapsed = time.perf_counter() - started
+    stats = dict(pipeline.stats) if pipeline else None
+    disable_async_logging()
+    drained = time.perf_counter() - started
+    return histogram, elapsed, drained, stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=5000, help="Cycles per mode")
+    parser.add_argument("--fills", type=int, default=3, help="Fills (log lines) per cycle")
+    parser.add_argument("--fsync", action="store_true", help="fsync every file flush")
+    parser.add_argument("--gap", type=float, default=0.0, help="Seconds idle between cycles")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_logging_"))
+    print(f"{'mode':>6} {'p50 (us)':>9} {'p99 (us)':>9} {'p999 (us)':>10} {'max (us)':>10} "
+          f"{'loop (s)':>9} {'drained (s)':>12} {'dropped':>8}")
+    for use_async in (False, True):
+        histogram, elapsed, drained, stats = run(args.cycles, args.fills, args.fsync, args.gap, use_async)
+        q = histogram.quantiles((0.5, 0.99, 0.999))
+        print(f"{'async' if use_async else 'sync':>6} {q[0.5] / 1e3:>9.1f} {q[0.99] / 1e3:>9.1f} "
+              f"{q[0.999] / 1e3:>10.1f} {histogram.max / 1e3:>10.1f} {elapsed:>9.3f} {drained:>12.3f} "
+              f"{stats['dropped'] if stats else '-':>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Quoting throughput for many symbols: sequential MarketMakers vs MultiSymbolRunner
+
+Sequential runs each symbol's sync MarketMaker.step() in turn, like one
+loop per market. The runner schedules every symbol on one event loop over
+a shared AsyncFameexClient. Both hit a local mock server with injected
+per-request latency and an unthrottled rate limiter.
+
+    python script/bench_multi_symbol.py --symbols 12 48 --cycles 5 --latency 0.02
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.api_client import FameexClient
+from config.async_api_client import AsyncFameexClient
+from config.rate_limiter import RateLimiter
+from market_maker import MarketMaker
+from multi_market_maker import MultiSymbolRunner
+from tests.utils.mock_exchange_server import MockExchangeServer
+
+def _unthrottled() -> RateLimiter:
+    """Limiter that never waits, so only scheduling and transport are measured"""
+    return RateLimiter({"order": (10**9, 1.0), "market_data": (10**9, 1.0)})
+
+def bench_sequential(url: str, symbols: list, cycles: int) -> float:
+    client = FameexClient("bench", "bench", base_url=url, rate_limiter=_unthrottled())
+    makers = [MarketMaker(client, symbol=symbol) for symbol in symbols]
+    start = time.perf_counter()
+    for _ in range(cycles):
+        for maker in makers:
+            maker.step()
+    return time.perf_counter() - start
+
+async def bench_runner(url: str, symbols: list, cycles: int) -> float:
+    async with AsyncFameexClient("bench", "bench", base_url=url, pool_size=64,
+                                 rate_limiter=_unthrottled()) as client:
+        runner = MultiSymbolRunner.from_config(client, {symbol: {} for symbol in symbols},
+                                               refresh_interval=0, max_concurrency=64)
+        for maker in runner.makers.values():
+            maker.load_kline_volatility_async = lambda: asyncio.sleep(0)  # Not part of the quote loop
+        start = time.perf_counter()
+        await runner.run(max_cycles=cycles)
+        return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[12, 48], help="Symbol counts")
+    parser.add_argument("--cycles", type=int, default=5, help="Quoting cycles per symbol")
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock server latency (s)")
+    args = parser.parse_args()
+
+    print(f"{'symbols':>8} {'sequential (cyc/s)':>19} {'runner (cyc/s)':>15} {'speedup':>8}")
+    with MockExchangeServer(latency=args.latency) as server:
+        for count in args.symbols:
+            symbols = [f"SYM{i:03d}USDT" for i in range(count)]
+            total = count * args.cycles
+            sequential = total / bench_sequential(server.url, symbols, args.cycles)
+            concurrent = total / asyncio.run(bench_runner(server.url, symbols, args.cycles))
+            print(f"{count:>8} {sequential:>19.1f} {concurrent:>15.1f} {concurrent / sequential:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
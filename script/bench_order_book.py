@@ -0,0 +1,77 @@
+"""Per-cycle cost: list-of-strings order book vs array-backed OrderBook
+
+Each cycle applies one level change and then answers the queries the quote
+loop and test_cli need: best bid/ask, mid, microprice, depth at a price and
+total depth per side. The list path re-parses strings into Decimal like
+calculate_new_orders and _log_order_book_details do today.
+
+    python script/bench_order_book.py --cycles 2000
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_data.order_book import OrderBook, BIDS, ASKS
+
+def make_levels(depth: int):
+    bids = [[f"{0.0950 - i * 0.0001:.4f}", str(random.randint(100, 5000))] for i in range(depth)]
+    asks = [[f"{0.0952 + i * 0.0001:.4f}", str(random.randint(100, 5000))] for i in range(depth)]
+    return bids, asks
+
+def list_cycle(order_book: dict, level: int, size: str) -> tuple:
+    bids, asks = order_book['bids'], order_book['asks']
+    bids[level][1] = size  # Venue delivers a fresh list; the update itself is free here
+    best_bid = Decimal(bids[0][0])
+    best_ask = Decimal(asks[0][0])
+    mid = (best_bid + best_ask) / 2
+    bid_size, ask_size = Decimal(bids[0][1]), Decimal(asks[0][1])
+    microprice = (best_bid * ask_size + best_ask * bid_size) / (bid_size + ask_size)
+    target = Decimal(bids[level][0])
+    depth_at = next((Decimal(q) for p, q in bids if Decimal(p) == target), Decimal('0'))
+    total_bids = sum(Decimal(q) for _, q in bids)
+    total_asks = sum(Decimal(q) for _, q in asks)
+    return mid, microprice, depth_at, total_bids, total_asks
+
+def book_cycle(book: OrderBook, price: str, size: str) -> tuple:
+    book.update(BIDS, price, size)
+    book.best_bid()
+    book.best_ask()
+    mid = book.mid()
+    microprice = book.microprice()
+    depth_at = book.depth_at(BIDS, price)
+    total_bids = book.cumulative_depth(BIDS)
+    total_asks = book.cumulative_depth(ASKS)
+    return mid, microprice, depth_at, total_bids, total_asks
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=2000, help="Cycles per measurement")
+    args = parser.parse_args()
+
+    print(f"{'levels':>7} {'list (us)':>12} {'OrderBook (us)':>15} {'speedup':>8}")
+    for depth in (5, 100, 1000):
+        random.seed(depth)
+        bids, asks = make_levels(depth)
+        order_book = {'bids': [list(l) for l in bids], 'asks': [list(l) for l in asks]}
+        book = OrderBook.from_levels(bids, asks)
+        updates = [(random.randrange(depth), str(random.randint(100, 5000))) for _ in range(args.cycles)]
+
+        def run_list():
+            for level, size in updates:
+                list_cycle(order_book, level, size)
+
+        def run_book():
+            for level, size in updates:
+                book_cycle(book, bids[level][0], size)
+
+        list_us = min(timeit.repeat(run_list, number=1, repeat=3)) / args.cycles * 1e6
+        book_us = min(timeit.repeat(run_book, number=1, repeat=3)) / args.cycles * 1e6
+        print(f"{depth:>7} {list_us:>12.2f} {book_us:>15.2f} {list_us / book_us:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""OrderManager operation cost as the number of resting orders grows
+
+Times lookups by id and by price level, fills, cancels and one
+reconciliation diff against a full open-orders listing, for books of
+increasing size. Per-operation cost should stay flat; reconciliation is
+linear in the listing.
+
+    python script/bench_orders.py --orders 100 1000 10000
+"""
+import argparse
+import os
+import sys
+import time
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trading.orders import OrderManager
+from trading.wallet_manager import WalletManager
+
+SYMBOL = "SZARUSDT"
+
+def build(count: int) -> OrderManager:
+    manager = OrderManager(WalletManager(), grace=0, limit=count + 1)
+    for i in range(count):
+        side = 1 if i % 2 == 0 else 2
+        price = Decimal(9000 - i) / 100000 if side == 1 else Decimal(10000 + i) / 100000
+        manager.add(str(i), SYMBOL, {"symbol": SYMBOL, "side": side, "orderType": 1,
+                                     "price": str(price), "amount": "100"})
+    return manager
+
+def per_op(func, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - started) / len(items) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, nargs="+", default=[100, 1000, 10000], help="Resting order counts")
+    args = parser.parse_args()
+
+    print(f"{'orders':>7} {'get us':>7} {'level us':>9} {'fill us':>8} {'cancel us':>10} {'reconcile ms':>13}")
+    for count in args.orders:
+        manager = build(count)
+        ids = [str(i) for i in range(0, count, max(1, count // 1000))]
+        levels = [(manager.get(i).side, manager.get(i).price) for i in ids]
+        get = per_op(manager.get, ids)
+        level = per_op(lambda lv: manager.at_level(SYMBOL, *lv), levels)
+        fill = per_op(lambda i: manager.on_fill(i, Decimal("10")), ids)
+        listing = [{"orderId": order_id, "side": o.side, "price": str(o.price), "origQty": "100",
+                    "executedQty": "10"} for order_id, o in manager.orders.items()]
+        # Drop a tenth of the orders and add as many unknown ones
+        listing = listing[count // 10:] + [{"orderId": f"x{i}", "side": "BUY", "price": "0.01",
+                                            "origQty": "1", "executedQty": "0"} for i in range(count // 10)]
+        started = time.perf_counter()
+        manager.reconcile(SYMBOL, listing)
+        reconcile = (time.perf_counter() - started) * 1000
+        remaining = [i for i in ids if i in manager]
+        cancel = per_op(manager.on_cancel, remaining) if remaining else 0.0
+        print(f"{count:>7} {get:>7.2f} {level:>9.2f} {fill:>8.2f} {cancel:>10.2f} {reconcile:>13.2f}")
+
+if __name__ == "__main__":
+    main()
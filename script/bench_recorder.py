@@ -0,0 +1,83 @@
+"""Reading recorded depth: JSON lines vs memory-mapped int64 columns
+
+Writes the same depth snapshots both as JSONL (what logging the REST
+responses would give) and through the recorder's columnar store, then
+times loading them into numeric arrays and summing bid size.
+
+    python script/bench_recorder.py --snapshots 10000 --levels 50
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_data.columnar import MarketDataStore, day_of
+from market_data.order_book import to_scaled
+from market_data.recorder import depth_rows
+
+START = 1700006400000  # Midnight UTC
+
+def snapshots(count: int, levels: int):
+    rng = random.Random(3)
+    for i in range(count):
+        mid = 950 + rng.randint(-5, 5)
+        yield {'data': {
+            'bids': [[f"{(mid - 1 - k) / 10000:.4f}", str(rng.randint(1, 5000))] for k in range(levels)],
+            'asks': [[f"{(mid + 1 + k) / 10000:.4f}", str(rng.randint(1, 5000))] for k in range(levels)],
+            'timestamp': START + i * 1000,
+        }}
+
+def read_json(path: str) -> int:
+    total = 0
+    with open(path) as f:
+        for line in f:
+            for price, size in json.loads(line)['data']['bids']:
+                to_scaled(price, 8)
+                total += to_scaled(size, 8)
+    return total
+
+def read_columnar(root: str) -> int:
+    depth = MarketDataStore(root).open('SZARUSDT', 'depth', day_of(START))
+    return int(depth['size'][depth['side'] == 0].sum())
+
+def read_range(root: str) -> int:
+    depth = MarketDataStore(root).open('SZARUSDT', 'depth', day_of(START))
+    return len(depth.between(START + 3_600_000, START + 3_660_000)['ts'])  # One minute
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--snapshots", type=int, default=10000, help="Depth snapshots (1/s)")
+    parser.add_argument("--levels", type=int, default=50, help="Levels per side")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'depth.jsonl')
+        store = MarketDataStore(os.path.join(tmp, 'store'))
+        with open(json_path, 'w') as f:
+            for seq, snapshot in enumerate(snapshots(args.snapshots, args.levels)):
+                f.write(json.dumps(snapshot) + '\n')
+                store.append('SZARUSDT', 'depth', depth_rows(snapshot, 0, seq))
+        store.close()
+        rows = args.snapshots * args.levels * 2
+
+        print(f"{args.snapshots} snapshots, {rows} level rows "
+              f"(a day at 1 snapshot/s is {86400 / args.snapshots:.1f}x this)")
+        print(f"{'reader':<24} {'seconds':>8} {'rows/s':>12} {'per day (s)':>12}")
+        for name, read in (("json lines", lambda: read_json(json_path)),
+                           ("mmap columns", lambda: read_columnar(os.path.join(tmp, 'store')))):
+            started = time.perf_counter()
+            read()
+            seconds = time.perf_counter() - started
+            print(f"{name:<24} {seconds:>8.4f} {rows / seconds:>12.0f} "
+                  f"{seconds * 86400 / args.snapshots:>12.3f}")
+        started = time.perf_counter()
+        read_range(os.path.join(tmp, 'store'))
+        print(f"{'mmap 1-minute seek':<24} {time.perf_counter() - started:>8.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Order placement throughput and overcommit under concurrent submitters
+
+Runs many asyncio market makers that share one wallet and order store,
+each requoting a ladder every cycle against a fake venue with a fixed
+round-trip latency. The shared quote balance covers only part of the
+combined ladders, so submitters compete for it. The venue counts every
+request after which the orders resting on it need more than the account
+holds.
+
+Compares placement with reserve-on-submit against sending every quote
+unreserved, as MarketMaker did before reservations.
+
+    python script/bench_reservations.py --submitters 50 --cycles 40 --latency 0.002
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_maker import MarketMaker
+from trading.orders import OrderManager
+from trading.wallet_manager import WalletManager
+
+class FakeVenue:
+    """Async client stand-in that tracks what its resting orders commit"""
+    supports_batch_orders = True
+    max_batch_size = 10
+
+    def __init__(self, wallet: WalletManager, latency: float):
+        self.wallet = wallet
+        self.latency = latency
+        self.resting = {}
+        self.committed = {}
+        self.placed = 0
+        self.overcommits = 0
+        self._next_id = 0
+
+    def _commit(self, asset: str, amount: Decimal) -> None:
+        self.committed[asset] = self.committed.get(asset, Decimal('0')) + amount
+
+    async def cancel_replace(self, symbol, cancel_ids, new_orders):
+        await asyncio.sleep(self.latency)
+        canceled = []
+        for order_id in cancel_ids:
+            asset, amount = self.resting.pop(order_id)
+            self._commit(asset, -amount)
+            canceled.append({'orderId': order_id})
+        placed = []
+        base, quote = self.wallet.symbols.assets(symbol)
+        for order in new_orders:
+            self._next_id += 1
+            volume, price = Decimal(order['volume']), Decimal(order['price'])
+            commitment = (quote, volume * price) if order['side'] == 1 else (base, volume)
+            self.resting[str(self._next_id)] = commitment
+            self._commit(*commitment)
+            placed.append({'code': 200, 'data': {'orderId': str(self._next_id)}})
+        self.placed += len(placed)
+        if any(amount > self.wallet.get_balance(asset)
+               for asset, amount in self.committed.items()):
+            self.overcommits += 1
+        return {'canceled': canceled, 'placed': placed}
+
+def ladder(symbol: str, cycle: int, levels: int):
+    # Prices move every cycle so every quote is cancelled and replaced
+    offset = Decimal(cycle % 2) / 10000
+    orders = []
+    for level in range(levels):
+        step = Decimal(level) / 1000
+        orders.append({"symbol": symbol, "side": 1, "orderType": 1,
+                       "price": str(Decimal("0.0950") - step - offset), "amount": "100"})
+        orders.append({"symbol": symbol, "side": 2, "orderType": 1,
+                       "price": str(Decimal("0.1050") + step + offset), "amount": "100"})
+    return orders
+
+async def unreserved(maker: MarketMaker, new_orders):
+    """Requote as before reservations: send the whole plan, record the result"""
+    plan = maker._plan_quotes(new_orders)
+    if plan.is_empty:
+        return
+    result = await maker.client.cancel_replace(
+        maker.symbol, plan.cancel_ids, [maker._order_params(order) for order in plan.place]
+    )
+    for order_id, canceled in zip(plan.cancel_ids, result['canceled']):
+        if canceled is not None:
+            maker.orders.on_cancel(order_id)
+    for order, placed in zip(plan.place, result['placed']):
+        maker.orders.add(maker._extract_order_id(placed), maker.symbol, order)
+
+async def run(submitters: int, cycles: int, levels: int, latency: float, funding: float, reserve: bool):
+    wallet = WalletManager()
+    symbols = [f"T{i}USDT" for i in range(submitters)]
+    # Enough quote for ``funding`` of every submitter's bids
+    bid_notional = sum(Decimal(o["price"]) * 100 for o in ladder(symbols[0], 0, levels) if o["side"] == 1)
+    wallet.update_balance("USDT", bid_notional * submitters * Decimal(str(funding)))
+    for symbol in symbols:
+        wallet.update_balance(symbol[:-4], Decimal(100 * levels))
+    venue = FakeVenue(wallet, latency)
+    orders = OrderManager(wallet)
+    makers = [MarketMaker(venue, symbol=symbol, wallet_manager=wallet, order_manager=orders) for symbol in symbols]
+
+    async def submit(maker: MarketMaker):
+        for cycle in range(cycles):
+            quotes = ladder(maker.symbol, cycle, levels)
+            if reserve:
+                await maker.replace_quotes_async(quotes)
+            else:
+                await unreserved(maker, quotes)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(submit(maker) for maker in makers))
+    elapsed = time.perf_counter() - started
+    return venue.placed, elapsed, venue.overcommits, orders.stats['unfunded']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submitters", type=int, default=50, help="Concurrent market makers")
+    parser.add_argument("--cycles", type=int, default=40, help="Requotes per submitter")
+    parser.add_argument("--levels", type=int, default=5, help="Quote levels per side")
+    parser.add_argument("--latency", type=float, default=0.002, help="Venue round trip in seconds")
+    parser.add_argument("--funding", type=float, default=0.6,
+                        help="Share of all bids the quote balance covers")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'mode':>10} {'placed':>8} {'orders/s':>10} {'unfunded':>9} {'overcommits':>12}")
+    for reserve in (False, True):
+        placed, elapsed, overcommits, unfunded = asyncio.run(run(
+            args.submitters, args.cycles, args.levels, args.latency, args.funding, reserve))
+        mode = "reserved" if reserve else "unreserved"
+        print(f"{mode:>10} {placed:>8} {placed / elapsed:>10.0f} {unfunded:>9} {overcommits:>12}")
+
+if __name__ == "__main__":
+    main()
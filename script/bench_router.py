@@ -0,0 +1,79 @@
+"""Smart order router: sequential vs concurrent venue calls, single-venue vs routed fills
+
+Starts --venues local mock venues, each adding --latency seconds (plus up
+to --jitter) to every request, and times fetching every book one venue
+after another against SmartOrderRouter.refresh. Then compares the
+fee-inclusive cost of buying --amount on the first venue alone with the
+router's split across all of them; the venues' books are offset from one
+another and their taker fees differ, as they would across real venues.
+
+    python script/bench_router.py --venues 4 --latency 0.05 --amount 5000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.async_api_client import AsyncFameexClient
+from venues import MockVenue, SmartOrderRouter, Venue
+
+SYMBOL = "SZARUSDT"
+
+async def bench(args):
+    mocks = [MockVenue.synthetic(SYMBOL, mid=Decimal("0.0951") + Decimal("0.0001") * (i % 3),
+                                 latency=args.latency, jitter=args.jitter)
+             for i in range(args.venues)]
+    for mock in mocks:
+        await mock.start()
+    clients = [AsyncFameexClient("key", "secret", base_url=mock.url) for mock in mocks]
+    venues = [Venue(f"venue{i}", client, maker_fee=0, taker_fee=Decimal("0.0005") * (i % 3))
+              for i, client in enumerate(clients)]
+    router = SmartOrderRouter(venues, SYMBOL, timeout=10)
+    try:
+        sequential, concurrent = [], []
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            for venue in venues:
+                await router._fetch_book(venue)
+            sequential.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            await router.refresh()
+            concurrent.append(time.perf_counter() - started)
+        print(f"book refresh across {args.venues} venues ({args.rounds} rounds, median)")
+        print(f"  sequential {statistics.median(sequential) * 1e3:8.1f} ms")
+        print(f"  concurrent {statistics.median(concurrent) * 1e3:8.1f} ms")
+
+        single = SmartOrderRouter(venues[:1], SYMBOL)
+        alone = single.plan("BUY", args.amount)
+        routed = router.plan("BUY", args.amount)
+        print(f"buying {args.amount} {SYMBOL} (fee-inclusive quote paid)")
+        for name, legs in (("venue0 only", alone), ("routed", routed)):
+            filled = sum(leg.amount for leg in legs)
+            cost = sum(leg.cost for leg in legs)
+            average = cost / filled if filled else Decimal(0)
+            print(f"  {name:<12} filled {filled:>10} cost {cost:>14.6f} avg {average:.8f} legs {len(legs)}")
+    finally:
+        for client in clients:
+            await client.close()
+        for mock in mocks:
+            await mock.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--venues", type=int, default=4, help="Mock venues to route across")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds each venue adds per request")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Most extra random seconds per request")
+    parser.add_argument("--rounds", type=int, default=10, help="Refreshes timed each way")
+    parser.add_argument("--amount", default="5000", help="Size bought in the routing comparison")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    asyncio.run(bench(args))
+
+if __name__ == "__main__":
+    main()
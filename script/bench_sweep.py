@@ -0,0 +1,62 @@
+"""Parameter sweep scaling: configurations per second by worker count
+
+Generates a synthetic SZARUSDT recording (see bench_backtest.py), saves
+it once as a memory-mapped event log and sweeps a spread x volatility
+multiplier grid with 1, 2, 4, ... worker processes up to the core count.
+Speedup is relative to a single in-process worker.
+
+    python script/bench_sweep.py --messages 50000 --configs 16
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest import ParameterSweep, load_events
+from bench_backtest import write_recording
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50000, help="Recorded messages to generate")
+    parser.add_argument("--configs", type=int, default=16, help="Configurations per sweep (rounded to a grid)")
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1, help="Largest pool to time")
+    args = parser.parse_args()
+
+    spreads = max(1, args.configs // 4)
+    grid = {
+        'spread_percentage': [round(0.0002 * (i + 1), 6) for i in range(spreads)],
+        'volatility_multiplier': [0, 0.5, 1, 2][:max(1, args.configs // spreads)],
+    }
+    counts, processes = [], 1
+    while processes < args.max_processes:
+        counts.append(processes)
+        processes *= 2
+    counts.append(args.max_processes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "szarusdt.jsonl")
+        write_recording(path, args.messages)
+        directory = os.path.join(tmp, "events")
+        events = load_events(path)
+        events.save(directory)
+        print(f"{len(events)} events, {len(ParameterSweep(directory, grid).configs)} configurations, "
+              f"{os.cpu_count()} cores")
+        print(f"{'processes':>9} {'seconds':>8} {'configs/s':>10} {'speedup':>8} {'efficiency':>10}")
+
+        baseline = None
+        for count in counts:
+            sweep = ParameterSweep(directory, grid, processes=count, requote_interval=1.0)
+            started = time.perf_counter()
+            rows = sweep.run()
+            seconds = time.perf_counter() - started
+            baseline = baseline or seconds
+            speedup = baseline / seconds
+            print(f"{count:>9} {seconds:>8.2f} {len(rows) / seconds:>10.2f} {speedup:>7.2f}x "
+                  f"{speedup / count:>10.0%}")
+        print(sweep.table(rows, top=5))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Trade history: list of string dicts vs the bounded column store with running aggregates
+
+Applies --fills fills through PositionTracker.update_position and
+through the previous implementation (a dict of strings appended per
+fill), reporting time per fill and memory held afterwards. Then times a
+VWAP/realized-PnL query: O(1) from the running aggregates, against a
+scan of the stored dicts.
+
+    python script/bench_trade_history.py --fills 200000 --history 100000
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trading.position_tracker import PositionTracker
+from utils.fixed_point import FixedPoint
+
+SYMBOL = "SZARUSDT"
+
+class DictTracker:
+    """The previous PositionTracker trade list"""
+    def __init__(self):
+        self.scale = FixedPoint(8)
+        self.positions = {}
+        self.trades = []
+
+    def update_position(self, symbol, amount, price, is_buy):
+        delta = self.scale.to_int(amount)
+        position = self.positions.get(symbol, 0) + (delta if is_buy else -delta)
+        self.positions[symbol] = position
+        self.trades.append({
+            'symbol': symbol,
+            'amount': str(amount),
+            'price': str(price),
+            'side': 'buy' if is_buy else 'sell',
+            'position_after': self.scale.to_str(position)
+        })
+
+    def vwap(self, symbol):
+        volume = notional = Decimal(0)
+        for trade in self.trades:
+            if trade['symbol'] == symbol:
+                amount = Decimal(trade['amount'])
+                volume += amount
+                notional += amount * Decimal(trade['price'])
+        return notional / volume
+
+def fills(count):
+    for i in range(count):
+        yield Decimal(10 + i % 7), Decimal("0.09") + Decimal(i % 50) / 10000, i % 3 != 0
+
+def run(make_tracker, count):
+    tracker = make_tracker()
+    started = time.perf_counter()
+    for amount, price, is_buy in fills(count):
+        tracker.update_position(SYMBOL, amount, price, is_buy)
+    per_fill = (time.perf_counter() - started) / count * 1e6
+    started = time.perf_counter()
+    tracker.vwap(SYMBOL)
+    query = (time.perf_counter() - started) * 1e3
+
+    # Memory in a separate pass; tracing slows every allocation
+    tracemalloc.start()
+    tracker = make_tracker()
+    for amount, price, is_buy in fills(count):
+        tracker.update_position(SYMBOL, amount, price, is_buy)
+    held = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    return per_fill, held, query
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fills", type=int, default=200000, help="Fills applied")
+    parser.add_argument("--history", type=int, default=100000, help="Fills the column store keeps")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'store':>8} {'us/fill':>8} {'held (MiB)':>11} {'vwap query (ms)':>16}")
+    for name, make_tracker in (("dicts", DictTracker),
+                               ("columns", lambda: PositionTracker(history_size=args.history))):
+        per_fill, held, query = run(make_tracker, args.fills)
+        print(f"{name:>8} {per_fill:>8.2f} {held:>11.1f} {query:>16.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Per-tick cost of volatility: list + statistics.stdev vs streaming estimator
+
+The list path is the old MarketMaker.calculate_volatility: append, pop(0)
+and recompute the stdev of every return in the history on each tick.
+
+    python script/bench_volatility.py --ticks 2000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import timeit
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trading.volatility import VolatilityEstimator
+
+def list_tick(history: list, price: float, length: int) -> Decimal:
+    history.append(price)
+    if len(history) > length:
+        history.pop(0)
+    returns = [(history[i] - history[i - 1]) / history[i - 1] for i in range(1, len(history))]
+    return Decimal(str(statistics.stdev(returns))) if len(returns) > 1 else Decimal('0.01')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=2000, help="Ticks per measurement")
+    args = parser.parse_args()
+
+    print(f"{'history':>8} {'list (us)':>12} {'streaming (us)':>15} {'speedup':>8}")
+    for length in (100, 1000, 10000):
+        random.seed(length)
+        price, prices = 0.095, []
+        for _ in range(length + args.ticks):
+            price *= 1 + random.gauss(0, 0.002)
+            prices.append(price)
+        warmup, ticks = prices[:length], prices[length:]
+
+        history = list(warmup)
+        estimator = VolatilityEstimator(windows=(length,), ewma_alpha=0.06)
+        for p in warmup:
+            estimator.update(p)
+
+        def run_list():
+            for p in ticks:
+                list_tick(history, p, length)
+
+        def run_streaming():
+            for p in ticks:
+                estimator.update(p)
+                estimator.get_volatility()
+
+        list_us = min(timeit.repeat(run_list, number=1, repeat=3)) / args.ticks * 1e6
+        stream_us = min(timeit.repeat(run_streaming, number=1, repeat=3)) / args.ticks * 1e6
+        print(f"{length:>8} {list_us:>12.2f} {stream_us:>15.2f} {list_us / stream_us:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
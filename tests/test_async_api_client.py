@@ -0,0 +1,78 @@
+import time
+import pytest
+from config.api_client import FameexClient
+from config.async_api_client import AsyncFameexClient
+from tests.utils.mock_exchange_server import MockExchangeServer
+
+SYMBOL = "SZARUSDT"
+
+@pytest.fixture
+def mock_server():
+    """Local FameEX stand-in with a small injected latency"""
+    with MockExchangeServer(latency=0.05) as server:
+        yield server
+
+class TestAsyncFameexClient:
+    def test_signature_matches_sync_client(self):
+        """Async client signs exactly like FameexClient"""
+        sync_client = FameexClient("key", "secret")
+        async_client = AsyncFameexClient("key", "secret")
+        params = {"symbol": "szarusdt", "volume": "100", "side": 1, "type": 1}
+
+        assert async_client._generate_signature("1700000000000", "POST", "/sapi/v1/order", params) == \
+            sync_client._generate_signature("1700000000000", "POST", "/sapi/v1/order", params)
+
+    @pytest.mark.asyncio
+    async def test_mock_order_in_test_mode(self):
+        """Trade endpoints are mocked in test mode without network access"""
+        async with AsyncFameexClient("key", "secret", test_mode=True) as client:
+            result = await client.place_order(SYMBOL, "BUY", "LIMIT", "100", "0.095")
+
+        assert result['code'] == 200
+        assert result['data']['symbol'] == "szarusdt"
+        assert result['data']['side'] == 1
+        assert result['data']['type'] == 1
+        assert client.session is None  # Mocked calls never open a connection
+
+    @pytest.mark.asyncio
+    async def test_order_book_shape(self, mock_server):
+        """Order book is returned in the same shape as the sync client"""
+        async with AsyncFameexClient("key", "secret", base_url=mock_server.url) as client:
+            order_book = await client.get_order_book(SYMBOL, 2)
+
+        assert set(order_book['data'].keys()) == {'bids', 'asks', 'timestamp'}
+        assert order_book['data']['bids'] == mock_server.order_book['bids'][:2]
+
+    @pytest.mark.asyncio
+    async def test_signed_request_headers(self, mock_server):
+        """Signed POSTs carry timestamp in the body"""
+        async with AsyncFameexClient("key", "secret", base_url=mock_server.url) as client:
+            result = await client.place_order(SYMBOL, 2, 1, "100", "0.096")
+
+        assert result['status'] == 'NEW'
+        method, path, params = mock_server.requests[-1]
+        assert (method, path) == ("POST", "/sapi/v1/order")
+        assert 'timestamp' in params
+
+    @pytest.mark.asyncio
+    async def test_concurrent_fan_out(self, mock_server):
+        """Depth and both quote sides complete in roughly one round trip"""
+        async with AsyncFameexClient("key", "secret", base_url=mock_server.url) as client:
+            await client.get_ticker(SYMBOL)  # Warm up the connection pool
+            start = time.perf_counter()
+            order_book, bid, ask = await client.gather(
+                client.get_order_book(SYMBOL, 5),
+                client.place_order(SYMBOL, 1, 1, "100", "0.094"),
+                client.place_order(SYMBOL, 2, 1, "100", "0.096"),
+            )
+            elapsed = time.perf_counter() - start
+
+        assert order_book['data']['asks']
+        assert bid['orderId'] != ask['orderId']
+        assert elapsed < 3 * mock_server.latency
+
+    @pytest.mark.asyncio
+    async def test_request_error_returns_none(self, mock_server):
+        """HTTP errors are logged and surfaced as None like the sync client"""
+        async with AsyncFameexClient("key", "secret", base_url=mock_server.url) as client:
+            assert await client.get_klines(SYMBOL) is None
@@ -0,0 +1,218 @@
+import gzip
+import json
+import pytest
+import numpy as np
+from decimal import Decimal
+import backtest.engine
+from backtest import Backtester, EventLog, EventLogBuilder, SimulatedExchange, load_events
+from backtest.events import BID, ASK, TRADE_BUY, TRADE_SELL, CLEAR
+from market_data.order_book import OrderBook
+from trading.symbols import SymbolInfo
+
+SCALE = 10 ** 8
+
+def scaled(value):
+    return int(Decimal(value) * SCALE)
+
+MESSAGES = [
+    {"ts": 1000, "bids": [["0.0950", "1000"]], "asks": [["0.0952", "800"]]},
+    {"channel": "market_szarusdt_depth_incr", "ts": 1010,
+     "tick": {"seq": 2, "prevSeq": 1, "bids": [["0.0951", "500"]], "asks": [["0.0952", "0"]]}},
+    {"channel": "market_szarusdt_trade_ticker", "ts": 1020,
+     "tick": {"data": [{"side": "sell", "price": "0.0951", "vol": "200"}]}},
+    {"event": "heartbeat"},
+]
+
+@pytest.fixture
+def recording(tmp_path):
+    path = tmp_path / "szarusdt.jsonl"
+    path.write_text("\n".join(json.dumps(m) for m in MESSAGES) + "\nnot json\n")
+    return str(path)
+
+@pytest.fixture
+def book():
+    return OrderBook.from_levels([["0.0950", "1000"], ["0.0949", "2000"]],
+                                 [["0.0952", "800"], ["0.0953", "1500"]])
+
+@pytest.fixture
+def fills():
+    return []
+
+@pytest.fixture
+def exchange(book, fills):
+    return SimulatedExchange(book, on_fill=lambda order, price, size: fills.append((order.order_id, price, size)))
+
+def place(exchange, side, price, volume):
+    return exchange.place_order("SZARUSDT", side, 1, volume, price)['data']['orderId']
+
+class TestLoadEvents:
+    def test_jsonl(self, recording):
+        events = load_events(recording)
+
+        assert events.kind.tolist() == [CLEAR, BID, ASK, BID, ASK, TRADE_SELL]
+        assert events.ts.tolist() == [1000, 1000, 1000, 1010, 1010, 1020]
+        assert events.price[1] == scaled("0.0950")
+        assert events.size[4] == 0
+        assert events.size[5] == scaled("200")
+
+    def test_gzip_and_npz_round_trip(self, recording, tmp_path):
+        gz_path = str(tmp_path / "szarusdt.jsonl.gz")
+        with open(recording, 'rb') as src, gzip.open(gz_path, 'wb') as dst:
+            dst.write(src.read())
+        events = load_events(gz_path)
+        npz_path = str(tmp_path / "szarusdt.npz")
+        events.save(npz_path)
+
+        loaded = load_events(npz_path)
+
+        assert len(loaded) == len(events) == 6
+        for column in ('ts', 'kind', 'price', 'size'):
+            assert np.array_equal(getattr(loaded, column), getattr(events, column))
+
+    def test_directory_round_trip_is_memory_mapped(self, recording, tmp_path):
+        events = load_events(recording)
+        directory = str(tmp_path / "events")
+        events.save(directory)
+
+        loaded = load_events(directory)
+        assert isinstance(loaded.price, np.memmap)
+        assert not loaded.price.flags.writeable
+        assert loaded.kind.tolist() == events.kind.tolist()
+        assert loaded.price.tolist() == events.price.tolist()
+        assert loaded.price_decimals == events.price_decimals
+
+    def test_timestamps_never_go_backwards(self):
+        builder = EventLogBuilder()
+        builder.add_trade(2000, True, "1", "1")
+        builder.add_trade(1500, True, "1", "1")
+        builder.add_trade(None, False, "1", "1")
+        assert builder.build().ts.tolist() == [2000, 2000, 2000]
+
+class TestSimulatedExchange:
+    def test_joins_back_of_queue(self, exchange, fills):
+        order_id = place(exchange, 1, "0.0950", "300")
+
+        exchange.on_trade(False, scaled("0.0950"), scaled("600"))
+        assert fills == []
+        assert exchange.bids[0].queue_ahead == scaled("400")
+
+        exchange.on_trade(False, scaled("0.0950"), scaled("500"))
+        assert fills == [(order_id, scaled("0.0950"), scaled("100"))]
+        assert exchange.bids[0].remaining == scaled("200")
+
+    def test_level_shrink_moves_queue_up(self, exchange, fills):
+        place(exchange, 1, "0.0950", "300")
+        exchange.on_level(True, scaled("0.0950"), scaled("100"))
+        exchange.on_trade(False, scaled("0.0950"), scaled("250"))
+
+        assert [size for _, _, size in fills] == [scaled("150")]
+
+    def test_trade_through_price_fills(self, exchange, fills):
+        order_id = place(exchange, 2, "0.0955", "300")
+        exchange.on_trade(True, scaled("0.0956"), scaled("1000"))
+
+        assert fills == [(order_id, scaled("0.0955"), scaled("300"))]
+        assert exchange.asks == []
+        assert order_id not in exchange.orders
+        assert exchange.stats['filled'] == 1
+
+    def test_trade_away_from_price_does_not_fill(self, exchange, fills):
+        place(exchange, 2, "0.0955", "300")
+        exchange.on_trade(True, scaled("0.0952"), scaled("1000"))
+        exchange.on_trade(False, scaled("0.0950"), scaled("1000"))
+        assert fills == []
+
+    def test_book_crossing_our_quote_fills(self, exchange, fills):
+        order_id = place(exchange, 1, "0.0951", "300")
+        exchange.on_level(False, scaled("0.0951"), scaled("50"))
+        assert fills == [(order_id, scaled("0.0951"), scaled("300"))]
+
+    def test_marketable_order_takes_liquidity(self, exchange, fills):
+        order_id = place(exchange, 1, "0.0953", "1000")
+
+        assert fills == [(order_id, scaled("0.0952"), scaled("800")),
+                         (order_id, scaled("0.0953"), scaled("200"))]
+        assert order_id not in exchange.orders
+
+    def test_latency(self, book, fills):
+        exchange = SimulatedExchange(book, latency=50, on_fill=lambda *fill: fills.append(fill))
+        exchange.advance(1000)
+        place(exchange, 2, "0.0952", "100")
+        exchange.on_trade(True, scaled("0.0953"), scaled("1000"))
+        assert fills == []
+
+        exchange.advance(1050)
+        assert exchange.asks[0].queue_ahead == scaled("800")
+        exchange.on_trade(True, scaled("0.0953"), scaled("1000"))
+        assert len(fills) == 1
+
+    def test_cancel(self, exchange):
+        order_id = place(exchange, 1, "0.0940", "100")
+        assert exchange.cancel_order("SZARUSDT", order_id) is not None
+        assert exchange.cancel_order("SZARUSDT", order_id) is None
+        assert exchange.bids == []
+
+def make_events():
+    builder = EventLogBuilder()
+    builder.add_snapshot(0, [["0.0950", "1000"]], [["0.0952", "1000"]])
+    ts = 0
+    for i in range(50):
+        ts += 200
+        # Aggressive flow alternating through both sides of the book
+        price = "0.0800" if i % 2 else "0.1100"
+        builder.add_trade(ts, i % 2 == 0, price, "100000")
+        ts += 200
+        builder.add_levels(ts, [["0.0950", str(1000 + i)]], [])
+    return builder.build()
+
+class TestBacktester:
+    def run(self, **kwargs):
+        info = SymbolInfo('SZARUSDT', 'SZAR', 'USDT', tick_size=Decimal('0.0001'), lot_size=Decimal('1'))
+        backtester = Backtester(make_events(), symbol_info=info, spread_percentage=Decimal('0.001'),
+                                **kwargs)
+        return backtester, backtester.run()
+
+    def test_fills_update_position_and_wallet(self):
+        backtester, result = self.run(fee_rate=Decimal('0'))
+        maker = backtester.maker
+
+        assert result.stats['fills'] > 0
+        position = maker.position_tracker.get_position('SZARUSDT')
+        assert float(position) == pytest.approx(result.position[-1])
+        assert len(maker.position_tracker.trades) == result.stats['fills']
+        initial_szar = Decimal('10000') / Decimal('0.0951')
+        assert maker.wallet_manager.balances['SZAR'] == int(initial_szar) + position
+        # Filled quotes are no longer tracked as resting
+        assert set(maker.active_orders) <= set(backtester.exchange.orders)
+
+    def test_result_summary(self):
+        _, result = self.run()
+        summary = result.summary()
+
+        assert summary['events'] == len(make_events())
+        assert 0 < summary['fill_ratio'] <= 1
+        assert summary['fees'] > 0
+        assert len(result.ts) == len(result.pnl) == len(result.position) == result.requotes
+
+    def test_deterministic(self):
+        _, first = self.run()
+        _, second = self.run()
+        assert first.summary()['pnl'] == second.summary()['pnl']
+        assert np.array_equal(first.position, second.position)
+
+    def test_requote_interval(self):
+        _, frequent = self.run(requote_interval=0)
+        _, sparse = self.run(requote_interval=5)
+        assert sparse.requotes < frequent.requotes
+
+    def test_chunked_replay_matches(self, monkeypatch):
+        _, whole = self.run()
+        # Chunks that split batches of events sharing a timestamp
+        monkeypatch.setattr(backtest.engine, 'REPLAY_CHUNK', 3)
+        _, chunked = self.run()
+        assert chunked.requotes == whole.requotes
+        assert np.array_equal(chunked.pnl, whole.pnl)
+
+    def test_volatility_multiplier(self):
+        backtester, _ = self.run(volatility_multiplier=Decimal('5'))
+        assert backtester.maker.risk_manager.volatility_multiplier == Decimal('5')
@@ -0,0 +1,124 @@
+import pytest
+from decimal import Decimal
+from unittest.mock import patch
+from config.api_client import FameexClient
+from config.async_api_client import AsyncFameexClient
+from market_maker import MarketMaker
+from tests.utils.mock_exchange_server import MockExchangeServer
+
+SYMBOL = "SZARUSDT"
+
+QUOTES = [
+    {"side": 1, "order_type": 1, "volume": "100", "price": "0.0940"},
+    {"side": 2, "order_type": 1, "volume": "100", "price": "0.0960"},
+    {"side": "BUY", "order_type": "LIMIT", "volume": "50", "price": "0.0930"},
+]
+
+@pytest.fixture
+def mock_server():
+    with MockExchangeServer() as server:
+        yield server
+
+def _paths(server):
+    return [path for _, path, _ in server.requests]
+
+class TestBatchOrders:
+    def test_place_orders_single_request(self, mock_server):
+        """N orders collapse into one signed /batchOrders request"""
+        client = FameexClient("key", "secret", base_url=mock_server.url)
+        results = client.place_orders(SYMBOL, QUOTES)
+
+        assert _paths(mock_server) == ["/sapi/v1/batchOrders"]
+        assert len(results) == len(QUOTES)
+        assert len({r['orderId'] for r in results}) == len(QUOTES)
+
+        params = mock_server.requests[0][2]
+        assert params['orders'][2] == {"side": "BUY", "batchType": "LIMIT", "volume": "50", "price": "0.0930"}
+        assert 'timestamp' in params
+
+    def test_place_orders_chunks_by_batch_size(self, mock_server):
+        """Batches larger than the venue limit are split"""
+        client = FameexClient("key", "secret", base_url=mock_server.url)
+        results = client.place_orders(SYMBOL, QUOTES * 5)
+
+        assert _paths(mock_server) == ["/sapi/v1/batchOrders"] * 2
+        assert all(results)
+
+    def test_cancel_orders_single_request(self, mock_server):
+        client = FameexClient("key", "secret", base_url=mock_server.url)
+        results = client.cancel_orders(SYMBOL, ["11", "12"])
+
+        assert _paths(mock_server) == ["/sapi/v1/batchCancel"]
+        assert [r['orderId'] for r in results] == ["11", "12"]
+        assert all(r['status'] == 'CANCELED' for r in results)
+
+    def test_fallback_parallel_single_calls(self, mock_server):
+        """Venues without batch endpoints get parallel single requests"""
+        client = FameexClient("key", "secret", base_url=mock_server.url)
+        client.supports_batch_orders = False
+        results = client.place_orders(SYMBOL, QUOTES)
+
+        assert sorted(_paths(mock_server)) == ["/sapi/v1/order"] * len(QUOTES)
+        assert all(r['status'] == 'NEW' for r in results)
+
+    def test_cancel_replace_skips_placement_on_failed_cancel(self):
+        """A failed cancel never leaves old and new quotes resting together"""
+        client = FameexClient("key", "secret", test_mode=True)
+        with patch.object(client, 'cancel_orders', return_value=[None]), \
+             patch.object(client, 'place_orders') as place_orders:
+            result = client.cancel_replace(SYMBOL, ["1"], QUOTES[:2])
+
+        place_orders.assert_not_called()
+        assert result == {'canceled': [None], 'placed': []}
+
+    def test_cancel_replace_test_mode(self):
+        """Test-mode mocks cover the batch endpoints"""
+        client = FameexClient("key", "secret", test_mode=True)
+        result = client.cancel_replace(SYMBOL, ["1", "2"], QUOTES[:2])
+
+        assert [r['orderId'] for r in result['canceled']] == ["1", "2"]
+        assert len(result['placed']) == 2 and all(result['placed'])
+
+    @pytest.mark.asyncio
+    async def test_async_cancel_replace(self, mock_server):
+        async with AsyncFameexClient("key", "secret", base_url=mock_server.url) as client:
+            result = await client.cancel_replace(SYMBOL, ["7", "8"], QUOTES[:2])
+
+        assert _paths(mock_server) == ["/sapi/v1/batchCancel", "/sapi/v1/batchOrders"]
+        assert len(result['placed']) == 2
+
+    def test_market_maker_replaces_quotes(self):
+        """MarketMaker swaps its resting quotes for the new set"""
+        market_maker = MarketMaker(FameexClient("key", "secret", test_mode=True))
+        market_maker.wallet_manager.update_balance("USDT", Decimal("100"))
+        market_maker.wallet_manager.update_balance("SZAR", Decimal("100"))
+        market_maker.active_orders = {"old_bid": {}, "old_ask": {}}
+        orders = [
+            {"symbol": SYMBOL, "side": 1, "orderType": 1, "price": "0.094", "amount": "100"},
+            {"symbol": SYMBOL, "side": 2, "orderType": 1, "price": "0.096", "amount": "100"},
+        ]
+
+        market_maker.replace_quotes(orders)
+
+        assert "old_bid" not in market_maker.active_orders
+        assert sorted(o["side"] for o in market_maker.active_orders.values()) == [1, 2]
+
+    def test_test_mode_reconcile_sees_our_quotes(self):
+        """Test-mode open orders are the quotes placed and not cancelled, so nothing is adopted or closed"""
+        market_maker = MarketMaker(FameexClient("key", "secret", test_mode=True))
+        market_maker.wallet_manager.update_balance("USDT", Decimal("100"))
+        market_maker.wallet_manager.update_balance("SZAR", Decimal("100"))
+        orders = [
+            {"symbol": SYMBOL, "side": 1, "orderType": 1, "price": "0.094", "amount": "100"},
+            {"symbol": SYMBOL, "side": 2, "orderType": 1, "price": "0.096", "amount": "100"},
+        ]
+        market_maker.replace_quotes(orders)
+        market_maker.replace_quotes([dict(order, price=str(Decimal(order["price"]) + Decimal("0.001")))
+                                     for order in orders])
+        available = market_maker.wallet_manager.get_available_balance("USDT")
+
+        for _ in range(3):
+            counts = market_maker.orders.reconcile_with(market_maker.client, SYMBOL, force=True)
+            assert counts == {'closed': 0, 'adopted': 0, 'partial': 0}
+        assert sorted(market_maker.client._test_orders) == sorted(market_maker.active_orders)
+        assert market_maker.wallet_manager.get_available_balance("USDT") == available
@@ -0,0 +1,101 @@
+import pytest
+from decimal import Decimal
+from unittest.mock import Mock, AsyncMock
+from market_data.depth_feed import DepthFeed, DepthUpdate, decode_frame, parse_depth_message
+from tests.utils.mock_exchange_server import DEFAULT_ORDER_BOOK
+from tests.utils.mock_ws_server import ReplayWebSocketServer, load_frames
+
+SYMBOL = "SZARUSDT"
+
+@pytest.fixture
+def frames():
+    return load_frames("szarusdt_depth_frames.jsonl")
+
+@pytest.fixture
+def rest_client():
+    """Sync client whose REST snapshot is the mock exchange's default book"""
+    client = Mock()
+    client.get_order_book.return_value = {'data': dict(DEFAULT_ORDER_BOOK, timestamp=1700000000000)}
+    return client
+
+class TestDepthFeed:
+    def test_apply_updates_and_remove_levels(self, rest_client):
+        feed = DepthFeed(rest_client, SYMBOL)
+        feed.load_snapshot(rest_client.get_order_book(SYMBOL))
+
+        assert feed.apply_update(DepthUpdate(5, None, [["0.0951", "10"]], [["0.0952", "0"]]))
+        book = feed.get_order_book()
+
+        assert book['bids'][0] == ["0.0951", "10"]
+        assert book['asks'][0] == ["0.0953", "800"]
+
+    def test_wait_for_change(self, rest_client):
+        feed = DepthFeed(rest_client, SYMBOL)
+        assert not feed.wait_for_change(timeout=0)
+
+        feed.load_snapshot(rest_client.get_order_book(SYMBOL))
+        assert feed.wait_for_change(timeout=0)
+        assert not feed.wait_for_change(timeout=0)  # Cleared once consumed
+
+    def test_gap_detection(self, rest_client):
+        feed = DepthFeed(rest_client, SYMBOL)
+        feed.load_snapshot(rest_client.get_order_book(SYMBOL))
+        feed.apply_update(DepthUpdate(10, 9, [], []))
+
+        assert feed.apply_update(DepthUpdate(9, 8, [["0.1", "1"]], []))  # Stale, ignored
+        assert not feed.apply_update(DepthUpdate(12, 11, [], []))
+        assert feed.stats['gaps'] == 1
+        assert feed.stats['stale'] == 1
+        assert not feed.synced
+
+    def test_decode_gzip_frame(self):
+        import gzip
+        assert decode_frame(gzip.compress(b'{"ping": 1}')) == {"ping": 1}
+        assert decode_frame('{"ping": 2}') == {"ping": 2}
+        assert parse_depth_message({"event_rep": "sub"}) is None
+
+    def test_order_book_shape_matches_market_maker_input(self, rest_client):
+        """Output can be fed straight into calculate_new_orders"""
+        feed = DepthFeed(rest_client, SYMBOL, depth=2)
+        feed.load_snapshot(rest_client.get_order_book(SYMBOL))
+        book = feed.get_order_book()
+
+        assert book['bids'] == [["0.095", "1500"], ["0.0949", "2300"]]
+        assert book['asks'] == [["0.0952", "1200"], ["0.0953", "800"]]
+        assert Decimal(book['bids'][0][0]) < Decimal(book['asks'][0][0])
+
+    @pytest.mark.asyncio
+    async def test_replay_recorded_frames(self, frames, rest_client):
+        async with ReplayWebSocketServer(frames) as server:
+            feed = DepthFeed(rest_client, SYMBOL, ws_url=server.url, depth=10)
+            await feed.run(max_reconnects=0)
+
+        assert server.received[0] == feed.subscribe_message()
+        assert {'pong': 1700000000000} in server.received
+        assert feed.stats['updates'] == 8
+        assert feed.stats['resyncs'] == 1
+        assert feed.last_seq == 1008
+
+        book = feed.get_order_book()
+        assert book['bids'] == [["0.095", "1800"], ["0.0948", "900"], ["0.0947", "5000"]]
+        assert book['asks'] == [["0.0953", "600"], ["0.0954", "700"], ["0.0955", "3100"], ["0.0956", "250"]]
+
+    @pytest.mark.asyncio
+    async def test_gap_triggers_rest_resync(self, frames):
+        """A dropped frame is detected and the book is rebuilt from REST"""
+        client = Mock()
+        client.get_order_book = AsyncMock(return_value={'data': dict(DEFAULT_ORDER_BOOK)})
+        del frames[5]  # Drop seq 1005
+
+        async with ReplayWebSocketServer(frames, compress=False) as server:
+            feed = DepthFeed(client, SYMBOL, ws_url=server.url, depth=10)
+            await feed.run(max_reconnects=0)
+
+        assert feed.stats['gaps'] == 1
+        assert feed.stats['resyncs'] == 2
+        assert client.get_order_book.await_count == 2
+
+        # seq 1006 revealed the gap and is superseded by the snapshot
+        book = feed.get_order_book()
+        assert book['bids'] == [["0.095", "1800"], ["0.0949", "2300"], ["0.0948", "900"]]
+        assert book['asks'][:2] == [["0.0952", "1200"], ["0.0953", "600"]]
@@ -0,0 +1,207 @@
+import asyncio
+import pytest
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from trading.executions import ExecutionTracker, parse_fill
+from trading.position_tracker import PositionTracker
+from trading.wallet_manager import WalletManager
+
+SYMBOL = "SZARUSDT"
+
+def trade(trade_id, side="BUY", price="0.1", qty="100", fee="0.01", ts=None, **extra):
+    return {"symbol": SYMBOL, "id": trade_id, "side": side, "price": price, "qty": qty, "fee": fee,
+            "time": ts if ts is not None else 1700000000000 + int(trade_id), **extra}
+
+class FakeClient:
+    """myTrades over an in-memory trade list, optionally ignoring fromId"""
+    def __init__(self, trades=(), honors_from_id=True):
+        self.trades = list(trades)
+        self.honors_from_id = honors_from_id
+        self.calls = []
+
+    def _page(self, limit, from_id):
+        self.calls.append(from_id)
+        if from_id is not None and self.honors_from_id:
+            return {"code": 200, "data": [t for t in self.trades if int(t["id"]) >= from_id][:limit]}
+        return {"code": 200, "data": self.trades[-limit:]}
+
+    def get_my_trades(self, symbol, limit=100, from_id=None):
+        return self._page(limit, from_id)
+
+class AsyncFakeClient(FakeClient):
+    async def get_my_trades(self, symbol, limit=100, from_id=None):
+        return self._page(limit, from_id)
+
+@pytest.fixture
+def wallet():
+    wallet = WalletManager()
+    wallet.update_balance("USDT", Decimal("1000"))
+    wallet.update_balance("SZAR", Decimal("5000"))
+    return wallet
+
+@pytest.fixture
+def positions():
+    return PositionTracker()
+
+def tracker_for(client, positions, wallet, **kwargs):
+    return ExecutionTracker(client, positions, wallet, poll_interval=0, **kwargs)
+
+class TestParseFill:
+    def test_fields(self):
+        fill = parse_fill(trade("7", side="SELL", feeCoin="SZAR", orderId=42), SYMBOL)
+        assert fill.trade_id == "7"
+        assert fill.order_id == "42"
+        assert not fill.is_buy
+        assert fill.price == Decimal("0.1")
+        assert fill.amount == Decimal("100")
+        assert fill.fee_asset == "SZAR"
+
+    def test_is_buyer_and_malformed(self):
+        assert parse_fill(trade("1", side="SELL", isBuyer=True), SYMBOL).is_buy
+        assert parse_fill({"id": "1", "side": "BUY"}, SYMBOL) is None
+
+class TestExecutionTracker:
+    def test_first_poll_only_primes(self, positions, wallet):
+        client = FakeClient([trade("1"), trade("2")])
+        tracker = tracker_for(client, positions, wallet)
+
+        assert tracker.poll(SYMBOL) == []
+        assert positions.get_position(SYMBOL) == 0
+        assert wallet.balances["USDT"] == Decimal("1000")
+
+    def test_applies_only_new_fills(self, positions, wallet):
+        client = FakeClient([trade("1"), trade("2")])
+        tracker = tracker_for(client, positions, wallet)
+        tracker.poll(SYMBOL)
+        client.trades += [trade("3"), trade("4", side="SELL", qty="40")]
+
+        fills = tracker.poll(SYMBOL)
+
+        assert [f.trade_id for f in fills] == ["3", "4"]
+        assert client.calls[-1] == 3  # fromId just past the mark
+        assert positions.get_position(SYMBOL) == Decimal("60")
+        assert len(positions.trades) == 2
+        assert wallet.balances["SZAR"] == Decimal("5060")
+        # -10 for the buy, +4 for the sell, 0.02 fees
+        assert wallet.balances["USDT"] == Decimal("993.98")
+        assert tracker.poll(SYMBOL) == []
+
+    def test_duplicates_dropped_when_from_id_ignored(self, positions, wallet):
+        client = FakeClient([trade("1"), trade("2")], honors_from_id=False)
+        tracker = tracker_for(client, positions, wallet)
+        tracker.poll(SYMBOL)
+        client.trades.append(trade("3"))
+
+        assert [f.trade_id for f in tracker.poll(SYMBOL)] == ["3"]
+        assert tracker.stats['duplicates'] >= 2
+        assert positions.get_position(SYMBOL) == Decimal("100")
+
+    def test_catches_up_over_several_pages(self, positions, wallet):
+        client = FakeClient([trade("1")])
+        tracker = tracker_for(client, positions, wallet, limit=2)
+        tracker.poll(SYMBOL)
+        client.trades += [trade(str(i), qty="1") for i in range(2, 7)]
+
+        fills = tracker.poll(SYMBOL)
+
+        assert [f.trade_id for f in fills] == ["2", "3", "4", "5", "6"]
+        assert client.calls[1:] == [2, 4, 6]
+        assert positions.get_position(SYMBOL) == Decimal("5")
+
+    def test_fee_in_base_asset(self, positions, wallet):
+        client = FakeClient()
+        tracker = tracker_for(client, positions, wallet)
+        tracker.poll(SYMBOL)
+        client.trades.append(trade("1", fee="0.5", feeCoin="SZAR"))
+        tracker.poll(SYMBOL)
+
+        assert wallet.balances["SZAR"] == Decimal("5099.5")
+        assert wallet.balances["USDT"] == Decimal("990")
+
+    def test_same_timestamp_non_numeric_ids(self, positions, wallet):
+        client = FakeClient()
+        tracker = tracker_for(client, positions, wallet)
+        tracker.poll(SYMBOL)
+        client.trades.append(trade("a", ts=5))
+        tracker.poll(SYMBOL)
+        client.trades.append(trade("b", ts=5))
+
+        assert [f.trade_id for f in tracker.poll(SYMBOL)] == ["b"]
+        assert positions.get_position(SYMBOL) == Decimal("200")
+
+    def test_poll_interval(self, positions, wallet):
+        client = FakeClient()
+        tracker = ExecutionTracker(client, positions, wallet, poll_interval=60)
+        tracker.poll(SYMBOL)
+        tracker.poll(SYMBOL)
+        assert len(client.calls) == 1
+        tracker.poll(SYMBOL, force=True)
+        assert len(client.calls) == 2
+
+    def test_errors_keep_the_mark(self, positions, wallet):
+        client = FakeClient([trade("1")])
+        tracker = tracker_for(client, positions, wallet)
+        tracker.poll(SYMBOL)
+        client.get_my_trades = MagicMock(side_effect=ConnectionError("down"))
+
+        assert tracker.poll(SYMBOL) == []
+        assert tracker.stats['errors'] == 1
+        assert tracker._from_id(SYMBOL) == 2
+
+    @pytest.mark.asyncio
+    async def test_poll_async(self, positions, wallet):
+        client = AsyncFakeClient([trade("1")])
+        tracker = tracker_for(client, positions, wallet)
+        await tracker.poll_async(SYMBOL)
+        client.trades.append(trade("2", side="SELL"))
+
+        fills = await tracker.poll_async(SYMBOL)
+
+        assert [f.trade_id for f in fills] == ["2"]
+        assert positions.get_position(SYMBOL) == Decimal("-100")
+
+    async def test_cancelled_catch_up_refetches_its_pages(self, positions, wallet):
+        """A poll cancelled between pages (e.g. by the step timeout) must not skip their fills"""
+        client = AsyncFakeClient([trade("1")])
+        tracker = tracker_for(client, positions, wallet, limit=2)
+        await tracker.poll_async(SYMBOL)
+        client.trades += [trade(str(i), qty="1") for i in range(2, 7)]
+        fetch = client.get_my_trades
+
+        async def slow_second_page(symbol, limit=100, from_id=None):
+            if len(client.calls) == 2:
+                await asyncio.sleep(1)
+            return await fetch(symbol, limit, from_id)
+        client.get_my_trades = slow_second_page
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(tracker.poll_async(SYMBOL), 0.05)
+        assert positions.get_position(SYMBOL) == 0
+
+        client.get_my_trades = fetch
+        fills = await tracker.poll_async(SYMBOL)
+        assert [f.trade_id for f in fills] == ["2", "3", "4", "5", "6"]
+        assert positions.get_position(SYMBOL) == Decimal("5")
+
+    def test_test_mode_applies_no_fills(self, positions, wallet, monkeypatch):
+        from config import api_client
+        clock = iter(range(1700000000, 1700000100, 5))
+        monkeypatch.setattr(api_client, "time", SimpleNamespace(time=lambda: next(clock)))
+        tracker = tracker_for(api_client.FameexClient("key", "secret", test_mode=True), positions, wallet)
+        for _ in range(3):
+            assert tracker.poll(SYMBOL) == []
+
+        assert positions.get_position(SYMBOL) == 0
+        assert wallet.get_balance("USDT") == Decimal("1000")
+
+    def test_market_maker_step_polls(self, positions, wallet):
+        from market_maker import MarketMaker
+        client = MagicMock()
+        client.supports_batch_orders = False
+        client.get_order_book.return_value = None
+        executions = MagicMock()
+        maker = MarketMaker(client, symbol=SYMBOL, executions=executions)
+
+        maker.step()
+
+        executions.poll.assert_called_once_with(SYMBOL)
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from decimal import Decimal
+from utils.fixed_point import FixedPoint, FixedPointView, decimals_for, format_scaled, to_scaled
+from trading.position_tracker import PositionTracker
+from trading.symbols import SymbolInfo, SymbolRegistry
+from trading.wallet_manager import WalletManager
+
+@pytest.mark.parametrize("value,decimals,expected", [
+    ("0.0951", 4, 951),
+    ("-1.5", 8, -150000000),
+    ("12", 2, 1200),
+    (7, 3, 7000),
+    (Decimal("0.00000001"), 8, 1),
+    (0.1, 4, 1000),
+    ("1e-4", 4, 1),
+    ("0.00015", 4, 2),  # Over-precise values round half-even
+])
+def test_to_scaled(value, decimals, expected):
+    assert to_scaled(value, decimals) == expected
+
+def test_format_scaled():
+    assert format_scaled(951, 4) == "0.0951"
+    assert format_scaled(9500, 4) == "0.95"
+    assert format_scaled(10000, 4) == "1"
+    assert format_scaled(-5, 2) == "-0.05"
+    assert format_scaled(9500, 4, strip=False) == "0.9500"
+    assert format_scaled(12, 0, strip=False) == "12"
+
+def test_decimals_for():
+    assert decimals_for(Decimal("0.0001")) == 4
+    assert decimals_for(Decimal("0.50")) == 1
+    assert decimals_for(Decimal("10")) == 0
+
+def test_round_trip():
+    scale = FixedPoint(8)
+    for text in ("0", "0.00000001", "123.456", "-42.1"):
+        assert scale.to_decimal(scale.to_int(text)) == Decimal(text)
+        assert scale.to_str(scale.to_int(text)) == text
+
+def test_view_writes_through():
+    data = {}
+    view = FixedPointView(data, FixedPoint(4))
+    view["USDT"] = Decimal("1.25")
+    view["USDT"] += Decimal("0.5")
+    assert data == {"USDT": 17500}
+    assert view["USDT"] == Decimal("1.75")
+    assert dict(view) == {"USDT": Decimal("1.75")}
+
+def test_wallet_stays_exact():
+    wallet = WalletManager()
+    for _ in range(10):
+        wallet.adjust_balance("USDT", Decimal("0.1"))
+    assert wallet.get_balance("USDT") == Decimal("1")
+    wallet.reserve_balance("USDT", Decimal("0.3"))
+    assert wallet.available_scaled("USDT") == 70000000
+
+def test_positions_stay_exact():
+    tracker = PositionTracker()
+    tracker.update_positions("SZARUSDT", [(Decimal("0.1"), Decimal("1"), True)] * 3)
+    assert tracker.get_position("SZARUSDT") == Decimal("0.3")
+    assert tracker.get_position_scaled("SZARUSDT") == 30000000
+
+class TestCanPlaceOrders:
+    @pytest.fixture
+    def wallet(self):
+        info = SymbolInfo("SZARUSDT", "SZAR", "USDT", tick_size=Decimal("0.0001"), lot_size=Decimal("1"),
+                          min_qty=Decimal("5"), min_notional=Decimal("1"))
+        wallet = WalletManager(SymbolRegistry([info]))
+        wallet.update_balance("KAS", Decimal("10"))
+        wallet.update_balance("USDT", Decimal("25"))
+        wallet.update_balance("SZAR", Decimal("300"))
+        return wallet
+
+    def test_matches_can_place_order(self, wallet):
+        ticks = np.array([1000, 950, 900, 2000, 1050, 1100, 1000], dtype=np.int64)
+        lots = np.array([100, 250, 300, 4, 200, 300, 301], dtype=np.int64)
+        is_buy = np.array([True, True, True, True, False, False, False])
+        credit = {"USDT": Decimal("1")}
+
+        mask = wallet.can_place_orders("SZARUSDT", ticks, lots, is_buy, credit=credit)
+
+        expected = [wallet.can_place_order(1 if buy else 2, "SZARUSDT", Decimal(q), Decimal(t) / 10000, credit=credit)
+                    for t, q, buy in zip(ticks.tolist(), lots.tolist(), is_buy.tolist())]
+        assert mask.dtype == bool
+        assert mask.tolist() == expected
+
+    def test_no_gas_funds_nothing(self, wallet):
+        wallet.update_balance("KAS", Decimal("0"))
+        assert not wallet.can_place_orders("SZARUSDT", [1000], [100], [True]).any()
+
+    def test_overflowing_notional_is_exact(self):
+        info = SymbolInfo("BIGUSDT", "BIG", "USDT", tick_size=Decimal("1e-12"), lot_size=Decimal("1e-12"))
+        wallet = WalletManager(SymbolRegistry([info]))
+        wallet.update_balance("KAS", Decimal("10"))
+        wallet.update_balance("USDT", Decimal("20000000"))
+        # 2e18 ticks * 1e13 lots overflows int64
+        ticks = np.array([2 * 10 ** 18, 2 * 10 ** 18], dtype=np.int64)
+        lots = np.array([10 ** 13, 10 ** 13 + 1], dtype=np.int64)
+
+        mask = wallet.can_place_orders("BIGUSDT", ticks, lots, [True, True])
+
+        assert mask.tolist() == [True, False]
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from decimal import Decimal
+from unittest.mock import AsyncMock
+import pytest
+from config.async_api_client import AsyncFameexClient
+from trading.position_tracker import PositionTracker
+from venues import Hedger, MockVenue, SmartOrderRouter, Venue
+
+SYMBOL = "SZARUSDT"
+
+async def test_hedges_inventory_past_threshold_without_blocking():
+    async with MockVenue.synthetic(SYMBOL, mid="0.1", step="0.001", levels=5, size="400",
+                                   latency=0.1) as venue:
+        async with AsyncFameexClient("key", "secret", base_url=venue.url) as client:
+            hedger = Hedger.from_venues({"mock": client}, [SYMBOL], thresholds={SYMBOL: "500"},
+                                        slippage="0.02")
+            tracker = PositionTracker()
+            hedger.attach(tracker)
+
+            tracker.update_position(SYMBOL, Decimal("300"), Decimal("0.1"), True)
+            assert hedger.stats['triggers'] == 0
+
+            started = time.perf_counter()
+            tracker.update_position(SYMBOL, Decimal("300"), Decimal("0.1"), True)
+            assert time.perf_counter() - started < 0.05  # Did not wait on the venue
+            assert hedger.stats['triggers'] == 1
+            await hedger.close()
+
+            assert hedger.hedged[SYMBOL] == Decimal("-600")
+            assert hedger.exposure(SYMBOL) == 0 and tracker.get_position(SYMBOL) == Decimal("600")
+            assert [(t['side'], t['price'], t['qty']) for t in venue.trades] == [
+                ("SELL", "0.099", "400"), ("SELL", "0.098", "200")]
+            assert hedger.latency.histograms[f"hedge.{SYMBOL}"].count == 1
+            assert "mock.place_order" in hedger.latency.histograms
+
+async def test_hedge_cancels_unfilled_remainder():
+    client = AsyncMock()
+    client.get_order_book.return_value = {'data': {'bids': [["0.99", "5"]], 'asks': [["1.01", "50"]]}}
+    client.place_order.return_value = {'orderId': '7', 'status': 'PARTIALLY_FILLED', 'executedQty': '30'}
+    client.cancel_orders.return_value = [{'orderId': '7', 'status': 'CANCELED'}]
+    router = SmartOrderRouter([Venue("other", client)], "SZARBTC")
+    hedger = Hedger({SYMBOL: router}, thresholds={SYMBOL: "10"}, budget=0)
+    tracker = PositionTracker()
+    hedger.attach(tracker)
+
+    tracker.update_positions(SYMBOL, [(Decimal("20"), Decimal("1"), False), (Decimal("20"), Decimal("1"), False)])
+    await hedger.close()
+
+    # Bought back on the hedge pair, no higher than best ask plus slippage
+    first = client.place_order.call_args_list[0].kwargs
+    assert (first['side'], first['volume'], first['price']) == ('BUY', "40", "1.01")
+    client.cancel_orders.assert_awaited_once_with("SZARBTC", ['7'])
+    # The second round's 10 filled in full (the venue's executedQty is capped at the order size)
+    assert client.place_order.call_args_list[1].kwargs['volume'] == "10"
+    assert hedger.hedged[SYMBOL] == Decimal("40") and hedger.exposure(SYMBOL) == 0
+    assert hedger.stats['hedges'] == hedger.stats['over_budget'] == 2
+
+async def test_fills_during_a_hedge_are_picked_up():
+    client = AsyncMock()
+    client.get_order_book.return_value = {'data': {'bids': [["0.99", "1000"]], 'asks': []}}
+
+    async def place_order(symbol, **order):
+        await asyncio.sleep(0.05)
+        return {'orderId': '1', 'status': 'FILLED', 'executedQty': order['volume']}
+    client.place_order.side_effect = place_order
+    hedger = Hedger({SYMBOL: SmartOrderRouter([Venue("other", client)], SYMBOL)}, thresholds={SYMBOL: "10"})
+    tracker = PositionTracker()
+    hedger.attach(tracker)
+
+    tracker.update_position(SYMBOL, Decimal("15"), Decimal("1"), True)
+    await asyncio.sleep(0.01)
+    tracker.update_position(SYMBOL, Decimal("12"), Decimal("1"), True)  # While the first hedge is in flight
+    await hedger.close()
+
+    assert hedger.stats['triggers'] == 1 and hedger.stats['hedges'] == 2
+    assert [call.kwargs['volume'] for call in client.place_order.call_args_list] == ["15", "12"]
+    assert hedger.exposure(SYMBOL) == 0
+
+async def test_fill_behind_a_new_ack_is_read_from_trades():
+    client = AsyncMock()
+    client.get_order_book.return_value = {'data': {'bids': [["0.99", "100"]], 'asks': []}}
+    client.place_order.return_value = {'orderId': '5', 'status': 'NEW'}
+    client.cancel_orders.return_value = [None]  # Already done by the time the cancel arrives
+    client.get_my_trades.return_value = [
+        {'id': 1, 'orderId': '5', 'side': 'SELL', 'price': '0.99', 'qty': '25', 'time': int(time.time() * 1000)},
+        {'id': 2, 'orderId': '5', 'side': 'SELL', 'price': '0.99', 'qty': '15', 'time': int(time.time() * 1000)},
+    ]
+    hedger = Hedger({SYMBOL: SmartOrderRouter([Venue("other", client)], SYMBOL)}, thresholds={SYMBOL: "10"})
+    tracker = PositionTracker()
+    hedger.attach(tracker)
+
+    tracker.update_position(SYMBOL, Decimal("40"), Decimal("1"), True)
+    await hedger.close()
+
+    assert hedger.hedged[SYMBOL] == Decimal("-40") and hedger.exposure(SYMBOL) == 0
+    assert client.place_order.await_count == 1 and not hedger.unsettled
+
+async def test_timed_out_hedge_is_settled_before_hedging_again():
+    client = AsyncMock()
+    client.get_order_book.return_value = {'data': {'bids': [["0.99", "100"]], 'asks': []}}
+
+    async def place_order(symbol, **order):
+        await asyncio.sleep(1)  # Reaches the venue and fills, but the ack is too late
+    client.place_order.side_effect = place_order
+    client.get_open_orders.side_effect = [ConnectionError()] * 3 + [[]]  # Down through the first settle
+    client.get_my_trades.return_value = [
+        {'id': 3, 'orderId': '1', 'side': 'BUY', 'price': '0.99', 'qty': '7', 'time': 0},  # Before the hedge
+        {'id': 4, 'orderId': '8', 'side': 'SELL', 'price': '0.99', 'qty': '40', 'time': int(time.time() * 1000)},
+    ]
+    router = SmartOrderRouter([Venue("other", client)], SYMBOL, timeout=0.05)
+    hedger = Hedger({SYMBOL: router}, thresholds={SYMBOL: "10"}, settle_checks=2, settle_interval=0.01)
+    tracker = PositionTracker()
+    hedger.attach(tracker)
+
+    tracker.update_position(SYMBOL, Decimal("40"), Decimal("1"), True)
+    await hedger.close()
+    # Its fill cannot be read yet, so the exposure is unknown and nothing more is sent
+    assert client.place_order.await_count == 1 and hedger.hedged[SYMBOL] == 0
+    assert len(hedger.unsettled[SYMBOL]) == 1 and hedger.stats['misses'] == 0
+
+    tracker.update_position(SYMBOL, Decimal("5"), Decimal("1"), True)
+    await hedger.close()
+    assert client.place_order.await_count == 1 and not hedger.unsettled
+    assert hedger.hedged[SYMBOL] == Decimal("-40") and hedger.exposure(SYMBOL) == Decimal("5")
+
+def test_hedging_on_the_quoting_venue_needs_its_own_account():
+    from main import hedge_credentials
+    assert hedge_credentials("fameex", ["mock"], "key", "secret") == ("key", "secret")
+    with pytest.raises(ValueError):
+        hedge_credentials("fameex", ["mock", "FameEX"], "key", "secret")
+    with pytest.raises(ValueError):
+        hedge_credentials("fameex", ["fameex"], "key", "secret", "key", "secret")
+    assert hedge_credentials("fameex", ["fameex"], "key", "secret", "hedge", "hedged") == ("hedge", "hedged")
@@ -0,0 +1,183 @@
+import os
+from decimal import Decimal
+import numpy as np
+import pytest
+from trading.journal import Journal, JournalState, RECORD, RecordKind
+from trading.orders import OrderManager, OrderStatus
+from trading.position_tracker import PositionTracker
+from trading.risk_manager import RiskManager
+from trading.wallet_manager import WalletManager
+
+def components():
+    tracker = PositionTracker()
+    wallet = WalletManager()
+    risk = RiskManager(tracker, wallet)
+    return tracker, wallet, risk, OrderManager(wallet)
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    return str(tmp_path / "journal")
+
+def test_state_survives_a_restart(journal_dir):
+    journal = Journal(journal_dir)
+    tracker, wallet, risk, orders = components()
+    journal.attach(tracker, wallet, risk, orders)
+    tracker.update_position("SZARUSDT", Decimal("100"), Decimal("0.0951"), True)
+    tracker.update_positions("SZARUSDT", [(Decimal("30"), Decimal("0.0952"), False),
+                                          (Decimal("5.5"), Decimal("0.0950"), True)])
+    wallet.update_balance("USDT", Decimal("1000"))
+    wallet.adjust_balance("USDT", Decimal("-9.51"))
+    risk.set_limits("SZARUSDT", Decimal("5000"), Decimal("500"), Decimal("0.002"))
+    journal.close()
+
+    restored = Journal(journal_dir)
+    tracker, wallet, risk, _ = components()
+    restored.attach(tracker, wallet, risk)
+    assert tracker.get_position("SZARUSDT") == Decimal("75.5")
+    assert wallet.get_balance("USDT") == Decimal("990.49")
+    assert risk.max_position_size["SZARUSDT"] == Decimal("5000")
+    assert risk.min_spread["SZARUSDT"] == Decimal("0.002")
+    assert restored.stats['replayed'] == 6
+    restored.close()
+
+@pytest.mark.parametrize("snapshot_every", [1000, 2])
+def test_fill_stats_survive_a_restart(journal_dir, snapshot_every):
+    journal = Journal(journal_dir, snapshot_every=snapshot_every)
+    tracker, wallet, risk, orders = components()
+    journal.attach(tracker)
+    tracker.update_position("SZARUSDT", Decimal("60"), Decimal("10"), True)
+    journal.sync()
+    tracker.update_position("SZARUSDT", Decimal("40"), Decimal("10"), True)
+    journal.sync()
+    journal.close()
+
+    restored = Journal(journal_dir)
+    tracker = PositionTracker()
+    restored.attach(tracker)
+    tracker.update_position("SZARUSDT", Decimal("100"), Decimal("12"), False)
+    stats = tracker.get_stats("SZARUSDT")
+    assert tracker.get_position("SZARUSDT") == 0
+    assert stats['realized_pnl'] == Decimal("200") and stats['average_entry_price'] is None
+    assert stats['buy_volume'] == Decimal("100") and stats['trades'] == 3
+    restored.close()
+
+def test_appends_are_group_committed(journal_dir):
+    journal = Journal(journal_dir, commit_interval=60)
+    for i in range(100):
+        journal.fill("SZARUSDT", 1, 2, i % 2 == 0)
+    assert len(journal.records()) == 0  # Still gathering the group
+    assert journal.sync(timeout=5)
+    assert journal.stats['commits'] == 1
+    records = journal.records()
+    assert len(records) == 100
+    assert (records['kind'] == RecordKind.FILL).all()
+    assert records['side'].tolist()[:2] == [1, 2]
+    journal.close()
+
+def test_snapshot_compacts_segments(journal_dir):
+    journal = Journal(journal_dir, snapshot_every=10)
+    for _ in range(25):
+        journal.fill("SZARUSDT", 3, 1, True)
+        journal.sync()
+    journal.balance("USDT", 7)
+    journal.close()
+
+    assert os.path.exists(os.path.join(journal_dir, "snapshot.json"))
+    assert len([name for name in os.listdir(journal_dir) if name.endswith(".jnl")]) == 1
+    restored = Journal(journal_dir)
+    assert restored.state.positions == {"SZARUSDT": 75}
+    assert restored.state.balances == {"USDT": 7}
+    assert restored.stats['replayed'] < 26
+    restored.close()
+
+def test_replay_matches_incremental_folding():
+    rng = np.random.default_rng(7)
+    keys = ["SZARUSDT", "KASUSDT", "SZARUSDT_PERP", "SZARUSDT_SWAP"]  # Last two share 8-byte prefixes
+    records = np.zeros(500, dtype=RECORD)
+    records['kind'] = rng.choice([RecordKind.FILL, RecordKind.BALANCE, RecordKind.LIMITS], 500)
+    records['key'] = [keys[i].encode() for i in rng.integers(0, len(keys), 500)]
+    records['side'] = rng.integers(1, 3, 500)
+    for field in ('a', 'b', 'c'):
+        records[field] = rng.integers(0, 10**12, 500)
+
+    expected = JournalState()
+    for record in records.tolist():
+        ts, kind, side, status, pad, key, order_id, a, b, c = record
+        expected.apply(kind, key.decode(), side, a, b, c)
+    folded = JournalState()
+    folded.apply_records(records)
+    assert folded.to_dict() == expected.to_dict()
+
+def test_torn_record_is_trimmed(journal_dir):
+    journal = Journal(journal_dir)
+    journal.fill("SZARUSDT", 10, 1, True)
+    journal.fill("SZARUSDT", 4, 1, False)
+    journal.close()
+    segment = os.path.join(journal_dir, "0000000000000000.jnl")
+    with open(segment, "ab") as f:
+        f.write(b"\x01" * (RECORD.itemsize // 2))
+
+    restored = Journal(journal_dir)
+    assert os.path.getsize(segment) == 2 * RECORD.itemsize
+    assert restored.state.positions == {"SZARUSDT": 6}
+    restored.fill("SZARUSDT", 1, 1, True)
+    restored.close()
+    reopened = Journal(journal_dir)
+    assert reopened.state.positions == {"SZARUSDT": 7}
+    reopened.close()
+
+def test_failed_commit_is_kept_for_retry(journal_dir, monkeypatch):
+    journal = Journal(journal_dir, commit_interval=60)
+    journal.fill("SZARUSDT", 5, 1, True)
+    fsync, failures = os.fsync, [OSError(28, "No space left on device")]
+
+    def flaky_fsync(fd):
+        if failures:
+            raise failures.pop()
+        fsync(fd)
+    monkeypatch.setattr(os, "fsync", flaky_fsync)
+    with pytest.raises(OSError):
+        journal.sync(timeout=5)
+    assert len(journal.records()) == 0 and journal.stats['failures'] == 1
+
+    journal.fill("SZARUSDT", 3, 1, True)
+    assert journal.sync(timeout=5)
+    assert journal.records()['a'].tolist() == [5, 3]
+    journal.close()
+    reopened = Journal(journal_dir)
+    assert reopened.state.positions == {"SZARUSDT": 8}
+    reopened.close()
+
+def test_over_long_keys_are_skipped(journal_dir):
+    journal = Journal(journal_dir)
+    tracker, wallet, risk, orders = components()
+    journal.attach(tracker, order_manager=orders)
+    tracker.update_position("SZARUSDT_PERPETUAL", Decimal("1"), Decimal("1"), True)
+    orders.add("o" * 41, "SZARUSDT", {'side': 'BUY', 'price': '0.0951', 'amount': '100'})
+
+    # The components carry on; only the journal leaves the records out
+    assert tracker.get_position("SZARUSDT_PERPETUAL") == 1 and orders.get("o" * 41) is not None
+    assert journal.seq == 0 and journal.state.positions == {} and journal.stats['skipped'] == 2
+    journal.close()
+
+def test_order_transitions_are_journaled(journal_dir):
+    journal = Journal(journal_dir)
+    tracker, wallet, risk, orders = components()
+    journal.attach(order_manager=orders)
+    orders.add("order-1", "SZARUSDT", {'side': 'BUY', 'price': '0.0951', 'amount': '100'})
+    orders.on_fill("order-1", Decimal("40"))
+    orders.on_fill("order-1", Decimal("60"))
+    journal.sync()
+
+    records = journal.records()
+    assert records['status'].tolist() == [OrderStatus.NEW, OrderStatus.PARTIAL, OrderStatus.FILLED]
+    assert records['order_id'].tolist() == [b"order-1"] * 3
+    assert records['c'].tolist() == [0, 40 * 10**8, 100 * 10**8]
+    assert (records['side'] == 1).all()
+    journal.close()
+
+def test_scale_mismatch_is_refused(journal_dir):
+    journal = Journal(journal_dir, decimals=4)
+    with pytest.raises(ValueError):
+        journal.attach(PositionTracker(decimals=8))
+    journal.close()
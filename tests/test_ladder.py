@@ -0,0 +1,123 @@
+import pytest
+import numpy as np
+from decimal import Decimal
+from market_data.order_book import OrderBook
+from trading.ladder import QuoteLadder
+from trading.symbols import SymbolInfo
+
+@pytest.fixture
+def info():
+    return SymbolInfo('SZARUSDT', 'SZAR', 'USDT', tick_size=Decimal('0.0001'), lot_size=Decimal('1'))
+
+def build(info, **kwargs):
+    settings = {'levels': 5, 'min_size': Decimal('100'), 'max_size': Decimal('1000'), **kwargs}
+    return QuoteLadder(**settings).build(Decimal('0.0931'), Decimal('0.0971'), info)
+
+class TestQuoteLadder:
+    def test_linear_spacing(self, info):
+        bids, asks = QuoteLadder(levels=3, step=Decimal('0.01'), min_size=Decimal('100')).build(
+            Decimal('0.1000'), Decimal('0.1100'), info)
+
+        assert [p for p, _ in bids.levels()] == [Decimal('0.1000'), Decimal('0.0990'), Decimal('0.0980')]
+        assert [p for p, _ in asks.levels()] == [Decimal('0.1100'), Decimal('0.1111'), Decimal('0.1122')]
+
+    def test_geometric_spacing_widens(self, info):
+        bids, asks = QuoteLadder(levels=4, spacing='geometric', step=Decimal('0.01'),
+                                 spacing_ratio=2).build(Decimal('0.1000'), Decimal('0.1000'), info)
+
+        assert bids.ticks.tolist() == [1000, 990, 970, 930]
+        assert asks.ticks.tolist() == [1000, 1010, 1030, 1070]
+
+    def test_levels_never_share_a_tick(self, info):
+        # Step far below one tick at this price
+        bids, asks = QuoteLadder(levels=10, step=Decimal('0.0001')).build(
+            Decimal('0.0931'), Decimal('0.0971'), info)
+
+        assert np.all(np.diff(bids.ticks) == -1)
+        assert np.all(np.diff(asks.ticks) == 1)
+        assert bids.ticks[0] == 931 and asks.ticks[0] == 971
+
+    def test_touch_prices_round_away_from_mid(self, info):
+        bids, asks = QuoteLadder().build(Decimal('0.09319'), Decimal('0.09701'), info)
+
+        assert bids.levels()[0][0] == Decimal('0.0931')
+        assert asks.levels()[0][0] == Decimal('0.0971')
+
+    @pytest.mark.parametrize("curve, expected", [
+        ('flat', [100, 100, 100, 100, 100]),
+        ('linear', [100, 325, 550, 775, 1000]),
+        ('geometric', [100, 150, 225, 337, 506]),
+    ])
+    def test_size_curves(self, info, curve, expected):
+        bids, asks = build(info, size_curve=curve)
+
+        assert bids.lots.tolist() == expected
+        assert asks.lots.tolist() == expected
+
+    def test_geometric_sizes_capped(self, info):
+        bids, _ = build(info, size_curve='geometric', size_ratio=4)
+        assert bids.lots.tolist() == [100, 400, 1000, 1000, 1000]
+
+    def test_sizes_round_down_to_lot(self):
+        info = SymbolInfo('KASUSDT', 'KAS', 'USDT', tick_size=Decimal('0.00001'), lot_size=Decimal('0.01'))
+        bids, _ = QuoteLadder(levels=3, size_curve='linear', min_size=Decimal('1'),
+                              max_size=Decimal('2.005')).build(Decimal('0.1'), Decimal('0.11'), info)
+
+        assert [s for _, s in bids.levels()] == [Decimal('1.00'), Decimal('1.50'), Decimal('2.00')]
+
+    def test_depth_sizes_follow_book(self, info):
+        book = OrderBook.from_levels(
+            [["0.0931", "1000"], ["0.0929", "2000"], ["0.0920", "50000"]],
+            [["0.0971", "500"], ["0.0975", "3000"]]
+        )
+        ladder = QuoteLadder(levels=3, step=Decimal('0.002'), size_curve='depth',
+                             min_size=Decimal('100'), max_size=Decimal('1000'), depth_fraction=0.1)
+        bids, asks = ladder.build(Decimal('0.0931'), Decimal('0.0971'), info, book)
+
+        # Bids at 0.0931/0.0929/0.0927: 10% of 1000, 3000, 3000 visible
+        assert bids.lots.tolist() == [100, 300, 300]
+        # Asks at 0.0971/0.0973/0.0975: 50 is floored at min_size
+        assert asks.lots.tolist() == [100, 100, 350]
+
+    def test_depth_sizes_without_book(self, info):
+        bids, asks = build(info, size_curve='depth')
+        assert bids.lots.tolist() == asks.lots.tolist() == [100] * 5
+
+    def test_non_positive_prices_dropped(self, info):
+        bids, _ = QuoteLadder(levels=5, step=Decimal('0.4')).build(Decimal('0.0010'), Decimal('0.0020'), info)
+        assert bids.ticks.tolist() == [10, 6, 2]
+
+    def test_to_orders(self, info):
+        bids, asks = QuoteLadder(levels=2, min_size=Decimal('100')).build(
+            Decimal('0.0931'), Decimal('0.0971'), info)
+
+        orders = QuoteLadder.to_orders('SZARUSDT', (bids, asks))
+
+        assert orders == [
+            {"symbol": "SZARUSDT", "side": 1, "orderType": 1, "price": "0.0931", "amount": "100"},
+            {"symbol": "SZARUSDT", "side": 1, "orderType": 1, "price": "0.0929", "amount": "100"},
+            {"symbol": "SZARUSDT", "side": 2, "orderType": 1, "price": "0.0971", "amount": "100"},
+            {"symbol": "SZARUSDT", "side": 2, "orderType": 1, "price": "0.0973", "amount": "100"},
+        ]
+
+    @pytest.mark.parametrize("kwargs", [{'levels': 0}, {'spacing': 'log'}, {'size_curve': 'random'}])
+    def test_invalid_settings(self, kwargs):
+        with pytest.raises(ValueError):
+            QuoteLadder(**kwargs)
+
+    def test_market_maker_quotes_full_ladder(self, info):
+        from unittest.mock import Mock
+        from market_maker import MarketMaker
+        from trading.symbols import SymbolRegistry
+        maker = MarketMaker(Mock(), symbol_registry=SymbolRegistry([info]), order_book_depth=3,
+                            max_order_size=Decimal('300'))
+        maker.risk_manager.max_position_size['SZARUSDT'] = Decimal('100000')
+        for asset in ('SZAR', 'USDT', 'KAS'):
+            maker.wallet_manager.update_balance(asset, Decimal('100000'))
+
+        orders = maker.calculate_new_orders({'bids': [["0.0950", "100"]], 'asks': [["0.0952", "100"]]})
+
+        assert [o["side"] for o in orders] == [1, 1, 1, 2, 2, 2]
+        assert [o["amount"] for o in orders] == ["100", "200", "300"] * 2
+        bid_prices = [Decimal(o["price"]) for o in orders[:3]]
+        assert bid_prices == sorted(bid_prices, reverse=True)
@@ -0,0 +1,103 @@
+import math
+import random
+import urllib.request
+import pytest
+from config.async_api_client import AsyncFameexClient
+from config.rate_limiter import RateLimiter
+from multi_market_maker import MultiSymbolRunner
+from utils.latency import LatencyHistogram, LatencyRecorder, serve_metrics
+from tests.utils.mock_exchange_server import MockExchangeServer
+
+class TestLatencyHistogram:
+    def test_quantiles_within_bucket_precision(self):
+        rng = random.Random(7)
+        values = sorted(int(rng.lognormvariate(11, 1.5)) for _ in range(20000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for q, reported in histogram.quantiles((0.5, 0.99, 0.999)).items():
+            exact = values[max(1, math.ceil(q * len(values))) - 1]
+            assert exact <= reported <= exact * 1.016
+        assert histogram.count == len(values)
+        assert histogram.min == values[0] and histogram.max == values[-1]
+
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for value in (3, 3, 90, 127):
+            histogram.record(value)
+        assert histogram.quantiles((0.5, 1.0)) == {0.5: 3, 1.0: 127}
+
+    def test_huge_values_are_clamped(self):
+        histogram = LatencyHistogram()
+        histogram.record(10 ** 15)
+        assert histogram.quantiles((0.5,)) == {0.5: 10 ** 15}
+
+    def test_empty(self):
+        assert LatencyHistogram().quantiles((0.5,)) == {0.5: 0}
+
+class TestLatencyRecorder:
+    def test_disabled_records_nothing(self):
+        recorder = LatencyRecorder(enabled=False)
+        with recorder.span("step"):
+            pass
+        recorder.record("step", 100)
+        assert recorder.span("step") is recorder.span("other")
+        assert recorder.histograms == {}
+
+    def test_spans_and_summary(self):
+        recorder = LatencyRecorder(enabled=True)
+        for _ in range(3):
+            with recorder.span("step"):
+                pass
+        recorder.record("cancel_replace", 2_000_000)
+
+        summary = recorder.summary()
+        assert summary["step"]["count"] == 3
+        assert summary["cancel_replace"]["p50_us"] == pytest.approx(2000, rel=0.016)
+        assert set(summary["step"]) == {"count", "mean_us", "p50_us", "p99_us", "p999_us", "max_us"}
+
+    def test_span_records_on_error(self):
+        recorder = LatencyRecorder(enabled=True)
+        with pytest.raises(ValueError):
+            with recorder.span("step"):
+                raise ValueError
+        assert recorder.histograms["step"].count == 1
+
+    def test_maybe_log_respects_interval(self):
+        recorder = LatencyRecorder(enabled=True, log_interval=0)
+        recorder.record("step", 1000)
+        assert recorder.maybe_log()
+        recorder.log_interval = 60
+        recorder.maybe_log()
+        assert not recorder.maybe_log()
+
+    def test_prometheus_endpoint(self):
+        recorder = LatencyRecorder(enabled=True)
+        recorder.record("get_order_book", 1500)
+        server = serve_metrics(recorder, 0, host="127.0.0.1")
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                text = response.read().decode()
+        finally:
+            server.shutdown()
+
+        assert "# TYPE quote_loop_latency_seconds summary" in text
+        assert 'quote_loop_latency_seconds{span="get_order_book",quantile="0.99"} 0.000001500' in text
+        assert 'quote_loop_latency_seconds_count{span="get_order_book"} 1' in text
+
+@pytest.mark.asyncio
+async def test_quote_loop_spans():
+    recorder = LatencyRecorder(enabled=True)
+    with MockExchangeServer() as server:
+        async with AsyncFameexClient("key", "secret", base_url=server.url,
+                                     rate_limiter=RateLimiter({"order": (10000, 1.0), "market_data": (10000, 1.0)})) as client:
+            runner = MultiSymbolRunner.from_config(client, {"SZARUSDT": {}, "KASUSDT": {}},
+                                                   latency=recorder, refresh_interval=0)
+            await runner.run(max_cycles=2)
+
+    assert {maker.latency for maker in runner.makers.values()} == {recorder}
+    for span in ("step", "get_order_book", "calculate_new_orders", "check_order",
+                 "can_place_order", "replace_quotes"):
+        assert recorder.histograms[span].count == 4
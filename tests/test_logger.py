@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+import pytest
+from utils.logger import (
+    AsyncLogPipeline, LazyJson, disable_async_logging, enable_async_logging, setup_logger
+)
+
+@pytest.fixture(autouse=True)
+def log_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    disable_async_logging()
+
+def read_log(log_dir, name):
+    return (log_dir / "logs" / f"{name}.log").read_text().splitlines()
+
+class ThreadName:
+    """Log argument that remembers which threads formatted it"""
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread().name)
+        return "formatted"
+
+def test_async_logging_writes_off_thread(log_dir):
+    logger = setup_logger("async_test", log_to_console=False)
+    enable_async_logging()
+    arg = ThreadName()
+
+    logger.info("Trade %s", arg)
+    logger.info("Position updated: %s", LazyJson({"symbol": "SZARUSDT", "amount": "100"}))
+    disable_async_logging()
+
+    lines = read_log(log_dir, "async_test")
+    assert lines[0].endswith("INFO - Trade formatted")
+    assert lines[1].endswith('Position updated: {"symbol": "SZARUSDT", "amount": "100"}')
+    # pytest's capture handler on the root logger also formats it, on this thread
+    assert "log-pipeline" in arg.threads
+
+def test_loggers_set_up_later_join_the_pipeline(log_dir):
+    enable_async_logging()
+    logger = setup_logger("late_test", log_to_console=False)
+
+    assert [type(h).__name__ for h in logger.handlers] == ["_PipelineHandler"]
+    logger.warning("queued")
+    disable_async_logging()
+
+    assert read_log(log_dir, "late_test")[0].endswith("WARNING - queued")
+    assert type(logger.handlers[0]).__name__ == "_RotatingFileHandler"
+
+def test_drop_policy_reports_the_gap(log_dir):
+    logger = setup_logger("drop_test", log_to_console=False)
+    pipeline = AsyncLogPipeline(queue_size=2, policy="drop")
+    logger.handlers = [pipeline.handler("drop_test")]
+
+    for i in range(5):
+        logger.info("record %d", i)
+    pipeline.start()
+    pipeline.stop()
+
+    assert pipeline.stats['dropped'] == 3
+    lines = read_log(log_dir, "drop_test")
+    assert lines[0].endswith("WARNING - Dropped 3 log records while the queue was full")
+    assert [line.rsplit(" - ", 1)[1] for line in lines[1:]] == ["record 0", "record 1"]
+
+def test_warnings_wait_for_room(log_dir):
+    logger = setup_logger("block_test", log_to_console=False)
+    pipeline = AsyncLogPipeline(queue_size=1, policy="drop")
+    logger.handlers = [pipeline.handler("block_test")]
+    logger.info("fills the queue")
+
+    writer = threading.Thread(target=logger.warning, args=("must not be lost",))
+    writer.start()
+    time.sleep(0.05)
+    assert writer.is_alive()
+
+    pipeline.start()
+    writer.join(timeout=5)
+    pipeline.stop()
+
+    assert pipeline.stats['dropped'] == 0
+    assert read_log(log_dir, "block_test")[1].endswith("must not be lost")
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        AsyncLogPipeline(policy="spill")
+
+def test_lazy_json_is_not_encoded_below_level():
+    logger = setup_logger("lazy_test", log_to_console=False)
+    logger.debug("%s", LazyJson(object()))  # Not JSON-serializable; never encoded
+    assert str(LazyJson({"a": 1})) == '{"a": 1}'
+    assert logger.level == logging.INFO
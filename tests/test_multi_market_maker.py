@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from collections import Counter
+from decimal import Decimal
+from config.async_api_client import AsyncFameexClient
+from config.rate_limiter import RateLimiter
+from multi_market_maker import MultiSymbolRunner
+from tests.utils.mock_exchange_server import MockExchangeServer
+
+MARKETS = {
+    "SZARUSDT": {},
+    "KASUSDT": {"spread_percentage": Decimal("0.01"), "order_book_depth": 10},
+    "CUSDUSDT": {},
+    "XECUSDT": {"min_order_size": Decimal("100000")},
+}
+
+@pytest.fixture
+def mock_server():
+    with MockExchangeServer(latency=0.01) as server:
+        yield server
+
+def _unthrottled():
+    return RateLimiter({"order": (10000, 1.0), "market_data": (10000, 1.0)})
+
+class TestMultiSymbolRunner:
+    def test_from_config_shares_account_state(self):
+        runner = MultiSymbolRunner.from_config(AsyncFameexClient("key", "secret"), MARKETS)
+        makers = list(runner.makers.values())
+
+        assert list(runner.makers) == list(MARKETS)
+        assert len({id(m.wallet_manager) for m in makers}) == 1
+        assert len({id(m.risk_manager) for m in makers}) == 1
+        assert runner.makers["KASUSDT"].order_book_depth == 10
+        assert runner.makers["XECUSDT"].min_order_size == Decimal("100000")
+        assert runner.makers["KASUSDT"].risk_manager.min_spread["KASUSDT"] == Decimal("0.01")
+
+    @pytest.mark.asyncio
+    async def test_all_symbols_quoted_over_one_client(self, mock_server):
+        async with AsyncFameexClient("key", "secret", base_url=mock_server.url,
+                                     rate_limiter=_unthrottled()) as client:
+            runner = MultiSymbolRunner.from_config(client, MARKETS, refresh_interval=0)
+            await runner.run(max_cycles=3)
+
+        depth_calls = Counter(params["symbol"] for _, path, params in mock_server.requests
+                              if path == "/sapi/v1/depth")
+        assert depth_calls == {symbol.lower(): 3 for symbol in MARKETS}
+        assert all(stats['cycles'] == 3 for stats in runner.get_stats().values())
+
+    @pytest.mark.asyncio
+    async def test_slow_market_does_not_starve_others(self, mock_server):
+        async with AsyncFameexClient("key", "secret", base_url=mock_server.url,
+                                     rate_limiter=_unthrottled()) as client:
+            runner = MultiSymbolRunner.from_config(client, MARKETS, refresh_interval=0,
+                                                   max_concurrency=2, step_timeout=0.2)
+
+            async def stuck():
+                await asyncio.sleep(10)
+            runner.makers["KASUSDT"].step_async = stuck
+
+            await asyncio.wait_for(runner.run(max_cycles=2), timeout=5)
+
+        stats = runner.get_stats()
+        assert stats["KASUSDT"]['timeouts'] == 2
+        assert all(stats[s]['cycles'] == 2 for s in MARKETS if s != "KASUSDT")
+
+    @pytest.mark.asyncio
+    async def test_cycle_errors_are_isolated(self):
+        runner = MultiSymbolRunner.from_config(AsyncFameexClient("key", "secret"), {"SZARUSDT": {}})
+
+        async def broken():
+            raise RuntimeError("boom")
+        runner.makers["SZARUSDT"].step_async = broken
+
+        await runner.run_cycle(runner.makers["SZARUSDT"], asyncio.Semaphore(1))
+        assert runner.stats["SZARUSDT"]['errors'] == 1
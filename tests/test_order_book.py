@@ -0,0 +1,95 @@
+import pytest
+from decimal import Decimal
+from market_data.order_book import OrderBook, BIDS, ASKS, to_scaled, format_scaled
+
+@pytest.fixture
+def book():
+    return OrderBook.from_levels(
+        bids=[["0.0949", "2300"], ["0.0950", "1500"], ["0.0948", "900"]],
+        asks=[["0.0953", "800"], ["0.0952", "500"], ["0.0955", "3100"]],
+        symbol="SZARUSDT"
+    )
+
+class TestScaledConversion:
+    @pytest.mark.parametrize("value,expected", [
+        ("0.0950", 9500000),
+        ("1500", 150000000000),
+        ("-0.5", -50000000),
+        (Decimal("0.123456789"), 12345679),  # Rounded to 8 places
+        (2, 200000000),
+        ("1e-4", 10000),
+    ])
+    def test_to_scaled(self, value, expected):
+        assert to_scaled(value, 8) == expected
+
+    def test_format_round_trip(self):
+        assert format_scaled(to_scaled("0.0950", 8), 8) == "0.095"
+        assert format_scaled(to_scaled("1500", 8), 8) == "1500"
+        assert format_scaled(-5, 2) == "-0.05"
+
+class TestOrderBook:
+    def test_sorted_best_first(self, book):
+        assert book.levels(BIDS) == [["0.095", "1500"], ["0.0949", "2300"], ["0.0948", "900"]]
+        assert book.levels(ASKS) == [["0.0952", "500"], ["0.0953", "800"], ["0.0955", "3100"]]
+
+    def test_top_of_book(self, book):
+        assert book.best_bid() == Decimal("0.095")
+        assert book.best_ask() == Decimal("0.0952")
+        assert book.mid() == Decimal("0.0951")
+        assert book.spread() == Decimal("0.0002")
+
+    def test_microprice_leans_to_thin_side(self, book):
+        # Thin ask (500) vs deep bid (1500): microprice sits closer to the ask
+        expected = (Decimal("0.095") * 500 + Decimal("0.0952") * 1500) / 2000
+        assert book.microprice() == expected
+        assert book.microprice() > book.mid()
+
+    def test_level_updates(self, book):
+        book.update(BIDS, "0.0951", "100")  # Insert new best
+        book.update(ASKS, "0.0952", "0")    # Remove best
+        book.update(BIDS, "0.0949", "50")   # Modify in place
+
+        assert book.best_bid() == Decimal("0.0951")
+        assert book.best_ask() == Decimal("0.0953")
+        assert book.depth_at(BIDS, "0.0949") == Decimal("50")
+        assert book.level_count(BIDS) == 4
+        assert book.level_count(ASKS) == 2
+
+    def test_remove_missing_level_is_noop(self, book):
+        book.update(ASKS, "0.0999", "0")
+        assert book.level_count(ASKS) == 3
+
+    def test_depth_queries(self, book):
+        assert book.depth_at(ASKS, "0.0953") == Decimal("800")
+        assert book.depth_at(ASKS, "0.0954") == Decimal("0")
+        assert book.cumulative_depth(BIDS) == Decimal("4700")
+        assert book.cumulative_depth(BIDS, levels=2) == Decimal("3800")
+        assert book.cumulative_depth(BIDS, price="0.0949") == Decimal("3800")
+        assert book.cumulative_depth(ASKS, price="0.0954") == Decimal("1300")
+
+    def test_empty_book(self):
+        book = OrderBook.from_dict({"bids": [], "asks": []})
+        assert book.best_bid() is None
+        assert book.mid() is None
+        assert book.microprice() is None
+        assert book.cumulative_depth(ASKS) == Decimal("0")
+
+    def test_from_dict_with_data_envelope(self):
+        book = OrderBook.from_dict({'data': {'bids': [["1", "2"]], 'asks': [["3", "4"]], 'timestamp': 17}})
+        assert book.to_dict() == {'bids': [["1", "2"]], 'asks': [["3", "4"]], 'timestamp': 17}
+
+    def test_copy_is_independent(self, book):
+        top = book.copy(depth=1)
+        book.update(BIDS, "0.0950", "0")
+
+        assert top.levels(BIDS) == [["0.095", "1500"]]
+        assert top.level_count(ASKS) == 1
+        assert book.best_bid() == Decimal("0.0949")
+
+    def test_slots(self, book):
+        with pytest.raises(AttributeError):
+            book.extra = 1
+
+    def test_unknown_side(self, book):
+        with pytest.raises(ValueError):
+            book.update("buy", "1", "1")
@@ -0,0 +1,207 @@
+import pytest
+from decimal import Decimal
+from unittest.mock import MagicMock
+from trading.orders import OrderManager, OrderStatus
+from trading.wallet_manager import WalletManager
+
+SYMBOL = "SZARUSDT"
+
+def quote(side, price, amount="100"):
+    return {"symbol": SYMBOL, "side": side, "orderType": 1, "price": price, "amount": amount}
+
+def venue_order(order_id, side="BUY", price="0.094", qty="100", executed="0"):
+    return {"symbol": SYMBOL, "orderId": order_id, "side": side, "price": price,
+            "origQty": qty, "executedQty": executed, "status": "NEW"}
+
+@pytest.fixture
+def wallet():
+    wallet = WalletManager()
+    wallet.update_balance("USDT", Decimal("1000"))
+    wallet.update_balance("SZAR", Decimal("1000"))
+    return wallet
+
+@pytest.fixture
+def manager(wallet):
+    return OrderManager(wallet, reconcile_interval=0, grace=0)
+
+def reserve_and_add(manager, wallet, order_id, order):
+    """Add an order with its balance reserved, as the caller would"""
+    asset, amount = ("USDT", Decimal(order["amount"]) * Decimal(order["price"])) if order["side"] == 1 \
+        else ("SZAR", Decimal(order["amount"]))
+    assert wallet.reserve_balance(asset, amount)
+    return manager.add(order_id, SYMBOL, order, amount)
+
+class TestLifecycle:
+    def test_indexes(self, manager):
+        manager.add("1", SYMBOL, quote(1, "0.094"))
+        manager.add("2", SYMBOL, quote(1, "0.094"))
+        manager.add("3", SYMBOL, quote(2, "0.096"))
+
+        assert manager.get("1").status == OrderStatus.NEW
+        assert {o.order_id for o in manager.at_level(SYMBOL, "BUY", "0.0940")} == {"1", "2"}
+        assert [o.order_id for o in manager.at_level(SYMBOL, 2, Decimal("0.096"))] == ["3"]
+        assert set(manager.open_orders(SYMBOL)) == {"1", "2", "3"}
+        assert manager.open_orders("KASUSDT") == {}
+
+    def test_partial_then_filled_releases_reservation(self, manager, wallet):
+        reserve_and_add(manager, wallet, "1", quote(1, "0.1", "100"))
+        assert wallet.reserved_balances["USDT"] == Decimal("10")
+
+        order = manager.on_fill("1", Decimal("40"))
+        assert order.status == OrderStatus.PARTIAL
+        assert order.remaining == Decimal("60")
+        assert wallet.reserved_balances["USDT"] == Decimal("6")
+
+        order = manager.on_fill("1", Decimal("60"))
+        assert order.status == OrderStatus.FILLED
+        assert wallet.reserved_balances["USDT"] == 0
+        assert "1" not in manager
+        assert manager.at_level(SYMBOL, 1, "0.1") == []
+
+    def test_cancel_releases_reservation(self, manager, wallet):
+        reserve_and_add(manager, wallet, "1", quote(2, "0.1", "250"))
+        assert wallet.get_available_balance("SZAR") == Decimal("750")
+
+        assert manager.on_cancel("1").status == OrderStatus.CANCELED
+        assert wallet.get_available_balance("SZAR") == Decimal("1000")
+        assert len(manager) == 0
+
+    def test_reject_releases_reservation(self, manager, wallet):
+        wallet.reserve_balance("USDT", Decimal("5"))
+        order = manager.reject(SYMBOL, quote(1, "0.05"), Decimal("5"))
+
+        assert order.status == OrderStatus.REJECTED
+        assert wallet.reserved_balances["USDT"] == 0
+        assert manager.stats['rejected'] == 1
+
+    def test_fill_for_unknown_order(self, manager):
+        assert manager.on_fill("missing", Decimal("1")) is None
+        assert manager.stats['unknown_fills'] == 1
+
+    def test_overfill_is_capped(self, manager):
+        manager.add("1", SYMBOL, quote(1, "0.1", "10"))
+        order = manager.on_fill("1", Decimal("15"))
+        assert order.filled == Decimal("10")
+        assert order.status == OrderStatus.FILLED
+
+    def test_replace_all(self, manager):
+        manager.add("old", SYMBOL, quote(1, "0.09"))
+        manager.replace_all(SYMBOL, {"a": quote(1, "0.094"), "b": {}})
+
+        assert set(manager.open_orders(SYMBOL)) == {"a", "b"}
+        assert manager.stats['canceled'] == 1
+
+class TestReconcile:
+    def test_closes_missing_and_adopts_unknown(self, manager, wallet):
+        reserve_and_add(manager, wallet, "1", quote(1, "0.1", "100"))
+        manager.add("2", SYMBOL, quote(2, "0.11"))
+
+        counts = manager.reconcile(SYMBOL, {"code": 200, "data": [
+            venue_order("2", "SELL", "0.11"),
+            venue_order("9", "SELL", "0.12", qty="50", executed="20"),
+        ]})
+
+        assert counts == {'closed': 1, 'adopted': 1, 'partial': 0}
+        assert "1" not in manager
+        assert wallet.reserved_balances["USDT"] == 0
+        adopted = manager.open_orders(SYMBOL)["9"]
+        assert adopted["side"] == 2
+        assert adopted["amount"] == "30"
+        # Order 2 was tracked without a reservation; the adopted order's remainder is reserved
+        assert manager.get("9").reserved == Decimal("30")
+        assert wallet.reserved_balances["SZAR"] == Decimal("30")
+
+    def test_marks_partial_from_executed_qty(self, manager):
+        manager.add("1", SYMBOL, quote(1, "0.094"))
+        counts = manager.reconcile(SYMBOL, [venue_order("1", executed="10")])
+        assert counts['partial'] == 1
+        assert manager.get("1").status == OrderStatus.PARTIAL
+
+    def test_grace_period_keeps_new_orders(self, wallet):
+        manager = OrderManager(wallet, reconcile_interval=0, grace=60)
+        manager.add("1", SYMBOL, quote(1, "0.094"))
+        assert manager.reconcile(SYMBOL, [])['closed'] == 0
+        assert "1" in manager
+
+    def test_full_page_does_not_close(self, wallet):
+        manager = OrderManager(wallet, reconcile_interval=0, grace=0, limit=1)
+        manager.add("1", SYMBOL, quote(1, "0.094"))
+        manager.reconcile(SYMBOL, [venue_order("2")])
+        assert "1" in manager
+
+    def test_bad_response_changes_nothing(self, manager):
+        manager.add("1", SYMBOL, quote(1, "0.094"))
+        for response in (None, {"code": 500, "msg": "error"}):
+            assert manager.reconcile(SYMBOL, response)['closed'] == 0
+        assert "1" in manager
+        assert manager.stats['errors'] == 2
+
+    def test_reconcile_with_respects_interval(self, wallet):
+        manager = OrderManager(wallet, reconcile_interval=60, grace=0)
+        client = MagicMock()
+        client.get_open_orders.return_value = []
+
+        manager.reconcile_with(client, SYMBOL)
+        manager.reconcile_with(client, SYMBOL)
+        assert client.get_open_orders.call_count == 1
+        manager.reconcile_with(client, SYMBOL, force=True)
+        assert client.get_open_orders.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_reconcile_with_async(self, manager):
+        manager.add("1", SYMBOL, quote(1, "0.094"))
+
+        async def get_open_orders(symbol, limit):
+            return {"data": []}
+        client = MagicMock()
+        client.get_open_orders = get_open_orders
+
+        counts = await manager.reconcile_with_async(client, SYMBOL)
+        assert counts['closed'] == 1
+
+class TestMarketMakerIntegration:
+    def test_failed_placements_are_rejected(self, wallet):
+        from market_maker import MarketMaker
+        client = MagicMock()
+        client.supports_batch_orders = False
+        client.cancel_replace.return_value = {
+            'canceled': [], 'placed': [{'code': 200, 'data': {'orderId': '1'}}, None]
+        }
+        maker = MarketMaker(client, symbol=SYMBOL, wallet_manager=wallet)
+
+        maker.replace_quotes([quote(1, "0.094"), quote(2, "0.096")])
+
+        assert list(maker.active_orders) == ["1"]
+        assert maker.orders.stats['rejected'] == 1
+
+    def test_fills_from_execution_tracker(self, wallet):
+        from trading.executions import ExecutionTracker
+        from trading.position_tracker import PositionTracker
+        manager = OrderManager(wallet)
+        manager.add("7", SYMBOL, quote(1, "0.1", "100"))
+        client = MagicMock()
+        client.get_my_trades.side_effect = [
+            [],
+            [{"id": 1, "orderId": 7, "side": "BUY", "price": "0.1", "qty": "100", "time": 1}],
+        ]
+        tracker = ExecutionTracker(client, PositionTracker(), wallet, order_manager=manager, poll_interval=0)
+
+        tracker.poll(SYMBOL)
+        tracker.poll(SYMBOL)
+
+        assert "7" not in manager
+        assert manager.stats['filled'] == 1
+
+    def test_step_reconciles_when_due(self, wallet):
+        from market_maker import MarketMaker
+        client = MagicMock()
+        client.supports_batch_orders = False
+        client.get_order_book.return_value = None
+        client.get_open_orders.return_value = [venue_order("5")]
+        maker = MarketMaker(client, symbol=SYMBOL, wallet_manager=wallet)
+
+        maker.step()
+        maker.step()
+
+        client.get_open_orders.assert_called_once()
+        assert "5" in maker.active_orders
@@ -32,7 +32,7 @@ class TestPositionTracker:
         trade = position_tracker.trades[0]
         assert trade['symbol'] == symbol
         assert trade['amount'] == str(amount)
-        assert trade['price'] == str(price)
+        assert Decimal(trade['price']) == price  # Stored fixed-point; formatted without trailing zeros
         assert trade['side'] == 'buy'
         assert trade['position_after'] == str(amount)
 
@@ -130,4 +130,70 @@ class TestPositionTracker:
         
         # Position should remain unchanged
         assert position_tracker.get_position(symbol) == initial_position
-        assert len(position_tracker.trades) == initial_trades + 1  # Trade still recorded 
\ No newline at end of file
+        assert len(position_tracker.trades) == initial_trades + 1  # Trade still recorded 
+    def test_batch_update(self, position_tracker, symbol):
+        """Test a batch of fills updates the position once with per-fill records"""
+        position_tracker.update_position(symbol, Decimal('10'), Decimal('1.0'), True)
+        position_tracker.update_positions(symbol, [
+            (Decimal('100'), Decimal('1.0'), True),
+            (Decimal('30'), Decimal('1.1'), False),
+        ])
+
+        assert position_tracker.get_position(symbol) == Decimal('80')
+        assert [t['position_after'] for t in position_tracker.trades] == ['10', '110', '80']
+        assert position_tracker.trades[2]['side'] == 'sell'
+
+    def test_history_is_bounded(self, symbol):
+        """Test the trade history keeps only the most recent fills"""
+        position_tracker = PositionTracker(history_size=3)
+        for i in range(1, 6):
+            position_tracker.update_position(symbol, Decimal(i), Decimal('1.0'), True)
+
+        assert len(position_tracker.trades) == 3
+        assert position_tracker.trades.total == 5
+        assert [t['amount'] for t in position_tracker.trades] == ['3', '4', '5']
+        assert position_tracker.trades[-1]['position_after'] == '15'
+        assert position_tracker.trades.column('amount').tolist() == [3 * 10**8, 4 * 10**8, 5 * 10**8]
+        assert position_tracker.trades.column('symbol').tolist() == [symbol] * 3
+        assert position_tracker.get_stats(symbol)['volume'] == Decimal('15')  # Aggregates cover every fill
+        with pytest.raises(IndexError):
+            position_tracker.trades[3]
+
+    def test_pnl_and_entry_price(self, position_tracker, symbol):
+        """Test realized/unrealized PnL and average entry through a flip"""
+        position_tracker.update_position(symbol, Decimal('100'), Decimal('1.0'), True)
+        position_tracker.update_position(symbol, Decimal('100'), Decimal('1.2'), True)
+        assert position_tracker.average_entry_price(symbol) == Decimal('1.1')
+        assert position_tracker.unrealized_pnl(symbol, Decimal('1.3')) == Decimal('40')
+
+        position_tracker.update_position(symbol, Decimal('50'), Decimal('1.3'), False)
+        assert position_tracker.realized_pnl(symbol) == Decimal('10')
+        assert position_tracker.average_entry_price(symbol) == Decimal('1.1')
+
+        # Sell 200: closes 150 at a 0.1 loss each, opens 50 short at 1.0
+        position_tracker.update_position(symbol, Decimal('200'), Decimal('1.0'), False)
+        assert position_tracker.realized_pnl(symbol) == Decimal('-5')
+        assert position_tracker.average_entry_price(symbol) == Decimal('1')
+        assert position_tracker.unrealized_pnl(symbol, Decimal('0.9')) == Decimal('5')
+
+        position_tracker.update_position(symbol, Decimal('50'), Decimal('0.9'), True)
+        assert position_tracker.realized_pnl(symbol) == Decimal('0')
+        assert position_tracker.average_entry_price(symbol) is None
+
+    def test_volume_and_vwap(self, position_tracker, symbol):
+        """Test volume, turnover and VWAP across fills"""
+        assert position_tracker.vwap(symbol) is None
+        position_tracker.update_positions(symbol, [
+            (Decimal('100'), Decimal('1.0'), True),
+            (Decimal('300'), Decimal('1.2'), False),
+        ])
+
+        stats = position_tracker.get_stats(symbol, mark_price=Decimal('1.1'))
+        assert stats['trades'] == 2
+        assert stats['volume'] == Decimal('400')
+        assert stats['buy_volume'] == Decimal('100')
+        assert stats['sell_volume'] == Decimal('300')
+        assert stats['turnover'] == Decimal('460')
+        assert stats['vwap'] == Decimal('1.15')
+        assert stats['realized_pnl'] == Decimal('20')
+        assert stats['unrealized_pnl'] == Decimal('20')  # Short 200 from 1.2, marked at 1.1
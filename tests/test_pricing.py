@@ -0,0 +1,113 @@
+import math
+import pytest
+import numpy as np
+from decimal import Decimal
+from trading.pricing import AvellanedaStoikovModel, SymmetricModel, create_pricing_model
+from trading.position_tracker import PositionTracker
+from trading.risk_manager import RiskManager
+from trading.wallet_manager import WalletManager
+
+SYMBOL = "SZARUSDT"
+
+@pytest.fixture
+def model():
+    return AvellanedaStoikovModel(risk_aversion=2.5, intensity=100.0, horizon=1000)
+
+def make_risk_manager(pricing_model):
+    risk = RiskManager(PositionTracker(), WalletManager(), pricing_model=pricing_model)
+    risk.set_limits(SYMBOL, max_position=Decimal('1000'), max_order_size=Decimal('1000'),
+                    min_spread=Decimal('0.005'))
+    return risk
+
+class TestSymmetricModel:
+    def test_quotes_around_mid(self):
+        bid, ask = SymmetricModel().quote(100.0, 0.8, 0.01, 0.02)
+        assert bid == pytest.approx(98.0)
+        assert ask == pytest.approx(102.0)
+
+class TestAvellanedaStoikovModel:
+    def test_flat_inventory_is_symmetric(self, model):
+        bid, ask = model.quote(100.0, 0.0, 0.002, 0.0)
+        expected = 0.5 * 2.5 * 0.002 ** 2 * 1000 + math.log(1 + 2.5 / 100) / 2.5
+        assert 100 - bid == pytest.approx(100 * expected)
+        assert ask - 100 == pytest.approx(100 * expected)
+
+    def test_long_inventory_skews_down(self, model):
+        flat_bid, flat_ask = model.quote(100.0, 0.0, 0.002, 0.0)
+        bid, ask = model.quote(100.0, 0.5, 0.002, 0.0)
+
+        shift = 0.5 * 2.5 * 0.002 ** 2 * 1000
+        assert bid == pytest.approx(flat_bid - 100 * shift)
+        assert ask == pytest.approx(flat_ask - 100 * shift)
+        # Short inventory mirrors it
+        short_bid, short_ask = model.quote(100.0, -0.5, 0.002, 0.0)
+        assert short_ask - 100 == pytest.approx(100 - bid)
+
+    def test_spread_widens_with_volatility(self, model):
+        calm = model.quote(100.0, 0.0, 0.001, 0.0)
+        wild = model.quote(100.0, 0.0, 0.01, 0.0)
+        assert wild[1] - wild[0] > calm[1] - calm[0]
+
+    def test_min_spread_floor(self, model):
+        bid, ask = model.quote(100.0, 0.0, 0.0, 0.05)
+        assert (bid, ask) == (pytest.approx(95.0), pytest.approx(105.0))
+
+    def test_skewed_quote_never_crosses_mid(self, model):
+        bid, ask = model.quote(100.0, 1.0, 0.05, 0.01)
+        assert ask == pytest.approx(100.0)
+        bid, ask = model.quote(100.0, -1.0, 0.05, 0.01)
+        assert bid == pytest.approx(100.0)
+
+    def test_quote_many_matches_scalar(self, model):
+        mids = np.array([0.095, 0.1, 0.2])
+        inventory = np.array([-1.0, 0.2, 0.9])
+        bids, asks = model.quote_many(mids, inventory, 0.004, 0.001)
+        for i in range(3):
+            bid, ask = model.quote(mids[i], inventory[i], 0.004, 0.001)
+            assert bids[i] == pytest.approx(bid)
+            assert asks[i] == pytest.approx(ask)
+
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            AvellanedaStoikovModel(risk_aversion=0)
+
+class TestCreatePricingModel:
+    def test_by_name(self):
+        assert isinstance(create_pricing_model('symmetric'), SymmetricModel)
+        model = create_pricing_model('avellaneda_stoikov', horizon=10)
+        assert isinstance(model, AvellanedaStoikovModel)
+        assert model.horizon == 10
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            create_pricing_model('black_scholes')
+
+class TestRiskManagerPricing:
+    def test_default_model_keeps_recommended_spread(self):
+        risk = make_risk_manager(None)
+        risk.wallet_manager.update_balance('SZAR', Decimal('1000'))
+        risk.wallet_manager.update_balance('USDT', Decimal('1000'))
+
+        bid, ask = risk.get_quote_prices(SYMBOL, Decimal('0.1'), Decimal('0.01'))
+
+        spread = risk.get_recommended_spread(SYMBOL, Decimal('0.01'))
+        assert float(bid) == pytest.approx(float(Decimal('0.1') * (1 - spread)))
+        assert float(ask) == pytest.approx(float(Decimal('0.1') * (1 + spread)))
+
+    def test_inventory_from_position_tracker(self, model):
+        risk = make_risk_manager(model)
+        assert risk.get_inventory(SYMBOL) == 0.0
+        risk.position_tracker.update_position(SYMBOL, Decimal('250'), Decimal('0.1'), True)
+        assert risk.get_inventory(SYMBOL) == 0.25
+        risk.position_tracker.update_position(SYMBOL, Decimal('2250'), Decimal('0.1'), False)
+        assert risk.get_inventory(SYMBOL) == -1.0
+        assert risk.get_inventory("KASUSDT") == 0.0
+
+    def test_long_position_lowers_quotes(self, model):
+        risk = make_risk_manager(model)
+        flat = risk.get_quote_prices(SYMBOL, Decimal('0.1'), Decimal('0.002'))
+        risk.position_tracker.update_position(SYMBOL, Decimal('500'), Decimal('0.1'), True)
+        long = risk.get_quote_prices(SYMBOL, Decimal('0.1'), Decimal('0.002'))
+
+        assert long[0] < flat[0] and long[1] < flat[1]
+        assert float(long[1] - long[0]) == pytest.approx(float(flat[1] - flat[0]))
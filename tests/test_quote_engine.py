@@ -0,0 +1,91 @@
+import pytest
+from decimal import Decimal
+from config.api_client import FameexClient
+from market_maker import MarketMaker
+from trading.quote_engine import QuoteEngine, normalize_side
+
+SYMBOL = "SZARUSDT"
+
+def quote(side, price, amount="100"):
+    return {"symbol": SYMBOL, "side": side, "orderType": 1, "price": price, "amount": amount}
+
+@pytest.fixture
+def engine():
+    return QuoteEngine(tick_size=Decimal("0.0001"), price_tolerance=Decimal("0.001"), batch_size=10)
+
+@pytest.fixture
+def live():
+    return {"bid1": quote(1, "0.0940"), "ask1": quote(2, "0.0960")}
+
+class TestQuoteEngine:
+    def test_normalize_side(self):
+        assert normalize_side(1) == normalize_side("buy") == "BUY"
+        assert normalize_side("2") == normalize_side("SELL") == "SELL"
+        assert normalize_side(3) is None
+
+    def test_unchanged_quotes_are_kept(self, engine, live):
+        # Sub-tick drift from mid-price recalculation
+        plan = engine.plan(live, [quote(1, "0.09403"), quote(2, "0.09598")])
+
+        assert plan.is_empty
+        assert set(plan.keep) == {"bid1", "ask1"}
+        assert plan.requests == 0
+        assert plan.naive_requests == 2
+
+    def test_price_move_beyond_tolerance(self, engine, live):
+        plan = engine.plan(live, [quote(1, "0.0942"), quote(2, "0.0960")])
+
+        assert plan.cancel_ids == ["bid1"]
+        assert plan.place == [quote(1, "0.0942")]
+        assert list(plan.keep) == ["ask1"]
+
+    def test_relative_tolerance_wider_than_tick(self):
+        engine = QuoteEngine(tick_size=Decimal("0.0001"), price_tolerance=Decimal("0.01"))
+        plan = engine.plan({"b": quote(1, "0.0940")}, [quote(1, "0.0945")])
+        assert plan.is_empty
+
+    def test_size_and_type_changes_requote(self, engine, live):
+        plan = engine.plan(live, [quote(1, "0.0940", "150"), dict(quote(2, "0.0960"), orderType=2)])
+        assert sorted(plan.cancel_ids) == ["ask1", "bid1"]
+        assert len(plan.place) == 2
+
+    def test_levels_added_and_removed(self, engine, live):
+        desired = [quote(1, "0.0940"), quote(1, "0.0930")]
+        plan = engine.plan(live, desired)
+
+        assert plan.keep == {"bid1": live["bid1"]}
+        assert plan.cancel_ids == ["ask1"]
+        assert plan.place == [quote(1, "0.0930")]
+
+    def test_malformed_live_entries_cancelled(self, engine):
+        plan = engine.plan({"junk": {}}, [])
+        assert plan.cancel_ids == ["junk"]
+
+    def test_metrics(self, live):
+        engine = QuoteEngine(price_tolerance=Decimal("0.001"), batch_size=1)
+        engine.record(engine.plan(live, [quote(1, "0.0940"), quote(2, "0.0960")]))
+        engine.record(engine.plan(live, [quote(1, "0.0950"), quote(2, "0.0960")]))
+
+        stats = engine.get_stats()
+        assert stats['cycles'] == 2
+        assert stats['idle_cycles'] == 1
+        assert stats['requotes'] == 1
+        assert stats['requotes_avoided'] == 3
+        assert stats['requests_sent'] == 2
+        assert stats['requests_saved'] == 6
+
+class TestMarketMakerRequoting:
+    def test_unchanged_book_sends_nothing(self, mocker):
+        maker = MarketMaker(FameexClient("key", "secret", test_mode=True))
+        maker.wallet_manager.update_balance("USDT", Decimal("100"))
+        maker.wallet_manager.update_balance("SZAR", Decimal("1000"))
+        cancel_replace = mocker.spy(maker.client, "cancel_replace")
+        orders = [quote(1, "0.094"), quote(2, "0.096")]
+
+        maker.replace_quotes(orders)
+        maker.replace_quotes([quote(1, "0.09401"), quote(2, "0.096")])
+
+        assert cancel_replace.call_count == 1
+        assert len(maker.active_orders) == 2
+        assert maker.quote_engine.stats['idle_cycles'] == 1
+        assert maker.quote_engine.stats['requotes_avoided'] == 2
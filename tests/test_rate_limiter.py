@@ -0,0 +1,109 @@
+import asyncio
+import time
+import pytest
+from config.api_client import FameexClient
+from config.rate_limiter import RateLimiter, TokenBucket, Priority
+from tests.utils.mock_exchange_server import MockExchangeServer
+
+class TestTokenBucket:
+    def test_burst_then_throttle(self):
+        """Full bucket allows a burst, then paces at the refill rate"""
+        bucket = TokenBucket(capacity=5, period=0.1)
+
+        start = time.monotonic()
+        for _ in range(5):
+            assert bucket.acquire(Priority.ORDER) == 0.0
+        assert time.monotonic() - start < 0.02
+
+        assert bucket.acquire(Priority.ORDER) > 0
+        stats = bucket.stats['order']
+        assert stats['requests'] == 6
+        assert stats['throttled'] == 1
+        assert stats['wait_time'] > 0
+
+    def test_reserved_headroom_per_lane(self):
+        """Lower lanes cannot drain the tokens held back for cancels"""
+        bucket = TokenBucket(capacity=10, period=1000, reserve=2)
+
+        granted = {}
+        for priority in (Priority.QUERY, Priority.ORDER, Priority.CANCEL):
+            count = 0
+            while bucket._try_acquire(priority, registered=True) == 0.0:
+                bucket._waiting[priority] += 1  # Keep waiting counters balanced
+                count += 1
+            granted[priority] = count
+
+        assert granted == {Priority.QUERY: 6, Priority.ORDER: 2, Priority.CANCEL: 2}
+
+    def test_waiting_cancel_preempts_orders(self):
+        """New quotes yield while a cancel is queued"""
+        bucket = TokenBucket(capacity=10, period=1000)
+        bucket._waiting[Priority.CANCEL] = 1
+
+        assert bucket._try_acquire(Priority.ORDER, registered=False) > 0
+        assert bucket._waiting[Priority.ORDER] == 1
+
+    def test_backoff_empties_bucket(self):
+        bucket = TokenBucket(capacity=10, period=1)
+        bucket.backoff(0.5)
+
+        assert bucket.tokens <= -5
+        assert bucket._try_acquire(Priority.CANCEL, registered=False) > 0.5
+
+    @pytest.mark.asyncio
+    async def test_acquire_async(self):
+        bucket = TokenBucket(capacity=2, period=0.1)
+        waits = [await bucket.acquire_async(Priority.QUERY) for _ in range(3)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] > 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_its_lane(self):
+        """A waiter abandoned by wait_for must not block lower lanes after the bucket refills"""
+        bucket = TokenBucket(capacity=1, period=0.2)
+        await bucket.acquire_async(Priority.CANCEL)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(bucket.acquire_async(Priority.CANCEL), 0.01)
+        assert bucket._waiting == [0, 0, 0]
+
+        assert await asyncio.wait_for(bucket.acquire_async(Priority.QUERY), 1.0) > 0
+
+class TestRateLimiter:
+    def test_default_limits_from_config(self):
+        limiter = RateLimiter()
+
+        assert limiter.buckets['order'].capacity == 100
+        assert limiter.buckets['market_data'].capacity == 20
+        assert limiter.buckets['order'].rate == 50
+
+    def test_endpoint_classes(self):
+        limiter = RateLimiter()
+
+        assert limiter.classify("/sapi/v1/batchCancel") == (limiter.buckets['order'], Priority.CANCEL)
+        assert limiter.classify("/sapi/v1/order") == (limiter.buckets['order'], Priority.ORDER)
+        assert limiter.classify("/sapi/v1/depth") == (limiter.buckets['market_data'], Priority.QUERY)
+        assert limiter.classify("/sapi/v1/klines")[0] is limiter.buckets['market_data']
+
+    def test_client_requests_are_limited(self):
+        """FameexClient charges each request against its bucket"""
+        limiter = RateLimiter({"order": (100, 2.0), "market_data": (3, 0.3)}, reserve_fraction=0)
+        with MockExchangeServer() as server:
+            client = FameexClient("key", "secret", base_url=server.url, rate_limiter=limiter)
+            for _ in range(4):
+                client.get_order_book("SZARUSDT", 5)
+
+        stats = limiter.get_stats()['market_data']['query']
+        assert stats['requests'] == 4
+        assert stats['throttled'] == 1
+
+    def test_429_triggers_backoff(self):
+        limiter = RateLimiter()
+        with MockExchangeServer() as server:
+            server.rate_limited.add("/sapi/v1/depth")
+            client = FameexClient("key", "secret", base_url=server.url, rate_limiter=limiter)
+            assert client.get_order_book("SZARUSDT") is None
+
+        assert limiter.backoffs == 1
+        assert limiter.buckets['market_data'].tokens < 0
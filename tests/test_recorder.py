@@ -0,0 +1,149 @@
+import os
+import pytest
+import numpy as np
+from unittest.mock import Mock
+from backtest.events import load_recorded, BID, ASK, TRADE_BUY, TRADE_SELL, CLEAR
+from market_data.columnar import ColumnWriter, ColumnarFile, MarketDataStore, TRADE_COLUMNS, day_of
+from market_data.recorder import MarketDataRecorder, depth_rows, kline_rows, trade_rows
+
+DAY = 1700006400000  # 2023-11-15 00:00 UTC
+SCALE = 10 ** 8
+
+def trades(ts_list, start_id=1):
+    return {'ts': ts_list, 'id': list(range(start_id, start_id + len(ts_list))),
+            'side': [1] * len(ts_list), 'price': [SCALE] * len(ts_list), 'size': [2 * SCALE] * len(ts_list)}
+
+class TestColumnar:
+    def test_append_and_mmap(self, tmp_path):
+        writer = ColumnWriter(str(tmp_path), TRADE_COLUMNS, index_stride=4)
+        writer.append(trades([DAY + i for i in range(10)]))
+        writer.append(trades([DAY + 10 + i for i in range(3)], start_id=11))
+        writer.close()
+
+        data = ColumnarFile(str(tmp_path))
+
+        assert len(data) == 13
+        assert isinstance(data['ts'], np.memmap)
+        assert data['id'].tolist() == list(range(1, 14))
+        assert os.path.getsize(tmp_path / 'index.i64') == 4 * 16  # Rows 0, 4, 8, 12
+
+    @pytest.mark.parametrize("start, end, rows", [
+        (None, None, (0, 100)),
+        (DAY + 37, DAY + 50, (37, 50)),
+        (DAY + 40, None, (40, 100)),
+        (None, DAY + 1, (0, 1)),
+        (DAY - 5, DAY + 3, (0, 3)),
+        (DAY + 500, None, (100, 100)),
+        (DAY + 60, DAY + 10, (60, 60)),
+    ])
+    def test_time_range_seek(self, tmp_path, start, end, rows):
+        writer = ColumnWriter(str(tmp_path), TRADE_COLUMNS, index_stride=8)
+        writer.append(trades([DAY + i for i in range(100)]))
+        writer.close()
+
+        data = ColumnarFile(str(tmp_path))
+
+        assert data.row_range(start, end) == rows
+        assert data.between(start, end)['ts'].tolist() == [DAY + i for i in range(*rows)]
+
+    def test_torn_append_is_trimmed(self, tmp_path):
+        writer = ColumnWriter(str(tmp_path), TRADE_COLUMNS, index_stride=4)
+        writer.append(trades([DAY + i for i in range(6)]))
+        writer.close()
+        with open(tmp_path / 'ts.i64', 'ab') as f:
+            f.write(np.arange(3, dtype='<i8').tobytes())  # ts written, other columns lost
+
+        assert len(ColumnarFile(str(tmp_path))) == 6
+        writer = ColumnWriter(str(tmp_path), TRADE_COLUMNS)
+        assert writer.rows == 6
+        writer.append(trades([DAY + 6]))
+        writer.close()
+        assert ColumnarFile(str(tmp_path))['ts'].tolist() == [DAY + i for i in range(7)]
+
+    def test_column_mismatch(self, tmp_path):
+        ColumnWriter(str(tmp_path), TRADE_COLUMNS).close()
+        with pytest.raises(ValueError):
+            ColumnWriter(str(tmp_path), ('ts', 'price'))
+
+    def test_store_splits_days(self, tmp_path):
+        store = MarketDataStore(str(tmp_path))
+        store.append('szarusdt', 'trades', trades([DAY - 1, DAY, DAY + 1]))
+
+        assert store.days('SZARUSDT', 'trades') == ['2023-11-14', '2023-11-15']
+        assert len(store.open('SZARUSDT', 'trades', '2023-11-15')) == 2
+        assert day_of(DAY) == '2023-11-15'
+
+class TestRowParsing:
+    def test_depth_rows(self):
+        rows = depth_rows({'data': {'bids': [["0.0950", "10"]], 'asks': [["0.0952", "5"], ["0.0953", "1"]],
+                                    'timestamp': DAY}}, 0, 7)
+
+        assert rows['ts'] == [DAY] * 3
+        assert rows['seq'] == [7] * 3
+        assert rows['side'] == [0, 1, 1]
+        assert rows['price'][0] == 9500000
+        assert rows['size'][1] == 5 * SCALE
+
+    def test_trade_rows_skip_recorded(self):
+        response = {'data': [
+            {'id': 3, 'time': DAY + 2, 'price': '0.1', 'qty': '1', 'side': 'SELL'},
+            {'id': 2, 'time': DAY + 1, 'price': '0.1', 'qty': '1', 'side': 'BUY'},
+            {'id': 1, 'time': DAY, 'price': '0.1', 'qty': '1', 'side': 'BUY'},
+            {'price': 'missing fields'},
+        ]}
+
+        rows = trade_rows(response, after=(DAY, 1))
+
+        assert rows['id'] == [2, 3]
+        assert rows['side'] == [1, 2]
+
+    def test_kline_rows_skip_forming_bar(self):
+        response = [{'idx': DAY + i * 60000, 'open': '1', 'high': '2', 'low': '0.5',
+                     'close': '1.5', 'vol': '10'} for i in range(3)]
+
+        assert kline_rows(response)['ts'] == [DAY, DAY + 60000]
+        assert kline_rows(response, after=DAY)['ts'] == [DAY + 60000]
+
+class TestMarketDataRecorder:
+    @pytest.fixture
+    def client(self):
+        client = Mock()
+        client.get_order_book.side_effect = lambda symbol, limit: {'data': {
+            'bids': [["0.0950", "100"]], 'asks': [["0.0952", "80"]],
+            'timestamp': DAY + client.get_order_book.call_count * 1000}}
+        client.get_trades.return_value = {'data': [
+            {'id': 1, 'time': DAY + 500, 'price': '0.0951', 'qty': '5', 'side': 'BUY'},
+            {'id': 2, 'time': DAY + 1500, 'price': '0.0950', 'qty': '3', 'side': 'SELL'},
+        ]}
+        client.get_klines.return_value = []
+        return client
+
+    def test_records_and_replays(self, client, tmp_path):
+        recorder = MarketDataRecorder(client, ['szarusdt'], root=str(tmp_path), interval=0)
+        recorder.run(max_cycles=2)
+
+        assert recorder.stats == {'snapshots': 2, 'depth_rows': 4, 'trades': 2, 'klines': 0, 'errors': 0}
+        client.get_klines.assert_called_once()
+
+        events = load_recorded(str(tmp_path), 'SZARUSDT', '2023-11-15')
+        assert events.kind.tolist() == [TRADE_BUY, CLEAR, BID, ASK, TRADE_SELL, CLEAR, BID, ASK]
+        assert events.ts.tolist() == sorted(events.ts.tolist())
+
+    def test_restart_resumes_from_the_store(self, client, tmp_path):
+        MarketDataRecorder(client, ['SZARUSDT'], root=str(tmp_path), interval=0).run(max_cycles=2)
+
+        recorder = MarketDataRecorder(client, ['SZARUSDT'], root=str(tmp_path), interval=0)
+        recorder.run(max_cycles=1)
+
+        assert recorder.stats['trades'] == 0  # Both were recorded before the restart
+        store = MarketDataStore(str(tmp_path))
+        assert store.open('SZARUSDT', 'trades', '2023-11-15')['id'].tolist() == [1, 2]
+        assert store.open('SZARUSDT', 'depth', '2023-11-15')['seq'].tolist() == [1, 1, 2, 2, 3, 3]
+
+    def test_errors_do_not_stop_other_streams(self, client, tmp_path):
+        client.get_order_book.side_effect = ConnectionError("down")
+        recorder = MarketDataRecorder(client, ['SZARUSDT'], root=str(tmp_path), interval=0)
+        recorder.run(max_cycles=1)
+
+        assert recorder.stats['errors'] == 1
+        assert recorder.stats['trades'] == 2
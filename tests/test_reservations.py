@@ -0,0 +1,193 @@
+import asyncio
+import threading
+import pytest
+from decimal import Decimal
+from trading.orders import OrderManager
+from trading.wallet_manager import WalletManager, parse_account_balances
+from market_maker import MarketMaker
+
+SYMBOL = "SZARUSDT"
+
+def quote(side, price, amount="100", symbol=SYMBOL):
+    return {"symbol": symbol, "side": side, "orderType": 1, "price": price, "amount": amount}
+
+@pytest.fixture
+def wallet():
+    wallet = WalletManager()
+    wallet.update_balance("USDT", Decimal("15"))
+    wallet.update_balance("SZAR", Decimal("150"))
+    return wallet
+
+@pytest.fixture
+def manager(wallet):
+    return OrderManager(wallet, account_sync_interval=0)
+
+class FakeAsyncClient:
+    """Accepts every request after yielding to the event loop"""
+    supports_batch_orders = False
+    max_batch_size = 10
+
+    def __init__(self, account=None):
+        self.account = account
+        self.sent = []
+        self._next_id = 0
+
+    async def cancel_replace(self, symbol, cancel_ids, new_orders):
+        await asyncio.sleep(0)
+        canceled = [{'orderId': order_id} for order_id in cancel_ids]
+        placed = []
+        for order in new_orders:
+            self._next_id += 1
+            self.sent.append(order)
+            placed.append({'code': 200, 'data': {'orderId': str(self._next_id)}})
+        return {'canceled': canceled, 'placed': placed}
+
+    async def get_account_info(self):
+        return self.account
+
+class TestSubmission:
+    def test_reserves_on_submit(self, manager, wallet):
+        submission = manager.begin(SYMBOL, [], [quote(1, "0.1"), quote(2, "0.12")])
+        assert wallet.reserved_balances["USDT"] == Decimal("10.0")
+        assert wallet.reserved_balances["SZAR"] == Decimal("100")
+
+        manager.complete(submission, [], ["1", "2"])
+        assert manager.get("1").reserved == Decimal("10.0")
+        assert manager.reserved_totals() == {"USDT": Decimal("10.0"), "SZAR": Decimal("100")}
+
+    def test_unfunded_orders_are_dropped(self, manager, wallet):
+        submission = manager.begin(SYMBOL, [], [quote(1, "0.1"), quote(1, "0.09")])
+
+        assert len(submission.orders) == 1
+        assert wallet.get_available_balance("USDT") == Decimal("5.0")
+        assert manager.stats['unfunded'] == 1
+
+    def test_cancelled_quote_funds_its_replacement(self, manager, wallet):
+        manager.complete(manager.begin(SYMBOL, [], [quote(1, "0.1")]), [], ["1"])
+
+        # 10 USDT is held by order 1; only 5 is free, but its replacement
+        # takes over the funds it releases
+        submission = manager.begin(SYMBOL, ["1"], [quote(1, "0.11")])
+        assert len(submission.orders) == 1
+        manager.complete(submission, [{'orderId': "1"}], ["2"])
+
+        assert "1" not in manager
+        assert manager.get("2").reserved == Decimal("11.0")
+        assert wallet.reserved_balances["USDT"] == Decimal("11.0")
+
+    def test_failed_cancel_keeps_reservation(self, manager, wallet):
+        manager.complete(manager.begin(SYMBOL, [], [quote(1, "0.1")]), [], ["1"])
+
+        submission = manager.begin(SYMBOL, ["1"], [quote(1, "0.09")])
+        manager.complete(submission, [None], [])
+
+        assert manager.get("1").reserved == Decimal("10.0")
+        assert manager.stats['rejected'] == 1
+        assert wallet.reserved_balances["USDT"] == Decimal("10.0")
+
+    def test_fill_and_cancel_release(self, manager, wallet):
+        manager.complete(manager.begin(SYMBOL, [], [quote(1, "0.1"), quote(2, "0.12")]), [], ["1", "2"])
+
+        manager.on_fill("1", Decimal("100"))
+        manager.on_cancel("2")
+
+        assert wallet.reserved_balances["USDT"] == 0 and wallet.reserved_balances["SZAR"] == 0
+        assert manager.stats['filled'] == 1 and manager.stats['canceled'] == 1
+
+    def test_threads_never_overcommit(self, wallet):
+        manager = OrderManager(wallet)
+        wallet.update_balance("USDT", Decimal("100"))
+        submissions = []
+
+        def submit():
+            for _ in range(50):
+                submissions.append(manager.begin(SYMBOL, [], [quote(1, "0.1", "10")]))
+
+        threads = [threading.Thread(target=submit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        funded = sum(len(s.orders) for s in submissions)
+        assert funded == 100
+        assert wallet.reserved_balances["USDT"] == Decimal("100")
+
+class TestMarketMaker:
+    def maker(self, client, wallet, manager, symbol=SYMBOL):
+        return MarketMaker(client, symbol=symbol, wallet_manager=wallet, order_manager=manager)
+
+    async def test_concurrent_makers_share_funds(self, wallet, manager):
+        client = FakeAsyncClient()
+        makers = [self.maker(client, wallet, manager, symbol) for symbol in (SYMBOL, "KASUSDT")]
+
+        await asyncio.gather(*(
+            maker.replace_quotes_async([quote(1, "0.1", symbol=maker.symbol)]) for maker in makers
+        ))
+
+        # 15 USDT covers one 10 USDT bid, not both
+        assert len(client.sent) == 1
+        assert len(manager) == 1
+        assert wallet.reserved_balances["USDT"] == Decimal("10.0")
+
+    async def test_request_failure_releases(self, wallet, manager):
+        client = FakeAsyncClient()
+
+        async def fail(*args):
+            raise ConnectionError("down")
+        client.cancel_replace = fail
+        maker = self.maker(client, wallet, manager)
+
+        with pytest.raises(ConnectionError):
+            await maker.replace_quotes_async([quote(1, "0.1")])
+
+        assert wallet.reserved_balances["USDT"] == 0
+        assert len(manager) == 0
+
+class TestAccountSync:
+    def test_parse_account_balances(self):
+        response = {"balances": [{"asset": "usdt", "free": "10", "locked": "2.5"},
+                                 {"asset": "SZAR", "free": "100", "locked": "0"}, "junk"]}
+        assert parse_account_balances(response) == {"USDT": Decimal("12.5"), "SZAR": Decimal("100")}
+        assert parse_account_balances({"data": [{"coin": "KAS", "available": "1", "frozen": "1"}]}) == \
+            {"KAS": Decimal("2")}
+        assert parse_account_balances({"code": 500}) is None
+
+    def test_corrects_drift(self, manager, wallet):
+        manager.complete(manager.begin(SYMBOL, [], [quote(1, "0.1")]), [], ["1"])
+        wallet.reserved_balances["USDT"] += Decimal("3")  # Leaked reservation
+
+        drift = manager.sync_account({"balances": [{"asset": "USDT", "free": "10", "locked": "10"}]})
+
+        assert drift == {"USDT": Decimal("5")}
+        assert wallet.balances["USDT"] == Decimal("20")
+        assert wallet.reserved_balances["USDT"] == Decimal("10.0")
+
+    def test_keeps_reservations_of_submissions_in_flight(self, manager, wallet):
+        wallet.update_balance("USDT", Decimal("1000"))
+        manager.complete(manager.begin(SYMBOL, [], [quote(1, "1", "50")]), [], ["1"])
+        # A cancel-replace awaiting the venue: order 1's 50 pooled for its replacement, plus 850 more
+        submission = manager.begin(SYMBOL, ["1"], [quote(1, "1", "900")])
+        assert wallet.get_available_balance("USDT") == Decimal("100")
+
+        # Another symbol's step syncs the account meanwhile
+        manager.sync_account({"balances": [{"asset": "USDT", "free": "950", "locked": "50"}]})
+        assert wallet.reserved_balances["USDT"] == Decimal("900")
+        assert not manager.begin("KASUSDT", [], [quote(1, "1", "900", "KASUSDT")]).orders
+
+        manager.complete(submission, [{'orderId': "1"}], ["2"])
+        assert wallet.reserved_balances["USDT"] == Decimal("900")
+        assert manager.get("2").reserved == Decimal("900")
+
+    def test_bad_response_changes_nothing(self, manager, wallet):
+        assert manager.sync_account({"code": 500}) is None
+        assert wallet.balances["USDT"] == Decimal("15")
+        assert manager.stats['errors'] == 1
+
+    async def test_sync_account_with_async_respects_interval(self, wallet):
+        manager = OrderManager(wallet, account_sync_interval=60)
+        client = FakeAsyncClient(account={"balances": [{"asset": "USDT", "free": "20", "locked": "0"}]})
+
+        assert await manager.sync_account_with_async(client) == {"USDT": Decimal("5")}
+        assert await manager.sync_account_with_async(client) is None
+        assert manager.stats['account_syncs'] == 1
@@ -1,6 +1,7 @@
 import pytest
 from decimal import Decimal
-from trading.risk_manager import RiskManager
+import numpy as np
+from trading.risk_manager import RiskManager, RiskReason
 from trading.position_tracker import PositionTracker
 from trading.wallet_manager import WalletManager
 
@@ -211,4 +212,76 @@ class TestRiskManager:
             current_usdt = risk_manager.wallet_manager.get_available_balance('USDT')
             current_szar = risk_manager.wallet_manager.get_available_balance('SZAR')
             risk_manager.wallet_manager.update_balance('USDT', current_usdt - current_order)
-            risk_manager.wallet_manager.update_balance('SZAR', current_szar + current_order) 
\ No newline at end of file
+            risk_manager.wallet_manager.update_balance('SZAR', current_szar + current_order) 
+
+class TestCheckOrders:
+    @pytest.fixture
+    def limited(self, risk_manager, symbol):
+        risk_manager.set_limits(symbol, max_position=Decimal('300'),
+                                max_order_size=Decimal('100'), min_spread=Decimal('0.001'))
+        return risk_manager
+
+    @pytest.mark.parametrize("amount,price,is_buy,usdt,szar", [
+        ('50', '1.0', True, '10000', '10000'),
+        ('500', '1.0', True, '10000', '10000'),     # Position limit
+        ('250', '1.0', False, '100', '200'),        # Insufficient base
+        ('50', '1.0', False, '15000', '5000'),      # Worsens imbalance
+        ('50', '1.0', True, '15000', '5000'),       # Improves imbalance
+        ('200', '0.5', True, '300', '100'),         # Dynamic limit
+    ])
+    def test_single_order_matches_check_order(self, limited, symbol, amount, price, is_buy, usdt, szar):
+        limited.wallet_manager.update_balance('USDT', Decimal(usdt))
+        limited.wallet_manager.update_balance('SZAR', Decimal(szar))
+        expected = limited.check_order(symbol, Decimal(amount), Decimal(price), is_buy)
+
+        accepted, reasons = limited.check_orders(symbol, [Decimal(amount)], [Decimal(price)], [is_buy])
+        assert accepted.tolist() == [expected]
+        assert (reasons[0] == RiskReason.OK) == expected
+
+    def test_ladder_cumulative_position(self, limited, symbol):
+        accepted, reasons = limited.check_orders(
+            symbol, [100, 100, 100, 100, 100], [1.0, 0.99, 0.98, 1.01, 1.02],
+            [True, True, True, True, False]
+        )
+        # Fourth buy takes the cumulative position to 400 > 300; the sell is independent
+        assert accepted.tolist() == [True, True, True, False, True]
+        assert reasons[3] == RiskReason.POSITION_LIMIT
+
+    def test_ladder_cumulative_notional(self, limited, symbol):
+        limited.wallet_manager.update_balance('USDT', Decimal('100'))
+        limited.wallet_manager.update_balance('SZAR', Decimal('100'))
+
+        # Each order alone fits the 100 USDT, together they do not
+        assert limited.check_order(symbol, Decimal('0.6'), Decimal('100'), True)
+        accepted, reasons = limited.check_orders(symbol, [0.6, 0.6], [100.0, 100.0], [True, True])
+
+        assert accepted.tolist() == [True, False]
+        assert reasons[1] == RiskReason.INSUFFICIENT_BALANCE
+
+    def test_balance_ratio_after_each_fill(self, risk_manager, symbol):
+        risk_manager.set_limits(symbol, max_position=Decimal('10000'),
+                                max_order_size=Decimal('1000'), min_spread=Decimal('0.001'))
+        risk_manager.wallet_manager.update_balance('USDT', Decimal('15000'))
+        risk_manager.wallet_manager.update_balance('SZAR', Decimal('5000'))
+        risk_manager.position_tracker.positions[symbol] = Decimal('-6000')
+
+        # Buys move towards 1:1 until the ladder overshoots it
+        accepted, reasons = risk_manager.check_orders(
+            symbol, [3000, 3000, 3000], [1.0, 1.0, 1.0], [True] * 3
+        )
+        assert accepted.tolist() == [True, True, False]
+        assert reasons[2] == RiskReason.BALANCE_RATIO
+
+    def test_invalid_and_empty(self, limited, symbol):
+        accepted, reasons = limited.check_orders(symbol, [0, 10], [1.0, -1.0], [True, False])
+        assert not accepted.any()
+        assert set(reasons.tolist()) == {RiskReason.INVALID_ORDER}
+
+        accepted, reasons = limited.check_orders(symbol, [], [], [])
+        assert accepted.shape == reasons.shape == (0,)
+
+    def test_no_limits_rejects(self, risk_manager, symbol):
+        accepted, reasons = risk_manager.check_orders(symbol, np.array([50.0]), np.array([1.0]), [True])
+        assert not accepted[0]
+        assert reasons[0] == RiskReason.POSITION_LIMIT
+
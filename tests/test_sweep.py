@@ -0,0 +1,100 @@
+import pytest
+from decimal import Decimal
+from backtest import EventLogBuilder, ParameterSweep
+from backtest.sweep import backtest_kwargs, expand_grid, format_table, parse_param, rank
+from trading.pricing import AvellanedaStoikovModel
+from trading.symbols import SymbolInfo
+
+INFO = SymbolInfo('SZARUSDT', 'SZAR', 'USDT', tick_size=Decimal('0.0001'), lot_size=Decimal('1'))
+
+def make_events():
+    builder = EventLogBuilder()
+    builder.add_snapshot(0, [["0.0950", "1000"]], [["0.0952", "1000"]])
+    ts = 0
+    for i in range(40):
+        ts += 200
+        price = "0.0800" if i % 2 else "0.1100"
+        builder.add_trade(ts, i % 2 == 0, price, "100000")
+        ts += 200
+        builder.add_levels(ts, [["0.0950", str(1000 + i)]], [])
+    return builder.build()
+
+GRID = {'spread_percentage': [0.001, 0.01], 'volatility_multiplier': [1, 4]}
+
+def sweep(tmp_path, grid=GRID, **kwargs):
+    return ParameterSweep(make_events(), grid, symbol_info=INFO, workdir=str(tmp_path), **kwargs)
+
+class TestGrid:
+    def test_expand_grid(self):
+        configs = expand_grid({'a': [1, 2], 'b': ['x', 'y', 'z']})
+        assert len(configs) == 6
+        assert configs[0] == {'a': 1, 'b': 'x'}
+        assert configs[-1] == {'a': 2, 'b': 'z'}
+
+    def test_parse_param(self):
+        assert parse_param("spread_percentage=0.001, 0.002") == ('spread_percentage', [0.001, 0.002])
+        assert parse_param("order_book_depth=3,5") == ('order_book_depth', [3, 5])
+        assert parse_param("pricing_model=symmetric") == ('pricing_model', ['symmetric'])
+        with pytest.raises(ValueError):
+            parse_param("spread_percentage")
+
+    def test_backtest_kwargs(self):
+        kwargs = backtest_kwargs({'spread_percentage': 0.001, 'pricing_model': 'avellaneda_stoikov',
+                                  'risk_aversion': 5.0, 'order_book_depth': 3})
+        assert kwargs['spread_percentage'] == Decimal('0.001')
+        assert kwargs['order_book_depth'] == 3
+        assert isinstance(kwargs['pricing_model'], AvellanedaStoikovModel)
+        assert kwargs['pricing_model'].risk_aversion == 5.0
+        assert 'risk_aversion' not in kwargs
+
+class TestParameterSweep:
+    def test_ranked_results(self, tmp_path):
+        rows = sweep(tmp_path, processes=1).run()
+
+        assert len(rows) == 4
+        assert {(r['spread_percentage'], r['volatility_multiplier']) for r in rows} == \
+            {(s, v) for s in GRID['spread_percentage'] for v in GRID['volatility_multiplier']}
+        pnls = [r['pnl'] for r in rows]
+        assert pnls == sorted(pnls, reverse=True)
+        assert any(r['fills'] > 0 for r in rows)
+
+    def test_rank_by(self, tmp_path):
+        rows = sweep(tmp_path, processes=1, rank_by='fills').run()
+        fills = [r['fills'] for r in rows]
+        assert fills == sorted(fills, reverse=True)
+
+    def test_process_pool_matches_inline(self, tmp_path):
+        inline = sweep(tmp_path, processes=1).run()
+        pooled = sweep(tmp_path, processes=2).run()
+
+        key = lambda r: r['config']
+        assert [(r['config'], r['pnl'], r['fills']) for r in sorted(inline, key=key)] == \
+            [(r['config'], r['pnl'], r['fills']) for r in sorted(pooled, key=key)]
+
+    def test_saved_event_log_is_used_in_place(self, tmp_path):
+        directory = str(tmp_path / "events")
+        make_events().save(directory)
+        rows = ParameterSweep(directory, {'spread_percentage': [0.001]}, symbol_info=INFO,
+                              processes=1).run()
+        assert rows[0]['events'] == len(make_events())
+
+    def test_failed_configuration_ranks_last(self, tmp_path):
+        rows = sweep(tmp_path, {'pricing_model': ['symmetric', 'unknown']}, processes=1,
+                     spread_percentage=Decimal('0.001')).run()
+
+        assert 'error' not in rows[0]
+        assert rows[-1]['pricing_model'] == 'unknown'
+        assert rows[-1]['error'].startswith('ValueError')
+
+def test_format_table():
+    rows = rank([
+        {'config': 0, 'spread_percentage': 0.001, 'pnl': 1.5, 'fills': 3},
+        {'config': 1, 'spread_percentage': 0.002, 'pnl': 2.25, 'fills': 1},
+        {'config': 2, 'spread_percentage': 0.003, 'error': 'ValueError: bad'},
+    ])
+    lines = format_table(rows, ['spread_percentage'], ('pnl', 'fills')).splitlines()
+
+    assert lines[0].split() == ['rank', 'spread_percentage', 'pnl', 'fills']
+    assert lines[1].split() == ['1', '0.002', '2.25', '1']
+    assert lines[2].split() == ['2', '0.001', '1.5', '3']
+    assert lines[3].split() == ['3', '0.003', 'ValueError:', 'bad']
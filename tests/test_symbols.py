@@ -0,0 +1,124 @@
+import pytest
+from decimal import Decimal
+from config.api_client import FameexClient
+from config.async_api_client import AsyncFameexClient
+from trading.risk_manager import RiskManager
+from trading.position_tracker import PositionTracker
+from trading.symbols import SymbolInfo, SymbolRegistry, split_symbol, normalize_symbol
+from trading.wallet_manager import WalletManager
+from tests.utils.mock_exchange_server import MockExchangeServer, DEFAULT_SYMBOLS
+
+@pytest.fixture
+def registry():
+    registry = SymbolRegistry()
+    registry.load({"symbols": DEFAULT_SYMBOLS})
+    return registry
+
+class TestSplitSymbol:
+    @pytest.mark.parametrize("symbol,expected", [
+        ("SZARUSDT", ("SZAR", "USDT")),
+        ("SZAR-USDT", ("SZAR", "USDT")),
+        ("kas_usdt", ("KAS", "USDT")),
+        ("CUSDUSDT", ("CUSD", "USDT")),
+        ("XECUSDT", ("XEC", "USDT")),
+        ("KASBTC", ("KAS", "BTC")),
+        ("SZARKAS", ("SZAR", "KAS")),
+    ])
+    def test_split(self, symbol, expected):
+        assert split_symbol(symbol) == expected
+
+    def test_normalize(self):
+        assert normalize_symbol("szar-usdt") == normalize_symbol("SZAR/USDT") == "SZARUSDT"
+
+class TestSymbolInfo:
+    def test_from_exchange_precision(self, registry):
+        info = registry.get("SZARUSDT")
+        assert info.assets == ("SZAR", "USDT")
+        assert info.tick_size == Decimal("0.0001")
+        assert info.lot_size == Decimal("1")
+        assert info.min_qty == Decimal("10")
+        assert info.min_notional == Decimal("1")
+
+    def test_quantize(self, registry):
+        info = registry.get("SZARUSDT")
+        assert info.quantize_price(Decimal("0.093166"), side=1) == Decimal("0.0931")
+        assert info.quantize_price(Decimal("0.093166"), side=2) == Decimal("0.0932")
+        assert info.quantize_price(Decimal("0.093166")) == Decimal("0.0932")
+        assert info.quantize_size(Decimal("99.9")) == Decimal("99")
+        assert str(info.quantize_price(Decimal("0.0931"), side=1)) == "0.0931"
+
+    def test_explicit_tick_size(self):
+        info = SymbolInfo.from_exchange({"symbol": "btcusdt", "tickSize": "0.5", "stepSize": "0.001"})
+        assert info.quantize_price(Decimal("100.7"), side=1) == Decimal("100.5")
+        assert info.assets == ("BTC", "USDT")
+
+    def test_minimums(self, registry):
+        info = registry.get("SZARUSDT")
+        assert info.meets_minimums(Decimal("100"), Decimal("0.095"))
+        assert not info.meets_minimums(Decimal("5"), Decimal("1"))      # Below min qty
+        assert not info.meets_minimums(Decimal("10"), Decimal("0.05"))  # Below min notional
+
+class TestSymbolRegistry:
+    def test_lookup_by_any_spelling(self, registry):
+        info = registry.get("SZARUSDT")
+        assert registry.get("szarusdt") is info
+        assert registry.get("SZAR-USDT") is info
+        assert "szar_usdt" in registry
+        assert len(registry) == 2
+
+    def test_unknown_symbol_is_derived_and_cached(self, registry):
+        info = registry.get("XECUSDT")
+        assert info.assets == ("XEC", "USDT")
+        assert registry.get("XECUSDT") is info
+
+    def test_load_replaces_derived_entries(self):
+        registry = SymbolRegistry()
+        derived = registry.get("szar-usdt")
+        registry.load(DEFAULT_SYMBOLS)
+        assert registry.get("szar-usdt") is not derived
+        assert registry.get("szar-usdt").tick_size == Decimal("0.0001")
+
+    def test_malformed_entries_skipped(self):
+        assert SymbolRegistry().load([{"pricePrecision": 2}, {"symbol": "kasusdt"}]) == 1
+
+    def test_refresh_from_clients(self):
+        with MockExchangeServer() as server:
+            registry = SymbolRegistry()
+            assert registry.refresh(FameexClient("key", "secret", base_url=server.url)) == 2
+            assert registry.get("KASUSDT").lot_size == Decimal("0.01")
+
+    @pytest.mark.asyncio
+    async def test_refresh_async(self):
+        with MockExchangeServer() as server:
+            async with AsyncFameexClient("key", "secret", base_url=server.url) as client:
+                registry = SymbolRegistry()
+                assert await registry.refresh_async(client) == 2
+
+class TestRegistryConsumers:
+    def test_wallet_handles_unseparated_symbols(self, registry):
+        wallet = WalletManager(registry)
+        wallet.update_balance('KAS', Decimal('10'))
+        wallet.update_balance('USDT', Decimal('100'))
+
+        assert wallet.can_place_order(1, 'SZARUSDT', Decimal('100'), Decimal('0.095'))
+        assert not wallet.can_place_order(2, 'SZARUSDT', Decimal('100'), Decimal('0.095'))
+        assert not wallet.can_place_order(1, 'SZARUSDT', Decimal('5'), Decimal('0.095'))
+
+    def test_risk_manager_shares_wallet_registry(self, registry):
+        wallet = WalletManager(registry)
+        risk = RiskManager(PositionTracker(), wallet)
+        assert risk.symbols is registry
+
+    def test_market_maker_quantizes_quotes(self, registry):
+        from unittest.mock import Mock
+        from market_maker import MarketMaker
+        maker = MarketMaker(Mock(), symbol_registry=registry)
+        for asset in ('KAS', 'USDT', 'SZAR'):
+            maker.wallet_manager.update_balance(asset, Decimal('10000'))
+
+        orders = maker.calculate_new_orders({'bids': [["0.0950", "100"]], 'asks': [["0.0952", "100"]]})
+
+        assert {o["side"] for o in orders} == {1, 2}
+        assert all(len(o["price"].split(".")[1]) == 4 for o in orders)
+        assert all(o["amount"].isdigit() for o in orders)
+        assert orders[0]["amount"] == "100"
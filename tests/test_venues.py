@@ -0,0 +1,113 @@
+import time
+from decimal import Decimal
+from unittest.mock import AsyncMock
+import pytest
+from config.api_client import FameexClient
+from config.async_api_client import AsyncFameexClient
+from market_data.order_book import OrderBook
+from venues import MockVenue, SmartOrderRouter, Venue, create_async_client, create_client, register_venue
+
+SYMBOL = "SZARUSDT"
+
+def static_venue(name, bids, asks, maker_fee="0", taker_fee="0"):
+    """Venue whose book is set directly, without a client"""
+    venue = Venue(name, AsyncMock(), maker_fee, taker_fee)
+    venue.book = OrderBook.from_levels(bids, asks, SYMBOL)
+    return venue
+
+def test_registry_creates_clients():
+    assert isinstance(create_client("FameEX", "key", "secret"), FameexClient)
+    client = create_async_client("mock", "key", "secret", base_url="http://127.0.0.1:1")
+    assert isinstance(client, AsyncFameexClient) and client.base_url == "http://127.0.0.1:1"
+    with pytest.raises(ValueError):
+        create_client("nowhere", "key", "secret")
+
+    register_venue("async_only", async_factory=lambda *args, **kwargs: "client")
+    assert create_async_client("async_only", "key", "secret") == "client"
+    with pytest.raises(ValueError):
+        create_client("async_only", "key", "secret")
+
+async def test_mock_venue_speaks_the_fameex_api():
+    async with MockVenue.synthetic(SYMBOL, mid="0.1", step="0.01", levels=3, size="100",
+                                   balances={"USDT": "1000", "SZAR": "0"}) as venue:
+        async with AsyncFameexClient("key", "secret", base_url=venue.url) as client:
+            book = await client.get_order_book(SYMBOL, 2)
+            assert book['data']['asks'] == [["0.11", "100"], ["0.12", "100"]]
+
+            taken = await client.place_order(SYMBOL, "BUY", "LIMIT", "150", "0.12")
+            assert taken['status'] == 'FILLED'
+            resting = await client.place_order(SYMBOL, "BUY", "LIMIT", "50", "0.05")
+            assert [o['orderId'] for o in await client.get_open_orders(SYMBOL)] == [resting['orderId']]
+
+            venue.trade("SELL", "20")
+            trades = await client.get_my_trades(SYMBOL, from_id=3)
+            assert [(t['price'], t['qty'], t['isMaker']) for t in trades] == [("0.05", "20", True)]
+            assert (await client.cancel_orders(SYMBOL, [resting['orderId']]))[0]['status'] == 'CANCELED'
+
+            balances = {b['asset']: b for b in (await client.get_account_info())['balances']}
+            # 100 @ 0.11 + 50 @ 0.12 + 20 @ 0.05
+            assert balances['USDT']['free'] == "982" and balances['USDT']['locked'] == "0"
+            assert balances['SZAR']['free'] == "170"
+
+def test_plan_splits_by_fee_adjusted_price():
+    cheap = static_venue("cheap", [], [["1.00", "10"], ["1.02", "10"]], taker_fee="0.02")
+    fair = static_venue("fair", [], [["1.01", "15"]], taker_fee="0")
+    router = SmartOrderRouter([cheap, fair], SYMBOL)
+
+    legs = {leg.venue.name: leg for leg in router.plan("BUY", "20")}
+    # 1.01 on "fair" beats 1.00 * 1.02 on "cheap"
+    assert legs["fair"].amount == Decimal("15") and legs["fair"].price == Decimal("1.01")
+    assert legs["cheap"].amount == Decimal("5") and legs["cheap"].price == Decimal("1")
+    assert legs["cheap"].cost == Decimal("5.1")
+
+    assert [leg.venue.name for leg in router.plan("BUY", "100", limit_price="1.005")] == ["cheap"]
+    assert router.plan("SELL", "1") == []
+
+def test_consolidated_book_merges_levels():
+    a = static_venue("a", [["0.99", "5"]], [["1.01", "5"]])
+    b = static_venue("b", [["0.99", "7"], ["0.98", "1"]], [["1.02", "3"]])
+    book = SmartOrderRouter([a, b], SYMBOL).consolidated()
+    assert book.levels("bids") == [["0.99", "12"], ["0.98", "1"]]
+    assert book.levels("asks") == [["1.01", "5"], ["1.02", "3"]]
+
+def test_quote_venue_avoids_crossing_and_fees():
+    tight = static_venue("tight", [["0.99", "5"]], [["1.00", "5"]], maker_fee="0")
+    wide = static_venue("wide", [["0.98", "5"]], [["1.03", "5"]], maker_fee="0.001")
+    router = SmartOrderRouter([tight, wide], SYMBOL)
+
+    assert router.quote_venue("BUY", "1.00").name == "wide"  # Would take on "tight"
+    assert router.quote_venue("BUY", "0.99").name == "tight"  # Lower maker fee
+    assert router.quote_venue("BUY", "1.05") is None
+
+async def test_router_calls_venues_concurrently():
+    async with MockVenue.synthetic(SYMBOL, mid="0.1", latency=0.2) as slow, \
+               MockVenue.synthetic(SYMBOL, mid="0.1", latency=0.2) as other, \
+               MockVenue.synthetic(SYMBOL, mid="0.1", latency=1.0) as stuck:
+        clients = [AsyncFameexClient("key", "secret", base_url=venue.url) for venue in (slow, other, stuck)]
+        router = SmartOrderRouter([Venue(name, client) for name, client in zip(("slow", "other", "stuck"), clients)],
+                                  SYMBOL, timeout=0.5)
+        started = time.perf_counter()
+        assert await router.refresh() == {"slow": True, "other": True, "stuck": False}
+        assert time.perf_counter() - started < 0.9
+        assert router.stats['failures']["stuck"] == 1
+
+        results = await router.execute("BUY", "1500")
+        assert sorted(leg.venue.name for leg, _ in results) == ["other", "slow"]
+        assert all(response['status'] == 'FILLED' for _, response in results)
+        assert slow.stats['fills'] + other.stats['fills'] == 2
+        for client in clients:
+            await client.close()
+
+async def test_place_quotes_tags_venues():
+    async with MockVenue.synthetic(SYMBOL, mid="0.1", step="0.01", levels=2) as venue:
+        async with AsyncFameexClient("key", "secret", base_url=venue.url) as client:
+            router = SmartOrderRouter([Venue("mock", client)], SYMBOL)
+            await router.refresh()
+            results = await router.place_quotes([
+                {'side': 'BUY', 'order_type': 'LIMIT', 'volume': '10', 'price': '0.095'},
+                {'side': 'BUY', 'order_type': 'LIMIT', 'volume': '10', 'price': '0.2'},  # Crosses
+            ])
+            assert results[0]['venue'] == "mock" and results[1] is None
+            assert list(venue.orders) == [results[0]['orderId']]
+            canceled = await router.cancel({"mock": [results[0]['orderId']]})
+            assert canceled["mock"][0]['status'] == 'CANCELED'
@@ -0,0 +1,110 @@
+import math
+import random
+import statistics
+import pytest
+from decimal import Decimal
+from unittest.mock import Mock
+from trading.volatility import (
+    RollingVariance, EwmaVariance, VolatilityEstimator,
+    parse_klines, parkinson_volatility, garman_klass_volatility
+)
+
+@pytest.fixture
+def prices():
+    random.seed(7)
+    price, series = 0.095, []
+    for _ in range(2500):
+        price *= 1 + random.gauss(0, 0.002)
+        series.append(price)
+    return series
+
+def _returns(series):
+    return [(b - a) / a for a, b in zip(series, series[1:])]
+
+class TestRollingVariance:
+    def test_matches_statistics_stdev(self, prices):
+        returns = _returns(prices)
+        rolling = RollingVariance(100)
+        for i, r in enumerate(returns, 1):
+            rolling.add(r)
+            if i in (2, 50, 100, 101, 777, len(returns)):
+                expected = statistics.stdev(returns[max(0, i - 100):i])
+                assert rolling.stdev() == pytest.approx(expected, rel=1e-9)
+
+    def test_not_enough_values(self):
+        rolling = RollingVariance(10)
+        assert rolling.stdev() is None
+        rolling.add(0.1)
+        assert rolling.variance() is None
+
+    def test_window_too_small(self):
+        with pytest.raises(ValueError):
+            RollingVariance(1)
+
+class TestEwmaVariance:
+    def test_recursion(self):
+        ewma = EwmaVariance(alpha=0.5)
+        ewma.add(0.02)
+        ewma.add(0.0)
+        assert ewma.variance() == pytest.approx(0.0002)
+
+    def test_from_halflife(self):
+        assert EwmaVariance.from_halflife(1).alpha == pytest.approx(0.5)
+
+class TestRangeEstimators:
+    KLINES = [
+        {"open": "0.0950", "high": "0.0960", "low": "0.0945", "close": "0.0955", "vol": "1200"},
+        {"open": "0.0955", "high": "0.0958", "low": "0.0940", "close": "0.0942", "vol": "900"},
+        {"open": "bad", "high": "0.1", "low": "0.1", "close": "0.1"},
+    ]
+
+    def test_parse_klines(self):
+        bars = parse_klines({'data': self.KLINES})
+        assert bars == [(0.095, 0.096, 0.0945, 0.0955), (0.0955, 0.0958, 0.094, 0.0942)]
+        assert parse_klines(None) == []
+
+    def test_parkinson(self):
+        bars = parse_klines(self.KLINES)
+        expected = math.sqrt(sum(math.log(h / l) ** 2 for _, h, l, _ in bars) / (4 * math.log(2) * 2))
+        assert parkinson_volatility(bars) == pytest.approx(expected)
+        assert parkinson_volatility([]) is None
+
+    def test_garman_klass_below_range_only(self):
+        bars = parse_klines(self.KLINES)
+        assert 0 < garman_klass_volatility(bars) < parkinson_volatility(bars) * 1.5
+
+class TestVolatilityEstimator:
+    def test_multiple_windows(self, prices):
+        estimator = VolatilityEstimator(windows=(100, 1000), ewma_alpha=0.06)
+        for price in prices:
+            estimator.update(price)
+
+        returns = _returns(prices)
+        assert estimator.stdev() == pytest.approx(statistics.stdev(returns[-100:]), rel=1e-9)
+        assert estimator.stdev(1000) == pytest.approx(statistics.stdev(returns[-1000:]), rel=1e-9)
+        assert set(estimator.snapshot()) == {'rolling_100', 'rolling_1000', 'ewma'}
+
+    def test_fallbacks(self):
+        estimator = VolatilityEstimator()
+        assert estimator.get_volatility() == Decimal('0.01')
+
+        estimator.load_klines(TestRangeEstimators.KLINES)
+        assert estimator.get_volatility() == Decimal(str(estimator.range_volatility['garman_klass']))
+
+        for price in (0.095, 0.096, 0.094):
+            estimator.update(price)
+        assert estimator.get_volatility() == Decimal(str(estimator.stdev()))
+
+    def test_market_maker_uses_estimator(self):
+        from market_maker import MarketMaker
+        client = Mock()
+        client.get_klines.return_value = TestRangeEstimators.KLINES
+        maker = MarketMaker(client)
+
+        assert maker.load_kline_volatility()['parkinson'] > 0
+        maker.calculate_new_orders({'bids': [["0.0950", "100"]], 'asks': [["0.0952", "100"]]})
+        maker.calculate_new_orders({'bids': [["0.0960", "100"]], 'asks': [["0.0962", "100"]]})
+        maker.calculate_new_orders({'bids': [["0.0940", "100"]], 'asks': [["0.0942", "100"]]})
+
+        assert maker.volatility.windows[100].count == 2
+        assert maker.calculate_volatility() == maker.volatility.get_volatility()
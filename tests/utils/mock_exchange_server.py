@@ -0,0 +1,158 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+DEFAULT_SYMBOLS = [
+    {"symbol": "szarusdt", "baseAsset": "SZAR", "quoteAsset": "USDT",
+     "pricePrecision": 4, "quantityPrecision": 0, "limitVolumeMin": "10", "limitAmountMin": "1"},
+    {"symbol": "kasusdt", "baseAsset": "KAS", "quoteAsset": "USDT",
+     "pricePrecision": 5, "quantityPrecision": 2, "limitVolumeMin": "1", "limitAmountMin": "1"},
+]
+
+DEFAULT_ORDER_BOOK = {
+    "bids": [["0.0950", "1500"], ["0.0949", "2300"], ["0.0948", "900"]],
+    "asks": [["0.0952", "1200"], ["0.0953", "800"], ["0.0955", "3100"]],
+}
+
+class _MockExchangeHandler(BaseHTTPRequestHandler):
+    """Minimal FameEX-shaped REST handler with configurable latency"""
+    protocol_version = "HTTP/1.1"  # Keep-alive so pooled clients reuse connections
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method: str, params: Dict[str, Any]) -> None:
+        server = self.server
+        server.record_request(method, urlparse(self.path).path, params)
+        if server.latency:
+            time.sleep(server.latency)
+
+        path = urlparse(self.path).path
+        if path in server.rate_limited:
+            self._send_json({"code": 429, "msg": "Too many requests"}, status=429,
+                            headers={"Retry-After": str(server.retry_after)})
+            return
+        handler = server.routes.get((method, path))
+        if handler is None:
+            self._send_json({"code": 404, "msg": f"Unknown endpoint {path}"}, status=404)
+            return
+        status, payload = handler(params)
+        self._send_json(payload, status=status)
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self._handle("GET", {k: v[0] for k, v in query.items()})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        self._handle("POST", json.loads(raw) if raw else {})
+
+
+class MockExchangeServer(ThreadingHTTPServer):
+    """Local stand-in for the FameEX REST API
+
+    Runs in a background thread; use as a context manager and point a
+    client's ``base_url`` at ``server.url``.
+    """
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0, order_book: Optional[Dict] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _MockExchangeHandler)
+        self.latency = latency
+        self.order_book = order_book or DEFAULT_ORDER_BOOK
+        self.requests = []
+        self.rate_limited = set()  # Paths answered with 429
+        self.retry_after = 1
+        self._lock = threading.Lock()
+        self._order_seq = 0
+        self._thread = None
+        self.routes = {
+            ("GET", "/sapi/v1/depth"): self._depth,
+            ("GET", "/sapi/v1/ticker"): self._ticker,
+            ("GET", "/sapi/v1/symbols"): self._symbols,
+            ("POST", "/sapi/v1/order"): self._order,
+            ("POST", "/sapi/v1/cancel"): self._cancel,
+            ("POST", "/sapi/v1/batchOrders"): self._batch_orders,
+            ("POST", "/sapi/v1/batchCancel"): self._batch_cancel,
+        }
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_request(self, method: str, path: str, params: Dict[str, Any]) -> None:
+        with self._lock:
+            self.requests.append((method, path, params))
+
+    def _depth(self, params: Dict[str, Any]):
+        limit = int(params.get("limit", 100))
+        return 200, {
+            "time": int(time.time() * 1000),
+            "bids": self.order_book["bids"][:limit],
+            "asks": self.order_book["asks"][:limit],
+        }
+
+    def _ticker(self, params: Dict[str, Any]):
+        best_bid = self.order_book["bids"][0][0]
+        best_ask = self.order_book["asks"][0][0]
+        return 200, {"time": int(time.time() * 1000), "buy": best_bid, "sell": best_ask}
+
+    def _symbols(self, params: Dict[str, Any]):
+        return 200, {"symbols": DEFAULT_SYMBOLS}
+
+    def _next_order_id(self) -> str:
+        with self._lock:
+            self._order_seq += 1
+            return str(self._order_seq)
+
+    def _order(self, params: Dict[str, Any]):
+        order_id = self._next_order_id()
+        return 200, {
+            "orderId": order_id,
+            "symbol": params.get("symbol"),
+            "side": params.get("side"),
+            "price": params.get("price"),
+            "volume": params.get("volume"),
+            "status": "NEW",
+        }
+
+    def _cancel(self, params: Dict[str, Any]):
+        return 200, {"orderId": params.get("orderId"), "status": "CANCELED"}
+
+    def _batch_orders(self, params: Dict[str, Any]):
+        return 200, {"ids": [self._next_order_id() for _ in params.get("orders", [])]}
+
+    def _batch_cancel(self, params: Dict[str, Any]):
+        return 200, {"success": list(params.get("orderIds", [])), "failed": []}
+
+    def start(self) -> "MockExchangeServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "MockExchangeServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
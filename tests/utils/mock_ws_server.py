@@ -0,0 +1,67 @@
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, List, Union
+from aiohttp import web, WSMsgType
+from aiohttp.test_utils import TestServer
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+def load_frames(name: str) -> List[Dict]:
+    """Load recorded WebSocket frames from a JSONL fixture"""
+    with open(FIXTURES_DIR / name) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class ReplayWebSocketServer:
+    """Local WebSocket stand-in that replays recorded frames after a subscription
+
+    Frames are sent gzip-compressed like the FameEX market stream unless
+    ``compress`` is False. The connection is closed after the last frame.
+    """
+    def __init__(self, frames: List[Union[Dict, str]], compress: bool = True):
+        self.frames = frames
+        self.compress = compress
+        self.received: List[Dict] = []
+        self.connections = 0
+        app = web.Application()
+        app.router.add_get("/ws", self._handler)
+        self._server = TestServer(app)
+
+    @property
+    def url(self) -> str:
+        return str(self._server.make_url("/ws"))
+
+    async def _handler(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+
+        msg = await ws.receive()
+        if msg.type == WSMsgType.TEXT:
+            self.received.append(json.loads(msg.data))
+
+        for frame in self.frames:
+            payload = frame if isinstance(frame, str) else json.dumps(frame)
+            if self.compress:
+                await ws.send_bytes(gzip.compress(payload.encode("utf-8")))
+            else:
+                await ws.send_str(payload)
+
+        # Collect client replies (e.g. pongs) until the client stops sending
+        try:
+            while True:
+                msg = await ws.receive(timeout=0.1)
+                if msg.type != WSMsgType.TEXT:
+                    break
+                self.received.append(json.loads(msg.data))
+        except TimeoutError:
+            pass
+        await ws.close()
+        return ws
+
+    async def __aenter__(self) -> "ReplayWebSocketServer":
+        await self._server.start_server()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._server.close()
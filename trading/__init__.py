@@ -1,5 +1,15 @@
 from .position_tracker import PositionTracker
+from .trade_history import TradeHistory
 from .risk_manager import RiskManager
 from .wallet_manager import WalletManager
+from .volatility import VolatilityEstimator
+from .symbols import SymbolInfo, SymbolRegistry
+from .ladder import QuoteLadder
+from .pricing import PricingModel, SymmetricModel, AvellanedaStoikovModel
+from .executions import ExecutionTracker
+from .orders import OrderManager, OrderStatus
+from .journal import Journal
 
-__all__ = ['PositionTracker', 'RiskManager', 'WalletManager'] 
\ No newline at end of file
+__all__ = ['PositionTracker', 'TradeHistory', 'RiskManager', 'WalletManager', 'VolatilityEstimator', 'SymbolInfo', 'SymbolRegistry', 'QuoteLadder',
+           'PricingModel', 'SymmetricModel', 'AvellanedaStoikovModel', 'ExecutionTracker',
+           'OrderManager', 'OrderStatus', 'Journal'] 
\ No newline at end of file
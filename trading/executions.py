@@ -0,0 +1,242 @@
+import time
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from config.config import EXECUTION_POLL_INTERVAL, EXECUTION_FETCH_LIMIT, EXECUTION_MAX_PAGES
+from trading.position_tracker import PositionTracker
+from trading.wallet_manager import WalletManager
+from trading.orders import OrderManager
+from trading.symbols import SymbolRegistry
+from utils.logger import setup_logger
+
+logger = setup_logger("executions")
+
+class Fill:
+    """One of our executions, parsed from a myTrades entry"""
+    __slots__ = ('trade_id', 'order_id', 'symbol', 'is_buy', 'price', 'amount', 'fee', 'fee_asset', 'ts')
+
+    def __init__(self, trade_id: str, order_id: Optional[str], symbol: str, is_buy: bool, price: Decimal,
+                 amount: Decimal, fee: Decimal, fee_asset: Optional[str], ts: int):
+        self.trade_id = trade_id
+        self.order_id = order_id
+        self.symbol = symbol
+        self.is_buy = is_buy
+        self.price = price
+        self.amount = amount
+        self.fee = fee
+        self.fee_asset = fee_asset
+        self.ts = ts
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        """(ts, numeric id) ordering used for the high-water mark"""
+        return self.ts, _numeric_id(self.trade_id)
+
+def _numeric_id(trade_id: str) -> int:
+    try:
+        return int(trade_id)
+    except ValueError:
+        return 0
+
+def _entries(response: Any) -> List[Dict]:
+    """Unwrap a myTrades response down to its list of trades"""
+    if isinstance(response, dict):
+        for key in ('data', 'list', 'trades'):
+            if isinstance(response.get(key), (list, dict)):
+                return _entries(response[key])
+        return []
+    return [entry for entry in response if isinstance(entry, dict)] if isinstance(response, list) else []
+
+def parse_fill(entry: Dict, symbol: str) -> Optional[Fill]:
+    """Parse a myTrades entry; returns None if it is malformed"""
+    try:
+        trade_id = str(entry['id'])
+        if 'isBuyer' in entry:
+            is_buy = bool(entry['isBuyer'])
+        else:
+            is_buy = str(entry['side']).upper() in ('BUY', '1')
+        order_id = entry.get('orderId') or (entry.get('bidId') if is_buy else entry.get('askId'))
+        return Fill(
+            trade_id,
+            str(order_id) if order_id is not None else None,
+            str(entry.get('symbol') or symbol).upper(),
+            is_buy,
+            Decimal(str(entry['price'])),
+            Decimal(str(entry.get('qty', entry.get('volume', entry.get('amount'))))),
+            Decimal(str(entry.get('fee') or '0')),
+            entry.get('feeCoin') or entry.get('commissionAsset'),
+            int(entry.get('time') or entry.get('ts') or 0)
+        )
+    except (KeyError, TypeError, ValueError, InvalidOperation):
+        return None
+
+def parse_fills(response: Any, symbol: str) -> List[Fill]:
+    """Well-formed fills in a myTrades response, in response order"""
+    return [fill for fill in (parse_fill(entry, symbol) for entry in _entries(response)) if fill is not None]
+
+class ExecutionTracker:
+    """Applies our exchange fills to positions and balances
+
+    Polls myTrades per symbol from a high-water mark: requests pass
+    ``fromId`` past the newest trade already applied, so each poll only
+    downloads new fills, and any entry at or below the mark is dropped as
+    a duplicate. A full page means more fills are waiting, so up to
+    ``max_pages`` pages are fetched in one poll to catch up. Each poll's
+    new fills are applied as one batch: one PositionTracker update and one
+    balance update per asset. Fills also advance their orders in the
+    OrderManager, if one is given.
+
+    The first poll of a symbol only records the mark, so history from
+    before startup is not applied on top of the current balances.
+
+    Args:
+        client: Exchange client (sync for poll(), async for poll_async())
+        position_tracker: Positions to update
+        wallet_manager: Balances to update
+        symbol_registry: Asset lookup; defaults to the wallet's registry
+        order_manager: Live orders to mark partially filled or filled
+        poll_interval: Minimum seconds between polls of a symbol
+        limit: Trades per request
+        max_pages: Requests allowed per poll when catching up
+    """
+    def __init__(self, client, position_tracker: PositionTracker, wallet_manager: WalletManager,
+                 symbol_registry: Optional[SymbolRegistry] = None,
+                 order_manager: Optional[OrderManager] = None,
+                 poll_interval: float = EXECUTION_POLL_INTERVAL, limit: int = EXECUTION_FETCH_LIMIT,
+                 max_pages: int = EXECUTION_MAX_PAGES):
+        self.client = client
+        self.position_tracker = position_tracker
+        self.wallet_manager = wallet_manager
+        self.symbols = symbol_registry or wallet_manager.symbols
+        self.order_manager = order_manager
+        self.poll_interval = poll_interval
+        self.limit = limit
+        self.max_pages = max_pages
+        self.logger = logger
+        self._mark: Dict[str, Tuple[int, int]] = {}
+        self._seen: Dict[str, Set[str]] = {}  # Trade ids at the mark's timestamp
+        self._next_poll: Dict[str, float] = {}
+        self.stats = {'polls': 0, 'requests': 0, 'fills': 0, 'duplicates': 0, 'errors': 0}
+
+    def due(self, symbol: str) -> bool:
+        return time.monotonic() >= self._next_poll.get(symbol, 0.0)
+
+    def _cursor(self, symbol: str) -> Tuple[Optional[Tuple[int, int]], Set[str]]:
+        """Copy of the symbol's (mark, seen ids), advanced by a poll and committed once its fills apply"""
+        return self._mark.get(symbol), set(self._seen.get(symbol, ()))
+
+    def _from_id(self, symbol: str, cursor: Optional[Tuple] = None) -> Optional[int]:
+        mark = cursor[0] if cursor is not None else self._mark.get(symbol)
+        return mark[1] + 1 if mark and mark[1] else None
+
+    def _new_fills(self, symbol: str, response: Any, cursor: Tuple) -> Tuple[List[Fill], int, Tuple]:
+        """New fills in a response, oldest first, the number of entries it held and the advanced cursor"""
+        entries = _entries(response)
+        fills = sorted(parse_fills(entries, symbol), key=lambda fill: fill.key)
+        mark, seen = cursor
+        new = []
+        for fill in fills:
+            if mark is not None and (fill.key < mark or (fill.key == mark and fill.trade_id in seen)):
+                self.stats['duplicates'] += 1
+                continue
+            if mark is None or fill.ts != mark[0]:
+                seen.clear()
+            seen.add(fill.trade_id)
+            mark = fill.key
+            new.append(fill)
+        return new, len(entries), (mark, seen)
+
+    def _start_poll(self, symbol: str) -> bool:
+        """Whether this poll only primes the mark"""
+        self.stats['polls'] += 1
+        self._next_poll[symbol] = time.monotonic() + self.poll_interval
+        return symbol not in self._mark
+
+    def _commit(self, symbol: str, cursor: Tuple) -> None:
+        mark, seen = cursor
+        if mark is not None:
+            self._mark[symbol] = mark
+            self._seen[symbol] = seen
+
+    def _finish_poll(self, symbol: str, fills: List[Fill], priming: bool, cursor: Tuple) -> List[Fill]:
+        if priming:
+            self._commit(symbol, cursor)
+            self._mark.setdefault(symbol, (0, 0))
+            self.logger.info(f"Execution tracking for {symbol} starts after trade {self._mark[symbol]}")
+            return []
+        # The mark only moves once the fills are applied, so a poll cancelled
+        # between pages fetches them again rather than skipping them
+        self.apply(symbol, fills)
+        self._commit(symbol, cursor)
+        return fills
+
+    def poll(self, symbol: str, force: bool = False) -> List[Fill]:
+        """Fetch and apply fills newer than the mark; returns the applied fills"""
+        if not force and not self.due(symbol):
+            return []
+        priming = self._start_poll(symbol)
+        cursor = self._cursor(symbol)
+        fills = []
+        try:
+            for _ in range(1 if priming else self.max_pages):
+                self.stats['requests'] += 1
+                new, count, cursor = self._new_fills(symbol, self.client.get_my_trades(
+                    symbol, self.limit, self._from_id(symbol, cursor)), cursor)
+                fills.extend(new)
+                if count < self.limit or not new:
+                    break
+        except Exception as e:
+            self.stats['errors'] += 1
+            self.logger.error(f"Error polling fills for {symbol}: {e}")
+            if priming:
+                # Without a mark the next poll has to prime again
+                return []
+        return self._finish_poll(symbol, fills, priming, cursor)
+
+    async def poll_async(self, symbol: str, force: bool = False) -> List[Fill]:
+        """poll() for an async client"""
+        if not force and not self.due(symbol):
+            return []
+        priming = self._start_poll(symbol)
+        cursor = self._cursor(symbol)
+        fills = []
+        try:
+            for _ in range(1 if priming else self.max_pages):
+                self.stats['requests'] += 1
+                new, count, cursor = self._new_fills(symbol, await self.client.get_my_trades(
+                    symbol, self.limit, self._from_id(symbol, cursor)), cursor)
+                fills.extend(new)
+                if count < self.limit or not new:
+                    break
+        except Exception as e:
+            self.stats['errors'] += 1
+            self.logger.error(f"Error polling fills for {symbol}: {e}")
+            if priming:
+                # Without a mark the next poll has to prime again
+                return []
+        return self._finish_poll(symbol, fills, priming, cursor)
+
+    def apply(self, symbol: str, fills: Iterable[Fill]) -> None:
+        """Apply a batch of fills to the position and wallet"""
+        fills = list(fills)
+        if not fills:
+            return
+        base_asset, quote_asset = self.symbols.assets(symbol)
+        deltas: Dict[str, Decimal] = {base_asset: Decimal('0'), quote_asset: Decimal('0')}
+        for fill in fills:
+            sign = 1 if fill.is_buy else -1
+            deltas[base_asset] += sign * fill.amount
+            deltas[quote_asset] -= sign * fill.amount * fill.price
+            fee_asset = fill.fee_asset or quote_asset
+            deltas[fee_asset] = deltas.get(fee_asset, Decimal('0')) - fill.fee
+        self.position_tracker.update_positions(
+            symbol, [(fill.amount, fill.price, fill.is_buy) for fill in fills]
+        )
+        for asset, delta in deltas.items():
+            if delta:
+                self.wallet_manager.adjust_balance(asset, delta)
+        if self.order_manager is not None:
+            for fill in fills:
+                if fill.order_id is not None:
+                    self.order_manager.on_fill(fill.order_id, fill.amount)
+        self.stats['fills'] += len(fills)
+        self.logger.info("Applied %d fills for %s up to trade %s", len(fills), symbol, fills[-1].trade_id)
@@ -0,0 +1,418 @@
+import json
+import os
+import struct
+import threading
+import time
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from config.config import BALANCE_DECIMALS, JOURNAL_COMMIT_INTERVAL, JOURNAL_SNAPSHOT_EVERY
+from trading.trade_history import SymbolStats
+from utils.fixed_point import FixedPoint, Number
+from utils.logger import setup_logger
+
+logger = setup_logger("journal")
+
+class RecordKind(IntEnum):
+    FILL = 1  # key=symbol, side, a=amount, b=price
+    BALANCE = 2  # key=asset, a=new total
+    LIMITS = 3  # key=symbol, a=max position, b=max order size, c=min spread
+    ORDER = 4  # key=symbol, order_id, side, status, a=amount, b=price, c=filled
+
+# One record; every amount is a fixed-point int in the journal's units
+RECORD = np.dtype([
+    ('ts', '<i8'),  # Milliseconds since the epoch
+    ('kind', 'u1'),
+    ('side', 'u1'),  # 1 = buy, 2 = sell, 0 = n/a
+    ('status', 'u1'),  # OrderStatus for ORDER records
+    ('_pad', 'V5'),
+    ('key', 'S16'),
+    ('order_id', 'S40'),
+    ('a', '<i8'),
+    ('b', '<i8'),
+    ('c', '<i8'),
+])
+_PACK = struct.Struct('<qBBB5x16s40sqqq')
+assert _PACK.size == RECORD.itemsize
+
+SEGMENT_SUFFIX = '.jnl'
+SNAPSHOT_FILE = 'snapshot.json'
+
+def _group(keys: np.ndarray) -> Tuple[List[str], np.ndarray]:
+    """Distinct keys and each record's index into them
+
+    Sorts the keys as two uint64 halves rather than as byte strings,
+    which is several times faster; keys of up to 8 bytes need one sort.
+    """
+    halves = np.ascontiguousarray(keys).view('<u8').reshape(-1, 2)
+    if halves[:, 1].any():
+        _, low = np.unique(halves[:, 0], return_inverse=True)
+        high_values, high = np.unique(halves[:, 1], return_inverse=True)
+        codes = low * len(high_values) + high
+    else:
+        codes = halves[:, 0]
+    _, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    return [key.decode() for key in keys[first].tolist()], inverse
+
+def _last_rows(inverse: np.ndarray, groups: int) -> np.ndarray:
+    """Index of each group's last record"""
+    last = np.zeros(groups, dtype=np.int64)
+    np.maximum.at(last, inverse, np.arange(len(inverse)))
+    return last
+
+class JournalState:
+    """Positions, fill stats, balances and risk limits folded from journal records, in journal units
+
+    ``stats`` holds each symbol's SymbolStats (volume, cost basis,
+    realized PnL), which depend on the order of fills, so they are folded
+    one fill at a time even when a block of records is replayed.
+    """
+    __slots__ = ('positions', 'balances', 'limits', 'stats')
+
+    def __init__(self, positions: Optional[Dict[str, int]] = None, balances: Optional[Dict[str, int]] = None,
+                 limits: Optional[Dict[str, Tuple[int, int, int]]] = None,
+                 stats: Optional[Dict[str, SymbolStats]] = None):
+        self.positions = positions or {}
+        self.balances = balances or {}
+        self.limits = limits or {}
+        self.stats = stats or {}
+
+    def _fill_stats(self, key: str, side: int, amount: int, price: int) -> None:
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = SymbolStats()
+        stats.apply(amount if side == 1 else -amount, price)
+
+    def apply(self, kind: int, key: str, side: int, a: int, b: int, c: int) -> None:
+        """Fold one record"""
+        if kind == RecordKind.FILL:
+            self.positions[key] = self.positions.get(key, 0) + (a if side == 1 else -a)
+            self._fill_stats(key, side, a, b)
+        elif kind == RecordKind.BALANCE:
+            self.balances[key] = a
+        elif kind == RecordKind.LIMITS:
+            self.limits[key] = (a, b, c)
+
+    def apply_records(self, records: np.ndarray) -> None:
+        """Fold a block of records, vectorized per kind"""
+        kinds = records['kind']
+        fills = records[['key', 'side', 'a', 'b']][kinds == RecordKind.FILL]
+        if len(fills):
+            symbols, inverse = _group(fills['key'])
+            totals = np.zeros(len(symbols), dtype=np.int64)
+            np.add.at(totals, inverse, np.where(fills['side'] == 1, fills['a'], -fills['a']))
+            for symbol, total in zip(symbols, totals.tolist()):
+                self.positions[symbol] = self.positions.get(symbol, 0) + total
+            fill_stats = self._fill_stats
+            for key, side, amount, price in zip(inverse.tolist(), fills['side'].tolist(), fills['a'].tolist(),
+                                                fills['b'].tolist()):
+                fill_stats(symbols[key], side, amount, price)
+        balances = records[kinds == RecordKind.BALANCE]
+        if len(balances):
+            assets, inverse = _group(balances['key'])
+            for asset, row in zip(assets, _last_rows(inverse, len(assets))):
+                self.balances[asset] = int(balances['a'][row])
+        limits = records[kinds == RecordKind.LIMITS]
+        if len(limits):
+            symbols, inverse = _group(limits['key'])
+            for symbol, row in zip(symbols, _last_rows(inverse, len(symbols))):
+                self.limits[symbol] = (int(limits['a'][row]), int(limits['b'][row]), int(limits['c'][row]))
+
+    def copy(self) -> 'JournalState':
+        return JournalState(dict(self.positions), dict(self.balances), dict(self.limits),
+                            {symbol: SymbolStats.from_list(stats.to_list()) for symbol, stats in self.stats.items()})
+
+    def to_dict(self) -> Dict:
+        return {'positions': self.positions, 'balances': self.balances,
+                'limits': {symbol: list(limits) for symbol, limits in self.limits.items()},
+                'stats': {symbol: stats.to_list() for symbol, stats in self.stats.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'JournalState':
+        return cls(dict(data['positions']), dict(data['balances']),
+                   {symbol: tuple(limits) for symbol, limits in data['limits'].items()},
+                   {symbol: SymbolStats.from_list(stats) for symbol, stats in data.get('stats', {}).items()})
+
+class Journal:
+    """Append-only binary journal of fills, orders, balance and limit changes
+
+    Records are fixed-width (RECORD) with amounts as fixed-point ints, so
+    a segment file is read back with one np.fromfile. Appends only pack
+    the record into memory; a committer thread writes everything pending
+    every ``commit_interval`` seconds and fsyncs once per group, so
+    callers never wait on the disk. sync() waits for the current group
+    when a caller needs durability.
+
+    The journal folds every record into a JournalState as it is
+    appended. After ``snapshot_every`` records it writes that state to
+    ``snapshot.json``, starts a new segment and deletes the old ones, so
+    opening the journal reads the snapshot and replays only the records
+    since. attach() restores the state into the trading components and
+    hooks them up to journal their changes.
+
+    A record torn by a crash is trimmed on open; records appended after
+    the last commit are lost. A group whose write or fsync fails is kept
+    and retried with the next one, and sync() raises until it is
+    committed. A record whose key is longer than 16 bytes or order id
+    longer than 40 would be cut short, so it is logged and skipped
+    instead; appends run after the caller has changed its own state and
+    never raise.
+
+    Args:
+        directory: Journal directory (created if missing)
+        decimals: Fixed-point places of journaled amounts
+        commit_interval: Seconds the committer gathers records before a write
+        snapshot_every: Records between snapshots
+    """
+    def __init__(self, directory: str, decimals: int = BALANCE_DECIMALS,
+                 commit_interval: float = JOURNAL_COMMIT_INTERVAL,
+                 snapshot_every: int = JOURNAL_SNAPSHOT_EVERY):
+        self.directory = directory
+        self.commit_interval = commit_interval
+        self.snapshot_every = snapshot_every
+        self.logger = logger
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta['record_size'] != RECORD.itemsize:
+                raise ValueError(f"{directory} holds {meta['record_size']}-byte records, not {RECORD.itemsize}")
+        else:
+            meta = {'record_size': RECORD.itemsize, 'decimals': decimals}
+            with open(meta_path, 'w') as f:
+                json.dump(meta, f)
+        self.scale = FixedPoint(meta['decimals'])
+        self.stats = {'records': 0, 'commits': 0, 'snapshots': 0, 'replayed': 0, 'failures': 0, 'skipped': 0}
+
+        self.state, self._snapshot_seq = self._load_snapshot()
+        self.seq = self._replay()  # Records in the journal so far
+        self._committed = self.seq
+        self._segment = open(self._segment_path(self._open_segment_start()), 'ab')
+
+        self._pending: List[bytes] = []
+        self._cond = threading.Condition()
+        self._flush_now = False
+        self._closing = False
+        self._error: Optional[OSError] = None  # Last failed commit's error, until one succeeds
+        self._thread = threading.Thread(target=self._run, name="journal-commit", daemon=True)
+        self._thread.start()
+
+    # Files
+
+    def _segment_path(self, start: int) -> str:
+        return os.path.join(self.directory, f'{start:016d}{SEGMENT_SUFFIX}')
+
+    def _segments(self) -> List[int]:
+        """Start record number of each segment, oldest first"""
+        return sorted(int(name[:-len(SEGMENT_SUFFIX)]) for name in os.listdir(self.directory)
+                      if name.endswith(SEGMENT_SUFFIX))
+
+    def _load_snapshot(self) -> Tuple[JournalState, int]:
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return JournalState(), 0
+        with open(path) as f:
+            data = json.load(f)
+        return JournalState.from_dict(data['state']), data['seq']
+
+    def _replay(self) -> int:
+        """Fold records after the snapshot into the state; returns the record count"""
+        seq = self._snapshot_seq
+        segments = self._segments()
+        for i, start in enumerate(segments):
+            path = self._segment_path(start)
+            count = os.path.getsize(path) // RECORD.itemsize
+            if os.path.getsize(path) != count * RECORD.itemsize:
+                # Torn append from a crash
+                with open(path, 'r+b') as f:
+                    f.truncate(count * RECORD.itemsize)
+            end = start + count
+            if end <= self._snapshot_seq:
+                if i < len(segments) - 1:
+                    os.remove(path)  # Left over from a snapshot interrupted before cleanup
+                continue
+            records = np.fromfile(path, dtype=RECORD)[max(0, self._snapshot_seq - start):]
+            self.state.apply_records(records)
+            self.stats['replayed'] += len(records)
+            seq = end
+        return seq
+
+    def _open_segment_start(self) -> int:
+        segments = self._segments()
+        if segments and segments[-1] <= self.seq:
+            return segments[-1]
+        return self.seq
+
+    # Appending
+
+    def _append(self, kind: RecordKind, key: str, side: int = 0, status: int = 0,
+                order_id: str = '', a: int = 0, b: int = 0, c: int = 0) -> None:
+        key_bytes, order_id_bytes = key.encode(), order_id.encode()
+        if len(key_bytes) > 16 or len(order_id_bytes) > 40:
+            # struct would silently cut them short
+            self.stats['skipped'] += 1
+            self.logger.error("Not journaling %s record: key %r over 16 bytes or order id %r over 40",
+                              RecordKind(kind).name, key, order_id)
+            return
+        record = _PACK.pack(int(time.time() * 1000), kind, side, status, key_bytes, order_id_bytes, a, b, c)
+        with self._cond:
+            self._pending.append(record)
+            self.state.apply(kind, key, side, a, b, c)
+            self.seq += 1
+            self.stats['records'] += 1
+
+    def fill(self, symbol: str, amount: int, price: int, is_buy: bool) -> None:
+        """A fill moving ``symbol``'s position by ``amount`` units"""
+        self._append(RecordKind.FILL, symbol, 1 if is_buy else 2, a=amount, b=price)
+
+    def balance(self, asset: str, total: int) -> None:
+        """An asset's new total balance, in units"""
+        self._append(RecordKind.BALANCE, asset, a=total)
+
+    def limits(self, symbol: str, max_position: Number, max_order_size: Number, min_spread: Number) -> None:
+        to_int = self.scale.to_int
+        self._append(RecordKind.LIMITS, symbol, a=to_int(max_position), b=to_int(max_order_size),
+                     c=to_int(min_spread))
+
+    def order(self, order_id: str, symbol: str, side: int, status: int,
+              amount: Number, price: Optional[Number], filled: Number) -> None:
+        """An order reaching ``status`` (see trading.orders.OrderStatus)"""
+        to_int = self.scale.to_int
+        self._append(RecordKind.ORDER, symbol, side, status, order_id,
+                     to_int(amount), to_int(price) if price is not None else 0, to_int(filled))
+
+    # Committing
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closing)
+                if not self._flush_now and not self._closing:
+                    # Gather a group; sync() and close() cut the wait short
+                    self._cond.wait_for(lambda: self._flush_now or self._closing, self.commit_interval)
+                pending, self._pending = self._pending, []
+                seq = self.seq
+                snapshot = self.state.copy() if seq - self._snapshot_seq >= self.snapshot_every else None
+                self._flush_now = False
+                closing = self._closing
+            error = self._commit(pending) if pending else None
+            if error is None and snapshot is not None:
+                try:
+                    self._snapshot(seq, snapshot)
+                except OSError as e:
+                    # The records are durable in the segment; the next commit tries again
+                    self.logger.error(f"Journal snapshot failed: {e}")
+            with self._cond:
+                if error is None:
+                    self._committed = seq
+                    self._error = None
+                else:
+                    # Keep the group ahead of anything appended since; it goes out with the next one
+                    self._pending[:0] = pending
+                    self._error = error
+                    self.stats['failures'] += 1
+                self._cond.notify_all()
+                if closing and (not self._pending or error is not None):
+                    if error is not None:
+                        self.logger.error(f"Journal closed with {len(self._pending)} records uncommitted")
+                    return
+
+    def _commit(self, pending: List[bytes]) -> Optional[OSError]:
+        """Write and fsync a group; the error if it failed, with the segment cut back to before it"""
+        start = self._segment.tell()
+        try:
+            self._segment.write(b''.join(pending))
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+        except OSError as e:
+            self.logger.error(f"Journal commit failed: {e}")
+            try:
+                self._segment.truncate(start)  # Drop a partial write so the retry does not duplicate it
+                self._segment.seek(start)
+            except (OSError, ValueError):
+                pass
+            return e
+        self.stats['commits'] += 1
+        return None
+
+    def _snapshot(self, seq: int, state: JournalState) -> None:
+        """Write ``state`` as of ``seq`` records and start a new segment"""
+        segment = open(self._segment_path(seq), 'ab')
+        self._segment.close()
+        self._segment = segment
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'seq': seq, 'state': state.to_dict()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + '.tmp', path)
+        self._snapshot_seq = seq
+        for start in self._segments():
+            if start < seq:
+                os.remove(self._segment_path(start))
+        self.stats['snapshots'] += 1
+
+    def sync(self, timeout: Optional[float] = None) -> bool:
+        """Commit everything appended so far; False if ``timeout`` passed first
+
+        Raises:
+            OSError: The commit failed; the records stay pending for the next one
+        """
+        with self._cond:
+            target = self.seq
+            failures = self.stats['failures']
+            self._flush_now = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._committed >= target or self.stats['failures'] > failures, timeout)
+            if self._committed >= target:
+                return True
+            if self.stats['failures'] > failures:
+                raise OSError(f"Journal commit failed: {self._error}") from self._error
+            return False
+
+    def close(self) -> None:
+        """Commit what is pending and stop the committer"""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._segment.close()
+
+    # Restoring
+
+    def records(self) -> np.ndarray:
+        """Committed records since the last snapshot, oldest first"""
+        segments = [np.fromfile(self._segment_path(start), dtype=RECORD) for start in self._segments()]
+        return np.concatenate(segments) if segments else np.empty(0, dtype=RECORD)
+
+    def restore(self, position_tracker=None, wallet_manager=None, risk_manager=None) -> None:
+        """Load the journaled positions, fill stats, balances and limits into the components"""
+        state = self.state
+        if position_tracker is not None:
+            position_tracker._positions.update(state.positions)
+            position_tracker._stats.update({symbol: SymbolStats.from_list(stats.to_list())
+                                            for symbol, stats in state.stats.items()})
+        if wallet_manager is not None:
+            with wallet_manager.lock:
+                wallet_manager._totals.update(state.balances)
+        if risk_manager is not None:
+            to_decimal = self.scale.to_decimal
+            for symbol, (max_position, max_order_size, min_spread) in state.limits.items():
+                risk_manager.set_limits(symbol, to_decimal(max_position), to_decimal(max_order_size),
+                                        to_decimal(min_spread))
+
+    def attach(self, position_tracker=None, wallet_manager=None, risk_manager=None,
+               order_manager=None) -> None:
+        """Restore the journaled state into the components, then journal their changes"""
+        for component in (position_tracker, wallet_manager):
+            if component is not None and component.scale.decimals != self.scale.decimals:
+                raise ValueError(f"{type(component).__name__} uses {component.scale.decimals} decimals; "
+                                 f"the journal uses {self.scale.decimals}")
+        self.restore(position_tracker, wallet_manager, risk_manager)
+        for component in (position_tracker, wallet_manager, risk_manager, order_manager):
+            if component is not None:
+                component.journal = self
+        self.logger.info(f"Journal {self.directory}: restored {len(self.state.positions)} positions, "
+                         f"{len(self.state.balances)} balances, {len(self.state.limits)} limits "
+                         f"({self.stats['replayed']} records replayed)")
@@ -0,0 +1,175 @@
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from market_data.order_book import OrderBook, BIDS, ASKS
+from trading.symbols import SymbolInfo
+from utils.fixed_point import decimals_for, format_scaled, to_scaled
+
+SPACINGS = ('linear', 'geometric')
+SIZE_CURVES = ('flat', 'linear', 'geometric', 'depth')
+
+_EPSILON = 1e-9  # Absorbs float error when snapping to the tick/lot grid
+
+class Ladder:
+    """One side's prices and sizes, best level first, as integer tick/lot counts"""
+    __slots__ = ('side', 'ticks', 'lots', 'tick_size', 'lot_size')
+
+    def __init__(self, side: int, ticks: np.ndarray, lots: np.ndarray,
+                 tick_size: Decimal, lot_size: Decimal):
+        self.side = side
+        self.ticks = ticks
+        self.lots = lots
+        self.tick_size = tick_size
+        self.lot_size = lot_size
+
+    def __len__(self) -> int:
+        return len(self.ticks)
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self.ticks * float(self.tick_size)
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return self.lots * float(self.lot_size)
+
+    def levels(self) -> List[Tuple[Decimal, Decimal]]:
+        """Exact (price, size) Decimals per level"""
+        return [(Decimal(int(t)) * self.tick_size, Decimal(int(q)) * self.lot_size)
+                for t, q in zip(self.ticks.tolist(), self.lots.tolist())]
+
+    def level_strings(self) -> List[Tuple[str, str]]:
+        """(price, size) strings per level, to the tick/lot precision, as levels() prints them"""
+        price_decimals = decimals_for(self.tick_size)
+        size_decimals = decimals_for(self.lot_size)
+        tick = to_scaled(self.tick_size, price_decimals)
+        lot = to_scaled(self.lot_size, size_decimals)
+        return [(format_scaled(t * tick, price_decimals, False), format_scaled(q * lot, size_decimals, False))
+                for t, q in zip(self.ticks.tolist(), self.lots.tolist())]
+
+    def select(self, mask: np.ndarray) -> 'Ladder':
+        """Levels where ``mask`` is True"""
+        return Ladder(self.side, self.ticks[mask], self.lots[mask], self.tick_size, self.lot_size)
+
+class QuoteLadder:
+    """Vectorized multi-level quote generator
+
+    Level k sits ``offset(k)`` (relative) outside the touch price on each
+    side and is snapped to the tick grid, bids down and asks up, so no two
+    levels share a price. Sizes follow a curve between ``min_size`` and
+    ``max_size`` and are rounded down to the lot size.
+
+    Args:
+        levels: Quotes per side
+        spacing: 'linear' (offset k * step) or 'geometric' (each gap
+            ``spacing_ratio`` times the previous)
+        step: Relative distance between the first two levels
+        spacing_ratio: Gap growth for geometric spacing
+        size_curve: 'flat', 'linear' (min to max), 'geometric' (min *
+            size_ratio ** k) or 'depth' (depth_fraction of the book's
+            cumulative size down to the level)
+        min_size: Size of the first level and floor for the others
+        max_size: Cap on any level
+        size_ratio: Growth per level for geometric sizes
+        depth_fraction: Share of visible depth quoted by the depth curve
+    """
+    def __init__(self, levels: int = 1, spacing: str = 'linear', step: Decimal = Decimal('0.002'),
+                 spacing_ratio: float = 1.5, size_curve: str = 'flat',
+                 min_size: Decimal = Decimal('1'), max_size: Optional[Decimal] = None,
+                 size_ratio: float = 1.5, depth_fraction: float = 0.1):
+        if levels < 1:
+            raise ValueError("levels must be at least 1")
+        if spacing not in SPACINGS:
+            raise ValueError(f"Unknown spacing {spacing!r}, expected one of {SPACINGS}")
+        if size_curve not in SIZE_CURVES:
+            raise ValueError(f"Unknown size curve {size_curve!r}, expected one of {SIZE_CURVES}")
+        self.levels = levels
+        self.spacing = spacing
+        self.step = float(step)
+        self.spacing_ratio = spacing_ratio
+        self.size_curve = size_curve
+        self.min_size = float(min_size)
+        self.max_size = float(max_size) if max_size is not None else self.min_size
+        self.size_ratio = size_ratio
+        self.depth_fraction = depth_fraction
+        self._index = np.arange(levels, dtype=np.float64)
+        self._offsets = self._level_offsets()
+        self._static_sizes = None if size_curve == 'depth' else self._curve_sizes()
+
+    def _level_offsets(self) -> np.ndarray:
+        k = self._index
+        if self.spacing == 'geometric' and self.spacing_ratio != 1:
+            r = self.spacing_ratio
+            return self.step * (r ** k - 1) / (r - 1)
+        return self.step * k
+
+    def _curve_sizes(self) -> np.ndarray:
+        k = self._index
+        if self.size_curve == 'linear' and self.levels > 1:
+            sizes = self.min_size + (self.max_size - self.min_size) * k / (self.levels - 1)
+        elif self.size_curve == 'geometric':
+            sizes = self.min_size * self.size_ratio ** k
+        else:
+            sizes = np.full(self.levels, self.min_size)
+        return np.clip(sizes, self.min_size, max(self.max_size, self.min_size))
+
+    def _depth_sizes(self, book: Optional[OrderBook], side: str, prices: np.ndarray) -> np.ndarray:
+        """depth_fraction of the book's size from the touch down to each price"""
+        if book is None or book.level_count(side) == 0:
+            return np.full(self.levels, self.min_size)
+        keys, sizes, sign = book.scaled_columns(side)
+        keys = np.frombuffer(keys, dtype=np.int64)
+        sizes = np.frombuffer(sizes, dtype=np.int64)
+        scale = 10.0 ** book.price_decimals
+        our_keys = sign * np.round(prices * scale).astype(np.int64)
+        cumulative = np.concatenate(([0], np.cumsum(sizes)))
+        depth = cumulative[np.searchsorted(keys, our_keys, side='right')] / 10.0 ** book.size_decimals
+        return np.clip(depth * self.depth_fraction, self.min_size, max(self.max_size, self.min_size))
+
+    def build(self, bid_price: Decimal, ask_price: Decimal, symbol_info: SymbolInfo,
+              book: Optional[OrderBook] = None) -> Tuple[Ladder, Ladder]:
+        """Build bid and ask ladders from the first-level prices"""
+        tick = float(symbol_info.tick_size)
+        lot = float(symbol_info.lot_size)
+        index = self._index
+
+        # Strictly decreasing bid ticks / increasing ask ticks, best level first
+        bid_ticks = np.floor(float(bid_price) * (1 - self._offsets) / tick + _EPSILON)
+        bid_ticks = np.minimum.accumulate(bid_ticks + index) - index
+        ask_ticks = np.ceil(float(ask_price) * (1 + self._offsets) / tick - _EPSILON)
+        ask_ticks = np.maximum.accumulate(ask_ticks - index) + index
+
+        if self._static_sizes is not None:
+            bid_sizes = ask_sizes = self._static_sizes
+        else:
+            bid_sizes = self._depth_sizes(book, BIDS, bid_ticks * tick)
+            ask_sizes = self._depth_sizes(book, ASKS, ask_ticks * tick)
+
+        bid_lots = np.floor(bid_sizes / lot + _EPSILON)
+        ask_lots = np.floor(ask_sizes / lot + _EPSILON)
+
+        bids = Ladder(1, bid_ticks.astype(np.int64), bid_lots.astype(np.int64),
+                      symbol_info.tick_size, symbol_info.lot_size)
+        asks = Ladder(2, ask_ticks.astype(np.int64), ask_lots.astype(np.int64),
+                      symbol_info.tick_size, symbol_info.lot_size)
+        return self._drop_invalid(bids), self._drop_invalid(asks)
+
+    @staticmethod
+    def _drop_invalid(ladder: Ladder) -> Ladder:
+        keep = (ladder.ticks > 0) & (ladder.lots > 0)
+        return ladder if keep.all() else ladder.select(keep)
+
+    @staticmethod
+    def to_orders(symbol: str, ladders: Tuple[Ladder, ...]) -> List[Dict]:
+        """Order dicts in the shape MarketMaker and QuoteEngine use"""
+        return [
+            {
+                "symbol": symbol,
+                "side": ladder.side,
+                "orderType": 1,  # Limit
+                "price": price,
+                "amount": size
+            }
+            for ladder in ladders
+            for price, size in ladder.level_strings()
+        ]
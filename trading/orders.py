@@ -0,0 +1,550 @@
+import time
+from decimal import Decimal, InvalidOperation
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Set, Tuple
+from config.config import (
+    ORDER_RECONCILE_INTERVAL, ORDER_RECONCILE_GRACE, ORDER_RECONCILE_LIMIT, ACCOUNT_SYNC_INTERVAL
+)
+from trading.quote_engine import normalize_side, BUY, SELL
+from trading.symbols import SymbolRegistry
+from trading.wallet_manager import WalletManager, parse_account_balances
+from utils.logger import setup_logger
+
+logger = setup_logger("orders")
+
+class OrderStatus(IntEnum):
+    """Lifecycle of one of our orders"""
+    NEW = 0
+    PARTIAL = 1
+    FILLED = 2
+    CANCELED = 3
+    REJECTED = 4
+
+    @property
+    def is_terminal(self) -> bool:
+        return self >= OrderStatus.FILLED
+
+_JOURNAL_SIDES = {BUY: 1, SELL: 2}  # Side codes in journal records
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+
+class ManagedOrder:
+    """One order with its fill progress and the balance reserved for it"""
+    __slots__ = ('order_id', 'symbol', 'side', 'price', 'amount', 'filled', 'status',
+                 'order', 'reserved', 'created_at', 'updated_at')
+
+    def __init__(self, order_id: str, symbol: str, order: Dict, reserved: Decimal = Decimal('0')):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = normalize_side(order.get('side'))
+        self.price = _decimal(order.get('price'))
+        self.amount = _decimal(order.get('amount')) or Decimal('0')
+        self.filled = Decimal('0')
+        self.status = OrderStatus.NEW
+        self.order = order
+        self.reserved = reserved
+        self.created_at = time.monotonic()
+        self.updated_at = self.created_at
+
+    @property
+    def remaining(self) -> Decimal:
+        return max(Decimal('0'), self.amount - self.filled)
+
+    @property
+    def level(self) -> Tuple[str, Optional[str], Optional[Decimal]]:
+        return self.symbol, self.side, self.price
+
+    def __repr__(self) -> str:
+        return (f"ManagedOrder({self.order_id}, {self.symbol} {self.side} {self.amount}@{self.price}, "
+                f"{self.status.name}, filled={self.filled})")
+
+class Submission:
+    """Orders about to be sent, with the funds reserved for them
+
+    ``held`` is what each order being cancelled had reserved; it is
+    pooled so replacements can take it over, and ``pool`` is what is left.
+    ``used`` is what the new orders reserved, per asset.
+    """
+    __slots__ = ('symbol', 'cancel_ids', 'orders', 'reserved', 'held', 'pool', 'used')
+
+    def __init__(self, symbol: str, cancel_ids: List[str], orders: List[Dict], reserved: List[Decimal],
+                 held: Dict[str, Decimal], pool: Dict[str, Decimal], used: Optional[Dict[str, Decimal]] = None):
+        self.symbol = symbol
+        self.cancel_ids = cancel_ids
+        self.orders = orders
+        self.reserved = reserved
+        self.held = held
+        self.pool = pool
+        self.used = used or {}
+
+    def reserved_totals(self) -> Dict[str, Decimal]:
+        """Asset -> wallet reservation this submission holds until complete()"""
+        totals = dict(self.used)
+        for asset, amount in self.pool.items():
+            totals[asset] = totals.get(asset, Decimal('0')) + amount
+        return totals
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.cancel_ids and not self.orders
+
+def _entries(response: Any) -> Optional[List[Dict]]:
+    """Unwrap an openOrders response; None if it is not a valid listing"""
+    if isinstance(response, dict):
+        if response.get('code', 200) not in (200, 0, '0', '200'):
+            return None
+        for key in ('data', 'list', 'orders', 'resultList'):
+            if key in response and isinstance(response[key], (list, dict)):
+                return _entries(response[key])
+        return None
+    if isinstance(response, list):
+        return [entry for entry in response if isinstance(entry, dict)]
+    return None
+
+class OrderManager:
+    """Tracks our live orders through NEW, PARTIAL and a terminal state
+
+    Live orders are indexed by id, by symbol and by (symbol, side, price)
+    level, so lookups and removals stay O(1) however many orders rest.
+    Orders leave every index when they reach FILLED, CANCELED or
+    REJECTED, and whatever balance is still reserved for them is released
+    to the WalletManager. Fills release their share of the reservation
+    as they arrive.
+
+    Funds are reserved on submit: begin() reserves each order's quote
+    (buys) or base (sells) before it is sent and drops orders the wallet
+    cannot cover, and complete() records the venue's answer. Reserving
+    happens under the wallet lock with no await in between, so
+    concurrent tasks and threads can never commit the same funds twice.
+    Quotes being cancelled in the same request hand their reservations
+    to their replacements rather than releasing them first.
+
+    reconcile() diffs our view against the venue's open orders: orders
+    the venue no longer lists are closed, and venue orders we do not know
+    are adopted so they get requoted or cancelled like our own.
+    sync_account() replaces balances with the venue's totals and resets
+    reservations to those of live orders and of submissions between
+    begin() and complete(), correcting any drift. Adopted orders reserve
+    their remaining size, since the venue already holds those funds.
+
+    Args:
+        wallet_manager: Wallet holding the reservations
+        symbol_registry: Asset lookup; defaults to the wallet's registry
+        reconcile_interval: Minimum seconds between reconciliations of a symbol
+        grace: Seconds an order may be missing from the venue's listing
+            after placement before it is considered gone
+        limit: Open orders requested per reconciliation
+        account_sync_interval: Minimum seconds between account syncs
+    """
+    def __init__(self, wallet_manager: WalletManager, symbol_registry: Optional[SymbolRegistry] = None,
+                 reconcile_interval: float = ORDER_RECONCILE_INTERVAL, grace: float = ORDER_RECONCILE_GRACE,
+                 limit: int = ORDER_RECONCILE_LIMIT, account_sync_interval: float = ACCOUNT_SYNC_INTERVAL):
+        self.wallet_manager = wallet_manager
+        self.symbols = symbol_registry or wallet_manager.symbols
+        self.reconcile_interval = reconcile_interval
+        self.grace = grace
+        self.limit = limit
+        self.account_sync_interval = account_sync_interval
+        self.logger = logger
+        self.orders: Dict[str, ManagedOrder] = {}
+        self._by_symbol: Dict[str, Dict[str, ManagedOrder]] = {}
+        self._by_level: Dict[Tuple, Dict[str, ManagedOrder]] = {}
+        self._next_reconcile: Dict[str, float] = {}
+        self._next_account_sync = 0.0
+        self._in_flight: Set[Submission] = set()  # Between begin() and complete()
+        self.journal = None  # Set by Journal.attach
+        self.stats = {status.name.lower(): 0 for status in OrderStatus}
+        self.stats.update({'reconciles': 0, 'adopted': 0, 'closed_by_reconcile': 0,
+                           'unknown_fills': 0, 'unfunded': 0, 'account_syncs': 0, 'errors': 0})
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self.orders
+
+    # Lookups
+
+    def get(self, order_id: str) -> Optional[ManagedOrder]:
+        return self.orders.get(order_id)
+
+    def at_level(self, symbol: str, side, price) -> List[ManagedOrder]:
+        """Live orders resting at one price on one side"""
+        level = self._by_level.get((symbol, normalize_side(side), _decimal(price)))
+        return list(level.values()) if level else []
+
+    def open_orders(self, symbol: str) -> Dict[str, Dict]:
+        """Order id -> order dict for a symbol's live orders"""
+        return {order_id: managed.order for order_id, managed in self._by_symbol.get(symbol, {}).items()}
+
+    def reserved_totals(self, symbol: Optional[str] = None, in_flight: bool = False) -> Dict[str, Decimal]:
+        """Asset -> balance reserved by live orders, for one symbol or all
+
+        ``in_flight`` adds what submissions awaiting complete() hold.
+        """
+        orders = self._by_symbol.get(symbol, {}) if symbol is not None else self.orders
+        totals: Dict[str, Decimal] = {}
+        for managed in orders.values():
+            if managed.reserved:
+                asset = self._reserved_asset(managed)
+                totals[asset] = totals.get(asset, Decimal('0')) + managed.reserved
+        if in_flight:
+            for submission in self._in_flight:
+                if symbol is None or submission.symbol == symbol:
+                    for asset, amount in submission.reserved_totals().items():
+                        totals[asset] = totals.get(asset, Decimal('0')) + amount
+        return totals
+
+    # Lifecycle
+
+    def _reserved_asset(self, managed: ManagedOrder) -> Optional[str]:
+        if managed.side is None:
+            return None
+        base_asset, quote_asset = self.symbols.assets(managed.symbol)
+        return quote_asset if managed.side == BUY else base_asset
+
+    def _release(self, managed: ManagedOrder, amount: Decimal) -> None:
+        amount = min(amount, managed.reserved)
+        if amount <= 0:
+            return
+        asset = self._reserved_asset(managed)
+        if asset is not None:
+            self.wallet_manager.release_reserved_balance(asset, amount)
+            managed.reserved -= amount
+
+    def required(self, symbol: str, order: Dict) -> Tuple[Optional[str], Decimal]:
+        """Asset and amount an order ties up while it rests"""
+        return self._required(self.symbols.assets(symbol), order)
+
+    @staticmethod
+    def _required(assets: Tuple[str, str], order: Dict) -> Tuple[Optional[str], Decimal]:
+        side = normalize_side(order.get('side'))
+        price = _decimal(order.get('price'))
+        amount = _decimal(order.get('amount'))
+        if side is None or price is None or amount is None:
+            return None, Decimal('0')
+        return (assets[1], amount * price) if side == BUY else (assets[0], amount)
+
+    def begin(self, symbol: str, cancel_ids: List[str], orders: List[Dict]) -> Submission:
+        """Reserve funds for orders about to be sent with these cancels
+
+        Orders the wallet cannot cover are left out of the submission.
+        Every begin() must be followed by complete(), even if sending fails.
+        """
+        wallet = self.wallet_manager
+        assets = self.symbols.assets(symbol)
+        pool: Dict[str, Decimal] = {}
+        held: Dict[str, Decimal] = {}
+        funded, reserved = [], []
+        with wallet.lock:
+            for order_id in cancel_ids:
+                managed = self.orders.get(order_id)
+                if managed is not None and managed.reserved > 0:
+                    asset = assets[1] if managed.side == BUY else assets[0]
+                    pool[asset] = pool.get(asset, Decimal('0')) + managed.reserved
+                    held[order_id] = managed.reserved
+                    managed.reserved = Decimal('0')
+            # Fund orders from a local budget, then reserve once per asset
+            budget: Dict[str, Decimal] = {}
+            used: Dict[str, Decimal] = {}
+            for order in orders:
+                asset, need = self._required(assets, order)
+                if asset is not None:
+                    if asset not in budget:
+                        budget[asset] = wallet.get_available_balance(asset) + pool.get(asset, Decimal('0'))
+                    if need > budget[asset]:
+                        self.stats['unfunded'] += 1
+                        continue
+                    budget[asset] -= need
+                    used[asset] = used.get(asset, Decimal('0')) + need
+                funded.append(order)
+                reserved.append(need)
+            for asset, amount in used.items():
+                from_pool = min(pool.get(asset, Decimal('0')), amount)
+                if from_pool:
+                    pool[asset] -= from_pool
+                if amount > from_pool:
+                    # Checked against the budget above, under the same lock
+                    wallet.reserve_balance(asset, amount - from_pool, force=True)
+            submission = Submission(symbol, list(cancel_ids), funded, reserved, held, pool, used)
+            self._in_flight.add(submission)
+        if len(funded) < len(orders):
+            self.logger.warning(f"Insufficient balance to send {len(orders) - len(funded)}/{len(orders)} "
+                                f"orders for {symbol}")
+        return submission
+
+    def complete(self, submission: Submission, canceled: List[Optional[Dict]],
+                 placed_ids: List[Optional[str]]) -> None:
+        """Record the venue's answer to a submission
+
+        Args:
+            submission: Result of begin()
+            canceled: Cancel result per cancel id (None if it failed); missing
+                entries count as failed
+            placed_ids: Order id per submitted order (None if not placed)
+        """
+        symbol = submission.symbol
+        pool = submission.pool
+        wallet = self.wallet_manager
+        with wallet.lock:
+            self._in_flight.discard(submission)
+            placed_ids = list(placed_ids) + [None] * (len(submission.orders) - len(placed_ids))
+            for order, reserved, order_id in zip(submission.orders, submission.reserved, placed_ids):
+                if order_id:
+                    self.add(order_id, symbol, order, reserved)
+                else:
+                    self.reject(symbol, order, reserved)
+            canceled = list(canceled) + [None] * (len(submission.cancel_ids) - len(canceled))
+            for order_id, result in zip(submission.cancel_ids, canceled):
+                managed = self.orders.get(order_id)
+                if managed is None:
+                    continue
+                if result is not None:
+                    self._close(managed, OrderStatus.CANCELED)
+                    continue
+                # Still resting: take its funds back
+                held = submission.held.get(order_id, Decimal('0'))
+                if held:
+                    asset = self._reserved_asset(managed)
+                    from_pool = min(pool.get(asset, Decimal('0')), held)
+                    if from_pool:
+                        pool[asset] -= from_pool
+                    if held > from_pool:
+                        wallet.reserve_balance(asset, held - from_pool, force=True)
+                    managed.reserved = held
+            for asset, amount in pool.items():
+                if amount > 0:
+                    wallet.release_reserved_balance(asset, amount)
+            pool.clear()
+
+    def add(self, order_id: str, symbol: str, order: Dict,
+            reserved: Decimal = Decimal('0')) -> ManagedOrder:
+        """Track a new order the venue accepted
+
+        Args:
+            order_id: Venue order id
+            symbol: Trading pair symbol
+            order: Order dict as quoted (side, price, amount, orderType)
+            reserved: Balance already reserved for it (quote asset for
+                buys, base asset for sells), released as it fills or closes
+        """
+        existing = self.orders.get(order_id)
+        if existing is not None:
+            return existing
+        managed = ManagedOrder(order_id, symbol, order, Decimal(reserved))
+        self.orders[order_id] = managed
+        self._by_symbol.setdefault(symbol, {})[order_id] = managed
+        self._by_level.setdefault(managed.level, {})[order_id] = managed
+        self.stats['new'] += 1
+        self._journal(managed)
+        return managed
+
+    def reject(self, symbol: str, order: Dict, reserved: Decimal = Decimal('0')) -> ManagedOrder:
+        """Record an order the venue refused, releasing its reservation"""
+        managed = ManagedOrder('', symbol, order, Decimal(reserved))
+        self._release(managed, managed.reserved)
+        managed.status = OrderStatus.REJECTED
+        self.stats['rejected'] += 1
+        return managed
+
+    def _close(self, managed: ManagedOrder, status: OrderStatus) -> None:
+        self.orders.pop(managed.order_id, None)
+        symbol_orders = self._by_symbol.get(managed.symbol)
+        if symbol_orders is not None:
+            symbol_orders.pop(managed.order_id, None)
+        level = self._by_level.get(managed.level)
+        if level is not None:
+            level.pop(managed.order_id, None)
+            if not level:
+                del self._by_level[managed.level]
+        self._release(managed, managed.reserved)
+        managed.status = status
+        managed.updated_at = time.monotonic()
+        self.stats[status.name.lower()] += 1
+        self._journal(managed)
+
+    def _journal(self, managed: ManagedOrder) -> None:
+        if self.journal is not None:
+            self.journal.order(managed.order_id, managed.symbol, _JOURNAL_SIDES.get(managed.side, 0),
+                               managed.status, managed.amount, managed.price, managed.filled)
+
+    def on_fill(self, order_id: str, amount: Decimal) -> Optional[ManagedOrder]:
+        """Apply a fill; returns the order, or None if it is not live"""
+        managed = self.orders.get(order_id)
+        if managed is None:
+            self.stats['unknown_fills'] += 1
+            return None
+        with self.wallet_manager.lock:
+            amount = min(Decimal(amount), managed.remaining)
+            if managed.remaining:
+                # Release the filled share of what is still reserved
+                self._release(managed, managed.reserved * amount / managed.remaining)
+            managed.filled += amount
+            managed.updated_at = time.monotonic()
+            if managed.remaining == 0:
+                self._close(managed, OrderStatus.FILLED)
+            elif managed.status == OrderStatus.NEW:
+                managed.status = OrderStatus.PARTIAL
+                self.stats['partial'] += 1
+                self._journal(managed)
+        return managed
+
+    def on_cancel(self, order_id: str) -> Optional[ManagedOrder]:
+        """Close an order the venue confirmed cancelled"""
+        managed = self.orders.get(order_id)
+        if managed is not None:
+            with self.wallet_manager.lock:
+                self._close(managed, OrderStatus.CANCELED)
+        return managed
+
+    def replace_all(self, symbol: str, orders: Dict[str, Dict]) -> None:
+        """Make ``orders`` the symbol's complete set of live orders"""
+        for order_id in list(self._by_symbol.get(symbol, {})):
+            if order_id not in orders:
+                self.on_cancel(order_id)
+        for order_id, order in orders.items():
+            self.add(order_id, symbol, order)
+
+    # Reconciliation
+
+    def due(self, symbol: str) -> bool:
+        return time.monotonic() >= self._next_reconcile.get(symbol, 0.0)
+
+    def reconcile(self, symbol: str, response: Any) -> Dict[str, int]:
+        """Diff live orders against a get_open_orders response
+
+        Returns counts of orders closed, adopted and marked partially filled.
+        """
+        self._next_reconcile[symbol] = time.monotonic() + self.reconcile_interval
+        entries = _entries(response)
+        if entries is None:
+            self.stats['errors'] += 1
+            self.logger.warning(f"Skipping reconciliation for {symbol}: bad open orders response")
+            return {'closed': 0, 'adopted': 0, 'partial': 0}
+        self.stats['reconciles'] += 1
+        venue: Dict[str, Dict] = {}
+        for entry in entries:
+            order_id = entry.get('orderId', entry.get('id'))
+            if order_id is not None:
+                venue[str(order_id)] = entry
+
+        counts = {'closed': 0, 'adopted': 0, 'partial': 0}
+        live = self._by_symbol.get(symbol, {})
+        # A full page may have left orders out, so only a complete
+        # listing can show that an order is gone
+        if len(entries) < self.limit:
+            cutoff = time.monotonic() - self.grace
+            for managed in [m for order_id, m in live.items() if order_id not in venue]:
+                if managed.created_at <= cutoff:
+                    self._close(managed, OrderStatus.CANCELED)
+                    counts['closed'] += 1
+        for order_id, entry in venue.items():
+            managed = live.get(order_id)
+            if managed is None:
+                order = self._order_from_venue(symbol, entry)
+                asset, need = self.required(symbol, order)
+                with self.wallet_manager.lock:
+                    # Already locked on the venue, so reserved even past our available balance
+                    if asset is not None and need > 0:
+                        self.wallet_manager.reserve_balance(asset, need, force=True)
+                    self.add(order_id, symbol, order, need if asset is not None else Decimal('0'))
+                counts['adopted'] += 1
+            elif managed.status == OrderStatus.NEW and (_decimal(entry.get('executedQty')) or 0) > 0:
+                managed.status = OrderStatus.PARTIAL
+                self.stats['partial'] += 1
+                counts['partial'] += 1
+                self._journal(managed)
+        self.stats['closed_by_reconcile'] += counts['closed']
+        self.stats['adopted'] += counts['adopted']
+        if counts['closed'] or counts['adopted']:
+            self.logger.info(f"Reconciled {symbol}: {counts['closed']} closed, "
+                             f"{counts['adopted']} adopted, {len(live)} live")
+        return counts
+
+    @staticmethod
+    def _order_from_venue(symbol: str, entry: Dict) -> Dict:
+        amount = _decimal(entry.get('origQty', entry.get('volume'))) or Decimal('0')
+        executed = _decimal(entry.get('executedQty')) or Decimal('0')
+        return {
+            "symbol": symbol,
+            "side": 1 if normalize_side(entry.get('side')) == BUY else 2,
+            "orderType": 1,
+            "price": str(entry.get('price')),
+            "amount": str(amount - executed)
+        }
+
+    def reconcile_with(self, client, symbol: str, force: bool = False) -> Optional[Dict[str, int]]:
+        """Fetch the venue's open orders and reconcile, if due"""
+        if not force and not self.due(symbol):
+            return None
+        try:
+            response = client.get_open_orders(symbol, self.limit)
+        except Exception as e:
+            self._next_reconcile[symbol] = time.monotonic() + self.reconcile_interval
+            self.stats['errors'] += 1
+            self.logger.error(f"Error fetching open orders for {symbol}: {e}")
+            return None
+        return self.reconcile(symbol, response)
+
+    async def reconcile_with_async(self, client, symbol: str, force: bool = False) -> Optional[Dict[str, int]]:
+        """reconcile_with() for an async client"""
+        if not force and not self.due(symbol):
+            return None
+        try:
+            response = await client.get_open_orders(symbol, self.limit)
+        except Exception as e:
+            self._next_reconcile[symbol] = time.monotonic() + self.reconcile_interval
+            self.stats['errors'] += 1
+            self.logger.error(f"Error fetching open orders for {symbol}: {e}")
+            return None
+        return self.reconcile(symbol, response)
+
+    # Account sync
+
+    def account_sync_due(self) -> bool:
+        return time.monotonic() >= self._next_account_sync
+
+    def sync_account(self, response: Any) -> Optional[Dict[str, Decimal]]:
+        """Correct wallet balances and reservations from a get_account_info response
+
+        Returns the balance corrections applied, or None for a bad response.
+        """
+        self._next_account_sync = time.monotonic() + self.account_sync_interval
+        totals = parse_account_balances(response)
+        if totals is None:
+            self.stats['errors'] += 1
+            self.logger.warning("Skipping account sync: bad account response")
+            return None
+        self.stats['account_syncs'] += 1
+        with self.wallet_manager.lock:
+            return self.wallet_manager.sync_balances(totals, self.reserved_totals(in_flight=True))
+
+    def sync_account_with(self, client, force: bool = False) -> Optional[Dict[str, Decimal]]:
+        """Fetch account balances and sync, if due"""
+        if not force and not self.account_sync_due():
+            return None
+        try:
+            response = client.get_account_info()
+        except Exception as e:
+            self._next_account_sync = time.monotonic() + self.account_sync_interval
+            self.stats['errors'] += 1
+            self.logger.error(f"Error fetching account info: {e}")
+            return None
+        return self.sync_account(response)
+
+    async def sync_account_with_async(self, client, force: bool = False) -> Optional[Dict[str, Decimal]]:
+        """sync_account_with() for an async client"""
+        if not force and not self.account_sync_due():
+            return None
+        try:
+            response = await client.get_account_info()
+        except Exception as e:
+            self._next_account_sync = time.monotonic() + self.account_sync_interval
+            self.stats['errors'] += 1
+            self.logger.error(f"Error fetching account info: {e}")
+            return None
+        return self.sync_account(response)
@@ -1,34 +1,121 @@
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Tuple
 from decimal import Decimal
-import json
+from config.config import BALANCE_DECIMALS, TRADE_HISTORY_SIZE
+from trading.trade_history import SymbolStats, TradeHistory
+from utils.fixed_point import FixedPoint, FixedPointView, Number
 from utils.logger import setup_logger
 
 logger = setup_logger("position_tracker")
 
 class PositionTracker:
-    def __init__(self):
-        self.positions: Dict[str, Decimal] = {}
-        self.trades: list = []
+    """Net position per symbol, held in fixed-point units (see utils.fixed_point)
+
+    Recent fills are kept in a bounded TradeHistory; per-symbol volume,
+    VWAP, average entry price and realized PnL are updated on every fill
+    and cover all fills this tracker has seen.
+
+    Args:
+        decimals: Fixed-point places of positions and prices
+        history_size: Fills kept in ``trades``
+    """
+    def __init__(self, decimals: int = BALANCE_DECIMALS, history_size: int = TRADE_HISTORY_SIZE):
+        self.scale = FixedPoint(decimals)
+        self._positions: Dict[str, int] = {}
+        self.positions = FixedPointView(self._positions, self.scale)
+        self.trades = TradeHistory(self.scale, history_size)
+        self._stats: Dict[str, SymbolStats] = {}
         self.logger = logger
-        
+        self.journal = None  # Set by Journal.attach
+        self.hedger = None  # Set by Hedger.attach
+
+    def _fill(self, symbol: str, delta: int, price: int, is_buy: bool, position: int) -> None:
+        stats = self._stats.get(symbol)
+        if stats is None:
+            stats = self._stats[symbol] = SymbolStats()
+        stats.apply(delta if is_buy else -delta, price)
+        self.trades.append(symbol, delta, price, is_buy, position)
+        if self.journal is not None:
+            self.journal.fill(symbol, delta, price, is_buy)
+
     def update_position(self, symbol: str, amount: Decimal, price: Decimal, is_buy: bool):
         """Update position after a trade"""
-        if symbol not in self.positions:
-            self.positions[symbol] = Decimal('0')
-            
-        delta = amount if is_buy else -amount
-        self.positions[symbol] += delta
-        
-        trade = {
-            'symbol': symbol,
-            'amount': str(amount),
-            'price': str(price),
-            'side': 'buy' if is_buy else 'sell',
-            'position_after': str(self.positions[symbol])
-        }
-        self.trades.append(trade)
-        self.logger.info(f"Position updated: {json.dumps(trade)}")
-        
+        delta = self.scale.to_int(amount)
+        position = self._positions.get(symbol, 0) + (delta if is_buy else -delta)
+        self._positions[symbol] = position
+        self._fill(symbol, delta, self.scale.to_int(price), is_buy, position)
+        self.logger.info("Position updated: %s %s %s @ %s, position %s", symbol, 'buy' if is_buy else 'sell',
+                         amount, price, self.scale.to_str(position))
+        if self.hedger is not None:
+            self.hedger.on_position(symbol)
+
     def get_position(self, symbol: str) -> Decimal:
         """Get current position for a symbol"""
-        return self.positions.get(symbol, Decimal('0')) 
\ No newline at end of file
+        return self.scale.to_decimal(self._positions.get(symbol, 0))
+
+    def get_position_scaled(self, symbol: str) -> int:
+        """Current position in fixed-point units"""
+        return self._positions.get(symbol, 0)
+
+    def update_positions(self, symbol: str, fills: Iterable[Tuple[Decimal, Decimal, bool]]):
+        """Apply a batch of (amount, price, is_buy) fills with a single log line"""
+        scale = self.scale
+        position = self._positions.get(symbol, 0)
+        count = 0
+        for amount, price, is_buy in fills:
+            delta = scale.to_int(amount)
+            position += delta if is_buy else -delta
+            self._fill(symbol, delta, scale.to_int(price), is_buy, position)
+            count += 1
+        self._positions[symbol] = position
+        if count:
+            self.logger.info("Position updated: %s %d fills, position %s", symbol, count, scale.to_str(position))
+            if self.hedger is not None:
+                self.hedger.on_position(symbol)
+
+    def _squared(self, value: int) -> Decimal:
+        """Decimal of a size * price product"""
+        return Decimal(value).scaleb(-2 * self.scale.decimals)
+
+    def _price(self, numerator: int, size: int) -> Optional[Decimal]:
+        """Price from a size * price product and a size, or None for no size"""
+        return Decimal(numerator) / (Decimal(size) * self.scale.unit) if size else None
+
+    def realized_pnl(self, symbol: str) -> Decimal:
+        """Quote-asset PnL of closed size, against the average entry price"""
+        stats = self._stats.get(symbol)
+        return self._squared(stats.realized) if stats else Decimal('0')
+
+    def unrealized_pnl(self, symbol: str, mark_price: Number) -> Decimal:
+        """Quote-asset PnL of the open position if closed at ``mark_price``"""
+        stats = self._stats.get(symbol)
+        if not stats:
+            return Decimal('0')
+        return self._squared(stats.position * self.scale.to_int(mark_price) - stats.cost)
+
+    def average_entry_price(self, symbol: str) -> Optional[Decimal]:
+        """Average price of the open position; None when flat"""
+        stats = self._stats.get(symbol)
+        return self._price(stats.cost, stats.position) if stats else None
+
+    def vwap(self, symbol: str) -> Optional[Decimal]:
+        """Volume-weighted price of every fill; None before the first"""
+        stats = self._stats.get(symbol)
+        return self._price(stats.notional, stats.volume) if stats else None
+
+    def get_stats(self, symbol: str, mark_price: Optional[Number] = None) -> Dict[str, Decimal]:
+        """Fill aggregates for a symbol; unrealized PnL too when ``mark_price`` is given"""
+        stats = self._stats.get(symbol) or SymbolStats()
+        to_decimal = self.scale.to_decimal
+        result = {
+            'trades': stats.trades,
+            'volume': to_decimal(stats.volume),
+            'buy_volume': to_decimal(stats.buy_volume),
+            'sell_volume': to_decimal(stats.volume - stats.buy_volume),
+            'turnover': self._squared(stats.notional),
+            'vwap': self._price(stats.notional, stats.volume),
+            'average_entry_price': self._price(stats.cost, stats.position),
+            'realized_pnl': self._squared(stats.realized),
+        }
+        if mark_price is not None:
+            result['unrealized_pnl'] = self._squared(stats.position * self.scale.to_int(mark_price) - stats.cost)
+        return result
@@ -0,0 +1,117 @@
+import math
+from abc import ABC, abstractmethod
+from typing import Dict, Tuple, Type
+import numpy as np
+from config.config import PRICING_MODEL, AS_RISK_AVERSION, AS_ORDER_INTENSITY, AS_HORIZON
+
+class PricingModel(ABC):
+    """Turns mid price, inventory and volatility into bid/ask quote prices
+
+    All inputs are plain floats so models can run once per book update.
+    ``inventory`` is the position as a fraction of the position limit
+    (-1 short at the limit, 1 long at the limit), ``volatility`` is the
+    stdev of per-update mid returns and ``min_spread`` the relative
+    distance from mid each quote must keep at least.
+    """
+    name = ''
+    # Whether RiskManager should pass its volatility/imbalance-widened
+    # spread as min_spread instead of the configured floor
+    uses_recommended_spread = False
+
+    @abstractmethod
+    def quote(self, mid: float, inventory: float, volatility: float,
+              min_spread: float) -> Tuple[float, float]:
+        """(bid, ask) prices for one book update"""
+        pass
+
+    @abstractmethod
+    def quote_many(self, mid: np.ndarray, inventory: np.ndarray, volatility,
+                   min_spread) -> Tuple[np.ndarray, np.ndarray]:
+        """quote() over arrays, for backtests and parameter sweeps"""
+        pass
+
+class SymmetricModel(PricingModel):
+    """Quotes ``min_spread`` either side of mid regardless of inventory"""
+    name = 'symmetric'
+    uses_recommended_spread = True
+
+    def quote(self, mid: float, inventory: float, volatility: float,
+              min_spread: float) -> Tuple[float, float]:
+        return mid * (1 - min_spread), mid * (1 + min_spread)
+
+    def quote_many(self, mid, inventory, volatility, min_spread):
+        mid = np.asarray(mid, dtype=np.float64)
+        return mid * (1 - min_spread), mid * (1 + min_spread)
+
+class AvellanedaStoikovModel(PricingModel):
+    """Inventory-skewed quotes around a reservation price (Avellaneda & Stoikov, 2008)
+
+    In relative terms, with inventory q, per-update volatility s and a
+    horizon of T updates:
+
+        reservation = mid * (1 - q * gamma * s^2 * T)
+        half_spread = gamma * s^2 * T / 2 + ln(1 + gamma / kappa) / gamma
+
+    Both are closed form, so a quote costs a handful of float operations.
+    The half spread is floored at ``min_spread`` and the reservation shift
+    is capped at the half spread, so a heavily skewed side rests at mid
+    rather than crossing it.
+
+    Args:
+        risk_aversion: gamma; larger values skew harder for the same inventory
+        intensity: kappa; how fast fill probability decays with distance
+            from mid (per unit relative distance)
+        horizon: T, in book updates
+    """
+    name = 'avellaneda_stoikov'
+
+    def __init__(self, risk_aversion: float = AS_RISK_AVERSION,
+                 intensity: float = AS_ORDER_INTENSITY, horizon: float = AS_HORIZON):
+        if risk_aversion <= 0 or intensity <= 0 or horizon <= 0:
+            raise ValueError("risk_aversion, intensity and horizon must be positive")
+        self.risk_aversion = risk_aversion
+        self.intensity = intensity
+        self.horizon = horizon
+        # Volatility-independent part of the optimal spread
+        self._liquidity_spread = math.log1p(risk_aversion / intensity) / risk_aversion
+
+    def reservation_shift(self, inventory: float, volatility: float) -> float:
+        """Relative distance of the reservation price below mid"""
+        return inventory * self.risk_aversion * volatility * volatility * self.horizon
+
+    def half_spread(self, volatility: float) -> float:
+        """Relative optimal half spread before the min_spread floor"""
+        return 0.5 * self.risk_aversion * volatility * volatility * self.horizon + self._liquidity_spread
+
+    def quote(self, mid: float, inventory: float, volatility: float,
+              min_spread: float) -> Tuple[float, float]:
+        half = self.half_spread(volatility)
+        if half < min_spread:
+            half = min_spread
+        shift = self.reservation_shift(inventory, volatility)
+        if shift > half:
+            shift = half
+        elif shift < -half:
+            shift = -half
+        return mid * (1 - shift - half), mid * (1 - shift + half)
+
+    def quote_many(self, mid, inventory, volatility, min_spread):
+        mid = np.asarray(mid, dtype=np.float64)
+        volatility = np.asarray(volatility, dtype=np.float64)
+        half = np.maximum(self.half_spread(volatility), min_spread)
+        shift = np.clip(self.reservation_shift(np.asarray(inventory, dtype=np.float64), volatility),
+                        -half, half)
+        return mid * (1 - shift - half), mid * (1 - shift + half)
+
+PRICING_MODELS: Dict[str, Type[PricingModel]] = {
+    SymmetricModel.name: SymmetricModel,
+    AvellanedaStoikovModel.name: AvellanedaStoikovModel,
+}
+
+def create_pricing_model(name: str = PRICING_MODEL, **kwargs) -> PricingModel:
+    """Instantiate a pricing model by its config name"""
+    try:
+        model = PRICING_MODELS[name]
+    except KeyError:
+        raise ValueError(f"Unknown pricing model {name!r}, expected one of {sorted(PRICING_MODELS)}")
+    return model(**kwargs)
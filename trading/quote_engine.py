@@ -0,0 +1,152 @@
+import math
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger("quote_engine")
+
+BUY = 'BUY'
+SELL = 'SELL'
+
+def normalize_side(side) -> Optional[str]:
+    """Map 1/2 or 'BUY'/'SELL' onto 'BUY'/'SELL'"""
+    if side in (1, '1') or str(side).upper() == BUY:
+        return BUY
+    if side in (2, '2') or str(side).upper() == SELL:
+        return SELL
+    return None
+
+def _quote_key(order: Dict) -> Optional[Tuple[str, Decimal, Decimal, str]]:
+    """(side, price, amount, orderType) for a quote, or None if malformed"""
+    try:
+        side = normalize_side(order['side'])
+        price = Decimal(str(order['price']))
+        amount = Decimal(str(order['amount']))
+    except (KeyError, InvalidOperation):
+        return None
+    if side is None:
+        return None
+    return side, price, amount, str(order.get('orderType', 1))
+
+class QuotePlan:
+    """Changes needed to move the live quotes to the desired set"""
+    __slots__ = ('keep', 'cancel_ids', 'place', 'requests', 'naive_requests')
+
+    def __init__(self, keep: Dict[str, Dict], cancel_ids: List[str], place: List[Dict],
+                 requests: int, naive_requests: int):
+        self.keep = keep
+        self.cancel_ids = cancel_ids
+        self.place = place
+        self.requests = requests
+        self.naive_requests = naive_requests
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.cancel_ids and not self.place
+
+    def __repr__(self) -> str:
+        return (f"QuotePlan(keep={len(self.keep)}, cancel={len(self.cancel_ids)}, "
+                f"place={len(self.place)}, requests={self.requests})")
+
+class QuoteEngine:
+    """Diffs desired quotes against live ones so only meaningful changes are sent
+
+    A live quote is kept when a desired quote on the same side and level
+    has the same order type, a price within ``max(tick_size, price *
+    price_tolerance)`` and a size within ``size_tolerance`` (relative).
+    Everything else is cancelled and/or placed. Planning is pure; the
+    caller executes the plan with whatever client it has.
+
+    Args:
+        tick_size: Smallest price move worth requoting for
+        price_tolerance: Relative price move tolerated before requoting
+        size_tolerance: Relative size change tolerated before requoting
+        batch_size: Orders per request when estimating rate-limit usage
+    """
+    def __init__(self, tick_size: Decimal = Decimal('0.0001'), price_tolerance: Decimal = Decimal('0'),
+                 size_tolerance: Decimal = Decimal('0'), batch_size: int = 1):
+        self.tick_size = Decimal(tick_size)
+        self.price_tolerance = Decimal(price_tolerance)
+        self.size_tolerance = Decimal(size_tolerance)
+        self.batch_size = max(int(batch_size), 1)
+        self.stats = {
+            'cycles': 0,
+            'idle_cycles': 0,
+            'requotes': 0,
+            'requotes_avoided': 0,
+            'orders_canceled': 0,
+            'orders_placed': 0,
+            'requests_sent': 0,
+            'requests_saved': 0
+        }
+        self.logger = logger
+
+    def _requests(self, count: int) -> int:
+        return math.ceil(count / self.batch_size) if count else 0
+
+    def _unchanged(self, live: Tuple, desired: Tuple) -> bool:
+        _, live_price, live_amount, live_type = live
+        _, price, amount, order_type = desired
+        if live_type != order_type:
+            return False
+        if abs(price - live_price) >= max(self.tick_size, live_price * self.price_tolerance):
+            return False
+        return abs(amount - live_amount) <= live_amount * self.size_tolerance
+
+    def plan(self, live_orders: Dict[str, Dict], desired: List[Dict]) -> QuotePlan:
+        """Work out which live quotes to keep, cancel and place
+
+        Quotes are paired level by level per side, best price first.
+        Malformed live entries are always cancelled.
+        """
+        cancel_ids: List[str] = []
+        by_side: Dict[str, List] = {BUY: [], SELL: []}
+        for order_id, order in live_orders.items():
+            key = _quote_key(order)
+            if key is None:
+                cancel_ids.append(order_id)
+            else:
+                by_side[key[0]].append((key, order_id, order))
+
+        wanted: Dict[str, List] = {BUY: [], SELL: []}
+        for order in desired:
+            key = _quote_key(order)
+            if key is not None:
+                wanted[key[0]].append((key, order))
+
+        keep: Dict[str, Dict] = {}
+        place: List[Dict] = []
+        for side in (BUY, SELL):
+            best_first = side == BUY
+            live = sorted(by_side[side], key=lambda q: q[0][1], reverse=best_first)
+            new = sorted(wanted[side], key=lambda q: q[0][1], reverse=best_first)
+            for i in range(max(len(live), len(new))):
+                live_quote = live[i] if i < len(live) else None
+                new_quote = new[i] if i < len(new) else None
+                if live_quote and new_quote and self._unchanged(live_quote[0], new_quote[0]):
+                    keep[live_quote[1]] = live_quote[2]
+                    continue
+                if live_quote:
+                    cancel_ids.append(live_quote[1])
+                if new_quote:
+                    place.append(new_quote[1])
+
+        requests = self._requests(len(cancel_ids)) + self._requests(len(place))
+        naive_requests = self._requests(len(live_orders)) + self._requests(len(desired))
+        return QuotePlan(keep, cancel_ids, place, requests, naive_requests)
+
+    def record(self, plan: QuotePlan) -> None:
+        """Add a plan's outcome to the running metrics"""
+        self.stats['cycles'] += 1
+        if plan.is_empty:
+            self.stats['idle_cycles'] += 1
+        else:
+            self.stats['requotes'] += 1
+        self.stats['requotes_avoided'] += len(plan.keep)
+        self.stats['orders_canceled'] += len(plan.cancel_ids)
+        self.stats['orders_placed'] += len(plan.place)
+        self.stats['requests_sent'] += plan.requests
+        self.stats['requests_saved'] += plan.naive_requests - plan.requests
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
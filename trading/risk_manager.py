@@ -1,20 +1,42 @@
 from decimal import Decimal
-from typing import Optional, Dict
+from enum import IntEnum
+from typing import Optional, Dict, Sequence, Tuple
+import numpy as np
+from config.config import VOLATILITY_SPREAD_MULTIPLIER
 from utils.logger import setup_logger
 from trading.position_tracker import PositionTracker
 from trading.wallet_manager import WalletManager
+from trading.symbols import SymbolRegistry
+from trading.pricing import PricingModel, create_pricing_model
 
 logger = setup_logger("risk_manager")
 
+class RiskReason(IntEnum):
+    """Per-order result codes from RiskManager.check_orders"""
+    OK = 0
+    POSITION_LIMIT = 1
+    DYNAMIC_LIMIT = 2
+    INSUFFICIENT_BALANCE = 3
+    BALANCE_RATIO = 4
+    INVALID_ORDER = 5
+    ERROR = 6
+
 class RiskManager:
-    def __init__(self, position_tracker: PositionTracker, wallet_manager: WalletManager):
+    def __init__(self, position_tracker: PositionTracker, wallet_manager: WalletManager,
+                 symbol_registry: Optional[SymbolRegistry] = None,
+                 pricing_model: Optional[PricingModel] = None,
+                 volatility_multiplier: Decimal = VOLATILITY_SPREAD_MULTIPLIER):
         self.position_tracker = position_tracker
         self.wallet_manager = wallet_manager
+        self.symbols = symbol_registry or wallet_manager.symbols
+        self.pricing_model = pricing_model or create_pricing_model()
+        self.volatility_multiplier = Decimal(volatility_multiplier)
         self.max_position_size: Dict[str, Decimal] = {}
         self.max_drawdown: Dict[str, Decimal] = {}
         self.min_spread: Dict[str, Decimal] = {}
         self.target_balance_ratio: Dict[str, Decimal] = {}
         self.logger = logger
+        self.journal = None  # Set by Journal.attach
         
     def set_limits(self, symbol: str, max_position: Decimal, max_order_size: Decimal, min_spread: Decimal) -> None:
         """Set risk limits for a symbol
@@ -29,30 +51,17 @@ class RiskManager:
         self.max_drawdown[symbol] = Decimal('1.0')  # Assuming max_drawdown is set to 100%
         self.min_spread[symbol] = min_spread
         self.target_balance_ratio[symbol] = Decimal('1.0')  # Assuming target_ratio is set to 100%
+        if self.journal is not None:
+            self.journal.limits(symbol, max_position, max_order_size, min_spread)
         self.logger.info(f"Risk limits set for {symbol}: max_position={max_position}, "
                         f"max_drawdown={self.max_drawdown[symbol]}, min_spread={min_spread}, "
                         f"target_ratio={self.target_balance_ratio[symbol]}")
 
     def get_dynamic_position_limit(self, symbol: str, price: Decimal) -> Decimal:
         """Calculate dynamic position limit based on current portfolio value"""
-        # Handle both formats: SZARUSDT and SZAR-USDT
-        if '-' in symbol:
-            base_asset, quote_asset = symbol.split('-')
-        else:
-            # Extract base and quote assets from combined symbol
-            # Assuming common quote assets are USDT, USDC, etc. (3-4 chars)
-            quote_asset = symbol[-4:]  # Get last 4 chars for quote asset
-            base_asset = symbol[:-4]   # Get remaining chars for base asset
-            
-            # Handle 3-char quote assets like BTC
-            if quote_asset.startswith('U'):
-                quote_asset = symbol[-4:]  # USDT, USDC
-                base_asset = symbol[:-4]
-            else:
-                quote_asset = symbol[-3:]  # BTC, ETH
-                base_asset = symbol[:-3]
+        base_asset, quote_asset = self.symbols.assets(symbol)
         
-        self.logger.debug(f"Split symbol {symbol} into base={base_asset}, quote={quote_asset}")
+        self.logger.debug("Split symbol %s into base=%s, quote=%s", symbol, base_asset, quote_asset)
         
         # Get total portfolio value in quote asset
         base_balance = self.wallet_manager.get_available_balance(base_asset)
@@ -68,7 +77,7 @@ class RiskManager:
         base_spread = self.min_spread[symbol]
         
         # Increase spread with volatility
-        volatility_adjustment = market_volatility * Decimal('2.0')
+        volatility_adjustment = market_volatility * self.volatility_multiplier
         
         # Increase spread if position is imbalanced
         imbalance_factor = self.calculate_position_imbalance(symbol)
@@ -76,25 +85,36 @@ class RiskManager:
         
         return max(base_spread, base_spread + volatility_adjustment + imbalance_adjustment)
 
+    def get_inventory(self, symbol: str) -> float:
+        """Position as a fraction of the position limit, clipped to [-1, 1]"""
+        max_allowed = self.max_position_size.get(symbol)
+        if not max_allowed:
+            return 0.0
+        tracker = self.position_tracker
+        inventory = tracker.scale.to_float(tracker.get_position_scaled(symbol)) / float(max_allowed)
+        return max(-1.0, min(1.0, inventory))
+
+    def get_quote_prices(self, symbol: str, mid_price: Decimal,
+                         market_volatility: Decimal) -> Tuple[Decimal, Decimal]:
+        """Bid and ask prices from the pricing model for the current position"""
+        bid, ask = self.quote_prices(symbol, float(mid_price), market_volatility)
+        return Decimal(str(bid)), Decimal(str(ask))
+
+    def quote_prices(self, symbol: str, mid_price: float, market_volatility: Decimal) -> Tuple[float, float]:
+        """get_quote_prices() as floats, for callers that snap them to the tick grid"""
+        if self.pricing_model.uses_recommended_spread:
+            min_spread = self.get_recommended_spread(symbol, market_volatility)
+        else:
+            min_spread = self.min_spread[symbol]
+        return self.pricing_model.quote(
+            mid_price, self.get_inventory(symbol), float(market_volatility), float(min_spread)
+        )
+
     def calculate_position_imbalance(self, symbol: str) -> Decimal:
         """Calculate how far current position is from target ratio"""
-        # Handle both formats: SZARUSDT and SZAR-USDT
-        if '-' in symbol:
-            base_asset, quote_asset = symbol.split('-')
-        else:
-            # Extract base and quote assets from combined symbol
-            quote_asset = symbol[-4:]  # Get last 4 chars for quote asset
-            base_asset = symbol[:-4]   # Get remaining chars for base asset
-            
-            # Handle 3-char quote assets like BTC
-            if quote_asset.startswith('U'):
-                quote_asset = symbol[-4:]  # USDT, USDC
-                base_asset = symbol[:-4]
-            else:
-                quote_asset = symbol[-3:]  # BTC, ETH
-                base_asset = symbol[:-3]
+        base_asset, quote_asset = self.symbols.assets(symbol)
         
-        self.logger.debug(f"Checking balance ratio for {base_asset}/{quote_asset}")
+        self.logger.debug("Checking balance ratio for %s/%s", base_asset, quote_asset)
         
         # Get current balances
         base_balance = self.wallet_manager.get_available_balance(base_asset)
@@ -107,29 +127,15 @@ class RiskManager:
         target_ratio = self.target_balance_ratio.get(symbol, Decimal('1.0'))
         imbalance = abs(current_ratio - target_ratio) / target_ratio
         
-        self.logger.debug(f"Balance ratio - Current: {current_ratio:.4f}, Target: {target_ratio:.4f}, Imbalance: {imbalance:.4f}")
+        self.logger.debug("Balance ratio - Current: %.4f, Target: %.4f, Imbalance: %.4f", current_ratio, target_ratio, imbalance)
         
         return Decimal('1.0') + imbalance
 
     def _improves_balance_ratio(self, symbol: str, amount: Decimal, price: Decimal, is_buy: bool) -> bool:
         """Check if the order improves the balance ratio between assets"""
-        # Handle both formats: SZARUSDT and SZAR-USDT
-        if '-' in symbol:
-            base_asset, quote_asset = symbol.split('-')
-        else:
-            # Extract base and quote assets from combined symbol
-            quote_asset = symbol[-4:]  # Get last 4 chars for quote asset
-            base_asset = symbol[:-4]   # Get remaining chars for base asset
-            
-            # Handle 3-char quote assets like BTC
-            if quote_asset.startswith('U'):
-                quote_asset = symbol[-4:]  # USDT, USDC
-                base_asset = symbol[:-4]
-            else:
-                quote_asset = symbol[-3:]  # BTC, ETH
-                base_asset = symbol[:-3]
+        base_asset, quote_asset = self.symbols.assets(symbol)
         
-        self.logger.debug(f"Checking balance ratio for {base_asset}/{quote_asset}")
+        self.logger.debug("Checking balance ratio for %s/%s", base_asset, quote_asset)
         
         # Get current balances
         base_balance = self.wallet_manager.get_available_balance(base_asset)
@@ -154,55 +160,59 @@ class RiskManager:
         current_diff = abs(current_ratio - target_ratio)
         new_diff = abs(new_ratio - target_ratio)
         
-        self.logger.debug(f"Balance ratios - Current: {current_ratio:.4f}, New: {new_ratio:.4f}, Target: {target_ratio:.4f}")
+        self.logger.debug("Balance ratios - Current: %.4f, New: %.4f, Target: %.4f", current_ratio, new_ratio, target_ratio)
         
         return new_diff <= current_diff
 
     def check_order(self, symbol: str, amount: Decimal, price: Decimal, is_buy: bool) -> bool:
-        """Check if an order meets all risk criteria"""
+        """Check if an order meets all risk criteria
+        
+        Positions and balances are compared in the wallet's fixed-point
+        units; only the balance ratio gate uses floats, as check_orders does.
+        """
         try:
-            # Get current position
-            current_position = self.position_tracker.get_position(symbol)
+            wallet = self.wallet_manager
+            scale = wallet.scale
+            unit = scale.unit
+            amount = scale.to_int(amount)
+            price = scale.to_int(price)
             
             # Check position limits
-            if is_buy:
-                new_position = current_position + amount
-            else:
-                new_position = current_position - amount
-            
+            current_position = self.position_tracker.get_position_scaled(symbol)
+            new_position = abs(current_position + amount if is_buy else current_position - amount)
             max_allowed = self.max_position_size.get(symbol, Decimal('0'))
-            if abs(new_position) > max_allowed:
+            if new_position > scale.to_int(max_allowed):
                 self.logger.warning(f"Order would exceed position limit of {max_allowed}")
                 return False
             
-            # Check dynamic position limit
-            dynamic_limit = self.get_dynamic_position_limit(symbol, price)
-            if abs(new_position) > dynamic_limit:
-                self.logger.warning(f"Order would exceed dynamic position limit of {dynamic_limit}")
-                return False
+            base_asset, quote_asset = self.symbols.assets(symbol)
+            base = wallet.available_scaled(base_asset)
+            quote = wallet.available_scaled(quote_asset)
             
-            # Extract assets from symbol
-            if '-' in symbol:
-                base_asset, quote_asset = symbol.split('-')
-            else:
-                quote_asset = symbol[-4:]
-                base_asset = symbol[:-4]
+            # Check dynamic position limit: 20% of portfolio value, in units**2
+            if new_position * 5 * unit > base * price + quote * unit:
+                limit = scale.to_decimal((base * price // unit + quote) // 5)
+                self.logger.warning(f"Order would exceed dynamic position limit of {limit}")
+                return False
             
             # Check if we have enough balance
             if is_buy:
-                required_quote = amount * price
-                if self.wallet_manager.get_available_balance(quote_asset) < required_quote:
+                if quote * unit < amount * price:
                     self.logger.warning(f"Insufficient {quote_asset} balance for buy order")
                     return False
-            else:
-                if self.wallet_manager.get_available_balance(base_asset) < amount:
-                    self.logger.warning(f"Insufficient {base_asset} balance for sell order")
-                    return False
+            elif base < amount:
+                self.logger.warning(f"Insufficient {base_asset} balance for sell order")
+                return False
                 
             # Check if order improves balance ratio only if we have significant imbalance
-            current_ratio = self.calculate_position_imbalance(symbol)
-            if current_ratio > Decimal('1.2'):  # Only check if imbalance is >20%
-                if not self._improves_balance_ratio(symbol, amount, price, is_buy):
+            target = float(self.target_balance_ratio.get(symbol, Decimal('1.0')))
+            imbalance = 1.0 + abs(base / quote - target) / target if quote else 1.0
+            if imbalance > 1.2:  # Only check if imbalance is >20%
+                notional = amount * price / unit
+                new_base, new_quote = (base + amount, quote - notional) if is_buy else (base - amount, quote + notional)
+                current_ratio = base * price / unit / quote if quote else 0.0
+                new_ratio = new_base * price / unit / new_quote if new_quote else 0.0
+                if abs(new_ratio - target) > abs(current_ratio - target):
                     self.logger.warning("Order would worsen balance ratio")
                     return False
             
@@ -210,4 +220,88 @@ class RiskManager:
         
         except Exception as e:
             self.logger.error(f"Error in risk check: {str(e)}")
-            return False 
\ No newline at end of file
+            return False 
+
+    def check_orders(self, symbol: str, amounts: Sequence, prices: Sequence,
+                     is_buy: Sequence, credit: Optional[Dict[str, Decimal]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Check a whole quote ladder against the risk criteria in one pass
+        
+        Orders are evaluated in sequence per side as if every earlier order
+        on that side had filled: position, reserved notional (buys) or base
+        (sells) and the balance ratio are cumulative. Earlier orders count
+        even when rejected, so the result never over-commits. Checks match
+        check_order and are evaluated in float64.
+        
+        Args:
+            symbol: Trading pair symbol
+            amounts: Order sizes
+            prices: Limit prices
+            is_buy: True for buy orders
+            credit: Asset -> funds freed before these orders are sent
+                (reservations of the quotes they replace)
+            
+        Returns:
+            (accepted, reasons): boolean mask and RiskReason codes per order
+        """
+        amount = np.asarray(amounts, dtype=np.float64)
+        price = np.asarray(prices, dtype=np.float64)
+        buy = np.asarray(is_buy, dtype=bool)
+        if amount.size == 0:
+            return np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int8)
+        
+        try:
+            base_asset, quote_asset = self.symbols.assets(symbol)
+            scale = self.wallet_manager.scale
+            credit = credit or {}
+            base = scale.to_float(self.wallet_manager.available_scaled(base_asset)) + float(credit.get(base_asset, 0))
+            quote = scale.to_float(self.wallet_manager.available_scaled(quote_asset)) + float(credit.get(quote_asset, 0))
+            position = self.position_tracker.scale.to_float(self.position_tracker.get_position_scaled(symbol))
+            max_allowed = float(self.max_position_size.get(symbol, Decimal('0')))
+            target = float(self.target_balance_ratio.get(symbol, Decimal('1.0')))
+            
+            notional = amount * price
+            cum_buy = np.cumsum(np.where(buy, amount, 0.0))
+            cum_sell = np.cumsum(np.where(buy, 0.0, amount))
+            cum_buy_notional = np.cumsum(np.where(buy, notional, 0.0))
+            cum_sell_notional = np.cumsum(np.where(buy, 0.0, notional))
+            
+            # Position limits after this order and all earlier ones on its side
+            new_position = np.abs(np.where(buy, position + cum_buy, position - cum_sell))
+            position_fail = new_position > max_allowed
+            dynamic_fail = new_position > (base * price + quote) * 0.20
+            
+            # Cumulative reservation against available balances
+            balance_fail = np.where(buy, cum_buy_notional > quote, cum_sell > base)
+            
+            # Balances before and after this order fills
+            base_after = np.where(buy, base + cum_buy, base - cum_sell)
+            quote_after = np.where(buy, quote - cum_buy_notional, quote + cum_sell_notional)
+            base_before = np.where(buy, base_after - amount, base_after + amount)
+            quote_before = np.where(buy, quote_after + notional, quote_after - notional)
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # Same gate as calculate_position_imbalance, then _improves_balance_ratio
+                imbalance = np.where(quote_before != 0,
+                                     1.0 + np.abs(base_before / quote_before - target) / target, 1.0)
+                current_ratio = np.where(quote_before != 0, base_before * price / quote_before, 0.0)
+                new_ratio = np.where(quote_after != 0, base_after * price / quote_after, 0.0)
+            ratio_fail = (imbalance > 1.2) & (np.abs(new_ratio - target) > np.abs(current_ratio - target))
+            
+            invalid = ~((amount > 0) & (price > 0))
+            
+            # Lowest-priority first so the first failing check (as in check_order) wins
+            reasons = np.zeros(amount.size, dtype=np.int8)
+            reasons[ratio_fail] = RiskReason.BALANCE_RATIO
+            reasons[balance_fail] = RiskReason.INSUFFICIENT_BALANCE
+            reasons[dynamic_fail] = RiskReason.DYNAMIC_LIMIT
+            reasons[position_fail] = RiskReason.POSITION_LIMIT
+            reasons[invalid] = RiskReason.INVALID_ORDER
+        except Exception as e:
+            self.logger.error(f"Error in batch risk check: {str(e)}")
+            reasons = np.full(amount.size, RiskReason.ERROR, dtype=np.int8)
+        
+        accepted = reasons == RiskReason.OK
+        if not accepted.all():
+            self.logger.warning(f"Rejected {int((~accepted).sum())}/{amount.size} orders for {symbol}: "
+                                f"{[RiskReason(r).name for r in reasons[~accepted]]}")
+        return accepted, reasons
@@ -0,0 +1,165 @@
+import inspect
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_EVEN, ROUND_UP
+from typing import Any, Dict, Iterable, Optional, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger("symbols")
+
+# Matched longest first when a symbol has no separator, e.g. SZARUSDT -> SZAR/USDT
+QUOTE_ASSETS = ('USDT', 'USDC', 'BUSD', 'CUSD', 'USD', 'BTC', 'ETH', 'KAS', 'EUR')
+SEPARATORS = ('-', '_', '/')
+
+DEFAULT_TICK_SIZE = Decimal('0.00000001')
+DEFAULT_LOT_SIZE = Decimal('0.00000001')
+
+def normalize_symbol(symbol: str) -> str:
+    """Canonical registry key: upper case without separators"""
+    key = symbol.upper()
+    for sep in SEPARATORS:
+        key = key.replace(sep, '')
+    return key
+
+def split_symbol(symbol: str) -> Tuple[str, str]:
+    """Best-effort (base, quote) split for symbols the exchange did not describe"""
+    upper = symbol.upper()
+    for sep in SEPARATORS:
+        if sep in upper:
+            base, _, quote = upper.partition(sep)
+            return base, quote
+    for quote in sorted(QUOTE_ASSETS, key=len, reverse=True):
+        if upper.endswith(quote) and len(upper) > len(quote):
+            return upper[:-len(quote)], quote
+    return upper[:-4], upper[-4:]
+
+def _precision_step(precision: Any, default: Decimal) -> Decimal:
+    if precision is None:
+        return default
+    return Decimal(1).scaleb(-int(precision))
+
+class SymbolInfo:
+    """Trading rules for one pair"""
+    __slots__ = ('symbol', 'base_asset', 'quote_asset', 'tick_size', 'lot_size',
+                 'min_qty', 'min_notional')
+
+    def __init__(self, symbol: str, base_asset: str, quote_asset: str,
+                 tick_size: Decimal = DEFAULT_TICK_SIZE, lot_size: Decimal = DEFAULT_LOT_SIZE,
+                 min_qty: Decimal = Decimal('0'), min_notional: Decimal = Decimal('0')):
+        self.symbol = normalize_symbol(symbol)
+        self.base_asset = base_asset.upper()
+        self.quote_asset = quote_asset.upper()
+        self.tick_size = Decimal(tick_size)
+        self.lot_size = Decimal(lot_size)
+        self.min_qty = Decimal(min_qty)
+        self.min_notional = Decimal(min_notional)
+
+    @classmethod
+    def from_exchange(cls, data: Dict[str, Any]) -> 'SymbolInfo':
+        """Build from a /sapi/v1/symbols entry
+
+        Uses explicit tickSize/stepSize when present, otherwise derives them
+        from pricePrecision/quantityPrecision.
+        """
+        symbol = data['symbol']
+        base, quote = split_symbol(symbol)
+        return cls(
+            symbol,
+            data.get('baseAsset') or base,
+            data.get('quoteAsset') or quote,
+            tick_size=Decimal(str(data['tickSize'])) if data.get('tickSize')
+            else _precision_step(data.get('pricePrecision'), DEFAULT_TICK_SIZE),
+            lot_size=Decimal(str(data['stepSize'])) if data.get('stepSize')
+            else _precision_step(data.get('quantityPrecision'), DEFAULT_LOT_SIZE),
+            min_qty=Decimal(str(data.get('limitVolumeMin') or data.get('minQty') or '0')),
+            min_notional=Decimal(str(data.get('limitAmountMin') or data.get('minNotional') or '0'))
+        )
+
+    @property
+    def assets(self) -> Tuple[str, str]:
+        return self.base_asset, self.quote_asset
+
+    def quantize_price(self, price: Decimal, side: Optional[int] = None) -> Decimal:
+        """Snap a price to the tick grid, rounding bids down and asks up"""
+        rounding = {1: ROUND_DOWN, 2: ROUND_UP}.get(side, ROUND_HALF_EVEN)
+        return (Decimal(price) / self.tick_size).to_integral_value(rounding) * self.tick_size
+
+    def quantize_size(self, size: Decimal) -> Decimal:
+        """Round a size down to the lot size"""
+        return (Decimal(size) / self.lot_size).to_integral_value(ROUND_DOWN) * self.lot_size
+
+    def meets_minimums(self, size: Decimal, price: Decimal) -> bool:
+        """Check the exchange's minimum quantity and notional"""
+        return size >= self.min_qty and size * price >= self.min_notional
+
+    def __repr__(self) -> str:
+        return (f"SymbolInfo({self.symbol!r}, {self.base_asset}/{self.quote_asset}, "
+                f"tick={self.tick_size}, lot={self.lot_size}, min_notional={self.min_notional})")
+
+class SymbolRegistry:
+    """Symbol metadata cache with O(1) lookup by any spelling of a symbol
+
+    Load it once from the exchange with refresh(); symbols the exchange did
+    not describe are derived with split_symbol() on first use and cached.
+    """
+    def __init__(self, symbols: Optional[Iterable[SymbolInfo]] = None):
+        self._symbols: Dict[str, SymbolInfo] = {}
+        self.logger = logger
+        for info in symbols or ():
+            self.add(info)
+
+    def add(self, info: SymbolInfo) -> None:
+        self._symbols[info.symbol] = info
+
+    def get(self, symbol: str) -> SymbolInfo:
+        """Metadata for a symbol such as 'SZARUSDT', 'szarusdt' or 'SZAR-USDT'"""
+        info = self._symbols.get(symbol)
+        if info is None:
+            key = normalize_symbol(symbol)
+            info = self._symbols.get(key)
+            if info is None:
+                base, quote = split_symbol(symbol)
+                info = SymbolInfo(key, base, quote)
+                self._symbols[key] = info
+            self._symbols[symbol] = info  # Cache the raw spelling too
+        return info
+
+    def assets(self, symbol: str) -> Tuple[str, str]:
+        """(base, quote) assets for a symbol"""
+        return self.get(symbol).assets
+
+    def __contains__(self, symbol: str) -> bool:
+        return normalize_symbol(symbol) in self._symbols
+
+    def __len__(self) -> int:
+        return len({id(info) for info in self._symbols.values()})
+
+    def load(self, response: Any) -> int:
+        """Load a get_symbols() response, returning the number of symbols read"""
+        if isinstance(response, dict):
+            response = response.get('symbols', response.get('data', []))
+            if isinstance(response, dict):
+                response = response.get('symbols', [])
+        count = 0
+        for entry in response or []:
+            try:
+                info = SymbolInfo.from_exchange(entry)
+            except (KeyError, TypeError, ValueError, ArithmeticError) as e:
+                self.logger.warning(f"Skipping malformed symbol entry {entry}: {e}")
+                continue
+            # Replace any derived entries cached under other spellings
+            for key in [k for k, v in self._symbols.items() if v.symbol == info.symbol]:
+                del self._symbols[key]
+            self.add(info)
+            count += 1
+        self.logger.info(f"Loaded metadata for {count} symbols")
+        return count
+
+    def refresh(self, client) -> int:
+        """Load symbol metadata from a sync client"""
+        return self.load(client.get_symbols())
+
+    async def refresh_async(self, client) -> int:
+        """Load symbol metadata from a sync or async client"""
+        response = client.get_symbols()
+        if inspect.isawaitable(response):
+            response = await response
+        return self.load(response)
@@ -0,0 +1,145 @@
+from typing import Dict, Iterator, List, Sequence, Union
+import numpy as np
+from config.config import TRADE_HISTORY_SIZE
+from utils.fixed_point import FixedPoint
+
+class SymbolStats:
+    """Running aggregates for one symbol, updated in O(1) per fill
+
+    Sizes are in the tracker's fixed-point units; ``notional``, ``cost``
+    (signed cost basis of the open position) and ``realized`` are size *
+    price products, so in units squared. Closing fills realize PnL
+    against the average entry price.
+    """
+    __slots__ = ('trades', 'volume', 'buy_volume', 'notional', 'position', 'cost', 'realized')
+
+    def __init__(self):
+        self.trades = 0
+        self.volume = 0
+        self.buy_volume = 0
+        self.notional = 0
+        self.position = 0
+        self.cost = 0
+        self.realized = 0
+
+    def apply(self, delta: int, price: int) -> None:
+        """Fold a fill of signed size ``delta`` at ``price`` (both in units)"""
+        size = abs(delta)
+        self.trades += 1
+        self.volume += size
+        if delta > 0:
+            self.buy_volume += size
+        self.notional += size * price
+        position = self.position
+        if position == 0 or (position > 0) == (delta > 0):
+            self.cost += delta * price
+        else:
+            held = abs(position)
+            closing = min(size, held)
+            removed = self.cost * closing // held
+            self.realized += (closing if position > 0 else -closing) * price - removed
+            self.cost -= removed
+            if size > held:
+                # Flipped; the rest opens a position at this price
+                self.cost = (position + delta) * price
+        self.position = position + delta
+
+    def to_list(self) -> List[int]:
+        """The aggregates in ``__slots__`` order, for snapshots"""
+        return [getattr(self, name) for name in self.__slots__]
+
+    @classmethod
+    def from_list(cls, values: Sequence[int]) -> 'SymbolStats':
+        stats = cls()
+        for name, value in zip(cls.__slots__, values):
+            setattr(stats, name, value)
+        return stats
+
+class TradeHistory:
+    """The most recent fills, column-wise in a fixed-size ring
+
+    Holds the last ``capacity`` fills in preallocated arrays, so memory
+    stays the same however long the process runs. ``total`` counts every
+    fill ever appended. Indexing returns a fill as a dict of strings,
+    oldest retained fill first; column() returns one field as an array.
+
+    Args:
+        scale: Fixed-point scale of the stored sizes and prices
+        capacity: Fills kept
+    """
+    __slots__ = ('scale', 'capacity', 'total', '_symbols', '_symbol_ids',
+                 '_symbol', '_amount', '_price', '_position', '_is_buy')
+
+    def __init__(self, scale: FixedPoint, capacity: int = TRADE_HISTORY_SIZE):
+        if capacity < 1:
+            raise ValueError(f"Trade history capacity must be positive, got {capacity}")
+        self.scale = scale
+        self.capacity = capacity
+        self.total = 0
+        self._symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self._symbol = np.zeros(capacity, dtype=np.int32)
+        self._amount = np.zeros(capacity, dtype=np.int64)
+        self._price = np.zeros(capacity, dtype=np.int64)
+        self._position = np.zeros(capacity, dtype=np.int64)
+        self._is_buy = np.zeros(capacity, dtype=bool)
+
+    def append(self, symbol: str, amount: int, price: int, is_buy: bool, position: int) -> None:
+        """Record a fill; sizes and prices in units"""
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        slot = self.total % self.capacity
+        self._symbol[slot] = symbol_id
+        self._amount[slot] = amount
+        self._price[slot] = price
+        self._position[slot] = position
+        self._is_buy[slot] = is_buy
+        self.total += 1
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def _slot(self, index: int) -> int:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("trade index out of range")
+        return (self.total - length + index) % self.capacity
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        slot = self._slot(index)
+        to_str = self.scale.to_str
+        return {
+            'symbol': self._symbols[self._symbol[slot]],
+            'amount': to_str(int(self._amount[slot])),
+            'price': to_str(int(self._price[slot])),
+            'side': 'buy' if self._is_buy[slot] else 'sell',
+            'position_after': to_str(int(self._position[slot]))
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def column(self, name: str) -> np.ndarray:
+        """One field of the retained fills, oldest first
+
+        ``symbol`` gives symbol strings, ``is_buy`` booleans, and
+        ``amount``, ``price`` and ``position_after`` fixed-point units.
+        """
+        columns = {'symbol': self._symbol, 'amount': self._amount, 'price': self._price,
+                   'position_after': self._position, 'is_buy': self._is_buy}
+        if name not in columns:
+            raise KeyError(f"Unknown trade column {name!r}; expected one of {list(columns)}")
+        values = columns[name]
+        length = len(self)
+        start = (self.total - length) % self.capacity
+        values = np.concatenate((values[start:length], values[:start])) if start else values[:length].copy()
+        if name == 'symbol':
+            return np.array(self._symbols, dtype=object)[values] if length else np.empty(0, dtype=object)
+        return values
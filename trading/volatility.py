@@ -0,0 +1,195 @@
+import math
+from array import array
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+class RollingVariance:
+    """Windowed sample variance over a fixed ring buffer
+
+    Adding a value is O(1): once the buffer is full the oldest value is
+    swapped out with Welford's add/remove update. The running moments are
+    recomputed from the buffer once per wrap to stop floating-point drift.
+    """
+    __slots__ = ('window', '_values', '_index', 'count', '_mean', '_m2')
+
+    def __init__(self, window: int):
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = window
+        self._values = array('d', bytes(8 * window))
+        self._index = 0
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        if self.count < self.window:
+            self.count += 1
+            delta = value - self._mean
+            self._mean += delta / self.count
+            self._m2 += delta * (value - self._mean)
+        else:
+            old = self._values[self._index]
+            mean = self._mean + (value - old) / self.window
+            self._m2 += (value - old) * (value - mean + old - self._mean)
+            self._mean = mean
+        self._values[self._index] = value
+        self._index += 1
+        if self._index == self.window:
+            self._index = 0
+            if self.count == self.window:
+                self._recompute()
+
+    def _recompute(self) -> None:
+        mean = math.fsum(self._values) / self.window
+        self._mean = mean
+        self._m2 = math.fsum((v - mean) ** 2 for v in self._values)
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    def variance(self) -> Optional[float]:
+        """Sample variance (n - 1), or None with fewer than two values"""
+        if self.count < 2:
+            return None
+        return max(self._m2, 0.0) / (self.count - 1)
+
+    def stdev(self) -> Optional[float]:
+        variance = self.variance()
+        return None if variance is None else math.sqrt(variance)
+
+class EwmaVariance:
+    """Exponentially weighted variance of zero-mean returns (RiskMetrics style)"""
+    __slots__ = ('alpha', 'count', '_variance')
+
+    def __init__(self, alpha: float = 0.06):
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.count = 0
+        self._variance = 0.0
+
+    @classmethod
+    def from_halflife(cls, halflife: float) -> 'EwmaVariance':
+        return cls(1 - 0.5 ** (1 / halflife))
+
+    def add(self, value: float) -> None:
+        if self.count == 0:
+            self._variance = value * value
+        else:
+            self._variance += self.alpha * (value * value - self._variance)
+        self.count += 1
+
+    def variance(self) -> Optional[float]:
+        return self._variance if self.count else None
+
+    def stdev(self) -> Optional[float]:
+        return math.sqrt(self._variance) if self.count else None
+
+def parse_klines(klines: Any) -> List[Tuple[float, float, float, float]]:
+    """Extract (open, high, low, close) tuples from a get_klines response
+
+    Accepts the API's list of {'open', 'high', 'low', 'close', ...} dicts,
+    optionally inside a 'data' envelope. Malformed bars are skipped.
+    """
+    if isinstance(klines, dict):
+        klines = klines.get('data') or []
+    bars = []
+    for kline in klines or []:
+        try:
+            bar = tuple(float(kline[k]) for k in ('open', 'high', 'low', 'close'))
+        except (KeyError, TypeError, ValueError):
+            continue
+        if min(bar) > 0:
+            bars.append(bar)
+    return bars
+
+def parkinson_volatility(bars: Sequence[Tuple[float, float, float, float]]) -> Optional[float]:
+    """Per-bar volatility from the high/low range (Parkinson, 1980)"""
+    if not bars:
+        return None
+    total = math.fsum(math.log(high / low) ** 2 for _, high, low, _ in bars)
+    return math.sqrt(total / (4 * math.log(2) * len(bars)))
+
+def garman_klass_volatility(bars: Sequence[Tuple[float, float, float, float]]) -> Optional[float]:
+    """Per-bar volatility from open/high/low/close (Garman-Klass, 1980)"""
+    if not bars:
+        return None
+    k = 2 * math.log(2) - 1
+    total = math.fsum(
+        0.5 * math.log(high / low) ** 2 - k * math.log(close / open_) ** 2
+        for open_, high, low, close in bars
+    )
+    return math.sqrt(max(total, 0.0) / len(bars))
+
+class VolatilityEstimator:
+    """Streaming volatility of simple mid-price returns over several windows
+
+    Each price tick updates every rolling window and the optional EWMA in
+    constant time. Range-based estimates from klines can be loaded as a
+    fallback for when too few ticks have been seen.
+
+    Args:
+        windows: Rolling window lengths in returns; the first is the default
+        ewma_alpha: Smoothing factor for an additional EWMA estimate
+        default: Volatility reported before any estimate is available
+    """
+    def __init__(self, windows: Iterable[int] = (100,), ewma_alpha: Optional[float] = None,
+                 default: Decimal = Decimal('0.01')):
+        self.windows: Dict[int, RollingVariance] = {w: RollingVariance(w) for w in windows}
+        if not self.windows:
+            raise ValueError("at least one window is required")
+        self.primary_window = next(iter(self.windows))
+        self.ewma = EwmaVariance(ewma_alpha) if ewma_alpha else None
+        self.default = default
+        self.last_price: Optional[float] = None
+        self.range_volatility: Dict[str, float] = {}
+
+    def update(self, price: float) -> None:
+        """Record a new price and update all estimators"""
+        price = float(price)
+        if price <= 0:
+            return
+        last, self.last_price = self.last_price, price
+        if last is None:
+            return
+        ret = (price - last) / last
+        for window in self.windows.values():
+            window.add(ret)
+        if self.ewma is not None:
+            self.ewma.add(ret)
+
+    def stdev(self, window: Optional[int] = None) -> Optional[float]:
+        """Rolling stdev for a window, or None if it has fewer than two returns"""
+        return self.windows[window or self.primary_window].stdev()
+
+    def ewma_stdev(self) -> Optional[float]:
+        return self.ewma.stdev() if self.ewma is not None else None
+
+    def load_klines(self, klines: Any) -> Dict[str, float]:
+        """Compute Parkinson and Garman-Klass estimates from a get_klines response"""
+        bars = parse_klines(klines)
+        if bars:
+            self.range_volatility = {
+                'parkinson': parkinson_volatility(bars),
+                'garman_klass': garman_klass_volatility(bars)
+            }
+        return self.range_volatility
+
+    def get_volatility(self, window: Optional[int] = None) -> Decimal:
+        """Volatility for quoting: rolling stdev, then kline range estimate, then default"""
+        value = self.stdev(window)
+        if value is None:
+            value = self.range_volatility.get('garman_klass')
+        if value is None:
+            return self.default
+        return Decimal(str(value))
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """All current estimates keyed by name"""
+        estimates = {f"rolling_{w}": est.stdev() for w, est in self.windows.items()}
+        if self.ewma is not None:
+            estimates['ewma'] = self.ewma.stdev()
+        estimates.update(self.range_volatility)
+        return estimates
@@ -2,63 +2,223 @@ import json
 import hmac
 import hashlib
 import base64
-from decimal import Decimal
-from typing import Dict, Optional
+import threading
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Optional
+import numpy as np
+from config.config import BALANCE_DECIMALS
+from utils.fixed_point import FixedPoint, FixedPointView
 from utils.logger import setup_logger
+from trading.symbols import SymbolRegistry
 
 logger = setup_logger("wallet_manager")
 
+def parse_account_balances(response: Any) -> Optional[Dict[str, Decimal]]:
+    """Total (free + locked) balance per asset from a get_account_info response
+
+    Returns None if the response holds no balance list.
+    """
+    if isinstance(response, dict) and 'data' in response and 'balances' not in response:
+        response = response['data']
+    entries = response.get('balances') if isinstance(response, dict) else response
+    if not isinstance(entries, list):
+        return None
+    totals = {}
+    for entry in entries:
+        try:
+            asset = str(entry.get('asset') or entry['coin']).upper()
+            free = Decimal(str(entry.get('free', entry.get('available', '0'))))
+            locked = Decimal(str(entry.get('locked', entry.get('frozen', '0'))))
+        except (AttributeError, KeyError, InvalidOperation):
+            continue
+        totals[asset] = free + locked
+    return totals
+
+_INT64_MAX = 2 ** 63 - 1
+
+def _steps(numerator: int, denominator: int, step: Decimal) -> int:
+    """Whole steps in numerator / denominator, rounded down, in exact integers"""
+    step_numerator, step_denominator = step.as_integer_ratio()
+    return numerator * step_denominator // (denominator * step_numerator)
+
 class WalletManager:
-    def __init__(self):
-        self.balances: Dict[str, Decimal] = {
-            'KAS': Decimal('0'),
-            'USDC': Decimal('0'),
-            'SZAR': Decimal('0')
-        }
-        self.reserved_balances: Dict[str, Decimal] = {
-            'KAS': Decimal('0'),
-            'USDC': Decimal('0'),
-            'SZAR': Decimal('0')
-        }
+    """Balances and reservations per asset
+
+    Amounts are held as integer counts of 10**-decimals units (see
+    utils.fixed_point), so reserving, releasing and balance checks are
+    exact integer arithmetic. The Decimal methods convert at the edges;
+    hot paths use the ``*_scaled`` methods and can_place_orders().
+    """
+    def __init__(self, symbol_registry: Optional[SymbolRegistry] = None, decimals: int = BALANCE_DECIMALS):
+        self.symbols = symbol_registry or SymbolRegistry()
+        self.scale = FixedPoint(decimals)
+        self._totals: Dict[str, int] = {'KAS': 0, 'USDC': 0, 'SZAR': 0}
+        self._reserved: Dict[str, int] = {'KAS': 0, 'USDC': 0, 'SZAR': 0}
+        # Decimal views of the totals and reservations
+        self.balances = FixedPointView(self._totals, self.scale)
+        self.reserved_balances = FixedPointView(self._reserved, self.scale)
         self.min_kas_reserve = Decimal('1.0')  # Minimum KAS for gas
         self.logger = logger
+        # Reservations are check-then-update; the lock keeps that atomic
+        # across threads, and no await happens while it is held
+        self.lock = threading.RLock()
+        self.journal = None  # Set by Journal.attach
         
     def update_balance(self, asset: str, amount: Decimal):
         """Update balance for an asset"""
-        if asset not in self.balances:
-            self.balances[asset] = Decimal('0')
-        self.balances[asset] = amount
-        self.logger.info(f"Balance updated for {asset}: {amount}")
+        self._totals[asset] = total = self.scale.to_int(amount)
+        if self.journal is not None:
+            self.journal.balance(asset, total)
+        self.logger.info("Balance updated for %s: %s", asset, amount)
+
+    def adjust_balance(self, asset: str, delta: Decimal) -> None:
+        """Add ``delta`` (negative to subtract) to an asset's balance"""
+        with self.lock:
+            self._totals[asset] = total = self._totals.get(asset, 0) + self.scale.to_int(delta)
+            if self.journal is not None:
+                self.journal.balance(asset, total)
+
+    def get_balance(self, asset: str) -> Decimal:
+        """Total balance, reserved or not"""
+        return self.scale.to_decimal(self._totals.get(asset, 0))
         
     def get_available_balance(self, asset: str) -> Decimal:
         """Get available balance (total - reserved)"""
-        return self.balances.get(asset, Decimal('0')) - self.reserved_balances.get(asset, Decimal('0'))
+        return self.scale.to_decimal(self.available_scaled(asset))
+
+    def available_scaled(self, asset: str) -> int:
+        """Available balance in fixed-point units"""
+        return self._totals.get(asset, 0) - self._reserved.get(asset, 0)
         
-    def reserve_balance(self, asset: str, amount: Decimal) -> bool:
-        """Reserve balance for pending orders"""
-        available = self.get_available_balance(asset)
-        if available >= amount:
-            self.reserved_balances[asset] = self.reserved_balances.get(asset, Decimal('0')) + amount
-            self.logger.info(f"Reserved {amount} {asset}")
+    def reserve_balance(self, asset: str, amount: Decimal, force: bool = False) -> bool:
+        """Reserve balance for pending orders
+        
+        Args:
+            asset: Asset to reserve
+            amount: Amount to reserve
+            force: Reserve even if it exceeds the available balance, for
+                funds already committed on the exchange
+        """
+        if self.reserve_scaled(asset, self.scale.to_int(amount), force):
+            self.logger.debug("Reserved %s %s", amount, asset)
             return True
         return False
+
+    def reserve_scaled(self, asset: str, units: int, force: bool = False) -> bool:
+        """reserve_balance() in fixed-point units"""
+        with self.lock:
+            if force or self.available_scaled(asset) >= units:
+                self._reserved[asset] = self._reserved.get(asset, 0) + units
+                return True
+            return False
         
     def release_reserved_balance(self, asset: str, amount: Decimal):
         """Release reserved balance"""
-        self.reserved_balances[asset] = max(
-            Decimal('0'),
-            self.reserved_balances.get(asset, Decimal('0')) - amount
-        )
-        self.logger.info(f"Released {amount} {asset} from reserved balance")
+        self.release_scaled(asset, self.scale.to_int(amount))
+        self.logger.debug("Released %s %s from reserved balance", amount, asset)
+
+    def release_scaled(self, asset: str, units: int) -> None:
+        """release_reserved_balance() in fixed-point units"""
+        with self.lock:
+            self._reserved[asset] = max(0, self._reserved.get(asset, 0) - units)
+
+    def sync_balances(self, totals: Dict[str, Decimal],
+                      reserved: Dict[str, Decimal]) -> Dict[str, Decimal]:
+        """Replace balances with exchange totals and reservations with those of live orders
+        
+        Args:
+            totals: Asset -> total balance reported by the exchange
+            reserved: Asset -> amount held by our live orders
+            
+        Returns:
+            Asset -> correction applied to the total balance, for assets that drifted
+        """
+        scale = self.scale
+        drift = {}
+        with self.lock:
+            for asset, total in totals.items():
+                total = scale.to_int(total)
+                previous = self._totals.get(asset, 0)
+                if total != previous:
+                    drift[asset] = scale.to_decimal(total - previous)
+                    if self.journal is not None:
+                        self.journal.balance(asset, total)
+                self._totals[asset] = total
+            for asset in set(self._reserved) | set(reserved):
+                self._reserved[asset] = scale.to_int(reserved.get(asset, 0))
+        if drift:
+            self.logger.warning(f"Balance drift corrected: {drift}")
+        return drift
+
+    def _has_gas(self) -> bool:
+        return self.available_scaled('KAS') >= self.scale.to_int(self.min_kas_reserve)
+        
+    def can_place_order(self, side: int, symbol: str, amount: Decimal, price: Decimal,
+                        credit: Optional[Dict[str, Decimal]] = None) -> bool:
+        """Check if order can be placed based on available balance
         
-    def can_place_order(self, side: int, symbol: str, amount: Decimal, price: Decimal) -> bool:
-        """Check if order can be placed based on available balance"""
-        base_asset, quote_asset = symbol.split('-')
+        ``credit`` adds funds that will be freed before the order is sent,
+        such as the reservations of quotes it replaces.
+        """
+        info = self.symbols.get(symbol)
+        base_asset, quote_asset = info.assets
+        if not info.meets_minimums(amount, price):
+            self.logger.warning(f"Order below {symbol} minimums: {amount} @ {price}")
+            return False
         
+        scale = self.scale
+        credit = credit or {}
+        amount = scale.to_int(amount)
         if side == 1:  # Buy
-            required_quote = amount * price
-            return (self.get_available_balance(quote_asset) >= required_quote and 
-                   self.get_available_balance('KAS') >= self.min_kas_reserve)
+            # amount * price in units**2, so the comparison stays exact
+            available = self.available_scaled(quote_asset) + scale.to_int(credit.get(quote_asset, 0))
+            return available * scale.unit >= amount * scale.to_int(price) and self._has_gas()
         else:  # Sell
-            return (self.get_available_balance(base_asset) >= amount and 
-                   self.get_available_balance('KAS') >= self.min_kas_reserve) 
\ No newline at end of file
+            available = self.available_scaled(base_asset) + scale.to_int(credit.get(base_asset, 0))
+            return available >= amount and self._has_gas()
+
+    def can_place_orders(self, symbol: str, ticks: np.ndarray, lots: np.ndarray, is_buy: np.ndarray,
+                         credit: Optional[Dict[str, Decimal]] = None) -> np.ndarray:
+        """can_place_order() for orders given as tick and lot counts, in one pass
+        
+        Each order is checked on its own against the available balance, as
+        can_place_order does. Balances and the symbol's minimums are
+        converted to tick/lot units once, so the per-order work is int64
+        comparisons.
+        
+        Args:
+            symbol: Trading pair symbol
+            ticks: Prices in multiples of the symbol's tick size
+            lots: Sizes in multiples of the symbol's lot size
+            is_buy: True for buy orders
+            credit: Asset -> funds freed before these orders are sent
+        
+        Returns:
+            Boolean mask of orders the wallet can fund
+        """
+        ticks = np.asarray(ticks, dtype=np.int64)
+        lots = np.asarray(lots, dtype=np.int64)
+        is_buy = np.asarray(is_buy, dtype=bool)
+        if not self._has_gas():
+            return np.zeros(len(ticks), dtype=bool)
+        info = self.symbols.get(symbol)
+        base_asset, quote_asset = info.assets
+        credit = credit or {}
+        scale = self.scale
+        step = info.tick_size * info.lot_size  # Quote value of one tick * lot
+        quote = _steps(self.available_scaled(quote_asset) + scale.to_int(credit.get(quote_asset, 0)),
+                       scale.unit, step)
+        base = _steps(self.available_scaled(base_asset) + scale.to_int(credit.get(base_asset, 0)),
+                      scale.unit, info.lot_size)
+        min_lots = -_steps(*(-info.min_qty).as_integer_ratio(), info.lot_size)
+        min_notional = -_steps(*(-info.min_notional).as_integer_ratio(), step)
+        if len(ticks) and int(ticks.max()) * int(lots.max()) > _INT64_MAX:
+            # Fine ticks and lots can overflow int64; fall back to Python ints
+            ticks, lots = ticks.astype(object), lots.astype(object)
+        else:
+            # Balances past int64 cover any order that fits in it
+            quote, base = min(quote, _INT64_MAX), min(base, _INT64_MAX)
+            min_lots, min_notional = min(min_lots, _INT64_MAX), min(min_notional, _INT64_MAX)
+        notional = ticks * lots
+        ok = np.where(is_buy, notional <= quote, lots <= base)
+        return (ok & (lots >= min_lots) & (notional >= min_notional)).astype(bool)
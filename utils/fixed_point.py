@@ -0,0 +1,92 @@
+from collections.abc import MutableMapping
+from decimal import Decimal
+from typing import Dict, Iterator, Union
+
+Number = Union[str, int, float, Decimal]
+
+def to_scaled(value: Number, decimals: int) -> int:
+    """Convert a price/size to an integer count of 10**-decimals units"""
+    if isinstance(value, int):
+        return value * 10 ** decimals
+    if isinstance(value, str) and 'e' not in value and 'E' not in value:
+        negative = value.startswith('-')
+        whole, _, frac = value.lstrip('+-').partition('.')
+        if len(frac) <= decimals:
+            scaled = int(whole or '0') * 10 ** decimals + int(frac.ljust(decimals, '0') or '0')
+            return -scaled if negative else scaled
+    if isinstance(value, Decimal):
+        return int(value.scaleb(decimals).to_integral_value())
+    # Floats and over-precise strings round half-even via Decimal
+    return int(Decimal(str(value)).scaleb(decimals).to_integral_value())
+
+def format_scaled(scaled: int, decimals: int, strip: bool = True) -> str:
+    """Format a scaled integer as a plain decimal string
+
+    Trailing zeros are dropped unless ``strip`` is False, which always
+    prints ``decimals`` places.
+    """
+    sign = '-' if scaled < 0 else ''
+    whole, frac = divmod(abs(scaled), 10 ** decimals)
+    if not strip:
+        return f"{sign}{whole}.{str(frac).rjust(decimals, '0')}" if decimals else f"{sign}{whole}"
+    if frac == 0:
+        return f"{sign}{whole}"
+    return f"{sign}{whole}.{str(frac).rjust(decimals, '0').rstrip('0')}"
+
+def decimals_for(step: Decimal) -> int:
+    """Decimal places needed to represent multiples of ``step`` exactly"""
+    return max(0, -Decimal(step).normalize().as_tuple().exponent)
+
+class FixedPoint:
+    """Integer scale of 10**-decimals units
+
+    Amounts are held as plain ints in these units, so balance and position
+    arithmetic is exact integer arithmetic; Decimals and strings only
+    appear where values enter or leave.
+    """
+    __slots__ = ('decimals', 'unit')
+
+    def __init__(self, decimals: int):
+        self.decimals = decimals
+        self.unit = 10 ** decimals
+
+    def to_int(self, value: Number) -> int:
+        return to_scaled(value, self.decimals)
+
+    def to_decimal(self, scaled: int) -> Decimal:
+        return Decimal(format_scaled(scaled, self.decimals))
+
+    def to_str(self, scaled: int) -> str:
+        return format_scaled(scaled, self.decimals)
+
+    def to_float(self, scaled: int) -> float:
+        return scaled / self.unit
+
+    def __repr__(self) -> str:
+        return f"FixedPoint({self.decimals})"
+
+class FixedPointView(MutableMapping):
+    """Decimal view of a dict of fixed-point ints; writes go through to it"""
+    __slots__ = ('_data', '_scale')
+
+    def __init__(self, data: Dict[str, int], scale: FixedPoint):
+        self._data = data
+        self._scale = scale
+
+    def __getitem__(self, key: str) -> Decimal:
+        return self._scale.to_decimal(self._data[key])
+
+    def __setitem__(self, key: str, value: Number) -> None:
+        self._data[key] = self._scale.to_int(value)
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
@@ -0,0 +1,212 @@
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import accumulate
+from typing import Dict, Sequence
+from config.config import LATENCY_TRACKING, LATENCY_LOG_INTERVAL
+from utils.logger import setup_logger
+
+logger = setup_logger("latency")
+
+QUANTILES = (0.5, 0.99, 0.999)
+
+_SUB_BITS = 7  # Exact below 128ns, then 64 buckets per power of two: under 1.6% error
+_SUB = 1 << _SUB_BITS
+_HALF = _SUB >> 1
+_MAX_BITS = 41  # Values from 2**41 ns (~37 minutes) share the last bucket
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of nanosecond durations
+
+    Values below 128ns get a bucket each; above that every power of two is
+    split into 64 buckets, so any recorded value is reported to within
+    1.6% with a fixed 2.4k-bucket count array and no allocation per record.
+    """
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * self._index((1 << _MAX_BITS) - 1)
+        self.counts.append(0)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        if value < _SUB:
+            return max(value, 0)
+        shift = value.bit_length() - _SUB_BITS
+        return _SUB + (shift - 1) * _HALF + (value >> shift) - _HALF
+
+    @staticmethod
+    def _highest(index: int) -> int:
+        """Largest value that falls in bucket ``index``"""
+        if index < _SUB:
+            return index
+        shift, mantissa = divmod(index - _SUB, _HALF)
+        return ((mantissa + _HALF + 1) << (shift + 1)) - 1
+
+    def record(self, ns: int) -> None:
+        # _index() inlined; this runs for every span
+        if ns < _SUB:
+            index = ns if ns > 0 else 0
+        elif ns.bit_length() <= _MAX_BITS:
+            shift = ns.bit_length() - _SUB_BITS
+            index = _SUB + (shift - 1) * _HALF + (ns >> shift) - _HALF
+        else:
+            index = -1
+        self.counts[index] += 1
+        if ns > self.max:
+            self.max = ns
+        if ns < self.min or not self.count:
+            self.min = ns
+        self.count += 1
+        self.total += ns
+
+    def quantiles(self, quantiles: Sequence[float] = QUANTILES) -> Dict[float, int]:
+        """Nanosecond value at each quantile (0-1), reported as its bucket's upper bound"""
+        if not self.count:
+            return {q: 0 for q in quantiles}
+        result = {}
+        last = len(self.counts) - 1
+        cumulative = accumulate(self.counts)
+        index, seen = -1, 0
+        for q in sorted(quantiles):
+            target = max(1, math.ceil(q * self.count))
+            while seen < target:
+                seen = next(cumulative)
+                index += 1
+            # The last bucket also holds every larger value
+            result[q] = self.max if index == last else min(self._highest(index), self.max)
+        return result
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+class _Span:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record(time.perf_counter_ns() - self.start)
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class LatencyRecorder:
+    """Named monotonic-clock spans aggregated into latency histograms
+
+    ``with recorder.span("name"):`` times a block with perf_counter_ns and
+    records it into that name's histogram. While disabled, span() returns
+    a shared no-op context, so instrumented code pays one attribute check
+    and an empty with block.
+
+    Recording takes no lock: spans are expected to come from one thread or
+    one event loop, as the quoting loops run.
+
+    Args:
+        enabled: Record spans; can be flipped at runtime
+        log_interval: Seconds between maybe_log() summaries
+    """
+    def __init__(self, enabled: bool = LATENCY_TRACKING, log_interval: float = LATENCY_LOG_INTERVAL):
+        self.enabled = enabled
+        self.log_interval = log_interval
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.logger = logger
+        self._next_log = time.monotonic() + log_interval
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        return histogram
+
+    def span(self, name: str):
+        """Context manager timing its block under ``name``"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self.histogram(name))
+
+    def record(self, name: str, ns: int) -> None:
+        """Record a duration measured elsewhere"""
+        if self.enabled:
+            self.histogram(name).record(ns)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Span name -> count, mean, p50/p99/p999 and max in microseconds"""
+        result = {}
+        # Copied first: the metrics thread may export while a span adds a name
+        for name, histogram in list(self.histograms.items()):
+            quantiles = histogram.quantiles()
+            result[name] = {
+                'count': histogram.count,
+                'mean_us': histogram.mean() / 1e3,
+                **{f"p{format(q * 100, 'g').replace('.', '')}_us": ns / 1e3 for q, ns in quantiles.items()},
+                'max_us': histogram.max / 1e3
+            }
+        return result
+
+    def prometheus_text(self, metric: str = "quote_loop_latency_seconds") -> str:
+        """Histograms in the Prometheus text exposition format, as summaries"""
+        lines = [f"# HELP {metric} Quote loop span latency",
+                 f"# TYPE {metric} summary"]
+        for name, histogram in list(self.histograms.items()):
+            for q, ns in histogram.quantiles().items():
+                lines.append(f'{metric}{{span="{name}",quantile="{q}"}} {ns / 1e9:.9f}')
+            lines.append(f'{metric}_sum{{span="{name}"}} {histogram.total / 1e9:.9f}')
+            lines.append(f'{metric}_count{{span="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def maybe_log(self) -> bool:
+        """Log the summary if enabled and the log interval has passed"""
+        if not self.enabled or time.monotonic() < self._next_log:
+            return False
+        self._next_log = time.monotonic() + self.log_interval
+        for name, stats in self.summary().items():
+            self.logger.info(
+                f"{name}: n={stats['count']} mean={stats['mean_us']:.1f}us p50={stats['p50_us']:.1f}us "
+                f"p99={stats['p99_us']:.1f}us p999={stats['p999_us']:.1f}us max={stats['max_us']:.1f}us"
+            )
+        return True
+
+def serve_metrics(recorder: LatencyRecorder, port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve ``recorder.prometheus_text()`` on /metrics from a daemon thread
+
+    Returns the server; call shutdown() on it to stop.
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = recorder.prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="latency-metrics", daemon=True).start()
+    logger.info(f"Serving latency metrics on {host}:{server.server_address[1]}/metrics")
+    return server
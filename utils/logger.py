@@ -1,12 +1,81 @@
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+from logging.handlers import QueueHandler, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from config.config import LOG_QUEUE_SIZE, LOG_QUEUE_POLICY, LOG_BATCH_SIZE
+
+QUEUE_POLICIES = ('drop', 'block')
+
+# Logger name -> the handlers that write its records, whether it logs
+# through them directly or through the async pipeline
+_handlers: Dict[str, List[logging.Handler]] = {}
+_pipeline: Optional['AsyncLogPipeline'] = None
+
+class _BatchedFlush:
+    """Handler mixin that can leave flushing to the end of a pipeline batch"""
+    deferred = False
+
+    def flush(self):
+        if not self.deferred:
+            super().flush()
+
+    def commit(self):
+        super().flush()
+
+class _StreamHandler(_BatchedFlush, logging.StreamHandler):
+    pass
+
+class _RotatingFileHandler(_BatchedFlush, RotatingFileHandler):
+    pass
+
+class LazyJson:
+    """Log argument that is only JSON-encoded if the record is written
+
+    ``logger.info("Trade: %s", LazyJson(trade))`` leaves the encoding to
+    the pipeline thread; ``trade`` must not change after the call.
+    """
+    __slots__ = ('obj',)
+
+    def __init__(self, obj: Any):
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return json.dumps(self.obj)
+
+def _make_handlers(name: str, log_file: Optional[str], log_to_console: bool, debug: bool) -> List[logging.Handler]:
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = []
+
+    # Console handler
+    if log_to_console:
+        console_handler = _StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.DEBUG if debug else logging.INFO)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    # File handler
+    file_handler = _RotatingFileHandler(
+        f"logs/{log_file or f'{name}.log'}",
+        maxBytes=10485760,  # 10MB
+        backupCount=5
+    )
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(formatter)
+    handlers.append(file_handler)
+    return handlers
 
 def setup_logger(name: str, log_file: Optional[str] = None, log_to_console: bool = True, debug: bool = False) -> logging.Logger:
     """Configure and return a logger instance
-    
+
+    With async logging enabled the logger gets a queue handler and its
+    console/file handlers are written from the pipeline thread.
+
     Args:
         name: Logger name
         log_file: Specific log filename (default: None, uses name.log)
@@ -15,30 +84,163 @@ def setup_logger(name: str, log_file: Optional[str] = None, log_to_console: bool
     """
     # Create logs directory if it doesn't exist
     Path("logs").mkdir(exist_ok=True)
-    
+
     logger = logging.getLogger(name)
     logger.setLevel(logging.DEBUG if debug else logging.INFO)
-    
-    # Remove any existing handlers
-    logger.handlers = []
-    
-    # Console handler
-    if log_to_console:
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.DEBUG if debug else logging.INFO)
-        console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
-    
-    # File handler
-    file_handler = RotatingFileHandler(
-        f"logs/{log_file or f'{name}.log'}",
-        maxBytes=10485760,  # 10MB
-        backupCount=5
-    )
-    file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
-    
-    return logger 
\ No newline at end of file
+
+    # Replaces any existing handlers
+    handlers = _make_handlers(name, log_file, log_to_console, debug)
+    _handlers[name] = handlers
+    if _pipeline is not None:
+        for handler in handlers:
+            handler.deferred = True
+        logger.handlers = [_pipeline.handler(name)]
+    else:
+        logger.handlers = handlers
+
+    return logger
+
+class _PipelineHandler(QueueHandler):
+    """Queues a logger's records for the pipeline thread, unformatted"""
+    def __init__(self, pipeline: 'AsyncLogPipeline', sink: str):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+        self.sink = sink
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # QueueHandler formats here, on the logging thread; the pipeline
+        # formats when it writes. The copy carries the logger whose
+        # handlers write it, since a record may propagate to several.
+        record = copy.copy(record)
+        record.sink = self.sink
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.pipeline.put(record)
+
+_STOP = object()
+
+class AsyncLogPipeline:
+    """Bounded queue of log records written in batches by a background thread
+
+    The thread takes whatever is queued, up to ``batch_size`` records,
+    formats and writes each to its logger's handlers, and flushes every
+    handler it touched once per batch.
+
+    When the queue is full, the ``drop`` policy discards DEBUG and INFO
+    records, counting them and noting the gap in the next record's log,
+    and waits for room for warnings and errors. The ``block`` policy
+    waits for room for every record.
+
+    Args:
+        queue_size: Records held before the policy applies
+        policy: 'drop' or 'block'
+        batch_size: Most records written per flush
+    """
+    def __init__(self, queue_size: int = LOG_QUEUE_SIZE, policy: str = LOG_QUEUE_POLICY,
+                 batch_size: int = LOG_BATCH_SIZE):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown log queue policy {policy!r}; expected one of {QUEUE_POLICIES}")
+        self.queue: queue.Queue = queue.Queue(queue_size)
+        self.policy = policy
+        self.batch_size = batch_size
+        self.stats = {'dropped': 0, 'written': 0, 'batches': 0}
+        self._reported_drops = 0
+        self._thread = threading.Thread(target=self._run, name="log-pipeline", daemon=True)
+
+    def handler(self, name: str) -> _PipelineHandler:
+        return _PipelineHandler(self, name)
+
+    def put(self, record: logging.LogRecord) -> None:
+        if self.policy == 'block' or record.levelno >= logging.WARNING:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.stats['dropped'] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write everything queued so far, then end the thread"""
+        if self._thread.is_alive():
+            self.queue.put(_STOP)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not self._write(batch):
+                return
+
+    def _write(self, batch: list) -> bool:
+        """Write a batch; False once the stop marker is reached"""
+        touched = set()
+        running = True
+        for record in batch:
+            if record is _STOP:
+                running = False
+                continue
+            if self.stats['dropped'] > self._reported_drops:
+                dropped = self.stats['dropped'] - self._reported_drops
+                self._reported_drops += dropped
+                self._handle(logging.makeLogRecord({
+                    'name': record.name, 'sink': record.sink, 'levelno': logging.WARNING,
+                    'levelname': 'WARNING', 'msg': f"Dropped {dropped} log records while the queue was full"
+                }), touched)
+            self._handle(record, touched)
+        for handler in touched:
+            try:
+                handler.commit()
+            except Exception:
+                handler.handleError(None)
+        self.stats['batches'] += 1
+        return running
+
+    def _handle(self, record: logging.LogRecord, touched: set) -> None:
+        for handler in _handlers.get(record.sink, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+                touched.add(handler)
+        self.stats['written'] += 1
+
+def enable_async_logging(queue_size: int = LOG_QUEUE_SIZE, policy: str = LOG_QUEUE_POLICY,
+                         batch_size: int = LOG_BATCH_SIZE) -> AsyncLogPipeline:
+    """Move every logger set up by setup_logger, now or later, onto a log pipeline
+
+    Logging calls then only queue the record; formatting and disk writes
+    happen on the pipeline thread. Returns the running pipeline.
+    """
+    global _pipeline
+    if _pipeline is not None:
+        return _pipeline
+    pipeline = AsyncLogPipeline(queue_size, policy, batch_size)
+    pipeline.start()
+    for name, handlers in _handlers.items():
+        for handler in handlers:
+            handler.deferred = True
+        logging.getLogger(name).handlers = [pipeline.handler(name)]
+    _pipeline = pipeline
+    atexit.register(disable_async_logging)
+    return pipeline
+
+def disable_async_logging() -> None:
+    """Write out queued records and return loggers to their own handlers"""
+    global _pipeline
+    pipeline, _pipeline = _pipeline, None
+    if pipeline is None:
+        return
+    for name, handlers in _handlers.items():
+        logging.getLogger(name).handlers = handlers
+    pipeline.stop()
+    for handlers in _handlers.values():
+        for handler in handlers:
+            handler.deferred = False
+            handler.flush()
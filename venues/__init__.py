@@ -0,0 +1,7 @@
+from .registry import register_venue, venue_names, create_client, create_async_client
+from .router import Venue, RouteLeg, SmartOrderRouter
+from .mock import MockVenue
+from .hedger import Hedger
+
+__all__ = ['register_venue', 'venue_names', 'create_client', 'create_async_client',
+           'Venue', 'RouteLeg', 'SmartOrderRouter', 'MockVenue', 'Hedger']
@@ -0,0 +1,298 @@
+import asyncio
+import time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+from config.base_client import AsyncExchangeClient
+from config.config import (HEDGE_LATENCY_BUDGET, HEDGE_SETTLE_CHECKS, HEDGE_SETTLE_INTERVAL, HEDGE_SLIPPAGE,
+                           HEDGE_THRESHOLDS)
+from trading.executions import parse_fills
+from trading.position_tracker import PositionTracker
+from trading.quote_engine import BUY, SELL
+from utils.fixed_point import Number
+from utils.latency import LatencyRecorder
+from utils.logger import setup_logger
+from venues.router import DECIMALS, SmartOrderRouter, Venue
+
+logger = setup_logger("hedger")
+
+CLOCK_SKEW_MS = 1000  # Venue trade times may run this far behind ours when matching unacknowledged legs
+CLAIMED_ORDERS = 1000  # Order ids per venue remembered as already counted
+
+class Leg:
+    """A hedge order whose executed size is not known yet
+
+    ``order_id`` is None when the venue never acknowledged the order.
+    """
+    __slots__ = ('venue', 'side', 'amount', 'order_id', 'executed', 'sent_ms')
+
+    def __init__(self, venue: Venue, side: str, amount: Decimal, order_id: Optional[str] = None,
+                 executed: Decimal = Decimal(0), sent_ms: int = 0):
+        self.venue = venue
+        self.side = side
+        self.amount = amount
+        self.order_id = order_id
+        self.executed = executed  # Lower bound from the acknowledgement
+        self.sent_ms = sent_ms
+
+def _acked(response: Dict, amount: Decimal) -> Decimal:
+    """Size an order acknowledgement reports as executed"""
+    executed = response.get('executedQty')
+    if executed is not None:
+        return min(Decimal(str(executed)), amount)
+    return amount if response.get('status') == 'FILLED' else Decimal(0)
+
+def _orders(response: Any) -> List[Dict]:
+    """Unwrap an open orders response down to its list of orders"""
+    if isinstance(response, dict):
+        response = response.get('data', response.get('list'))
+    return [order for order in response if isinstance(order, dict)] if isinstance(response, list) else []
+
+class Hedger:
+    """Offsets inventory the market maker builds up with IOC orders on other venues or pairs
+
+    PositionTracker calls on_position() after applying fills (see
+    attach()). When a symbol's net exposure - its position plus what
+    has been hedged so far - reaches its threshold, a hedge task is
+    started on the running event loop and on_position() returns at once,
+    so the quote loop never waits on a hedge. The task refreshes the
+    hedge router's books, routes the offsetting size as marketable
+    limits no worse than ``slippage`` past the best price, then cancels
+    whatever did not fill at once, which makes each leg immediate-or-cancel
+    on venues without a native IOC type. Fills that arrive while a hedge
+    is in flight are picked up when it finishes.
+
+    A leg's fill counts only once it is known: from an acknowledgement
+    that shows it filled in full, the cancel response, or the venue's
+    myTrades. Legs whose outcome is unknown - a timed out place or cancel
+    call, or trades not visible yet - stay in ``unsettled`` and no new
+    hedge for the symbol is sent until they settle. They are re-checked
+    ``settle_checks`` times, ``settle_interval`` seconds apart, and again
+    on the next fill after that.
+
+    The time from applying the fill that crossed the threshold to the
+    last hedge leg's acknowledgement is recorded under ``hedge.<symbol>`` in
+    ``latency``; hedges slower than ``budget`` are counted and logged.
+    Hedge positions live here only and start flat on restart. Hedge
+    venues must use a different account from the quoting one, or its
+    fill tracking would apply the hedges to positions as well.
+
+    Args:
+        routers: Inventory symbol -> router for the venues and pair it is hedged on
+        thresholds: Inventory symbol -> absolute net exposure that triggers a hedge
+        slippage: Fraction past the best price a hedge may take
+        budget: Seconds from fill detection to hedge acknowledgement
+        latency: Recorder for hedge latency (router spans go to the routers' own)
+        settle_checks: Re-checks of unknown legs before waiting for the next fill
+        settle_interval: Seconds between those re-checks
+    """
+    def __init__(self, routers: Dict[str, SmartOrderRouter], thresholds: Optional[Dict[str, Number]] = None,
+                 slippage: Number = HEDGE_SLIPPAGE, budget: float = HEDGE_LATENCY_BUDGET,
+                 latency: Optional[LatencyRecorder] = None, settle_checks: int = HEDGE_SETTLE_CHECKS,
+                 settle_interval: float = HEDGE_SETTLE_INTERVAL):
+        thresholds = thresholds if thresholds is not None else HEDGE_THRESHOLDS
+        self.routers = routers
+        self.thresholds = {symbol: Decimal(str(thresholds[symbol])) for symbol in routers if symbol in thresholds}
+        self.slippage = Decimal(str(slippage))
+        self.budget_ns = int(budget * 1e9)
+        self.latency = latency if latency is not None else LatencyRecorder(enabled=True)
+        self.position_tracker: Optional[PositionTracker] = None
+        self.settle_checks = settle_checks
+        self.settle_interval = settle_interval
+        self.hedged: Dict[str, Decimal] = {symbol: Decimal(0) for symbol in routers}
+        self.unsettled: Dict[str, List[Leg]] = {}
+        self.stats = {'triggers': 0, 'hedges': 0, 'legs': 0, 'misses': 0, 'over_budget': 0, 'errors': 0,
+                      'unsettled': 0}
+        self.logger = logger
+        self._claimed: Dict[str, Dict[str, None]] = {}  # Venue -> order ids whose fills are counted, oldest first
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._detected: Dict[str, int] = {}  # Symbol -> perf_counter_ns of the fill a hedge is for
+
+    @classmethod
+    def from_venues(cls, clients: Dict[str, AsyncExchangeClient], symbols: Iterable[str],
+                    latency: Optional[LatencyRecorder] = None, **kwargs) -> 'Hedger':
+        """Hedge each symbol on the same pair across ``clients`` (venue name -> client)
+
+        The routers' per-venue call spans go to ``latency`` too.
+        """
+        latency = latency if latency is not None else LatencyRecorder(enabled=True)
+        routers = {symbol: SmartOrderRouter([Venue(name, client) for name, client in clients.items()], symbol,
+                                            latency=latency)
+                   for symbol in symbols}
+        return cls(routers, latency=latency, **kwargs)
+
+    def attach(self, position_tracker: PositionTracker) -> None:
+        """Hedge the positions ``position_tracker`` holds"""
+        self.position_tracker = position_tracker
+        position_tracker.hedger = self
+
+    def exposure(self, symbol: str) -> Decimal:
+        """Position plus hedges, in base units"""
+        return self.position_tracker.get_position(symbol) + self.hedged.get(symbol, Decimal(0))
+
+    def on_position(self, symbol: str) -> None:
+        """Called after fills for ``symbol`` are applied; starts a hedge if one is due"""
+        threshold = self.thresholds.get(symbol)
+        if threshold is None:
+            return
+        if symbol in self._tasks:
+            self._detected.setdefault(symbol, time.perf_counter_ns())  # For the running hedge's next round
+            return
+        if not self.unsettled.get(symbol) and abs(self.exposure(symbol)) < threshold:
+            return
+        self._detected[symbol] = time.perf_counter_ns()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.logger.warning("Cannot hedge %s outside an event loop", symbol)
+            return
+        self.stats['triggers'] += 1
+        task = self._tasks[symbol] = loop.create_task(self._run(symbol))
+        task.add_done_callback(lambda _: self._tasks.pop(symbol, None))
+
+    async def _run(self, symbol: str) -> None:
+        try:
+            # Fills applied during a hedge raise the exposure again; keep going until it is under
+            # the threshold or the hedge venues stop filling. The exposure is only known once every
+            # leg sent has settled.
+            while True:
+                if self.unsettled.get(symbol):
+                    if not await self._settle(symbol):
+                        break
+                elif abs(self.exposure(symbol)) < self.thresholds[symbol]:
+                    break
+                elif not await self.hedge(symbol) and not self.unsettled.get(symbol):
+                    self.stats['misses'] += 1
+                    break
+        except Exception as e:
+            self.stats['errors'] += 1
+            self.logger.error(f"Hedge of {symbol} failed: {e!r}")
+        finally:
+            self._detected.pop(symbol, None)
+
+    async def _settle(self, symbol: str) -> bool:
+        """Re-check ``symbol``'s unsettled legs; False if some are still unknown"""
+        for _ in range(self.settle_checks):
+            await asyncio.sleep(self.settle_interval)
+            legs = self.unsettled.pop(symbol)
+            results = await asyncio.gather(*(self._executed(self.routers[symbol], leg) for leg in legs))
+            remaining = [leg for leg, done in zip(legs, results) if done is None]
+            self._apply(symbol, legs[0].side, sum((done for done in results if done is not None), Decimal(0)))
+            if not remaining:
+                return True
+            self.unsettled[symbol] = remaining
+        self.logger.error(f"{len(self.unsettled[symbol])} {symbol} hedge legs still unsettled after "
+                          f"{self.settle_checks} checks; not hedging it again until they settle")
+        return False
+
+    async def _executed(self, router: SmartOrderRouter, leg: Leg) -> Optional[Decimal]:
+        """Cancel what is left of ``leg`` and find out how much of it executed; None if still unknown"""
+        venue = leg.venue
+        canceled = True
+        if leg.order_id is not None:
+            result = (await router.cancel({venue.name: [leg.order_id]}))[venue.name][0]
+            if result is not None and result.get('executedQty') is not None:
+                self._claim(venue, [leg.order_id])
+                return max(min(Decimal(str(result['executedQty'])), leg.amount), leg.executed)
+            # Unknown to the venue once done, or the cancel failed: its trades tell what executed
+            canceled = result is not None
+        else:
+            # Never acknowledged: stop whatever of ours rests on that side, then count the fills
+            # since it was sent that no other order accounts for
+            listing = await router._call(venue, 'get_open_orders', venue.client.get_open_orders(router.symbol))
+            if listing is None:
+                return None
+            ids = [str(order['orderId']) for order in _orders(listing)
+                   if str(order.get('side', '')).upper() == leg.side and order.get('orderId') is not None]
+            if ids and None in (await router.cancel({venue.name: ids}))[venue.name]:
+                return None
+        trades = await router._call(venue, 'get_my_trades', venue.client.get_my_trades(router.symbol))
+        if trades is None:
+            return None
+        fills = parse_fills(trades, router.symbol)
+        if leg.order_id is not None:
+            done = sum((fill.amount for fill in fills if fill.order_id == leg.order_id), Decimal(0))
+            if not canceled and done < leg.amount:
+                return None  # May still be working, or its trades are not visible yet
+            self._claim(venue, [leg.order_id])
+            return max(min(done, leg.amount), leg.executed)
+        claimed = self._claimed.get(venue.name, {})
+        matched = [fill for fill in fills if fill.is_buy == (leg.side == BUY) and fill.order_id not in claimed
+                   and fill.ts >= leg.sent_ms - CLOCK_SKEW_MS]
+        self._claim(venue, [fill.order_id for fill in matched])
+        return min(sum((fill.amount for fill in matched), Decimal(0)), leg.amount)
+
+    def _claim(self, venue: Venue, order_ids: Iterable[str]) -> None:
+        claimed = self._claimed.setdefault(venue.name, {})
+        for order_id in order_ids:
+            claimed[order_id] = None
+        while len(claimed) > CLAIMED_ORDERS:
+            del claimed[next(iter(claimed))]
+
+    def _apply(self, symbol: str, side: str, filled: Decimal) -> None:
+        if filled:
+            self.stats['hedges'] += 1
+            self.hedged[symbol] += -filled if side == SELL else filled
+
+    def _limit_price(self, router: SmartOrderRouter, side: str) -> Optional[Decimal]:
+        book = router.consolidated(1)
+        best = book.best_ask() if side == BUY else book.best_bid()
+        if best is None:
+            return None
+        limit = Decimal(str(best)) * (1 + self.slippage if side == BUY else 1 - self.slippage)
+        return limit.quantize(Decimal(1).scaleb(-DECIMALS))
+
+    async def hedge(self, symbol: str) -> Decimal:
+        """Offset ``symbol``'s exposure once, now; returns the size filled"""
+        detected = self._detected.pop(symbol, None) or time.perf_counter_ns()
+        router = self.routers[symbol]
+        exposure = self.exposure(symbol)
+        side = SELL if exposure > 0 else BUY
+        await router.refresh()
+        limit = self._limit_price(router, side)
+        if limit is None:
+            self.logger.warning(f"No {router.symbol} liquidity to hedge {symbol} on")
+            return Decimal(0)
+        sent_ms = int(time.time() * 1000)
+        results = await router.execute(side, abs(exposure), limit)
+        acked = time.perf_counter_ns()
+
+        filled = Decimal(0)
+        open_legs: List[Leg] = []
+        for leg, response in results:
+            order_id = response.get('orderId') if response else None
+            if order_id is None:
+                # Timed out or failed: the order may still have reached the venue
+                open_legs.append(Leg(leg.venue, side, leg.amount, sent_ms=sent_ms))
+                continue
+            done = _acked(response, leg.amount)
+            if done < leg.amount:
+                open_legs.append(Leg(leg.venue, side, leg.amount, str(order_id), done, sent_ms))
+            else:
+                self._claim(leg.venue, [str(order_id)])
+                filled += done
+        outcomes = await asyncio.gather(*(self._executed(router, leg) for leg in open_legs))
+        unsettled = [leg for leg, done in zip(open_legs, outcomes) if done is None]
+        filled += sum((done for done in outcomes if done is not None), Decimal(0))
+        if unsettled:
+            self.stats['unsettled'] += len(unsettled)
+            self.unsettled.setdefault(symbol, []).extend(unsettled)
+            self.logger.warning(f"{len(unsettled)} {symbol} hedge legs unsettled, checking again")
+
+        self.stats['legs'] += len(results)
+        self._apply(symbol, side, filled)
+        elapsed = acked - detected
+        self.latency.record(f"hedge.{symbol}", elapsed)
+        if elapsed > self.budget_ns:
+            self.stats['over_budget'] += 1
+            self.logger.warning(f"Hedge of {symbol} took {elapsed / 1e6:.1f}ms from fill to ack, "
+                                f"over the {self.budget_ns / 1e6:.0f}ms budget")
+        self.logger.info(f"Hedged {symbol}: {side} {filled}/{abs(exposure)} {router.symbol} "
+                         f"(limit {limit}), exposure now {self.exposure(symbol)}")
+        return filled
+
+    async def close(self) -> None:
+        """Wait for hedges in flight"""
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'hedged': dict(self.hedged), 'latency': self.latency.summary()}
@@ -0,0 +1,271 @@
+import asyncio
+import itertools
+import random
+import time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from aiohttp import web
+from market_data.order_book import ASKS, BIDS, OrderBook
+from trading.symbols import SymbolRegistry
+from utils.fixed_point import Number, format_scaled, to_scaled
+from utils.logger import setup_logger
+
+logger = setup_logger("mock_venue")
+
+DECIMALS = 8  # Fixed-point places of every price and size the venue holds
+
+def _side(value: Any) -> str:
+    return 'BUY' if str(value).upper() in ('1', 'BUY') else 'SELL'
+
+def _is_limit(value: Any) -> bool:
+    return str(value).upper() in ('1', 'LIMIT')
+
+class MockVenue:
+    """Local venue speaking the FameEX REST API, for offline routing and latency tests
+
+    Serves one symbol. The book holds other participants' liquidity;
+    our orders take from it at the resting levels' prices, and what a
+    limit order leaves unfilled rests as one of our open orders (not
+    shown in the depth). trade() plays another participant hitting
+    those orders. Fills move the account balances and are listed by
+    myTrades. Every request first waits ``latency`` seconds plus up to
+    ``jitter``. Signatures are not checked.
+
+    Args:
+        symbol: Symbol traded
+        bids: [[price, size], ...] resting bids
+        asks: [[price, size], ...] resting asks
+        balances: Asset -> free balance
+        latency: Seconds added to every request
+        jitter: Most extra random seconds added to every request
+        host: Interface to listen on
+        port: Port to listen on; 0 picks a free one
+    """
+    def __init__(self, symbol: str = 'SZARUSDT', bids: Optional[List] = None, asks: Optional[List] = None,
+                 balances: Optional[Dict[str, Number]] = None, latency: float = 0.0, jitter: float = 0.0,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.symbol = symbol
+        self.base, self.quote = SymbolRegistry().assets(symbol)
+        self.book = OrderBook.from_levels(bids or [], asks or [], symbol, DECIMALS, DECIMALS)
+        self.balances: Dict[str, int] = {asset.upper(): to_scaled(amount, DECIMALS)
+                                         for asset, amount in (balances or {}).items()}
+        self.locked: Dict[str, int] = {}
+        self.orders: Dict[str, Dict] = {}  # Our open orders
+        self.trades: List[Dict] = []  # Our fills, oldest first
+        self.latency = latency
+        self.jitter = jitter
+        self.host = host
+        self.port = port
+        self.stats = {'requests': 0, 'orders': 0, 'cancels': 0, 'fills': 0}
+        self.logger = logger
+        self._ids = itertools.count(1)
+        self._runner: Optional[web.AppRunner] = None
+        self._site: Optional[web.TCPSite] = None
+        app = web.Application(middlewares=[self._delay])
+        app.router.add_get('/sapi/v1/depth', self._depth)
+        app.router.add_get('/sapi/v1/ticker', self._ticker)
+        app.router.add_post('/sapi/v1/order', self._order)
+        app.router.add_post('/sapi/v1/batchOrders', self._batch_orders)
+        app.router.add_post('/sapi/v1/cancel', self._cancel)
+        app.router.add_post('/sapi/v1/batchCancel', self._batch_cancel)
+        app.router.add_get('/sapi/v1/openOrders', self._open_orders)
+        app.router.add_get('/sapi/v1/account', self._account)
+        app.router.add_get('/sapi/v1/myTrades', self._my_trades)
+        self.app = app
+
+    @classmethod
+    def synthetic(cls, symbol: str = 'SZARUSDT', mid: Number = '0.0951', step: Number = '0.0001',
+                  levels: int = 20, size: Number = '1000', **kwargs) -> 'MockVenue':
+        """Venue with ``levels`` evenly spaced levels of ``size`` each side of ``mid``"""
+        mid, step = Decimal(str(mid)), Decimal(str(step))
+        bids = [[str(mid - step * i), str(size)] for i in range(1, levels + 1)]
+        asks = [[str(mid + step * i), str(size)] for i in range(1, levels + 1)]
+        return cls(symbol, bids, asks, **kwargs)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        self._site = web.TCPSite(self._runner, self.host, self.port)
+        await self._site.start()
+        if not self.port:
+            self.port = self._runner.addresses[0][1]
+        self.logger.info(f"Mock venue for {self.symbol} listening on {self.url}")
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> 'MockVenue':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    # Matching
+
+    def _fmt(self, scaled: int) -> str:
+        return format_scaled(scaled, DECIMALS)
+
+    def _move(self, asset: str, units: int) -> None:
+        self.balances[asset] = self.balances.get(asset, 0) + units
+
+    def _fill(self, order_id: str, is_buy: bool, price: int, size: int, is_maker: bool) -> None:
+        notional = price * size // 10 ** DECIMALS
+        self._move(self.base, size if is_buy else -size)
+        self._move(self.quote, -notional if is_buy else notional)
+        self.trades.append({
+            'id': len(self.trades) + 1, 'orderId': order_id, 'symbol': self.symbol.lower(),
+            'side': 'BUY' if is_buy else 'SELL', 'isBuyer': is_buy, 'isMaker': is_maker,
+            'price': self._fmt(price), 'qty': self._fmt(size), 'fee': '0', 'feeCoin': self.quote,
+            'time': int(time.time() * 1000)
+        })
+        self.stats['fills'] += 1
+
+    def _lock(self, order: Dict, units: int) -> None:
+        """Move ``units`` of an open order's remaining size in or out of locked balances"""
+        asset = self.quote if order['is_buy'] else self.base
+        amount = order['price'] * units // 10 ** DECIMALS if order['is_buy'] else units
+        self.locked[asset] = self.locked.get(asset, 0) + amount
+        self._move(asset, -amount)
+
+    def submit(self, side: Any, order_type: Any, volume: Number, price: Optional[Number] = None) -> Dict:
+        """Match an order of ours against the book; a limit order's remainder rests"""
+        order_id = str(next(self._ids))
+        is_buy = _side(side) == 'BUY'
+        limit = to_scaled(price, DECIMALS) if price is not None and _is_limit(order_type) else None
+        remaining = to_scaled(volume, DECIMALS)
+        book_side = ASKS if is_buy else BIDS
+        keys, sizes, sign = self.book.scaled_columns(book_side)
+        while remaining and keys:
+            level = sign * keys[0]
+            if limit is not None and (level > limit if is_buy else level < limit):
+                break
+            take = min(remaining, sizes[0])
+            self._fill(order_id, is_buy, level, take, is_maker=False)
+            self.book.update_scaled(book_side, level, sizes[0] - take)
+            remaining -= take
+        status = 'FILLED' if not remaining else 'NEW'
+        if remaining and limit is not None:
+            order = {'orderId': order_id, 'is_buy': is_buy, 'price': limit, 'size': remaining,
+                     'orig': to_scaled(volume, DECIMALS), 'time': int(time.time() * 1000)}
+            self.orders[order_id] = order
+            self._lock(order, remaining)
+            if remaining != order['orig']:
+                status = 'PARTIALLY_FILLED'
+        elif remaining:
+            status = 'CANCELED'  # Market order ran out of book
+        self.stats['orders'] += 1
+        executed = self._fmt(to_scaled(volume, DECIMALS) - remaining)
+        return {'orderId': order_id, 'symbol': self.symbol.lower(), 'side': 'BUY' if is_buy else 'SELL',
+                'price': price, 'origQty': str(volume), 'executedQty': executed, 'status': status}
+
+    def cancel(self, order_id: str) -> bool:
+        order = self.orders.pop(str(order_id), None)
+        if order is None:
+            return False
+        self._lock(order, -order['size'])
+        self.stats['cancels'] += 1
+        return True
+
+    def trade(self, side: str, volume: Number, price: Optional[Number] = None) -> List[Dict]:
+        """Another participant sends an order of ``side``, filling our best-priced open orders first
+
+        Returns the fills of ours it produced.
+        """
+        taker_buy = _side(side) == 'BUY'
+        remaining = to_scaled(volume, DECIMALS)
+        limit = to_scaled(price, DECIMALS) if price is not None else None
+        # Our orders on the other side, best price first, then oldest
+        makers = sorted((o for o in self.orders.values() if o['is_buy'] != taker_buy),
+                        key=lambda o: (o['price'] if taker_buy else -o['price'], int(o['orderId'])))
+        first = len(self.trades)
+        for order in makers:
+            if not remaining:
+                break
+            if limit is not None and (order['price'] > limit if taker_buy else order['price'] < limit):
+                break
+            take = min(remaining, order['size'])
+            self._lock(order, -take)
+            self._fill(order['orderId'], order['is_buy'], order['price'], take, is_maker=True)
+            order['size'] -= take
+            remaining -= take
+            if not order['size']:
+                del self.orders[order['orderId']]
+        return self.trades[first:]
+
+    # HTTP
+
+    @web.middleware
+    async def _delay(self, request: web.Request, handler):
+        self.stats['requests'] += 1
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        return await handler(request)
+
+    @staticmethod
+    def _ok(data: Any) -> web.Response:
+        return web.json_response({'code': 200, 'data': data})
+
+    async def _depth(self, request: web.Request) -> web.Response:
+        limit = int(request.query.get('limit', 100))
+        book = self.book.to_dict(limit)
+        return self._ok({'bids': book[BIDS], 'asks': book[ASKS], 'time': int(time.time() * 1000)})
+
+    async def _ticker(self, request: web.Request) -> web.Response:
+        bid, ask = self.book.best_bid(), self.book.best_ask()
+        return self._ok({'bid': str(bid) if bid is not None else None, 'ask': str(ask) if ask is not None else None})
+
+    async def _order(self, request: web.Request) -> web.Response:
+        params = await request.json()
+        return self._ok(self.submit(params['side'], params['type'], params['volume'], params.get('price')))
+
+    async def _batch_orders(self, request: web.Request) -> web.Response:
+        params = await request.json()
+        ids = [self.submit(order['side'], order['batchType'], order['volume'], order.get('price'))['orderId']
+               for order in params.get('orders', [])]
+        return self._ok({'ids': ids})
+
+    async def _cancel(self, request: web.Request) -> web.Response:
+        params = await request.json()
+        if not self.cancel(params['orderId']):
+            return web.json_response({'code': -2011, 'msg': 'Unknown order'})
+        return self._ok({'orderId': params['orderId'], 'status': 'CANCELED'})
+
+    async def _batch_cancel(self, request: web.Request) -> web.Response:
+        params = await request.json()
+        success, failed = [], []
+        for order_id in params.get('orderIds', []):
+            (success if self.cancel(order_id) else failed).append(order_id)
+        return self._ok({'success': success, 'failed': failed})
+
+    async def _open_orders(self, request: web.Request) -> web.Response:
+        limit = int(request.query.get('limit', 100))
+        return self._ok([{
+            'orderId': order['orderId'], 'symbol': self.symbol.lower(), 'side': 'BUY' if order['is_buy'] else 'SELL',
+            'price': self._fmt(order['price']), 'origQty': self._fmt(order['orig']),
+            'executedQty': self._fmt(order['orig'] - order['size']), 'type': 'LIMIT',
+            'status': 'NEW' if order['size'] == order['orig'] else 'PARTIALLY_FILLED', 'time': order['time']
+        } for order in list(self.orders.values())[:limit]])
+
+    async def _account(self, request: web.Request) -> web.Response:
+        assets = set(self.balances) | set(self.locked)
+        return self._ok({'balances': [{
+            'asset': asset, 'free': self._fmt(self.balances.get(asset, 0)),
+            'locked': self._fmt(self.locked.get(asset, 0))
+        } for asset in sorted(assets)]})
+
+    async def _my_trades(self, request: web.Request) -> web.Response:
+        limit = int(request.query.get('limit', 100))
+        from_id = request.query.get('fromId')
+        if from_id is not None:
+            trades = [t for t in self.trades if t['id'] >= int(from_id)][:limit]
+        else:
+            trades = self.trades[-limit:]
+        return self._ok(trades)
@@ -0,0 +1,59 @@
+from functools import partial
+from typing import Callable, Dict, List, Optional
+from config.api_client import FameexClient
+from config.async_api_client import AsyncFameexClient
+from config.base_client import AsyncExchangeClient, ExchangeClient
+from config.config import MOCK_VENUE_URL
+
+class VenueSpec:
+    """Client constructors for one venue; either may be None if the venue has no such client"""
+    __slots__ = ('name', 'factory', 'async_factory')
+
+    def __init__(self, name: str, factory: Optional[Callable[..., ExchangeClient]],
+                 async_factory: Optional[Callable[..., AsyncExchangeClient]]):
+        self.name = name
+        self.factory = factory
+        self.async_factory = async_factory
+
+_venues: Dict[str, VenueSpec] = {}
+
+def register_venue(name: str, factory: Optional[Callable[..., ExchangeClient]] = None,
+                   async_factory: Optional[Callable[..., AsyncExchangeClient]] = None) -> None:
+    """Make a venue available to create_client/create_async_client
+
+    Factories are called as ``factory(api_key, api_secret, test_mode, **kwargs)``;
+    registering a name again replaces it.
+    """
+    if factory is None and async_factory is None:
+        raise ValueError(f"Venue {name!r} needs a sync or async client factory")
+    _venues[name.lower()] = VenueSpec(name.lower(), factory, async_factory)
+
+def venue_names() -> List[str]:
+    return sorted(_venues)
+
+def _spec(name: str) -> VenueSpec:
+    spec = _venues.get(name.lower())
+    if spec is None:
+        raise ValueError(f"Unsupported exchange type: {name} (known: {', '.join(venue_names())})")
+    return spec
+
+def create_client(name: str, api_key: str, api_secret: str, test_mode: bool = False,
+                  **kwargs) -> ExchangeClient:
+    """Synchronous client for a registered venue"""
+    spec = _spec(name)
+    if spec.factory is None:
+        raise ValueError(f"Venue {spec.name} has no synchronous client")
+    return spec.factory(api_key, api_secret, test_mode, **kwargs)
+
+def create_async_client(name: str, api_key: str, api_secret: str, test_mode: bool = False,
+                        **kwargs) -> AsyncExchangeClient:
+    """Asyncio client for a registered venue"""
+    spec = _spec(name)
+    if spec.async_factory is None:
+        raise ValueError(f"Venue {spec.name} has no async client")
+    return spec.async_factory(api_key, api_secret, test_mode, **kwargs)
+
+register_venue("fameex", FameexClient, AsyncFameexClient)
+# MockVenue speaks the FameEX API; pass base_url to reach one not on MOCK_VENUE_URL
+register_venue("mock", partial(FameexClient, base_url=MOCK_VENUE_URL),
+               partial(AsyncFameexClient, base_url=MOCK_VENUE_URL))
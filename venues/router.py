@@ -0,0 +1,269 @@
+import asyncio
+import time
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from config.base_client import AsyncExchangeClient
+from config.config import ORDER_BOOK_DEPTH, ROUTER_TIMEOUT, VENUE_FEES
+from market_data.order_book import ASKS, BIDS, OrderBook
+from trading.quote_engine import BUY, normalize_side
+from utils.fixed_point import Number, format_scaled, to_scaled
+from utils.latency import LatencyRecorder
+from utils.logger import setup_logger
+
+logger = setup_logger("router")
+
+DECIMALS = 8  # Scale of the venue books (OrderBook.from_dict's default)
+
+class Venue:
+    """A venue the router trades on, with its fees and latest book
+
+    Args:
+        name: Venue name (see venues.registry)
+        client: Async client for the venue
+        maker_fee: Fee rate on resting orders (defaults from VENUE_FEES)
+        taker_fee: Fee rate on orders that take liquidity (defaults from VENUE_FEES)
+    """
+    __slots__ = ('name', 'client', 'maker_fee', 'taker_fee', 'book', 'updated')
+
+    def __init__(self, name: str, client: AsyncExchangeClient, maker_fee: Optional[Number] = None,
+                 taker_fee: Optional[Number] = None):
+        fees = VENUE_FEES.get(name, {})
+        self.name = name
+        self.client = client
+        self.maker_fee = Decimal(str(maker_fee if maker_fee is not None else fees.get('maker_fee', 0)))
+        self.taker_fee = Decimal(str(taker_fee if taker_fee is not None else fees.get('taker_fee', 0)))
+        self.book: Optional[OrderBook] = None  # None until fetched, or after a failed fetch
+        self.updated = 0.0
+
+    def __repr__(self) -> str:
+        return f"Venue({self.name!r}, maker={self.maker_fee}, taker={self.taker_fee}, book={self.book})"
+
+class RouteLeg:
+    """The part of a routed order sent to one venue
+
+    ``price`` is the worst level taken there, which the leg is sent as a
+    limit at; ``cost`` is the fee-inclusive quote amount paid (buys) or
+    received (sells) if it fills at the levels seen.
+    """
+    __slots__ = ('venue', 'side', 'amount', 'price', 'cost')
+
+    def __init__(self, venue: Venue, side: str, amount: Decimal, price: Decimal, cost: Decimal):
+        self.venue = venue
+        self.side = side
+        self.amount = amount
+        self.price = price
+        self.cost = cost
+
+    def order(self) -> Dict[str, str]:
+        return {'side': self.side, 'order_type': 'LIMIT', 'volume': str(self.amount), 'price': str(self.price)}
+
+    def __repr__(self) -> str:
+        return f"RouteLeg({self.venue.name}, {self.side} {self.amount}@{self.price}, cost={self.cost})"
+
+class SmartOrderRouter:
+    """Consolidated book for one symbol across venues, routing orders by effective price
+
+    refresh() fetches every venue's book at once; a venue whose fetch
+    fails or takes longer than ``timeout`` is left out of routing until
+    a later refresh succeeds. Taker orders are split across venues by
+    fee-adjusted level price (plan/execute); resting quotes go to the
+    venue where they would neither cross nor pay more in fees, with the
+    least size ahead of them (quote_venue/place_quotes). Calls to
+    different venues are always issued concurrently, and each is timed
+    under ``<venue>.<call>`` in ``latency``.
+
+    Args:
+        venues: Venues to route across
+        symbol: Symbol routed
+        depth: Book levels fetched per venue
+        timeout: Seconds to wait for each venue call
+        latency: Recorder for per-venue call latency
+    """
+    def __init__(self, venues: Sequence[Venue], symbol: str, depth: int = ORDER_BOOK_DEPTH,
+                 timeout: float = ROUTER_TIMEOUT, latency: Optional[LatencyRecorder] = None):
+        if not venues:
+            raise ValueError("SmartOrderRouter needs at least one venue")
+        self.venues: Dict[str, Venue] = {venue.name: venue for venue in venues}
+        self.symbol = symbol
+        self.depth = depth
+        self.timeout = timeout
+        self.latency = latency if latency is not None else LatencyRecorder()
+        self.stats = {'refreshes': 0, 'routed': 0, 'quotes': 0,
+                      'failures': {venue.name: 0 for venue in venues}}
+        self.logger = logger
+
+    async def _call(self, venue: Venue, call: str, coroutine):
+        """Await a venue call under the timeout; None on failure"""
+        try:
+            with self.latency.span(f"{venue.name}.{call}"):
+                return await asyncio.wait_for(coroutine, self.timeout)
+        except Exception as e:
+            self.stats['failures'][venue.name] += 1
+            self.logger.warning(f"{venue.name} {call} failed: {e!r}")
+            return None
+
+    async def _fetch_book(self, venue: Venue) -> bool:
+        response = await self._call(venue, 'get_order_book',
+                                    venue.client.get_order_book(self.symbol, self.depth))
+        if not response or not isinstance(response, dict):
+            venue.book = None
+            return False
+        venue.book = OrderBook.from_dict(response, f"{venue.name}:{self.symbol}")
+        venue.updated = time.monotonic()
+        return True
+
+    async def refresh(self) -> Dict[str, bool]:
+        """Fetch every venue's book concurrently; venue -> whether it succeeded"""
+        results = await asyncio.gather(*(self._fetch_book(venue) for venue in self.venues.values()))
+        self.stats['refreshes'] += 1
+        return dict(zip(self.venues, results))
+
+    def _live(self) -> List[Venue]:
+        return [venue for venue in self.venues.values() if venue.book is not None]
+
+    def consolidated(self, depth: Optional[int] = None) -> OrderBook:
+        """All live venues' levels in one book, sizes summed at equal prices"""
+        book = OrderBook(self.symbol)
+        for side in (BIDS, ASKS):
+            merged: Dict[int, int] = {}
+            for venue in self._live():
+                keys, sizes, sign = venue.book.scaled_columns(side)
+                for key, size in zip(keys, sizes):
+                    merged[sign * key] = merged.get(sign * key, 0) + size
+            for price, size in merged.items():
+                book.update_scaled(side, price, size)
+        return book.copy(depth) if depth is not None else book
+
+    def _taker_levels(self, side: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(effective price, price, size, venue index) of the levels a ``side`` order takes, best first"""
+        book_side = ASKS if side == BUY else BIDS
+        live = self._live()
+        prices, sizes, effective, owners = [], [], [], []
+        for i, venue in enumerate(live):
+            keys, level_sizes, sign = venue.book.scaled_columns(book_side)
+            price = np.array(keys, dtype=np.int64) * sign
+            rate = float(venue.taker_fee)
+            prices.append(price)
+            sizes.append(np.array(level_sizes, dtype=np.int64))
+            effective.append(price * (1 + rate if side == BUY else 1 - rate))
+            owners.append(np.full(len(price), i))
+        if not live:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty, empty
+        effective, prices, sizes, owners = (np.concatenate(column)
+                                            for column in (effective, prices, sizes, owners))
+        order = np.argsort(effective if side == BUY else -effective, kind='stable')
+        return effective[order], prices[order], sizes[order], owners[order]
+
+    def plan(self, side: str, amount: Number, limit_price: Optional[Number] = None) -> List[RouteLeg]:
+        """Split a taker order across venues, best fee-adjusted levels first
+
+        Args:
+            side: 'BUY'/'SELL' (or 1/2)
+            amount: Size to trade
+            limit_price: Worst level price to take, before fees
+
+        Returns:
+            One leg per venue used; their amounts fall short of ``amount``
+            if the live books (within the limit) do not hold enough
+        """
+        side = normalize_side(side)
+        live = self._live()
+        effective, prices, sizes, owners = self._taker_levels(side)
+        if limit_price is not None:
+            limit = to_scaled(limit_price, DECIMALS)
+            keep = prices <= limit if side == BUY else prices >= limit
+            prices, sizes, owners = prices[keep], sizes[keep], owners[keep]
+        wanted = to_scaled(amount, DECIMALS)
+        before = np.concatenate(([0], np.cumsum(sizes)[:-1])) if len(sizes) else sizes
+        take = np.clip(wanted - before, 0, sizes)
+        used = take > 0
+        legs = []
+        for i in np.unique(owners[used]).tolist():
+            venue = live[i]
+            mine = used & (owners == i)
+            size = int(take[mine].sum())
+            notional = sum(int(p) * int(t) for p, t in zip(prices[mine], take[mine]))
+            fee = venue.taker_fee
+            cost = Decimal(notional).scaleb(-2 * DECIMALS) * (1 + fee if side == BUY else 1 - fee)
+            worst = int(prices[mine].max() if side == BUY else prices[mine].min())
+            legs.append(RouteLeg(venue, side, Decimal(format_scaled(size, DECIMALS)),
+                                 Decimal(format_scaled(worst, DECIMALS)), cost))
+        return legs
+
+    async def execute(self, side: str, amount: Number, limit_price: Optional[Number] = None
+                      ) -> List[Tuple[RouteLeg, Optional[Dict]]]:
+        """Route a taker order: send each planned leg as a marketable limit, all at once
+
+        Returns (leg, venue response or None) pairs.
+        """
+        legs = self.plan(side, amount, limit_price)
+        responses = await asyncio.gather(*(
+            self._call(leg.venue, 'place_order', leg.venue.client.place_order(self.symbol, **leg.order()))
+            for leg in legs
+        ))
+        self.stats['routed'] += 1
+        self.logger.info(f"Routed {side} {amount} {self.symbol}: " +
+                         ", ".join(f"{leg.venue.name} {leg.amount}@{leg.price}" for leg in legs))
+        return list(zip(legs, responses))
+
+    def quote_venue(self, side: str, price: Number) -> Optional[Venue]:
+        """Venue to rest a quote at ``price`` on
+
+        Skips venues where it would cross the book; of the rest, picks the
+        lowest maker fee, then the least size resting at an equal or
+        better price. None if it would cross everywhere.
+        """
+        is_buy = normalize_side(side) == BUY
+        scaled = to_scaled(price, DECIMALS)
+        best = None
+        for venue in self._live():
+            book = venue.book
+            opposite = book.best_ask_scaled() if is_buy else book.best_bid_scaled()
+            if opposite is not None and (scaled >= opposite if is_buy else scaled <= opposite):
+                continue
+            keys, sizes, sign = book.scaled_columns(BIDS if is_buy else ASKS)
+            # Levels are best-first, so those at or better than the quote lead
+            ahead = sum(size for key, size in zip(keys, sizes)
+                        if (sign * key >= scaled if is_buy else sign * key <= scaled))
+            rank = (venue.maker_fee, ahead)
+            if best is None or rank < best[0]:
+                best = (rank, venue)
+        return best[1] if best else None
+
+    async def place_quotes(self, orders: List[Dict]) -> List[Optional[Dict]]:
+        """Rest place_order keyword dicts on their quote_venue, one batch per venue, all at once
+
+        Each result carries the venue in ``'venue'``; orders no venue can
+        take without crossing get None.
+        """
+        by_venue: Dict[str, List[int]] = {}
+        for i, order in enumerate(orders):
+            venue = self.quote_venue(order['side'], order['price'])
+            if venue is not None:
+                by_venue.setdefault(venue.name, []).append(i)
+        names = list(by_venue)
+        responses = await asyncio.gather(*(
+            self._call(self.venues[name], 'place_orders',
+                       self.venues[name].client.place_orders(self.symbol, [orders[i] for i in by_venue[name]]))
+            for name in names
+        ))
+        results: List[Optional[Dict]] = [None] * len(orders)
+        for name, placed in zip(names, responses):
+            for i, result in zip(by_venue[name], placed or []):
+                if result is not None:
+                    results[i] = {**result, 'venue': name}
+        self.stats['quotes'] += sum(result is not None for result in results)
+        return results
+
+    async def cancel(self, order_ids: Dict[str, List[str]]) -> Dict[str, List[Optional[Dict]]]:
+        """Cancel venue -> order ids on every venue at once"""
+        names = [name for name, ids in order_ids.items() if ids]
+        responses = await asyncio.gather(*(
+            self._call(self.venues[name], 'cancel_orders',
+                       self.venues[name].client.cancel_orders(self.symbol, order_ids[name]))
+            for name in names
+        ))
+        return {name: response if response is not None else [None] * len(order_ids[name])
+                for name, response in zip(names, responses)}